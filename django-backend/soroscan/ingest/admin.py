@@ -59,7 +59,7 @@ from .models import (
     WebhookDeliveryLog,
     WebhookSubscription,
 )
-from .tasks import backfill_contract_events, dispatch_webhook
+from .tasks import backfill_contract_events, dispatch_webhook, orchestrate_backfill
 
 
 class BackfillActionForm(ActionForm):
@@ -400,7 +400,7 @@ class TrackedContractAdmin(AdminAuditMixin, admin.ModelAdmin):
 
         task_ids = []
         for contract in queryset:
-            task = backfill_contract_events.delay(contract.contract_id, from_ledger_int, to_ledger_int)
+            task = orchestrate_backfill.delay(contract.contract_id, from_ledger_int, to_ledger_int)
             task_ids.append(f"{contract.name}: {task.id}")
 
         if task_ids:
@@ -1839,7 +1839,7 @@ class EventAggregationAdmin(AdminAuditMixin, admin.ModelAdmin):
 {type_html}
 
 <p style="color:#6c757d;font-size:12px;margin-top:32px">
-  Aggregations are updated hourly by the <code>aggregate_event_statistics</code> Celery task.
+  Counts are flushed every few seconds by <code>flush_event_counters</code> and finalised hourly by <code>aggregate_event_statistics</code>.
   Export raw data via <code>GET /api/ingest/analytics/export/?format=csv</code>.
 </p>
 </div></body></html>
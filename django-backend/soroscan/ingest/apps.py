@@ -7,6 +7,7 @@ class IngestConfig(AppConfig):
     verbose_name = "SoroScan Ingest"
 
     def ready(self):
+        import soroscan.ingest.services.event_bookkeeping  # noqa: F401 — registers signal handlers
         import soroscan.ingest.signals  # noqa: F401 — registers signal handlers
         from soroscan.operational_metrics import register_operational_collector
         from soroscan.shutdown import register_shutdown_handlers
@@ -0,0 +1,659 @@
+"""
+Streaming S3 archival of old contract events (data retention).
+
+Events are read in ``(timestamp, id)`` keyset chunks, each chunk through a
+server-side cursor, and written row by row into a compressor whose output
+goes straight to an S3 multipart upload. Nothing but the current chunk, the
+compressor window and one upload part is held in memory, however many
+events a policy archives.
+
+An object is closed once its compressed size reaches
+``ARCHIVE_MAX_OBJECT_BYTES`` and the next rows start a new one. After an
+object is uploaded, exactly the rows it contains are deleted: the keyset
+range from its first to its last row, limited to ids that existed when the
+run started so rows inserted meanwhile are never removed unarchived.
+
+Two formats are supported (``ARCHIVE_FORMAT``):
+
+* ``ndjson`` — gzip-compressed newline-delimited JSON (``.ndjson.gz``).
+* ``parquet`` — zstd-compressed Parquet (``.parquet``); requires ``pyarrow``.
+
+Restores run as background jobs (``run_restore_job``): each batch's object
+is decompressed as it is downloaded, optionally cut to a timestamp/ledger
+sub-range, and bulk-inserted with the idempotent importer, several batches
+at a time.
+
+Set ``AWS_S3_ENDPOINT_URL`` to archive to MinIO, LocalStack or another
+local S3 stand-in.
+"""
+import gzip
+import hashlib
+import io
+import json
+import logging
+import shutil
+import tempfile
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import UTC, datetime
+from typing import Any, BinaryIO
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max, Q, QuerySet
+from django.utils import timezone
+
+from .event_counters import mark_recount
+from .models import (
+    ArchivalAuditLog,
+    ArchivedEventBatch,
+    ContractEvent,
+    DataRetentionPolicy,
+    IndexerState,
+)
+from .pagination import keyset_after
+from .services.export_import import ImportResult, import_rows, iter_json_array
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FIELDS = (
+    "id",
+    "contract__contract_id",
+    "event_type",
+    "payload",
+    "payload_hash",
+    "ledger",
+    "event_index",
+    "timestamp",
+    "tx_hash",
+)
+
+ARCHIVE_FORMATS = ("ndjson", "parquet")
+
+# S3 rejects multipart parts below 5 MiB (except the last one).
+MIN_PART_BYTES = 5 * 1024 * 1024
+# Parquet objects being restored are buffered in memory up to this size,
+# then spill to a temporary file.
+RESTORE_SPOOL_BYTES = 64 * 1024 * 1024
+
+
+def s3_client():
+    import boto3  # noqa: PLC0415
+
+    return boto3.client(
+        "s3",
+        region_name=getattr(settings, "AWS_S3_REGION_NAME", None) or None,
+        endpoint_url=getattr(settings, "AWS_S3_ENDPOINT_URL", None) or None,
+        aws_access_key_id=getattr(settings, "AWS_ACCESS_KEY_ID", None) or None,
+        aws_secret_access_key=getattr(settings, "AWS_SECRET_ACCESS_KEY", None) or None,
+    )
+
+
+class MultipartUpload(io.RawIOBase):
+    """
+    Write-only file object that streams its bytes to one S3 object.
+
+    Bytes are buffered until *part_size* and sent as multipart parts. An
+    object that never fills a part is sent with a single ``put_object``.
+    ``close()`` completes the upload; ``abort()`` discards it.
+    """
+
+    def __init__(self, s3, bucket: str, key: str, part_size: int, **object_args: Any):
+        super().__init__()
+        self.s3 = s3
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.object_args = object_args
+        self.size = 0
+        self._buffer = bytearray()
+        self._upload_id: str | None = None
+        self._parts: list[dict[str, Any]] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self.size += len(data)
+        while len(self._buffer) >= self.part_size:
+            self._upload_part(bytes(self._buffer[: self.part_size]))
+            del self._buffer[: self.part_size]
+        return len(data)
+
+    def _upload_part(self, body: bytes) -> None:
+        if self._upload_id is None:
+            self._upload_id = self.s3.create_multipart_upload(
+                Bucket=self.bucket, Key=self.key, **self.object_args
+            )["UploadId"]
+        number = len(self._parts) + 1
+        response = self.s3.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=number,
+            Body=body,
+        )
+        self._parts.append({"PartNumber": number, "ETag": response["ETag"]})
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        if self._upload_id is None:
+            self.s3.put_object(
+                Bucket=self.bucket, Key=self.key, Body=bytes(self._buffer), **self.object_args
+            )
+        else:
+            if self._buffer:
+                self._upload_part(bytes(self._buffer))
+            self.s3.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self._upload_id,
+                MultipartUpload={"Parts": self._parts},
+            )
+        self._buffer.clear()
+        super().close()
+
+    def abort(self) -> None:
+        if self._upload_id is not None:
+            self.s3.abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self._upload_id
+            )
+        self._buffer.clear()
+        super().close()
+
+
+def _json_row(row: dict[str, Any]) -> dict[str, Any]:
+    return {**row, "timestamp": row["timestamp"].isoformat()}
+
+
+class _NDJSONWriter:
+    suffix = ".ndjson.gz"
+    object_args = {"ContentType": "application/x-ndjson", "ContentEncoding": "gzip"}
+
+    def __init__(self, sink: BinaryIO):
+        self._gzip = gzip.GzipFile(fileobj=sink, mode="wb")
+
+    def write(self, row: dict[str, Any]) -> None:
+        self._gzip.write(json.dumps(_json_row(row), default=str).encode("utf-8") + b"\n")
+
+    def close(self) -> None:
+        self._gzip.close()
+
+
+class _ParquetWriter:
+    suffix = ".parquet"
+    object_args = {"ContentType": "application/vnd.apache.parquet"}
+    row_group_size = 10_000
+
+    def __init__(self, sink: BinaryIO):
+        import pyarrow as pa  # noqa: PLC0415
+        import pyarrow.parquet as pq  # noqa: PLC0415
+
+        self._pa = pa
+        self._schema = pa.schema(
+            [
+                ("id", pa.int64()),
+                ("contract__contract_id", pa.string()),
+                ("event_type", pa.string()),
+                ("payload", pa.string()),
+                ("payload_hash", pa.string()),
+                ("ledger", pa.int64()),
+                ("event_index", pa.int64()),
+                ("timestamp", pa.timestamp("us", tz="UTC")),
+                ("tx_hash", pa.string()),
+            ]
+        )
+        self._writer = pq.ParquetWriter(sink, self._schema, compression="zstd")
+        self._rows: list[dict[str, Any]] = []
+
+    def write(self, row: dict[str, Any]) -> None:
+        self._rows.append({**row, "payload": json.dumps(row["payload"], default=str)})
+        if len(self._rows) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._rows:
+            self._writer.write_table(
+                self._pa.Table.from_pylist(self._rows, schema=self._schema)
+            )
+            self._rows = []
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+
+def _writer_class(archive_format: str):
+    if archive_format not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unknown ARCHIVE_FORMAT {archive_format!r}")
+    return _ParquetWriter if archive_format == "parquet" else _NDJSONWriter
+
+
+def iter_keyset(queryset: QuerySet, chunk_size: int) -> Iterator[dict[str, Any]]:
+    """Yield ``ARCHIVE_FIELDS`` rows in ``(timestamp, id)`` order, one keyset chunk at a time."""
+    queryset = queryset.order_by("timestamp", "id").values(*ARCHIVE_FIELDS)
+    after = None
+    while True:
+        chunk = keyset_after(queryset, *after) if after else queryset
+        count = 0
+        for row in chunk[:chunk_size].iterator(chunk_size=min(chunk_size, 2000)):
+            count += 1
+            after = (row["timestamp"], row["id"])
+            yield row
+        if count < chunk_size:
+            return
+
+
+def keyset_range(queryset: QuerySet, first: tuple[datetime, int], last: tuple[datetime, int]):
+    """Rows of *queryset* between two ``(timestamp, id)`` keys, both inclusive."""
+    # The plain timestamp bounds are redundant but let PostgreSQL prune partitions.
+    return queryset.filter(
+        timestamp__gte=first[0],
+        timestamp__lte=last[0],
+    ).filter(
+        Q(timestamp__gt=first[0]) | Q(timestamp=first[0], id__gte=first[1]),
+        Q(timestamp__lt=last[0]) | Q(timestamp=last[0], id__lte=last[1]),
+    )
+
+
+class _ArchiveObject:
+    """One S3 object being written: its upload, encoder and the key range it covers."""
+
+    def __init__(self, s3, policy: DataRetentionPolicy, index: int, writer_class, part_size: int):
+        contract_slug = policy.contract.contract_id[:12] if policy.contract else "global"
+        key = (
+            f"{policy.s3_prefix.rstrip('/')}/{contract_slug}/"
+            f"batch_{policy.id}_{index}_{int(timezone.now().timestamp())}{writer_class.suffix}"
+        )
+        self.upload = MultipartUpload(
+            s3, policy.s3_bucket, key, part_size, **writer_class.object_args
+        )
+        self.encoder = writer_class(self.upload)
+        self.count = 0
+        self.first: tuple[datetime, int] | None = None
+        self.last: tuple[datetime, int] | None = None
+
+    def write(self, row: dict[str, Any]) -> None:
+        self.encoder.write(row)
+        self.count += 1
+        self.last = (row["timestamp"], row["id"])
+        if self.first is None:
+            self.first = self.last
+
+    def finish(self) -> None:
+        self.encoder.close()
+        self.upload.close()
+
+    def abort(self) -> None:
+        self.upload.abort()
+
+
+def _delete_range(queryset: QuerySet, chunk_size: int) -> int:
+    deleted = 0
+    while True:
+        ids = list(queryset.order_by().values_list("id", flat=True)[:chunk_size])
+        if not ids:
+            return deleted
+        deleted += queryset.filter(id__in=ids).delete()[1].get(
+            ContractEvent._meta.label, 0
+        )
+
+
+def archive_policy_events(
+    policy: DataRetentionPolicy,
+    cutoff: datetime,
+    *,
+    s3=None,
+) -> Iterator[tuple[ArchivedEventBatch, int]]:
+    """
+    Archive *policy*'s events older than *cutoff*, yielding ``(batch, deleted)``
+    as each S3 object is completed and its rows are deleted.
+    """
+    archive_format = getattr(settings, "ARCHIVE_FORMAT", "ndjson")
+    writer_class = _writer_class(archive_format)
+    chunk_size = max(1, int(getattr(settings, "ARCHIVE_CHUNK_SIZE", 5000)))
+    max_bytes = max(1, int(getattr(settings, "ARCHIVE_MAX_OBJECT_BYTES", 100 * 1024 * 1024)))
+    part_size = max(
+        MIN_PART_BYTES, int(getattr(settings, "ARCHIVE_MULTIPART_PART_BYTES", 8 * 1024 * 1024))
+    )
+
+    base_qs = ContractEvent.objects.filter(timestamp__lt=cutoff)
+    if policy.contract_id:
+        base_qs = base_qs.filter(contract_id=policy.contract_id)
+    high_water = base_qs.aggregate(high=Max("id"))["high"]
+    if high_water is None:
+        return
+    base_qs = base_qs.filter(id__lte=high_water)
+
+    s3 = s3 or s3_client()
+    index = 0
+    current: _ArchiveObject | None = None
+    try:
+        for row in iter_keyset(base_qs, chunk_size):
+            if current is None:
+                current = _ArchiveObject(s3, policy, index, writer_class, part_size)
+            current.write(row)
+            if current.upload.size >= max_bytes:
+                yield _complete(current, policy, base_qs, chunk_size)
+                current = None
+                index += 1
+        if current is not None:
+            yield _complete(current, policy, base_qs, chunk_size)
+            current = None
+    finally:
+        if current is not None:
+            current.abort()
+
+
+def _complete(
+    archive: _ArchiveObject,
+    policy: DataRetentionPolicy,
+    base_qs: QuerySet,
+    chunk_size: int,
+) -> tuple[ArchivedEventBatch, int]:
+    archive.finish()
+    upload = archive.upload
+    with transaction.atomic():
+        batch, deleted = _record_batch(archive, policy, base_qs, chunk_size)
+    if deleted != archive.count:
+        logger.warning(
+            "Archive %s holds %d events but %d were deleted",
+            upload.key,
+            archive.count,
+            deleted,
+            extra={"policy_id": policy.id},
+        )
+    return batch, deleted
+
+
+def _record_batch(
+    archive: _ArchiveObject,
+    policy: DataRetentionPolicy,
+    base_qs: QuerySet,
+    chunk_size: int,
+) -> tuple[ArchivedEventBatch, int]:
+    upload = archive.upload
+    batch = ArchivedEventBatch.objects.create(
+        policy=policy,
+        s3_key=upload.key,
+        event_count=archive.count,
+        size_bytes=upload.size,
+        min_timestamp=archive.first[0],
+        max_timestamp=archive.last[0],
+    )
+    ArchivalAuditLog.objects.create(
+        action=ArchivalAuditLog.ACTION_ARCHIVE,
+        batch=batch,
+        policy=policy,
+        event_count=archive.count,
+        detail=f"Uploaded to s3://{upload.bucket}/{upload.key}",
+    )
+    deleted = _delete_range(keyset_range(base_qs, archive.first, archive.last), chunk_size)
+    if deleted:
+        # The hourly counters still include the archived rows.
+        mark_recount(archive.first[0])
+    return batch, deleted
+
+
+def _utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+
+def _in_window(timestamp: datetime, start: datetime | None, end: datetime | None) -> bool:
+    return (start is None or timestamp >= start) and (end is None or timestamp <= end)
+
+
+def _spool(body: BinaryIO):
+    """Copy a non-seekable S3 body to a temporary file (Parquet needs random access)."""
+    spool = tempfile.SpooledTemporaryFile(max_size=RESTORE_SPOOL_BYTES)
+    shutil.copyfileobj(body, spool, 1 << 20)
+    spool.seek(0)
+    return spool
+
+
+def _parquet_rows(body: BinaryIO, start: datetime | None, end: datetime | None):
+    import pyarrow.parquet as pq  # noqa: PLC0415
+
+    with _spool(body) as spool:
+        parquet = pq.ParquetFile(spool)
+        column = parquet.schema_arrow.get_field_index("timestamp")
+        groups = []
+        for group in range(parquet.num_row_groups):
+            stats = parquet.metadata.row_group(group).column(column).statistics
+            if stats is not None and stats.has_min_max and (
+                (start is not None and _utc(stats.max) < start)
+                or (end is not None and _utc(stats.min) > end)
+            ):
+                continue
+            groups.append(group)
+        if not groups:
+            return
+        for record_batch in parquet.iter_batches(row_groups=groups):
+            for row in record_batch.to_pylist():
+                if _in_window(_utc(row["timestamp"]), start, end):
+                    row["payload"] = json.loads(row["payload"])
+                    row["timestamp"] = row["timestamp"].isoformat()
+                    yield row
+
+
+def iter_archive_rows(
+    body: BinaryIO,
+    key: str,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield the event rows stored in an archive object, whatever its format,
+    decompressing as they are read.
+
+    With *start*/*end*, only rows timestamped inside that window are
+    yielded. Archives are written in ``(timestamp, id)`` order, so Parquet
+    row groups outside the window are never decoded and NDJSON reading stops
+    at the first row past *end*.
+    """
+    start = _utc(start) if start else None
+    end = _utc(end) if end else None
+    if key.endswith(".parquet"):
+        yield from _parquet_rows(body, start, end)
+    elif key.endswith(".ndjson.gz"):
+        with gzip.GzipFile(fileobj=body, mode="rb") as lines:
+            for line in lines:
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                if start is None and end is None:
+                    yield row
+                    continue
+                timestamp = _utc(datetime.fromisoformat(row["timestamp"]))
+                if end is not None and timestamp > end:
+                    return
+                if _in_window(timestamp, start, None):
+                    yield row
+    else:
+        # Objects written before streaming archival: one gzip-compressed JSON
+        # array, in no particular order.
+        with gzip.GzipFile(fileobj=body, mode="rb") as raw:
+            for row in iter_json_array(io.TextIOWrapper(raw, encoding="utf-8")):
+                if (start is None and end is None) or _in_window(
+                    _utc(datetime.fromisoformat(row["timestamp"])), start, end
+                ):
+                    yield row
+
+
+# ---------------------------------------------------------------------------
+# Restore
+# ---------------------------------------------------------------------------
+
+
+def batches_overlapping(
+    queryset: QuerySet, start: datetime | None, end: datetime | None
+) -> QuerySet:
+    """
+    Narrow *queryset* of ``ArchivedEventBatch`` to objects whose
+    ``[min_timestamp, max_timestamp]`` overlaps *start*..*end*. Batches
+    without timestamp metadata are always kept.
+    """
+    if start is not None:
+        queryset = queryset.filter(Q(max_timestamp__gte=start) | Q(max_timestamp__isnull=True))
+    if end is not None:
+        queryset = queryset.filter(Q(min_timestamp__lte=end) | Q(min_timestamp__isnull=True))
+    return queryset
+
+
+def _import_row(row: dict[str, Any]) -> dict[str, Any]:
+    return {**row, "contract_id": row["contract__contract_id"]}
+
+
+def restore_batch(
+    batch: ArchivedEventBatch,
+    *,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    start_ledger: int | None = None,
+    end_ledger: int | None = None,
+    user=None,
+    s3=None,
+) -> ImportResult:
+    """
+    Stream *batch*'s S3 object back into the events table.
+
+    Rows are inserted ``IMPORT_BATCH_SIZE`` at a time with the idempotent
+    bulk loader of :func:`~.services.export_import.import_rows` (COPY and
+    ``ON CONFLICT DO NOTHING`` on PostgreSQL), so events already present are
+    skipped and a retried restore resumes after its last committed chunk.
+    The optional timestamp and ledger bounds restore only that sub-range;
+    the batch is marked restored only when it was restored in full, with no
+    rows rejected.
+    """
+    window = (start, end, start_ledger, end_ledger)
+    digest = hashlib.sha1(repr(window).encode("utf-8")).hexdigest()[:16]
+    body = (s3 or s3_client()).get_object(Bucket=batch.policy.s3_bucket, Key=batch.s3_key)["Body"]
+    rows = (
+        _import_row(row)
+        for row in iter_archive_rows(body, batch.s3_key, start, end)
+        if (start_ledger is None or row["ledger"] >= start_ledger)
+        and (end_ledger is None or row["ledger"] <= end_ledger)
+    )
+    result = import_rows(rows, ImportResult(), checkpoint=f"restore:{batch.id}:{digest}")
+
+    partial = any(bound is not None for bound in window)
+    if not partial and not result.errors:
+        batch.status = ArchivedEventBatch.STATUS_RESTORED
+        batch.save(update_fields=["status"])
+    detail = f"Restored {result.imported} events, {result.skipped} already present"
+    if partial:
+        detail += (
+            f"; timestamps {start.isoformat() if start else '-'}..{end.isoformat() if end else '-'}"
+            f", ledgers {start_ledger if start_ledger is not None else '-'}"
+            f"..{end_ledger if end_ledger is not None else '-'}"
+        )
+    if result.errors:
+        detail += f"; {result.errors} rows rejected"
+    if user is not None:
+        detail += f" (user {user.id})"
+    ArchivalAuditLog.objects.create(
+        action=ArchivalAuditLog.ACTION_RESTORE,
+        batch=batch,
+        policy=batch.policy,
+        event_count=result.imported,
+        detail=detail,
+        performed_by=user,
+    )
+    return result
+
+
+def restore_job_key(job_id: str) -> str:
+    """``IndexerState`` key holding the progress of restore job *job_id*."""
+    return f"restore-job:{job_id}"
+
+
+def save_restore_job(job_id: str, **state: Any) -> None:
+    IndexerState.objects.update_or_create(
+        key=restore_job_key(job_id), defaults={"value": json.dumps(state)}
+    )
+
+
+def restore_job_status(job_id: str) -> dict[str, Any] | None:
+    state = IndexerState.objects.filter(key=restore_job_key(job_id)).first()
+    return json.loads(state.value) if state else None
+
+
+def run_restore_job(
+    job_id: str,
+    batch_ids: list[int],
+    *,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    start_ledger: int | None = None,
+    end_ledger: int | None = None,
+    user=None,
+    workers: int | None = None,
+) -> dict[str, Any]:
+    """
+    Restore *batch_ids* on up to ``RESTORE_WORKERS`` threads, one batch per
+    thread at a time, recording progress under :func:`restore_job_key`
+    after every batch. A failed batch is logged and counted; the others
+    still run. Returns the final job state.
+    """
+    workers = max(1, workers or int(getattr(settings, "RESTORE_WORKERS", 4)))
+    batches = list(
+        ArchivedEventBatch.objects.filter(id__in=batch_ids)
+        .select_related("policy")
+        .order_by("min_timestamp", "id")
+    )
+    state = {
+        "status": "running",
+        "batches": len(batches),
+        "done": 0,
+        "failed": 0,
+        "restored": 0,
+        "skipped": 0,
+        "rejected": 0,
+        "progress_percent": 0,
+    }
+    save_restore_job(job_id, **state)
+    s3 = s3_client()
+
+    def _restore(batch: ArchivedEventBatch) -> ImportResult | None:
+        try:
+            return restore_batch(
+                batch,
+                start=start,
+                end=end,
+                start_ledger=start_ledger,
+                end_ledger=end_ledger,
+                user=user,
+                s3=s3,
+            )
+        except Exception:
+            logger.exception("Restore job %s failed on archive batch %s", job_id, batch.id)
+            return None
+        finally:
+            if workers > 1:
+                connection.close()
+
+    def _record(result: ImportResult | None) -> None:
+        state["done"] += 1
+        if result is None:
+            state["failed"] += 1
+        else:
+            state["restored"] += result.imported
+            state["skipped"] += result.skipped
+            state["rejected"] += result.errors
+        state["progress_percent"] = int(state["done"] * 100 / len(batches))
+        save_restore_job(job_id, **state)
+
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for future in as_completed([pool.submit(_restore, batch) for batch in batches]):
+                _record(future.result())
+    else:
+        for batch in batches:
+            _record(_restore(batch))
+
+    state["status"] = "failed" if state["failed"] else "completed"
+    state["progress_percent"] = 100
+    save_restore_job(job_id, **state)
+    return state
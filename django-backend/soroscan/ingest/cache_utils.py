@@ -3,6 +3,7 @@ Redis-backed caching for expensive REST and GraphQL queries (issue #131).
 """
 import hashlib
 import json
+import uuid
 from functools import wraps
 from collections.abc import Callable
 from typing import Any
@@ -108,6 +109,32 @@ def get_event_count(contract_id: str) -> int:
     return count
 
 
+def get_event_counts(contract_ids) -> dict[str, int]:
+    """Batched ``get_event_count``: one cache round trip and at most one grouped query."""
+    from django.db.models import Count  # noqa: PLC0415
+
+    from .metrics import cache_hits_total, cache_misses_total
+    from .models import ContractEvent
+
+    keys = {f"event_count:{contract_id}": contract_id for contract_id in contract_ids}
+    cached = cache.get_many(list(keys))
+    counts = {keys[key]: count for key, count in cached.items()}
+    missing = [contract_id for key, contract_id in keys.items() if key not in cached]
+    if cached:
+        cache_hits_total.labels(cache_type="event_count").inc(len(cached))
+    if missing:
+        cache_misses_total.labels(cache_type="event_count").inc(len(missing))
+        fresh = dict.fromkeys(missing, 0)
+        fresh.update(
+            ContractEvent.objects.filter(contract__contract_id__in=missing)
+            .values_list("contract__contract_id")
+            .annotate(total=Count("id"))
+        )
+        cache.set_many({f"event_count:{cid}": count for cid, count in fresh.items()}, 300)
+        counts.update(fresh)
+    return counts
+
+
 def invalidate_event_count_cache(contract_id: str) -> None:
     """Invalidate event count cache for a contract."""
     key = f"event_count:{contract_id}"
@@ -137,6 +164,66 @@ def invalidate_decoded_payload_cache(event_id: int) -> None:
     cache.delete(decoded_payload_cache_key(event_id))
 
 
+def abi_plan_version_key(contract_pk: int) -> str:
+    """Return the Redis key holding a contract's compiled-ABI version stamp."""
+    return f"soroscan:abi_plan_version:{contract_pk}"
+
+
+def get_abi_plan_version(contract_pk: int) -> str:
+    """Return the contract's compiled-ABI version stamp, creating one if missing."""
+    key = abi_plan_version_key(contract_pk)
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_abi_plan_version(contract_pk: int) -> None:
+    """Invalidate compiled ABI plans for a contract in every worker."""
+    cache.set(abi_plan_version_key(contract_pk), uuid.uuid4().hex, timeout=None)
+
+
+def event_schema_version_key(contract_pk: int) -> str:
+    """Return the Redis key holding a contract's compiled-validator version stamp."""
+    return f"soroscan:event_schema_version:{contract_pk}"
+
+
+def get_event_schema_version(contract_pk: int) -> str:
+    """Return the contract's compiled-validator version stamp, creating one if missing."""
+    key = event_schema_version_key(contract_pk)
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_event_schema_version(contract_pk: int) -> None:
+    """Invalidate compiled event-schema validators for a contract in every worker."""
+    cache.set(event_schema_version_key(contract_pk), uuid.uuid4().hex, timeout=None)
+
+
+EVENT_ROUTES_VERSION_KEY = "soroscan:event_routes_version"
+
+
+def get_event_routes_version() -> str:
+    """Return the webhook/alert routing table version stamp, creating one if missing."""
+    version = cache.get(EVENT_ROUTES_VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(EVENT_ROUTES_VERSION_KEY, version, timeout=None):
+            version = cache.get(EVENT_ROUTES_VERSION_KEY, version)
+    return version
+
+
+def bump_event_routes_version() -> None:
+    """Make every worker rebuild its webhook/alert routing tables."""
+    cache.set(EVENT_ROUTES_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+
 def cache_result(ttl: int) -> Callable:
     """Cache successful DRF function-view responses for ``ttl`` seconds."""
 
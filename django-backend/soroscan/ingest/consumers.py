@@ -1,27 +1,87 @@
 """
 WebSocket consumers for real-time event streaming.
 """
+import asyncio
 import json
 import logging
+from urllib.parse import parse_qsl
 
 from channels.generic.websocket import AsyncWebsocketConsumer
+from django.conf import settings
 
+from .event_router import Predicate, compile_condition
 from .models import TrackedContract
+from .subscriptions import OVERFLOW_POLICIES, SubscriberQueue, message_event_type
 
 logger = logging.getLogger(__name__)
 
+PAYLOAD_FILTER_OPS = ("eq", "neq", "gt", "gte", "lt", "lte", "contains", "startswith", "in")
+
+
+def parse_event_filter(query_string: bytes) -> tuple[frozenset[str], Predicate | None]:
+    """
+    Compile the connection's query-string filters once, at connect time.
+
+    ``event_type`` may be repeated or comma-separated. ``payload.<path>`` keys,
+    optionally suffixed with ``__<op>``, become payload-field conditions that
+    must all match; ``in`` takes a comma-separated list. Raises ``ValueError``
+    for an unknown operator.
+    """
+    event_types: set[str] = set()
+    conditions = []
+    for key, value in parse_qsl(query_string.decode(), keep_blank_values=True):
+        if key == "event_type":
+            event_types.update(part.strip() for part in value.split(",") if part.strip())
+        elif key.startswith("payload."):
+            path, _, op = key.partition("__")
+            op = op or "eq"
+            if op not in PAYLOAD_FILTER_OPS:
+                raise ValueError(f"Unknown payload filter operator: {op}")
+            if op == "in":
+                value = [part.strip() for part in value.split(",")]
+            conditions.append({"op": op, "field": path, "value": value})
+    predicate = compile_condition({"op": "and", "conditions": conditions}) if conditions else None
+    return frozenset(event_types), predicate
+
+
+def event_frame(message: dict) -> str:
+    """The JSON text for one event, serialised once by the publisher when possible."""
+    return message.get("frame") or json.dumps(message["data"])
+
+
+def batch_frame(contract_id: str, frames: list[str]) -> str:
+    """Join pre-serialised event frames into one stream frame without re-encoding them."""
+    return (
+        f'{{"type": "events", "contract_id": {json.dumps(contract_id)}, '
+        f'"events": [{", ".join(frames)}]}}'
+    )
+
 
 class EventConsumer(AsyncWebsocketConsumer):
     """
     WebSocket consumer for streaming contract events in real-time.
 
     URL: ws://host/ws/events/<contract_id>/
-    Optional query param: ?event_type=<type> to filter by event type
+    Optional query params:
+        event_type=<type>[,<type>...]   filter by one or more event types
+        payload.<path>[__<op>]=<value>  filter on payload fields
+        mode=stream                     micro-batch events into
+                                        {"type": "events", "events": [...]} frames
+
+    Events are buffered in a bounded per-connection queue so a slow client
+    loses (or coalesces) its own backlog instead of stalling the group.
     """
 
     async def connect(self):
         self.contract_id = self.scope["url_route"]["kwargs"]["contract_id"]
-        self.event_type = self.scope["query_string"].decode().split("event_type=")[-1] if b"event_type=" in self.scope["query_string"] else None
+        params = dict(parse_qsl(self.scope["query_string"].decode()))
+        self.stream = params.get("mode") == "stream"
+        try:
+            self.event_types, self.payload_filter = parse_event_filter(self.scope["query_string"])
+        except ValueError as e:
+            logger.info(f"Rejecting WebSocket with invalid filter: {e}")
+            await self.close(code=4400)
+            return
 
         try:
             contract = await self.get_contract(self.contract_id)
@@ -33,15 +93,27 @@ class EventConsumer(AsyncWebsocketConsumer):
             await self.close(code=4004)
             return
 
+        overflow = getattr(settings, "WEBSOCKET_SEND_QUEUE_OVERFLOW", "drop_oldest")
+        self.queue = SubscriberQueue(
+            max(1, int(getattr(settings, "WEBSOCKET_SEND_QUEUE_SIZE", 1000))),
+            overflow if overflow in OVERFLOW_POLICIES else "drop_oldest",
+            transport="websocket",
+            key=message_event_type,
+        )
+        self.sender = asyncio.ensure_future(self.send_events())
+
         self.group_name = f"events_{self.contract_id}"
         await self.channel_layer.group_add(self.group_name, self.channel_name)
         await self.accept()
 
         logger.info(
-            f"WebSocket connected: contract_id={self.contract_id}, event_type={self.event_type}"
+            f"WebSocket connected: contract_id={self.contract_id}, "
+            f"event_types={sorted(self.event_types)}, stream={self.stream}"
         )
 
     async def disconnect(self, close_code):
+        if hasattr(self, "sender"):
+            self.sender.cancel()
         if hasattr(self, "group_name"):
             await self.channel_layer.group_discard(self.group_name, self.channel_name)
             logger.info(
@@ -52,12 +124,39 @@ class EventConsumer(AsyncWebsocketConsumer):
         """
         Handler for 'contract_event' messages sent to the group.
         """
-        event_data = event["data"]
-
-        if self.event_type and event_data.get("event_type") != self.event_type:
+        if self.event_types and message_event_type(event) not in self.event_types:
+            return
+        if self.payload_filter is not None and not self.payload_filter(event["data"]):
             return
 
-        await self.send(text_data=json.dumps(event_data))
+        self.queue.put(event)
+
+    async def send_events(self):
+        """Drain the send queue, one frame per event or one frame per batch window."""
+        loop = asyncio.get_running_loop()
+        window = max(0, int(getattr(settings, "WEBSOCKET_BATCH_WINDOW_MS", 50))) / 1000
+        max_batch = max(1, int(getattr(settings, "WEBSOCKET_MAX_BATCH_SIZE", 100)))
+        while True:
+            message = await self.queue.get()
+            if not self.stream:
+                await self.send(text_data=event_frame(message))
+                continue
+
+            frames = [event_frame(message)]
+            deadline = loop.time() + window
+            while len(frames) < max_batch:
+                if len(self.queue):
+                    message = await self.queue.get()
+                else:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        message = await asyncio.wait_for(self.queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                frames.append(event_frame(message))
+            await self.send(text_data=batch_frame(self.contract_id, frames))
 
     @staticmethod
     async def get_contract(contract_id):
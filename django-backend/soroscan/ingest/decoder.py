@@ -6,10 +6,13 @@ per-contract ABI definitions.  Failures are always safe — they never
 block event persistence.
 """
 import logging
+from collections.abc import Callable, Sequence
+from functools import lru_cache
+from threading import Lock
 from typing import Any
 
 import jsonschema
-from stellar_sdk import scval, xdr as stellar_xdr
+from stellar_sdk import StrKey, scval, xdr as stellar_xdr
 
 logger = logging.getLogger(__name__)
 
@@ -78,40 +81,228 @@ def _decode_sc_val(sc_val_obj: stellar_xdr.SCVal, type_hint: str) -> Any:
     (e.g. ``"Address"``, ``"I128"``).  It guides coercion but the
     function also falls back to ``str()`` for unrecognised types.
     """
-    try:
-        if type_hint == "Address":
-            return scval.to_address(sc_val_obj).address
-        if type_hint in ("I128", "U128"):
-            return scval.to_int128(sc_val_obj) if type_hint == "I128" else scval.to_uint128(sc_val_obj)
-        if type_hint in ("I64", "U64"):
-            return scval.to_int64(sc_val_obj) if type_hint == "I64" else scval.to_uint64(sc_val_obj)
-        if type_hint in ("I32", "U32"):
-            return scval.to_int32(sc_val_obj) if type_hint == "I32" else scval.to_uint32(sc_val_obj)
-        if type_hint == "String":
-            return scval.to_string(sc_val_obj)
-        if type_hint == "Bool":
-            return scval.to_bool(sc_val_obj)
-        if type_hint == "Bytes":
-            raw = scval.to_bytes(sc_val_obj)
-            return raw.hex() if isinstance(raw, bytes) else str(raw)
-        if type_hint == "Symbol":
-            return scval.to_symbol(sc_val_obj)
-        if type_hint == "Map":
-            native = scval.to_native(sc_val_obj)
-            return native if isinstance(native, dict) else str(native)
-        if type_hint == "Vec":
-            native = scval.to_native(sc_val_obj)
-            return native if isinstance(native, list) else str(native)
-    except Exception:
-        pass  # fall through to generic conversion
+    return FIELD_DECODERS.get(type_hint, _generic_fallback)(sc_val_obj)
+
+
+# ---------------------------------------------------------------------------
+# Compiled field decoders
+# ---------------------------------------------------------------------------
+
+_T = stellar_xdr.SCValType
 
-    # Generic fallback
+
+def _generic_fallback(sc_val_obj: stellar_xdr.SCVal) -> Any:
     try:
         return scval.to_native(sc_val_obj)
     except Exception:
         return str(sc_val_obj)
 
 
+def _with_fallback(convert: Callable[[stellar_xdr.SCVal], Any]) -> Callable[[stellar_xdr.SCVal], Any]:
+    def decode(sc_val_obj: stellar_xdr.SCVal) -> Any:
+        try:
+            return convert(sc_val_obj)
+        except Exception:
+            return _generic_fallback(sc_val_obj)
+
+    return decode
+
+
+def _fast_path(
+    sc_type: stellar_xdr.SCValType,
+    read: Callable[[stellar_xdr.SCVal], Any],
+    convert: Callable[[stellar_xdr.SCVal], Any],
+) -> Callable[[stellar_xdr.SCVal], Any]:
+    """Read the XDR union arm directly when the value has the expected type."""
+
+    def decode(sc_val_obj: stellar_xdr.SCVal) -> Any:
+        if sc_val_obj.type == sc_type:
+            return read(sc_val_obj)
+        return convert(sc_val_obj)
+
+    return _with_fallback(decode)
+
+
+@lru_cache(maxsize=4096)
+def _encode_account(raw: bytes) -> str:
+    return StrKey.encode_ed25519_public_key(raw)
+
+
+@lru_cache(maxsize=4096)
+def _encode_contract(raw: bytes) -> str:
+    return StrKey.encode_contract(raw)
+
+
+def _address(sc_val_obj: stellar_xdr.SCVal) -> Any:
+    # Encode account/contract keys directly; Address() would re-validate
+    # the strkey it was just given. Addresses repeat heavily, so memoise.
+    sc_address = sc_val_obj.address
+    if sc_val_obj.type == _T.SCV_ADDRESS and sc_address is not None:
+        if sc_address.type == stellar_xdr.SCAddressType.SC_ADDRESS_TYPE_ACCOUNT:
+            return _encode_account(sc_address.account_id.account_id.ed25519.uint256)
+        if sc_address.type == stellar_xdr.SCAddressType.SC_ADDRESS_TYPE_CONTRACT:
+            return _encode_contract(sc_address.contract_id.to_xdr_bytes())
+    return scval.from_address(sc_val_obj).address
+
+
+def _bytes_hex(sc_val_obj: stellar_xdr.SCVal) -> Any:
+    raw = scval.from_bytes(sc_val_obj)
+    return raw.hex() if isinstance(raw, bytes) else str(raw)
+
+
+def _native_of(kind: type) -> Callable[[stellar_xdr.SCVal], Any]:
+    def convert(sc_val_obj: stellar_xdr.SCVal) -> Any:
+        native = scval.to_native(sc_val_obj)
+        return native if isinstance(native, kind) else str(native)
+
+    return convert
+
+
+# type_hint → decoder. Values that do not match their hint fall back to
+# ``scval.to_native`` (or ``str``), as in :func:`_decode_sc_val`.
+FIELD_DECODERS: dict[str, Callable[[stellar_xdr.SCVal], Any]] = {
+    "Address": _with_fallback(_address),
+    "I128": _with_fallback(scval.from_int128),
+    "U128": _with_fallback(scval.from_uint128),
+    "I64": _fast_path(_T.SCV_I64, lambda v: v.i64.int64, scval.from_int64),
+    "U64": _fast_path(_T.SCV_U64, lambda v: v.u64.uint64, scval.from_uint64),
+    "I32": _fast_path(_T.SCV_I32, lambda v: v.i32.int32, scval.from_int32),
+    "U32": _fast_path(_T.SCV_U32, lambda v: v.u32.uint32, scval.from_uint32),
+    "String": _with_fallback(lambda v: scval.from_string(v).decode()),
+    "Bool": _fast_path(_T.SCV_BOOL, lambda v: v.b, scval.from_bool),
+    "Bytes": _with_fallback(_bytes_hex),
+    "Symbol": _with_fallback(scval.from_symbol),
+    "Map": _with_fallback(_native_of(dict)),
+    "Vec": _with_fallback(_native_of(list)),
+}
+
+
+class CompiledABI:
+    """An ABI turned into ``event_type → ((field_name, decoder), ...)`` once.
+
+    Decoding an event is then a dict lookup plus one precomputed callable per
+    field, instead of a scan of the ABI and a ``type_hint`` if-chain.
+    """
+
+    def __init__(self, abi_json: list[dict[str, Any]]):
+        self.plans: dict[str, tuple[tuple[str, Callable[[stellar_xdr.SCVal], Any]], ...]] = {}
+        for event_def in abi_json or []:
+            name = event_def.get("name")
+            if not name or name in self.plans:
+                # First definition wins, as with the linear scan.
+                continue
+            self.plans[name] = tuple(
+                (field["name"], FIELD_DECODERS.get(field["type"], _generic_fallback))
+                for field in event_def.get("fields", [])
+            )
+
+    def decode(self, raw_xdr: str, event_type: str) -> dict[str, Any] | None:
+        """Decode one payload into a named-field dict.
+
+        Returns ``None`` when the ABI has no definition for *event_type*.
+        XDR that cannot be parsed is logged and the error re-raised; callers
+        record it as ``decoding_status="failed"`` (see ``decode_many`` for a
+        variant that returns ``None`` instead).
+        """
+        plan = self.plans.get(event_type)
+        if plan is None:
+            return None
+
+        try:
+            sc_val_obj = stellar_xdr.SCVal.from_xdr(raw_xdr)
+        except Exception as exc:
+            logger.warning(
+                "Failed to parse XDR for event_type=%s: %s",
+                event_type,
+                exc,
+            )
+            raise
+
+        if not plan:
+            return {}
+
+        if sc_val_obj.type == _T.SCV_VEC and sc_val_obj.vec is not None:
+            vec_items = sc_val_obj.vec.sc_vec
+            count = len(vec_items)
+            return {
+                name: decode(vec_items[i]) if i < count else None
+                for i, (name, decode) in enumerate(plan)
+            }
+
+        # Not a vec: decode the single value into the first field.
+        first_name, first_decode = plan[0]
+        result = {first_name: first_decode(sc_val_obj)}
+        for name, _ in plan[1:]:
+            result[name] = None
+        return result
+
+    def decode_many(
+        self,
+        raw_xdrs: Sequence[str],
+        event_types: str | Sequence[str],
+    ) -> list[dict[str, Any] | None]:
+        """Decode a batch of payloads.
+
+        *event_types* is either one event type for the whole batch or one per
+        payload. Payloads that cannot be decoded come back as ``None``.
+        """
+        if isinstance(event_types, str):
+            event_types = [event_types] * len(raw_xdrs)
+
+        results: list[dict[str, Any] | None] = []
+        for raw_xdr, event_type in zip(raw_xdrs, event_types):
+            if not raw_xdr:
+                results.append(None)
+                continue
+            try:
+                results.append(self.decode(raw_xdr, event_type))
+            except Exception:
+                results.append(None)
+        return results
+
+
+# contract pk → (version stamp, compiled ABI or None when no ABI is registered)
+_compiled_abis: dict[int, tuple[str, CompiledABI | None]] = {}
+_compiled_abis_lock = Lock()
+_COMPILED_ABI_CACHE_SIZE = 4096
+
+
+def get_compiled_abi(contract: Any) -> CompiledABI | None:
+    """Return the compiled ABI for *contract*, or ``None`` if it has none.
+
+    Plans are cached per (contract, ABI version). The version stamp lives in
+    the Django cache and is bumped whenever the contract's ``ContractABI`` or
+    ``ContractABIVersion`` rows change, so every worker recompiles on its
+    next lookup.
+    """
+    from .cache_utils import get_abi_plan_version
+    from .models import ContractABI
+
+    version = get_abi_plan_version(contract.pk)
+    entry = _compiled_abis.get(contract.pk)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+
+    abi_json = (
+        ContractABI.objects.filter(contract_id=contract.pk)
+        .values_list("abi_json", flat=True)
+        .first()
+    )
+    compiled = CompiledABI(abi_json) if abi_json is not None else None
+
+    with _compiled_abis_lock:
+        if len(_compiled_abis) >= _COMPILED_ABI_CACHE_SIZE:
+            _compiled_abis.clear()
+        _compiled_abis[contract.pk] = (version, compiled)
+    return compiled
+
+
+def clear_compiled_abis() -> None:
+    """Drop every compiled ABI held by this process."""
+    with _compiled_abis_lock:
+        _compiled_abis.clear()
+
+
 # ---------------------------------------------------------------------------
 # Public decoder
 # ---------------------------------------------------------------------------
@@ -129,6 +320,9 @@ def decode_event_payload(
 
     Raises nothing — all exceptions are caught, logged, and converted
     to a ``None`` return so event persistence is never blocked.
+
+    Callers decoding many events for one contract should use
+    :func:`get_compiled_abi` instead.
     """
     # Find matching event definition
     event_def = next(
@@ -0,0 +1,331 @@
+"""
+Incremental event counters feeding ``EventAggregation``.
+
+Ingest bumps hourly (contract, event_type) counters as rows are created —
+one pipelined ``HINCRBY`` per page when the cache is Redis, an in-process
+accumulator otherwise. ``flush_event_counters`` drains them into
+``EventAggregation`` with one read and one bulk write per interval, so
+dashboard totals trail ingest by the flush interval rather than an hour.
+
+Buckets whose counts may have drifted from ``ContractEvent`` — anything a
+flush or a deletion touched — are marked for recount (``mark_recount``) and
+reconciled by ``recount_buckets`` under the flush lock, so a recount and the
+counters pending for the same bucket are never both applied.
+"""
+import logging
+import threading
+import uuid
+from collections import Counter
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "soroscan:event_counters:pending"
+FLUSH_LOCK_KEY = "soroscan:event_counters:flush_lock"
+FLUSH_LOCK_TIMEOUT = 300
+RECOUNT_KEY = "event_counters:recount_since"
+
+# Used when the cache is not Redis (tests, local development).
+_local_pending: Counter = Counter()
+_local_lock = threading.Lock()
+
+CounterKey = tuple[int, str, datetime]
+
+
+def hour_bucket(value: datetime) -> datetime:
+    """Truncate *value* to the start of its ``EventAggregation`` bucket."""
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _encode(key: CounterKey) -> str:
+    contract_pk, event_type, bucket = key
+    # event_type goes last so it may contain the separator.
+    return f"{contract_pk}|{bucket.isoformat()}|{event_type}"
+
+
+def _decode(field: str | bytes) -> CounterKey:
+    if isinstance(field, bytes):
+        field = field.decode()
+    contract_pk, bucket, event_type = field.split("|", 2)
+    return int(contract_pk), event_type, datetime.fromisoformat(bucket)
+
+
+def _redis():
+    backend = getattr(cache, "_cache", None)
+    if not hasattr(backend, "get_client"):
+        return None, None
+    key = cache.make_and_validate_key(PENDING_KEY)
+    return backend.get_client(key, write=True), key
+
+
+def _add(counts: Counter) -> None:
+    client, key = _redis()
+    if client is None:
+        with _local_lock:
+            _local_pending.update(counts)
+        return
+    pipe = client.pipeline()
+    for counter_key, count in counts.items():
+        pipe.hincrby(key, _encode(counter_key), count)
+    pipe.execute()
+
+
+def record_events(rows: Iterable[tuple[int, str, datetime]]) -> None:
+    """
+    Count newly created events given as ``(contract_pk, event_type, timestamp)``.
+
+    Each event bumps its per-type bucket and the contract total bucket
+    (``event_type=''``). Never raises: counts lost to a cache outage are
+    picked up by the drift check in ``aggregate_event_statistics``.
+    """
+    counts: Counter = Counter()
+    for contract_pk, event_type, timestamp in rows:
+        bucket = hour_bucket(timestamp)
+        counts[(contract_pk, event_type, bucket)] += 1
+        if event_type:
+            counts[(contract_pk, "", bucket)] += 1
+    if not counts:
+        return
+    try:
+        _add(counts)
+    except Exception:
+        logger.warning("Failed to record event counters", exc_info=True)
+
+
+def _drain() -> Counter:
+    client, key = _redis()
+    if client is None:
+        with _local_lock:
+            drained = Counter(_local_pending)
+            _local_pending.clear()
+        return drained
+
+    # RENAME is atomic, so increments racing with the drain land in a fresh hash.
+    draining = f"{key}:draining:{uuid.uuid4().hex}"
+    try:
+        client.rename(key, draining)
+    except Exception as exc:
+        if "no such key" in str(exc).lower():
+            return Counter()
+        raise
+    pipe = client.pipeline()
+    pipe.hgetall(draining)
+    pipe.delete(draining)
+    fields, _ = pipe.execute()
+    return Counter({_decode(field): int(count) for field, count in fields.items()})
+
+
+def _apply(counts: Counter) -> int:
+    from .models import EventAggregation
+    from .rollups import mark_dirty
+
+    if not counts:
+        return 0
+
+    with transaction.atomic():
+        existing = {
+            (row.contract_id, row.event_type, row.timestamp): row
+            for row in EventAggregation.objects.select_for_update().filter(
+                contract_id__in={key[0] for key in counts},
+                event_type__in={key[1] for key in counts},
+                timestamp__in={key[2] for key in counts},
+            )
+        }
+        to_update = []
+        to_create = []
+        for key, count in counts.items():
+            row = existing.get(key)
+            if row is not None:
+                row.event_count += count
+                to_update.append(row)
+            else:
+                contract_pk, event_type, bucket = key
+                to_create.append(
+                    EventAggregation(
+                        contract_id=contract_pk,
+                        event_type=event_type,
+                        timestamp=bucket,
+                        event_count=count,
+                    )
+                )
+        if to_update:
+            EventAggregation.objects.bulk_update(to_update, ["event_count"])
+        if to_create:
+            EventAggregation.objects.bulk_create(to_create)
+        mark_dirty(min(key[2] for key in counts))
+        mark_recount(min(key[2] for key in counts))
+    return len(counts)
+
+
+def flush_event_counters() -> int:
+    """
+    Add pending counters to ``EventAggregation`` and return the buckets touched.
+
+    Only one flush runs at a time. Counts are put back if the write fails.
+    """
+    if not cache.add(FLUSH_LOCK_KEY, timezone.now().isoformat(), timeout=FLUSH_LOCK_TIMEOUT):
+        return 0
+    try:
+        counts = _drain()
+        if not counts:
+            return 0
+        try:
+            return _apply(counts)
+        except Exception:
+            _add(counts)
+            raise
+    finally:
+        cache.delete(FLUSH_LOCK_KEY)
+
+
+def mark_recount(timestamp: datetime) -> None:
+    """Record that buckets from the one holding *timestamp* on need a drift check."""
+    from .models import IndexerState
+
+    IndexerState.keep_earliest(RECOUNT_KEY, hour_bucket(timestamp))
+
+
+def pop_recount() -> datetime | None:
+    """Remove and return the earliest bucket marked by ``mark_recount``."""
+    from .models import IndexerState
+
+    value = IndexerState.pop(RECOUNT_KEY)
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+def drifted_buckets(start: datetime, end: datetime) -> list[datetime]:
+    """
+    Buckets in ``[start, end)`` whose stored contract totals differ from the
+    number of ``ContractEvent`` rows in them.
+
+    Two grouped queries, however many buckets the range spans.
+    """
+    from .models import ContractEvent, EventAggregation
+
+    actual = dict(
+        ContractEvent.objects.filter(timestamp__gte=start, timestamp__lt=end)
+        .annotate(bucket=TruncHour("timestamp"))
+        .values("bucket")
+        .annotate(total=Count("id"))
+        .order_by()
+        .values_list("bucket", "total")
+    )
+    stored = dict(
+        EventAggregation.objects.filter(event_type="", timestamp__gte=start, timestamp__lt=end)
+        .values("timestamp")
+        .annotate(total=Sum("event_count"))
+        .order_by()
+        .values_list("timestamp", "total")
+    )
+    return sorted(
+        bucket
+        for bucket in actual.keys() | stored.keys()
+        if actual.get(bucket, 0) != (stored.get(bucket) or 0)
+    )
+
+
+def _recount(buckets: list[datetime]) -> list[dict]:
+    """Exact (contract, event_type) counts for *buckets*, plus contract totals."""
+    from .models import ContractEvent
+
+    window = Q()
+    for bucket in buckets:
+        window |= Q(timestamp__gte=bucket, timestamp__lt=bucket + timedelta(hours=1))
+    rows: list[dict] = []
+    totals: Counter = Counter()
+    for row in (
+        ContractEvent.objects.filter(window)
+        .annotate(bucket=TruncHour("timestamp"))
+        .values("contract_id", "event_type", "bucket")
+        .annotate(count=Count("id"))
+        .order_by()
+    ):
+        totals[(row["contract_id"], row["bucket"])] += row["count"]
+        # Typeless events only count towards the contract total bucket.
+        if row["event_type"]:
+            rows.append(row)
+    rows.extend(
+        {"contract_id": contract_pk, "event_type": "", "bucket": bucket, "count": total}
+        for (contract_pk, bucket), total in totals.items()
+    )
+    return rows
+
+
+def recount_buckets(buckets: Iterable[datetime]) -> bool:
+    """
+    Replace the ``EventAggregation`` rows of *buckets* with exact counts.
+
+    Runs under the flush lock: pending counters are drained first, those for
+    the recounted buckets are dropped (the recount already sees their rows)
+    and the rest are applied, so a later flush cannot add them a second time.
+    Returns False without writing when a flush holds the lock.
+    """
+    from .models import EventAggregation
+    from .rollups import mark_dirty
+
+    buckets = sorted(set(buckets))
+    if not buckets:
+        return True
+    if not cache.add(FLUSH_LOCK_KEY, timezone.now().isoformat(), timeout=FLUSH_LOCK_TIMEOUT):
+        return False
+    try:
+        counts = _drain()
+        recounted = set(buckets)
+        try:
+            with transaction.atomic():
+                _apply(Counter({key: count for key, count in counts.items() if key[2] not in recounted}))
+                existing = {
+                    (row.contract_id, row.event_type, row.timestamp): row
+                    for row in EventAggregation.objects.select_for_update().filter(
+                        timestamp__in=buckets
+                    )
+                }
+                to_update = []
+                to_create = []
+                for row in _recount(buckets):
+                    key = (row["contract_id"], row["event_type"], row["bucket"])
+                    aggregation = existing.pop(key, None)
+                    if aggregation is None:
+                        to_create.append(
+                            EventAggregation(
+                                contract_id=row["contract_id"],
+                                event_type=row["event_type"],
+                                timestamp=row["bucket"],
+                                event_count=row["count"],
+                            )
+                        )
+                    elif aggregation.event_count != row["count"]:
+                        aggregation.event_count = row["count"]
+                        to_update.append(aggregation)
+                # Rows the recount no longer sees (e.g. deleted events) go away.
+                if existing:
+                    EventAggregation.objects.filter(
+                        pk__in=[row.pk for row in existing.values()]
+                    ).delete()
+                if to_update:
+                    EventAggregation.objects.bulk_update(to_update, ["event_count"])
+                if to_create:
+                    EventAggregation.objects.bulk_create(to_create)
+                mark_dirty(buckets[0])
+        except Exception:
+            _add(counts)
+            raise
+    finally:
+        cache.delete(FLUSH_LOCK_KEY)
+    return True
+
+
+def clear_pending() -> None:
+    """Discard counters not yet flushed by this process or the shared cache."""
+    with _local_lock:
+        _local_pending.clear()
+    client, key = _redis()
+    if client is not None:
+        client.delete(key)
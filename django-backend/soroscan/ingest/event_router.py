@@ -0,0 +1,376 @@
+"""
+In-memory webhook and alert-rule routing for newly indexed events.
+
+Routes are built per contract — active webhook subscriptions grouped by
+event type and active alert rules — with every filter condition compiled to
+a predicate once. Tables are cached in-process and rebuilt when the routing
+version stamp in the Django cache changes; it is bumped whenever a
+subscription or an alert rule is saved or deleted (saves that only touch
+delivery bookkeeping excepted), when a tracked contract is created or
+deleted, and when a failing webhook is suspended.
+"""
+import logging
+import re
+from collections.abc import Callable, Collection, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from threading import Lock
+from typing import Any
+
+from .tasks import _as_number, _get_field
+
+logger = logging.getLogger(__name__)
+
+Predicate = Callable[[dict], bool]
+
+_TABLE_CACHE_SIZE = 4096
+
+
+def _never(event_data: dict) -> bool:
+    return False
+
+
+def _compile_equals(value: Any) -> Callable[[Any], bool]:
+    rhs_num = _as_number(value)
+    rhs_str = str(value)
+
+    def equals(current: Any) -> bool:
+        if rhs_num is not None:
+            lhs_num = _as_number(current)
+            if lhs_num is not None:
+                return lhs_num == rhs_num
+        return str(current) == rhs_str
+
+    return equals
+
+
+def _compile_comparison(op: str, value: Any) -> Callable[[Any], bool]:
+    if op == "eq":
+        return _compile_equals(value)
+    if op == "neq":
+        equals = _compile_equals(value)
+        return lambda current: not equals(current)
+    if op in ("gt", "gte", "lt", "lte"):
+        try:
+            rhs = float(str(value))
+        except (TypeError, ValueError):
+            return lambda current: False
+        compare = {
+            "gt": float.__gt__,
+            "gte": float.__ge__,
+            "lt": float.__lt__,
+            "lte": float.__le__,
+        }[op]
+
+        def numeric(current: Any) -> bool:
+            try:
+                return compare(float(str(current)), rhs)
+            except (TypeError, ValueError):
+                return False
+
+        return numeric
+    if op == "contains":
+        needle = str(value).lower()
+        return lambda current: current is not None and needle in str(current).lower()
+    if op == "startswith":
+        prefix = str(value)
+        return lambda current: current is not None and str(current).startswith(prefix)
+    if op == "in":
+        if isinstance(value, list):
+            options = [_compile_equals(item) for item in value]
+            return lambda current: any(option(current) for option in options)
+        return _compile_equals(value)
+    if op == "regex":
+        try:
+            pattern = re.compile(str(value))
+        except re.error:
+            return lambda current: False
+        return lambda current: current is not None and pattern.search(str(current)) is not None
+
+    logger.warning("Unknown condition op '%s' — treating as False", op)
+    return lambda current: False
+
+
+def compile_condition(condition: dict) -> Predicate:
+    """
+    Compile a condition AST into a predicate over flattened event data.
+
+    The result is equivalent to ``partial(tasks.evaluate_condition, condition)``
+    but does the parsing, numeric coercion of constants and regex compilation
+    once instead of on every event.
+    """
+    op = (condition.get("op") or "").lower()
+
+    if op == "not":
+        inner = compile_condition(condition.get("condition", {}))
+        return lambda event_data: not inner(event_data)
+
+    if op in ("and", "or"):
+        subs = [compile_condition(c) for c in condition.get("conditions", [])]
+        if op == "and":
+            return lambda event_data: all(sub(event_data) for sub in subs)
+        return lambda event_data: any(sub(event_data) for sub in subs)
+
+    path = condition.get("field", "")
+    compare = _compile_comparison(op, condition.get("value"))
+    return lambda event_data: compare(_get_field(event_data, path))
+
+
+def _safe_compile(condition: Any, kind: str, object_id: int) -> Predicate:
+    try:
+        return compile_condition(condition)
+    except Exception:
+        logger.exception(
+            "Invalid %s condition for id %s — it will never match",
+            kind,
+            object_id,
+            extra={f"{kind}_id": object_id},
+        )
+        return _never
+
+
+@dataclass
+class ContractRoutes:
+    """Compiled webhook and alert routes for one contract."""
+
+    # event_type -> [(webhook_id, predicate or None)]; "" matches every type
+    webhooks: dict[str, list[tuple[int, Predicate | None]]] = field(default_factory=dict)
+    alert_rules: list[tuple[int, Predicate]] = field(default_factory=list)
+    _merged: dict[str, list[tuple[int, Predicate | None]]] = field(default_factory=dict)
+
+    def webhooks_for(self, event_type: str) -> list[tuple[int, Predicate | None]]:
+        """Webhooks subscribed to *event_type* or to all events, in id order."""
+        merged = self._merged.get(event_type)
+        if merged is None:
+            merged = sorted(
+                self.webhooks.get(event_type, []) + (
+                    self.webhooks.get("", []) if event_type else []
+                ),
+                key=lambda route: route[0],
+            )
+            self._merged[event_type] = merged
+        return merged
+
+    def __bool__(self) -> bool:
+        return bool(self.webhooks or self.alert_rules)
+
+
+# contract_id -> (version stamp, routes)
+_tables: dict[str, tuple[str, ContractRoutes]] = {}
+_tables_lock = Lock()
+
+
+def _build_routes(contract_ids: list[str]) -> dict[str, ContractRoutes]:
+    from .models import AlertRule, WebhookSubscription
+
+    routes = {contract_id: ContractRoutes() for contract_id in contract_ids}
+    for webhook_id, contract_id, event_type, condition in (
+        WebhookSubscription.objects.filter(
+            contract__contract_id__in=contract_ids,
+            is_active=True,
+            status=WebhookSubscription.STATUS_ACTIVE,
+        )
+        .order_by("id")
+        .values_list("id", "contract__contract_id", "event_type", "filter_condition")
+    ):
+        predicate = _safe_compile(condition, "webhook", webhook_id) if condition else None
+        routes[contract_id].webhooks.setdefault(event_type, []).append((webhook_id, predicate))
+
+    for rule_id, contract_id, condition in (
+        AlertRule.objects.filter(contract__contract_id__in=contract_ids, is_active=True)
+        .order_by("id")
+        .values_list("id", "contract__contract_id", "condition")
+    ):
+        rules = routes[contract_id].alert_rules
+        if len(rules) < AlertRule.MAX_RULES_PER_CONTRACT:
+            rules.append((rule_id, _safe_compile(condition, "rule", rule_id)))
+    return routes
+
+
+def get_routes(contract_ids: Sequence[str]) -> dict[str, ContractRoutes]:
+    """Return routing tables for *contract_ids*, loading stale ones in one pass."""
+    from .cache_utils import get_event_routes_version
+
+    version = get_event_routes_version()
+    result: dict[str, ContractRoutes] = {}
+    missing: list[str] = []
+    for contract_id in dict.fromkeys(contract_ids):
+        entry = _tables.get(contract_id)
+        if entry is not None and entry[0] == version:
+            result[contract_id] = entry[1]
+        else:
+            missing.append(contract_id)
+
+    if missing:
+        built = _build_routes(missing)
+        with _tables_lock:
+            if len(_tables) + len(built) > _TABLE_CACHE_SIZE:
+                _tables.clear()
+            for contract_id, routes in built.items():
+                _tables[contract_id] = (version, routes)
+        result.update(built)
+    return result
+
+
+def clear_routes() -> None:
+    """Drop every routing table held by this process."""
+    with _tables_lock:
+        _tables.clear()
+
+
+def alert_context(row: dict[str, Any]) -> dict[str, Any]:
+    """Event data alert rule conditions are evaluated against."""
+    return {
+        "event_type": row["event_type"],
+        "ledger": row["ledger"],
+        "payload": row["payload"] or {},
+        # Flatten payload fields under decodedPayload for AST compatibility
+        "decodedPayload": row["payload"] or {},
+    }
+
+
+def webhook_context(row: dict[str, Any]) -> dict[str, Any]:
+    """Event data webhook filter conditions are evaluated against."""
+    return {
+        "contract_id": row["contract__contract_id"],
+        "event_type": row["event_type"],
+        "payload": row["payload"],
+        "decodedPayload": row["decoded_payload"] or {},
+        "ledger": row["ledger"],
+        "event_index": row["event_index"],
+        "tx_hash": row["tx_hash"],
+    }
+
+
+def match_alert_rules(routes: ContractRoutes, row: dict[str, Any]) -> list[int]:
+    """Return the ids of alert rules whose condition matches *row*."""
+    from .tasks import _get_metrics
+
+    if not routes.alert_rules:
+        return []
+    m = _get_metrics()
+    event_data = alert_context(row)
+    matched = []
+    for rule_id, predicate in routes.alert_rules:
+        try:
+            if predicate(event_data):
+                matched.append(rule_id)
+                m.alert_rules_evaluated_total.labels(outcome="matched").inc()
+            else:
+                m.alert_rules_evaluated_total.labels(outcome="no_match").inc()
+        except Exception:
+            logger.exception(
+                "Error evaluating condition for rule %s",
+                rule_id,
+                extra={"rule_id": rule_id},
+            )
+    return matched
+
+
+_ROW_FIELDS = (
+    "id",
+    "contract__contract_id",
+    "ledger",
+    "event_index",
+    "event_type",
+    "payload",
+    "decoded_payload",
+    "tx_hash",
+)
+
+
+EventKey = tuple[str, int, int]
+
+
+def event_key(event: dict[str, Any]) -> EventKey | None:
+    """``(contract_id, ledger, event_index)`` for a ``process_new_event`` payload."""
+    if not event.get("contract_id") or event.get("ledger") is None:
+        return None
+    return event["contract_id"], event["ledger"], event.get("event_index", 0)
+
+
+def event_time_range(event_batch: Sequence[dict[str, Any]]) -> tuple[datetime, datetime] | None:
+    """
+    Earliest and latest ``timestamp`` of a batch of ``process_new_event`` payloads.
+
+    None when any payload lacks one (e.g. queued by a worker that predates
+    the field), since rows outside the range would then be missed.
+    """
+    stamps = [event.get("timestamp") for event in event_batch]
+    if not stamps or not all(stamps):
+        return None
+    parsed = [datetime.fromisoformat(stamp) for stamp in stamps]
+    return min(parsed), max(parsed)
+
+
+def load_event_rows(
+    keys: Collection[EventKey],
+    fields: Sequence[str] = _ROW_FIELDS,
+    time_range: tuple[datetime, datetime] | None = None,
+) -> dict[EventKey, dict[str, Any]]:
+    """
+    Fetch ``ContractEvent`` rows for *keys* in one query, keyed like ``event_key``.
+
+    A *time_range* bounds ``timestamp`` too, so a partitioned table is only
+    searched in the months it covers.
+    """
+    from .models import ContractEvent
+
+    if not keys:
+        return {}
+    fields = tuple(dict.fromkeys(("contract__contract_id", "ledger", "event_index", *fields)))
+    queryset = ContractEvent.objects.filter(
+        contract__contract_id__in={key[0] for key in keys},
+        ledger__in={key[1] for key in keys},
+    )
+    if time_range is not None:
+        queryset = queryset.filter(timestamp__range=time_range)
+    return {
+        (row["contract__contract_id"], row["ledger"], row["event_index"]): row
+        for row in queryset.values(*fields)
+    }
+
+
+def route_events(
+    event_batch: Sequence[dict[str, Any]],
+    rows: dict[EventKey, dict[str, Any]] | None = None,
+) -> tuple[list[tuple[int, int]], list[tuple[int, int]]]:
+    """
+    Match a batch of ``process_new_event`` payloads against the routing tables.
+
+    Returns ``(webhook_id, event_id)`` deliveries and ``(rule_id, event_id)``
+    alerts. Events are looked up in a single query, and only for contracts
+    that have at least one route. Callers that already hold the rows (with at
+    least the ``_ROW_FIELDS`` columns) can pass them as *rows* to skip it.
+    """
+    keyed = [key for key in map(event_key, event_batch) if key is not None]
+    routes = get_routes([key[0] for key in keyed])
+    keyed = [key for key in keyed if routes[key[0]]]
+    if not keyed:
+        return [], []
+
+    if rows is None:
+        rows = load_event_rows(keyed, time_range=event_time_range(event_batch))
+
+    deliveries: list[tuple[int, int]] = []
+    alerts: list[tuple[int, int]] = []
+    for key in keyed:
+        row = rows.get(key)
+        if row is None:
+            logger.warning(
+                "ContractEvent not found for contract=%s ledger=%s index=%s — skipping webhook dispatch",
+                *key,
+                extra={"contract_id": key[0]},
+            )
+            continue
+        contract_routes = routes[key[0]]
+        context = None
+        for webhook_id, predicate in contract_routes.webhooks_for(row["event_type"]):
+            if predicate is not None:
+                if context is None:
+                    context = webhook_context(row)
+                if not predicate(context):
+                    continue
+            deliveries.append((webhook_id, row["id"]))
+        alerts.extend((rule_id, row["id"]) for rule_id in match_alert_rules(contract_routes, row))
+    return deliveries, alerts
@@ -0,0 +1,180 @@
+"""
+Per-request batch loaders for the GraphQL schema.
+
+Strawberry's ``DataLoader`` needs an event loop, but the schema is executed
+synchronously by ``ThrottledGraphQLView``. These loaders batch a different
+way. ``DataLoaderExtension`` records every model instance returned by a
+list resolver. The first time a field on one of those instances needs
+related data, that data is loaded for the whole recorded set in one query,
+so the query count follows the depth of the query rather than the number
+of rows returned.
+
+Resolvers reach the loaders of the running operation with ``get_loaders()``.
+Outside an operation a fresh, non-shared instance is returned.
+"""
+from collections import defaultdict
+from collections.abc import Callable, Hashable, Iterable
+from contextvars import ContextVar
+from typing import Any
+
+from django.db.models import Model, QuerySet
+from strawberry.extensions import SchemaExtension
+
+from .cache_utils import get_event_counts
+from .models import (
+    ContractEvent,
+    ContractInvocation,
+    ContractMetadata,
+    ContractVerification,
+    TrackedContract,
+)
+
+_current: ContextVar["Loaders | None"] = ContextVar("graphql_loaders", default=None)
+
+
+def _cached_relation(instance: Model, name: str) -> tuple[bool, Any]:
+    """Return ``(True, value)`` when *name* was already fetched (e.g. select_related)."""
+    descriptor = getattr(type(instance), name)
+    if not descriptor.is_cached(instance):
+        return False, None
+    try:
+        return True, getattr(instance, name)
+    except descriptor.RelatedObjectDoesNotExist:
+        return True, None
+
+
+class Loaders:
+    """Batch loaders scoped to one GraphQL operation."""
+
+    def __init__(self):
+        self._seen: dict[type[Model], list[Model]] = defaultdict(list)
+        self._results: dict[str, dict[Hashable, Any]] = defaultdict(dict)
+        self._consumed: dict[tuple[str, type[Model]], int] = defaultdict(int)
+
+    def register(self, instances: Iterable[Model]) -> None:
+        """Record sibling instances so later loads cover all of them at once."""
+        for instance in instances:
+            self._seen[type(instance)].append(instance)
+
+    def _load(
+        self,
+        name: str,
+        key: Hashable,
+        sources: dict[type[Model], Callable[[Model], Hashable]],
+        fetch: Callable[[set], dict],
+        default: Any = None,
+    ) -> Any:
+        results = self._results[name]
+        if key in results:
+            return results[key]
+
+        keys = {key}
+        for model, key_of in sources.items():
+            seen = self._seen.get(model, ())
+            start = self._consumed[(name, model)]
+            keys.update(key_of(instance) for instance in seen[start:])
+            self._consumed[(name, model)] = len(seen)
+        keys = {k for k in keys if k is not None and k not in results}
+
+        found = fetch(keys)
+        for k in keys:
+            results[k] = found.get(k, default)
+        return results[key]
+
+    # -- TrackedContract fields ---------------------------------------------
+
+    def event_count(self, contract: TrackedContract) -> int:
+        return self._load(
+            "event_count",
+            contract.contract_id,
+            {TrackedContract: lambda c: c.contract_id},
+            get_event_counts,
+            default=0,
+        )
+
+    def metadata(self, contract: TrackedContract) -> ContractMetadata | None:
+        cached, value = _cached_relation(contract, "contractmetadata")
+        if cached:
+            return value
+        return self._load(
+            "metadata",
+            contract.pk,
+            {TrackedContract: lambda c: c.pk},
+            lambda pks: {m.contract_id: m for m in ContractMetadata.objects.filter(contract_id__in=pks)},
+        )
+
+    def verification(self, contract: TrackedContract) -> ContractVerification | None:
+        cached, value = _cached_relation(contract, "verification")
+        if cached:
+            return value
+        return self._load(
+            "verification",
+            contract.pk,
+            {TrackedContract: lambda c: c.pk},
+            lambda pks: {
+                v.contract_id: v for v in ContractVerification.objects.filter(contract_id__in=pks)
+            },
+        )
+
+    # -- event / invocation fields ------------------------------------------
+
+    def contract(self, instance: ContractEvent | ContractInvocation) -> TrackedContract:
+        cached, value = _cached_relation(instance, "contract")
+        if cached:
+            return value
+        return self._load(
+            "contract",
+            instance.contract_id,
+            {
+                ContractEvent: lambda e: e.contract_id,
+                ContractInvocation: lambda i: i.contract_id,
+            },
+            TrackedContract.objects.in_bulk,
+        )
+
+    def invocation_events(self, invocation: ContractInvocation) -> list[ContractEvent]:
+        def fetch(pks):
+            grouped = defaultdict(list)
+            events = list(ContractEvent.objects.filter(invocation_id__in=pks))
+            for event in events:
+                grouped[event.invocation_id].append(event)
+            self.register(events)
+            return grouped
+
+        return self._load(
+            "invocation_events",
+            invocation.pk,
+            {ContractInvocation: lambda i: i.pk},
+            fetch,
+            default=[],
+        )
+
+
+def get_loaders() -> Loaders:
+    return _current.get() or Loaders()
+
+
+class DataLoaderExtension(SchemaExtension):
+    """Give each operation its own ``Loaders`` and feed it list results."""
+
+    def on_operation(self):
+        token = _current.set(Loaders())
+        try:
+            yield
+        finally:
+            try:
+                _current.reset(token)
+            except ValueError:
+                # Subscriptions are torn down from another task's context,
+                # where the variable was never set.
+                pass
+
+    def resolve(self, _next, root, info, *args, **kwargs):
+        result = _next(root, info, *args, **kwargs)
+        if isinstance(result, QuerySet):
+            result = list(result)
+        if isinstance(result, list) and result and isinstance(result[0], Model):
+            loaders = _current.get()
+            if loaders is not None:
+                loaders.register(result)
+        return result
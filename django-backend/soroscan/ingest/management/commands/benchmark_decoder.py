@@ -0,0 +1,124 @@
+"""
+Management command: benchmark_decoder
+
+Micro-benchmark for ABI event decoding. Compares the per-event path used
+before compiled plans (load ``ContractABI`` from the database, scan the ABI
+for the event name, decode field by field) against a cached
+:class:`~soroscan.ingest.decoder.CompiledABI` and its ``decode_many`` batch API.
+
+Runs against the configured database inside a transaction that is rolled
+back.
+
+Usage:
+    python manage.py benchmark_decoder
+    python manage.py benchmark_decoder --events=50000 --event-types=20
+"""
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from stellar_sdk import scval
+
+from soroscan.ingest.decoder import decode_event_payload, get_compiled_abi
+from soroscan.ingest.models import ContractABI, TrackedContract
+
+_FIELDS = [
+    {"name": "from", "type": "Address"},
+    {"name": "to", "type": "Address"},
+    {"name": "amount", "type": "I128"},
+    {"name": "memo", "type": "String"},
+    {"name": "nonce", "type": "U64"},
+    {"name": "ok", "type": "Bool"},
+]
+_ACCOUNT = "GAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAWHF"
+
+
+def _raw_xdr(n: int) -> str:
+    return scval.to_vec(
+        [
+            scval.to_address(_ACCOUNT),
+            scval.to_address(_ACCOUNT),
+            scval.to_int128(n * 1_000_000),
+            scval.to_string(f"memo-{n}"),
+            scval.to_uint64(n),
+            scval.to_bool(n % 2 == 0),
+        ]
+    ).to_xdr()
+
+
+class Command(BaseCommand):
+    help = "Benchmark per-event ABI decoding against compiled, cached decoder plans."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--events",
+            type=int,
+            default=5000,
+            help="Number of payloads to decode per mode (default: 5000)",
+        )
+        parser.add_argument(
+            "--event-types",
+            type=int,
+            default=10,
+            help="Event definitions in the synthetic ABI (default: 10)",
+        )
+
+    def handle(self, *args, **options):
+        events = options["events"]
+        event_types = options["event_types"]
+        if events <= 0 or event_types <= 0:
+            raise CommandError("--events and --event-types must be greater than 0")
+
+        abi_json = [
+            {"name": f"event_{i}", "fields": _FIELDS} for i in range(event_types)
+        ]
+        # The last definition is the worst case for a linear scan.
+        names = [f"event_{event_types - 1 - (n % 2)}" if event_types > 1 else "event_0" for n in range(events)]
+        payloads = [_raw_xdr(n) for n in range(events)]
+
+        with transaction.atomic():
+            owner = get_user_model().objects.create(
+                username=f"benchmark-decoder-{uuid.uuid4().hex[:12]}"
+            )
+            contract = TrackedContract.objects.create(
+                contract_id="C" + "B" * 55, name="decoder benchmark", owner=owner
+            )
+            ContractABI.objects.create(contract=contract, abi_json=abi_json)
+
+            start = time.perf_counter()
+            legacy = []
+            for raw_xdr, name in zip(payloads, names):
+                abi = ContractABI.objects.get(contract=contract)
+                legacy.append(decode_event_payload(raw_xdr, abi.abi_json, name))
+            legacy_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            compiled = []
+            for raw_xdr, name in zip(payloads, names):
+                compiled.append(get_compiled_abi(contract).decode(raw_xdr, name))
+            compiled_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            batched = get_compiled_abi(contract).decode_many(payloads, names)
+            batch_elapsed = time.perf_counter() - start
+
+            transaction.set_rollback(True)
+
+        if not (legacy == compiled == batched):
+            raise CommandError("Compiled decoder output differs from the per-event decoder")
+
+        for label, elapsed in (
+            ("per-event", legacy_elapsed),
+            ("compiled", compiled_elapsed),
+            ("decode_many", batch_elapsed),
+        ):
+            rate = events / elapsed if elapsed > 0 else 0.0
+            self.stdout.write(
+                f"{label:>11}: {events} events in {elapsed:.3f}s ({rate:.1f} events/sec)"
+            )
+        if batch_elapsed > 0:
+            self.stdout.write(
+                self.style.SUCCESS(f"speedup: {legacy_elapsed / batch_elapsed:.1f}x")
+            )
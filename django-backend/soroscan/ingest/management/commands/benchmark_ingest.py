@@ -0,0 +1,177 @@
+"""
+Management command: benchmark_ingest
+
+Measures ingest persistence throughput (events/sec) for the serial and the
+batched ``ingest_latest_events`` code paths against the configured database.
+
+Synthetic ``get_events`` pages are generated locally, so no RPC traffic is
+made, and every run happens inside a transaction that is rolled back.
+
+Usage:
+    python manage.py benchmark_ingest
+    python manage.py benchmark_ingest --events=20000 --contracts=10
+    python manage.py benchmark_ingest --mode=batch --page-size=200
+"""
+import time
+import uuid
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from soroscan.ingest.cache_utils import invalidate_cached_contract
+from soroscan.ingest.models import TrackedContract
+from soroscan.ingest.stellar_client import InvocationData
+from soroscan.ingest.tasks import (
+    _ingest_events_batch,
+    _ingest_events_serial,
+    _network_label,
+)
+
+_BASE32 = "ABCDEFGHIJKLMNOPQRSTUVWXYZ234567"
+_MODES = {
+    "serial": _ingest_events_serial,
+    "batch": _ingest_events_batch,
+}
+
+
+class _OfflineInvocationClient:
+    """Stand-in for SorobanClient that never reaches the network."""
+
+    def get_invocation(self, tx_hash: str) -> InvocationData:
+        return InvocationData(
+            caller="",
+            contract="",
+            function_name="",
+            parameters={},
+            result=None,
+            ledger_sequence=0,
+            success=False,
+            error="benchmark",
+        )
+
+    def get_invocations(self, tx_hashes) -> dict[str, InvocationData]:
+        return {tx_hash: self.get_invocation(tx_hash) for tx_hash in tx_hashes}
+
+
+def _contract_id(seed: int) -> str:
+    return "C" + "".join(_BASE32[(seed >> (5 * i)) & 0x1F] for i in range(55))
+
+
+def _synthetic_pages(contract_ids, total_events, page_size, events_per_ledger):
+    events = []
+    for n in range(total_events):
+        ledger = 1_000_000 + n // events_per_ledger
+        index = n % events_per_ledger
+        events.append(
+            SimpleNamespace(
+                contract_id=contract_ids[n % len(contract_ids)],
+                ledger=ledger,
+                id=f"{ledger:019d}-{index:010d}",
+                tx_hash=f"{n:064x}",
+                type="transfer",
+                value={"amount": n, "to": f"G{n:055d}"},
+                xdr="",
+            )
+        )
+    return [events[i:i + page_size] for i in range(0, len(events), page_size)]
+
+
+class Command(BaseCommand):
+    help = "Benchmark serial vs batched event persistence (events/sec)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--events",
+            type=int,
+            default=5000,
+            help="Number of synthetic events to ingest per mode (default: 5000)",
+        )
+        parser.add_argument(
+            "--contracts",
+            type=int,
+            default=5,
+            help="Number of tracked contracts the events are spread across (default: 5)",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=100,
+            help="Events per get_events page, matching the RPC limit (default: 100)",
+        )
+        parser.add_argument(
+            "--events-per-ledger",
+            type=int,
+            default=10,
+            help="Events emitted per ledger (default: 10)",
+        )
+        parser.add_argument(
+            "--mode",
+            choices=["both", *_MODES],
+            default="both",
+            help="Code path to benchmark (default: both)",
+        )
+
+    def handle(self, *args, **options):
+        for name in ("events", "contracts", "page_size", "events_per_ledger"):
+            if options[name] <= 0:
+                raise CommandError(f"--{name.replace('_', '-')} must be greater than 0")
+
+        modes = list(_MODES) if options["mode"] == "both" else [options["mode"]]
+        results = {}
+        for mode in modes:
+            elapsed = self._run(mode, options)
+            results[mode] = options["events"] / elapsed if elapsed > 0 else 0.0
+            self.stdout.write(
+                f"{mode:>6}: {options['events']} events in {elapsed:.3f}s "
+                f"({results[mode]:.1f} events/sec)"
+            )
+
+        if len(results) == 2 and results["serial"] > 0:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"batch speedup: {results['batch'] / results['serial']:.1f}x"
+                )
+            )
+
+    def _run(self, mode: str, options) -> float:
+        ingest = _MODES[mode]
+        network = _network_label()
+        client = _OfflineInvocationClient()
+        run_tag = uuid.uuid4().int
+        contract_ids = [
+            _contract_id(run_tag + n) for n in range(options["contracts"])
+        ]
+
+        try:
+            with transaction.atomic():
+                owner = get_user_model().objects.create(
+                    username=f"benchmark-ingest-{run_tag:x}"[:150]
+                )
+                TrackedContract.objects.bulk_create(
+                    TrackedContract(
+                        contract_id=contract_id,
+                        name=f"benchmark {n}",
+                        owner=owner,
+                    )
+                    for n, contract_id in enumerate(contract_ids)
+                )
+                pages = _synthetic_pages(
+                    contract_ids,
+                    options["events"],
+                    options["page_size"],
+                    options["events_per_ledger"],
+                )
+
+                start = time.perf_counter()
+                for page in pages:
+                    ingest(page, network, client)
+                elapsed = time.perf_counter() - start
+
+                transaction.set_rollback(True)
+        finally:
+            for contract_id in contract_ids:
+                invalidate_cached_contract(contract_id)
+
+        return elapsed
@@ -0,0 +1,202 @@
+"""
+Management command: benchmark_search
+
+Compares the indexed payload search (``services/event_search.py``) with the
+``payload::text ILIKE`` scans it replaced. Both run on a seeded table of
+synthetic events for one benchmark contract.
+
+Seeding happens once and is topped up to ``--events`` on later runs, so a
+10M-event table only has to be built once. ``--drop`` removes it again.
+Each query shape is timed as the REST search endpoint runs it: an exact count
+plus the first page of 50 rows. The median over ``--runs`` is reported.
+
+Usage:
+    python manage.py benchmark_search --events=10000000
+    python manage.py benchmark_search --runs=5 --explain
+    python manage.py benchmark_search --drop
+"""
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import TextField
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from soroscan.ingest.models import ContractEvent, TrackedContract
+from soroscan.ingest.services.event_search import (
+    filter_payload_contains,
+    filter_payload_field,
+    search_ranked,
+    search_text,
+)
+
+BENCHMARK_CONTRACT_ID = "C" + "B" * 55
+NEEDLE_EVERY = 100_000
+PAGE_SIZE = 50
+_ASSETS = ("XLM", "USDC", "EURC", "AQUA", "yXLM")
+
+
+def _payload(n: int) -> dict:
+    memo = f"needle-{n}" if n % NEEDLE_EVERY == 0 else f"memo {n % 997}"
+    return {
+        "amount": n % 100_000,
+        "to": f"G{n % 50_000:055d}",
+        "memo": memo,
+        "asset": {"code": _ASSETS[n % len(_ASSETS)], "issuer": f"G{n % 7:055d}"},
+    }
+
+
+def _legacy_text(qs, text):
+    return qs.annotate(_pt=Cast("payload", output_field=TextField())).filter(
+        _pt__icontains=text
+    )
+
+
+# name -> (legacy query, indexed query)
+_QUERIES = {
+    "q substring": (
+        lambda qs: _legacy_text(qs, "needle-4"),
+        lambda qs: search_text(qs, "needle-4"),
+    ),
+    "payload_contains": (
+        lambda qs: _legacy_text(qs, '"code": "EURC"'),
+        lambda qs: filter_payload_contains(qs, '{"asset": {"code": "EURC"}}'),
+    ),
+    "field eq": (
+        lambda qs: qs.filter(payload__to=f"G{123:055d}"),
+        lambda qs: filter_payload_field(qs, "to", "eq", f"G{123:055d}"),
+    ),
+    "field gte": (
+        lambda qs: qs.filter(payload__amount__gte=99_990),
+        lambda qs: filter_payload_field(qs, "amount", "gte", "99990"),
+    ),
+    "field contains": (
+        lambda qs: qs.filter(payload__memo__icontains="needle"),
+        lambda qs: filter_payload_field(qs, "memo", "contains", "needle"),
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = "Benchmark indexed payload search against payload::text ILIKE scans."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--events",
+            type=int,
+            default=10_000_000,
+            help="Seeded events for the benchmark contract (default: 10000000)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10_000,
+            help="Rows per bulk insert while seeding (default: 10000)",
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=3,
+            help="Timed runs per query; the median is reported (default: 3)",
+        )
+        parser.add_argument(
+            "--explain",
+            action="store_true",
+            help="Print the query plan of each indexed query",
+        )
+        parser.add_argument(
+            "--drop",
+            action="store_true",
+            help="Delete the benchmark contract and its events, then exit",
+        )
+
+    def handle(self, *args, **options):
+        if options["drop"]:
+            deleted, _ = TrackedContract.objects.filter(
+                contract_id=BENCHMARK_CONTRACT_ID
+            ).delete()
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} benchmark rows"))
+            return
+        for name in ("events", "batch_size", "runs"):
+            if options[name] <= 0:
+                raise CommandError(f"--{name.replace('_', '-')} must be greater than 0")
+
+        contract = self._seed(options["events"], options["batch_size"])
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(f'ANALYZE "{ContractEvent._meta.db_table}"')
+        else:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{connection.vendor} has no payload search indexes; "
+                    "numbers only mean something on PostgreSQL."
+                )
+            )
+
+        base = ContractEvent.objects.filter(contract=contract)
+        for name, (legacy, indexed) in _QUERIES.items():
+            before = self._time(legacy(base), options["runs"])
+            after = self._time(indexed(base), options["runs"])
+            self.stdout.write(
+                f"{name:>16}: legacy {before * 1000:9.1f}ms  indexed {after * 1000:9.1f}ms  "
+                f"({before / after if after else 0:.1f}x)"
+            )
+            if options["explain"]:
+                self.stdout.write(indexed(base).order_by("-timestamp", "-id")[:PAGE_SIZE].explain())
+
+        ranked = search_ranked(base, "needle")
+        elapsed = self._time(ranked, options["runs"], ordered=True)
+        self.stdout.write(f"{'ranked':>16}: {elapsed * 1000:9.1f}ms")
+        if options["explain"]:
+            self.stdout.write(ranked[:PAGE_SIZE].explain())
+
+    def _seed(self, total: int, batch_size: int) -> TrackedContract:
+        owner, _ = get_user_model().objects.get_or_create(username="benchmark-search")
+        contract, _ = TrackedContract.objects.get_or_create(
+            contract_id=BENCHMARK_CONTRACT_ID,
+            defaults={"name": "benchmark search", "owner": owner},
+        )
+        existing = ContractEvent.objects.filter(contract=contract).count()
+        if existing >= total:
+            self.stdout.write(f"Using {existing} seeded events")
+            return contract
+
+        self.stdout.write(f"Seeding {total - existing} events...")
+        start = time.perf_counter()
+        epoch = timezone.now() - timedelta(seconds=total)
+        for offset in range(existing, total, batch_size):
+            rows = []
+            for n in range(offset, min(offset + batch_size, total)):
+                payload = _payload(n)
+                rows.append(
+                    ContractEvent(
+                        contract=contract,
+                        event_type="transfer" if n % 3 else "swap",
+                        payload=payload,
+                        payload_hash=ContractEvent.hash_payload(payload),
+                        payload_size=ContractEvent.measure_payload(payload),
+                        ledger=1_000_000 + n,
+                        event_index=0,
+                        timestamp=epoch + timedelta(seconds=n),
+                        tx_hash=f"{n:064x}",
+                    )
+                )
+            with transaction.atomic():
+                ContractEvent.objects.bulk_create(rows)
+        self.stdout.write(f"Seeded in {time.perf_counter() - start:.1f}s")
+        return contract
+
+    @staticmethod
+    def _time(queryset, runs: int, ordered: bool = False) -> float:
+        page = queryset if ordered else queryset.order_by("-timestamp", "-id")
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            queryset.count()
+            list(page[:PAGE_SIZE])
+            samples.append(time.perf_counter() - start)
+        return statistics.median(samples)
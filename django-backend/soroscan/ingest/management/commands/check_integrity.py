@@ -2,11 +2,15 @@
 Check ledger sequence integrity in ContractEvent table.
 
 Scans the ContractEvent table for gaps in ledger_sequence to ensure
-no ledger events have been missed during indexing.
+no ledger events have been missed during indexing. Runs of consecutive
+ledgers are computed in the database, so the work grows with the number
+of gaps rather than the number of ledgers. The ledger coverage index is
+not consulted: it only records inserts, and this command audits the rows
+that are actually stored.
 """
 from django.core.management.base import BaseCommand
-from django.db.models import Min, Max
 from soroscan.ingest.models import ContractEvent
+from soroscan.ingest.services.ledger_coverage import runs_from_events, summarize_runs
 
 
 class Command(BaseCommand):
@@ -41,10 +45,9 @@ class Command(BaseCommand):
         if event_type:
             query = query.filter(event_type=event_type)
 
-        # Get ledger sequence range
-        stats = query.aggregate(min_ledger=Min("ledger"), max_ledger=Max("ledger"))
-        min_ledger = stats["min_ledger"]
-        max_ledger = stats["max_ledger"]
+        summary = summarize_runs(runs_from_events(query))
+        min_ledger = summary["min_ledger"]
+        max_ledger = summary["max_ledger"]
 
         if min_ledger is None or max_ledger is None:
             self.stdout.write(
@@ -65,16 +68,11 @@ class Command(BaseCommand):
         self.stdout.write(f"Ledger Range: {min_ledger:,} to {max_ledger:,}")
         self.stdout.write(f"Total Ledgers Spanned: {max_ledger - min_ledger + 1:,}")
 
-        # Get all unique ledger sequences
-        ledger_sequences = set(
-            query.values_list("ledger", flat=True).distinct().order_by("ledger")
-        )
         total_events = query.count()
         self.stdout.write(f"Total Events: {total_events:,}")
-        self.stdout.write(f"Unique Ledgers with Events: {len(ledger_sequences):,}")
+        self.stdout.write(f"Unique Ledgers with Events: {summary['observed_ledgers']:,}")
 
-        # Find gaps
-        gaps = self._find_gaps(min_ledger, max_ledger, ledger_sequences)
+        gaps = [(gap["from_ledger"], gap["to_ledger"]) for gap in summary["gaps"]]
 
         if not gaps:
             self.stdout.write(
@@ -107,37 +105,8 @@ class Command(BaseCommand):
             self.stdout.write(
                 self.style.ERROR(
                     f"Coverage: "
-                    f"{(len(ledger_sequences) / (max_ledger - min_ledger + 1) * 100):.2f}%"
+                    f"{(summary['observed_ledgers'] / summary['expected_ledgers'] * 100):.2f}%"
                 )
             )
 
         self.stdout.write("")
-
-    @staticmethod
-    def _find_gaps(min_ledger, max_ledger, ledger_sequences):
-        """
-        Find gaps in ledger sequences.
-
-        Args:
-            min_ledger: Minimum ledger sequence
-            max_ledger: Maximum ledger sequence
-            ledger_sequences: Set of existing ledger sequences
-
-        Returns:
-            List of tuples (start, end) representing gap ranges
-        """
-        gaps = []
-        expected = min_ledger
-
-        while expected <= max_ledger:
-            if expected not in ledger_sequences:
-                # Start of a gap
-                gap_start = expected
-                while expected <= max_ledger and expected not in ledger_sequences:
-                    expected += 1
-                # Gap ends at expected - 1
-                gaps.append((gap_start, expected - 1))
-            else:
-                expected += 1
-
-        return gaps
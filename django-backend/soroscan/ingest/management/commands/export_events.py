@@ -8,7 +8,13 @@ Usage examples:
     python manage.py export_events --contract CXXX --format csv --output events.csv
     python manage.py export_events --contract-id CXXX --format json --output events.json
     python manage.py export_events --contract-id CXXX --format parquet --output events.parquet \
-        --start-ledger 1000000 --end-ledger 2000000
+        --start-ledger 1000000 --end-ledger 2000000 --compression zstd --row-group-size 250000
+    python manage.py export_events --contract-id CXXX --format parquet --output export/ \
+        --shards 8 --workers 4
+
+With --shards N the ledger range is split into N contiguous ranges written as
+part-00000.<ext>, part-00001.<ext>, ... into the --output directory, alongside
+a manifest.json listing each file's ledger range, event count and size.
 """
 from datetime import datetime, time
 
@@ -19,10 +25,10 @@ from django.utils.dateparse import parse_date, parse_datetime
 from soroscan.ingest.models import TrackedContract
 from soroscan.ingest.services.export_import import (
     _count_events,
-    export_avro,
     export_csv,
     export_json,
-    export_parquet,
+    export_sharded,
+    export_to_path,
 )
 
 
@@ -55,7 +61,7 @@ class Command(BaseCommand):
         parser.add_argument(
             "--output",
             required=True,
-            help="Output file path (use - for stdout on csv/json)",
+            help="Output file path (use - for stdout on csv/json), or directory with --shards",
         )
         parser.add_argument(
             "--start-ledger",
@@ -83,7 +89,30 @@ class Command(BaseCommand):
             "--batch-size",
             type=int,
             default=500,
-            help="Internal streaming batch size (default: 500)",
+            help="Rows fetched per database round trip (default: 500)",
+        )
+        parser.add_argument(
+            "--shards",
+            type=int,
+            default=1,
+            help="Split the ledger range into this many files plus a manifest (default: 1)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Shards exported in parallel (default: 1)",
+        )
+        parser.add_argument(
+            "--compression",
+            default=None,
+            help="Parquet compression codec (default: EXPORT_PARQUET_COMPRESSION)",
+        )
+        parser.add_argument(
+            "--row-group-size",
+            type=int,
+            default=None,
+            help="Parquet rows per row group (default: EXPORT_PARQUET_ROW_GROUP_SIZE)",
         )
 
     def handle(self, *args, **options):
@@ -115,6 +144,39 @@ class Command(BaseCommand):
             raise CommandError("--start-ledger must be <= --end-ledger")
         if start_date is not None and end_date is not None and start_date > end_date:
             raise CommandError("--start-date must be <= --end-date")
+        if min(options["batch_size"], options["shards"], options["workers"]) < 1:
+            raise CommandError("--batch-size, --shards and --workers must be >= 1")
+
+        export_options = {"batch_size": options["batch_size"]}
+        if fmt == "parquet":
+            export_options["compression"] = options["compression"]
+            export_options["row_group_size"] = options["row_group_size"]
+
+        if options["shards"] > 1:
+            if output == "-":
+                raise CommandError("--shards needs an output directory, not stdout.")
+            try:
+                manifest = export_sharded(
+                    fmt,
+                    contract_id,
+                    output,
+                    options["shards"],
+                    options["workers"],
+                    start_ledger,
+                    end_ledger,
+                    start_date,
+                    end_date,
+                    **export_options,
+                )
+            except ImportError as exc:
+                raise CommandError(str(exc))
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Exported {manifest['events']} events to {len(manifest['files'])} "
+                    f"files in {output}"
+                )
+            )
+            return
 
         total = _count_events(
             contract_id,
@@ -136,6 +198,7 @@ class Command(BaseCommand):
                 end_ledger,
                 start_date,
                 end_date,
+                export_options,
             )
         except ImportError as exc:
             raise CommandError(str(exc))
@@ -166,73 +229,19 @@ class Command(BaseCommand):
         end_ledger,
         start_date,
         end_date,
+        export_options,
     ) -> int:
+        filters = (start_ledger, end_ledger, start_date, end_date)
+        if output != "-":
+            return export_to_path(fmt, contract_id, output, *filters, **export_options)
         if fmt == "json":
-            if output == "-":
-                return export_json(
-                    contract_id,
-                    self.stdout,
-                    start_ledger,
-                    end_ledger,
-                    start_date,
-                    end_date,
-                )
-            with open(output, "w", encoding="utf-8") as f:
-                return export_json(
-                    contract_id,
-                    f,
-                    start_ledger,
-                    end_ledger,
-                    start_date,
-                    end_date,
-                )
-
-        if fmt == "csv":
-            if output == "-":
-                return export_csv(
-                    contract_id,
-                    self.stdout,
-                    start_ledger,
-                    end_ledger,
-                    start_date,
-                    end_date,
-                )
-            with open(output, "w", encoding="utf-8", newline="") as f:
-                return export_csv(
-                    contract_id,
-                    f,
-                    start_ledger,
-                    end_ledger,
-                    start_date,
-                    end_date,
-                )
-
-        if fmt == "parquet":
-            if output == "-":
-                raise CommandError(
-                    "Parquet format cannot be written to stdout; provide a file path."
-                )
-            return export_parquet(
-                contract_id,
-                output,
-                start_ledger,
-                end_ledger,
-                start_date,
-                end_date,
+            return export_json(
+                contract_id, self.stdout, *filters, export_options["batch_size"]
             )
-
-        if fmt == "avro":
-            if output == "-":
-                raise CommandError(
-                    "Avro format cannot be written to stdout; provide a file path."
-                )
-            return export_avro(
-                contract_id,
-                output,
-                start_ledger,
-                end_ledger,
-                start_date,
-                end_date,
+        if fmt == "csv":
+            return export_csv(
+                contract_id, self.stdout, *filters, export_options["batch_size"]
             )
-
-        raise CommandError(f"Unknown format: {fmt}")
+        raise CommandError(
+            f"{fmt.capitalize()} format cannot be written to stdout; provide a file path."
+        )
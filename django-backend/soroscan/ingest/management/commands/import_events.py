@@ -1,23 +1,30 @@
 """
 Management command: import_events
 
-Imports ContractEvent rows from Parquet, CSV, or JSON files with:
+Imports ContractEvent rows from Parquet, CSV, JSON, NDJSON or Avro files with:
   - Schema validation on each row
   - Idempotent upsert (re-importing the same file is safe)
+  - Streaming input and COPY-based batch loading on PostgreSQL
+  - Several files loaded in parallel (--workers) and resumable runs (--resume)
   - Progress reporting
 
 Usage examples:
     python manage.py import_events --file events.json --format json
     python manage.py import_events --file events.parquet --format parquet --dry-run
+    python manage.py import_events --file a.ndjson --file b.ndjson --workers 2 --resume
 """
+from concurrent.futures import ThreadPoolExecutor
 
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
 
 from soroscan.ingest.services.export_import import (
     ImportResult,
+    checkpoint_key,
     import_avro,
     import_csv,
     import_json,
+    import_ndjson,
     import_parquet,
 )
 
@@ -26,10 +33,15 @@ class Command(BaseCommand):
     help = "Import contract events from Parquet, CSV, or JSON."
 
     def add_arguments(self, parser):
-        parser.add_argument("--file", required=True, help="Input file path")
+        parser.add_argument(
+            "--file",
+            required=True,
+            action="append",
+            help="Input file path (repeat to import several files)",
+        )
         parser.add_argument(
             "--format",
-            choices=["parquet", "csv", "json", "avro"],
+            choices=["parquet", "csv", "json", "ndjson", "avro"],
             default=None,
             help="Input format (auto-detected from extension if omitted)",
         )
@@ -43,29 +55,65 @@ class Command(BaseCommand):
             action="store_true",
             help="Abort on the first validation error",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Files imported concurrently (default: 1)",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Checkpoint each batch and skip rows a previous interrupted run committed",
+        )
 
     def handle(self, *args, **options):
-        path = options["file"]
-        fmt = options["format"] or self._detect_format(path)
+        paths = options["file"]
+        if isinstance(paths, str):
+            paths = [paths]
         dry_run = options["dry_run"]
         fail_fast = options["fail_fast"]
-
-        if fmt is None:
-            raise CommandError(
-                "Cannot detect format from file extension. Use --format to specify it."
+        resume = options["resume"]
+
+        jobs = []
+        for path in paths:
+            fmt = options["format"] or self._detect_format(path)
+            if fmt is None:
+                raise CommandError(
+                    "Cannot detect format from file extension. Use --format to specify it."
+                )
+            jobs.append((fmt, path))
+
+        for fmt, path in jobs:
+            self.stderr.write(
+                f"{'[DRY RUN] ' if dry_run else ''}Importing {fmt.upper()} from {path}"
             )
 
-        self.stderr.write(
-            f"{'[DRY RUN] ' if dry_run else ''}Importing {fmt.upper()} from {path}"
-        )
+        def _run(job):
+            fmt, path = job
+            checkpoint = checkpoint_key(path) if resume else None
+            return self._do_import(fmt, path, ImportResult(), dry_run, checkpoint)
+
+        def _run_in_thread(job):
+            try:
+                return _run(job)
+            finally:
+                connection.close()
 
         result = ImportResult()
         try:
-            result = self._do_import(fmt, path, result, dry_run)
+            workers = max(1, min(options["workers"], len(jobs)))
+            if workers == 1:
+                results = [_run(job) for job in jobs]
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    results = list(pool.map(_run_in_thread, jobs))
         except ImportError as exc:
             raise CommandError(str(exc))
         except (ValueError, OSError) as exc:
             raise CommandError(f"Import failed: {exc}")
+        for partial in results:
+            result.merge(partial)
 
         if result.errors and fail_fast:
             raise CommandError(
@@ -86,17 +134,18 @@ class Command(BaseCommand):
         )
         self.stdout.write(self.style.SUCCESS(msg))
 
-    def _do_import(self, fmt, path, result, dry_run) -> ImportResult:
-        if fmt == "json":
+    def _do_import(self, fmt, path, result, dry_run, checkpoint=None) -> ImportResult:
+        if fmt in ("json", "ndjson"):
+            importer = import_json if fmt == "json" else import_ndjson
             with open(path, "r", encoding="utf-8") as f:
-                return import_json(f, result, dry_run=dry_run)
+                return importer(f, result, dry_run=dry_run, checkpoint=checkpoint)
         elif fmt == "csv":
             with open(path, "r", encoding="utf-8", newline="") as f:
-                return import_csv(f, result, dry_run=dry_run)
+                return import_csv(f, result, dry_run=dry_run, checkpoint=checkpoint)
         elif fmt == "parquet":
-            return import_parquet(path, result, dry_run=dry_run)
+            return import_parquet(path, result, dry_run=dry_run, checkpoint=checkpoint)
         elif fmt == "avro":
-            return import_avro(path, result, dry_run=dry_run)
+            return import_avro(path, result, dry_run=dry_run, checkpoint=checkpoint)
         raise CommandError(f"Unknown format: {fmt}")
 
     @staticmethod
@@ -104,6 +153,8 @@ class Command(BaseCommand):
         lower = path.lower()
         if lower.endswith(".json"):
             return "json"
+        if lower.endswith((".ndjson", ".jsonl")):
+            return "ndjson"
         if lower.endswith(".csv"):
             return "csv"
         if lower.endswith(".parquet"):
@@ -1,8 +1,11 @@
 from datetime import timedelta
 from django.core.management.base import BaseCommand
 from django.conf import settings
+from django.db.models import Min
 from django.utils import timezone
+from soroscan.ingest.event_counters import mark_recount
 from soroscan.ingest.models import ContractEvent
+from soroscan.ingest.partitions import drop_partitions_before, existing_partitions, is_partitioned
 
 
 class Command(BaseCommand):
@@ -27,26 +30,49 @@ class Command(BaseCommand):
         
         cutoff_date = timezone.now() - timedelta(days=retention_days)
         
+        # Whole monthly partitions before the cutoff go without a row scan
+        partitioned = is_partitioned()
+        expired = (
+            [p.name for p in existing_partitions() if p.end <= cutoff_date]
+            if partitioned
+            else []
+        )
+
         # Query events older than cutoff date
         old_events = ContractEvent.objects.filter(timestamp__lt=cutoff_date)
-        count = old_events.count()
-        
+
         if dry_run:
+            if expired:
+                self.stdout.write(
+                    self.style.WARNING(f"DRY RUN: Would drop partitions {', '.join(expired)}")
+                )
+            count = old_events.count()
             self.stdout.write(
                 self.style.WARNING(
                     f"DRY RUN: Would delete {count} events older than {retention_days} days "
                     f"(before {cutoff_date.strftime('%Y-%m-%d %H:%M:%S')})"
                 )
             )
-        else:
-            if count > 0:
-                deleted_count, _ = old_events.delete()
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f"Successfully deleted {deleted_count} events older than {retention_days} days"
-                    )
-                )
-            else:
-                self.stdout.write(
-                    self.style.SUCCESS("No events found older than retention period")
+            return
+
+        # Buckets of removed events are recounted by aggregate_event_statistics
+        oldest = old_events.aggregate(oldest=Min("timestamp"))["oldest"]
+        if oldest is not None:
+            mark_recount(oldest)
+
+        if partitioned:
+            for name in drop_partitions_before(cutoff_date):
+                self.stdout.write(self.style.SUCCESS(f"Removed partition {name}"))
+
+        count = old_events.count()
+        if count > 0:
+            deleted_count, _ = old_events.delete()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Successfully deleted {deleted_count} events older than {retention_days} days"
                 )
+            )
+        elif not expired:
+            self.stdout.write(
+                self.style.SUCCESS("No events found older than retention period")
+            )
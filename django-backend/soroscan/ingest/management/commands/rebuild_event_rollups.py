@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from soroscan.ingest.rollups import roll_up
+
+
+class Command(BaseCommand):
+    help = "Recompute the daily, weekly and monthly EventRollup tiers from hourly aggregations"
+
+    def handle(self, *args, **options):
+        written = roll_up(rebuild=True)
+        for resolution, count in written.items():
+            self.stdout.write(f"{resolution}: {count} rows")
+        self.stdout.write(self.style.SUCCESS("Event rollups rebuilt"))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from soroscan.ingest.models import TrackedContract
+from soroscan.ingest.services.ledger_coverage import rebuild_coverage
+
+
+class Command(BaseCommand):
+    help = "Recompute the LedgerCoverage index from the ContractEvent table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--contract",
+            type=int,
+            help="TrackedContract primary key to rebuild (default: all contracts)",
+        )
+
+    def handle(self, *args, **options):
+        contracts = TrackedContract.objects.order_by("pk")
+        if options.get("contract"):
+            contracts = contracts.filter(pk=options["contract"])
+        for contract in contracts.iterator():
+            runs = rebuild_coverage(contract)
+            self.stdout.write(f"{contract.contract_id}: {runs} runs")
+        self.stdout.write(self.style.SUCCESS("Ledger coverage rebuilt"))
@@ -13,13 +13,25 @@ class Command(BaseCommand):
         parser.add_argument(
             "--checkpoint-id",
             type=int,
-            default=0,
-            help="Resume from events with id > checkpoint-id",
+            default=None,
+            help=(
+                "Resume from events with id > checkpoint-id "
+                "(default: the saved checkpoint of an interrupted run; 0 starts over)"
+            ),
         )
         parser.add_argument(
             "--rollback-on-error",
             action="store_true",
-            help="Rollback current batch and abort on first processing error",
+            help=(
+                "Roll back the failing batch and abort on the first processing error "
+                "(earlier batches stay committed)"
+            ),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Decode worker processes (default: REPROCESS_WORKERS; 0 = one per CPU)",
         )
 
     def handle(self, *args, **options):
@@ -28,11 +40,14 @@ class Command(BaseCommand):
         batch_size = options["batch_size"]
         checkpoint_id = options["checkpoint_id"]
         rollback_on_error = options["rollback_on_error"]
+        workers = options["workers"]
 
         if batch_size <= 0:
             raise CommandError("--batch-size must be greater than 0")
-        if checkpoint_id < 0:
+        if checkpoint_id is not None and checkpoint_id < 0:
             raise CommandError("--checkpoint-id must be >= 0")
+        if workers is not None and workers < 0:
+            raise CommandError("--workers must be >= 0")
 
         result = reprocess_contract_events(
             contract_id,
@@ -40,6 +55,7 @@ class Command(BaseCommand):
             batch_size=batch_size,
             checkpoint_id=checkpoint_id,
             rollback_on_error=rollback_on_error,
+            workers=workers,
         )
 
         self.stdout.write(
@@ -51,7 +67,9 @@ class Command(BaseCommand):
                 f"failed={result.failed_events} "
                 f"progress={result.progress_percent}% "
                 f"checkpoint={result.last_checkpoint_id} "
+                f"committed_through={result.committed_through_id} "
                 f"dry_run={result.dry_run} "
-                f"rolled_back={result.rolled_back}"
+                f"rolled_back={result.rolled_back} "
+                f"rate={result.events_per_second:.1f} events/sec"
             )
         )
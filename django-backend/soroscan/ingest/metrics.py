@@ -20,6 +20,8 @@ __all__ = [
     "events_validated_total",
     "backfill_ledgers_processed_total",
     "backfill_batch_duration_seconds",
+    "backfill_events_fetched_total",
+    "backfill_window_ledgers",
     "webhook_deliveries_total",
     "webhook_delivery_duration_seconds",
     "webhook_ack_total",
@@ -38,6 +40,7 @@ __all__ = [
     "webhook_payload_bytes",
     "cache_hits_total",
     "cache_misses_total",
+    "cache_evictions_total",
     "event_streaming_total",
     "ledger_gaps_total",
     "missing_events_total",
@@ -49,6 +52,7 @@ __all__ = [
     "celery_tasks_total",
     "celery_tasks_active",
     "celery_task_duration_seconds",
+    "subscriber_events_dropped_total",
 ]
 
 
@@ -150,6 +154,21 @@ backfill_batch_duration_seconds = _get_or_create(
     ["contract_id"],
 )
 
+backfill_events_fetched_total = _get_or_create(
+    Counter,
+    "soroscan_backfill_events_fetched_total",
+    "Total number of events fetched from RPC across all backfill batches",
+    ["contract_id"],
+)
+
+backfill_window_ledgers = _get_or_create(
+    Histogram,
+    "soroscan_backfill_window_ledgers",
+    "Ledger span of each adaptive backfill batch window",
+    ["contract_id"],
+    buckets=(10, 25, 50, 100, 200, 400, 800, 1600, 3200, 6400, 10000),
+)
+
 webhook_deliveries_total = _get_or_create(
     Counter,
     "soroscan_webhook_deliveries_total",
@@ -274,6 +293,13 @@ cache_misses_total = _get_or_create(
     ["cache_type"],
 )
 
+cache_evictions_total = _get_or_create(
+    Counter,
+    "soroscan_cache_evictions_total",
+    "Total number of entries evicted from in-process caches",
+    ["cache_type"],
+)
+
 event_streaming_total = _get_or_create(
     Counter,
     "soroscan_event_streaming_total",
@@ -346,3 +372,10 @@ celery_task_duration_seconds = _get_or_create(
     "Celery task execution duration",
     ["task_name"],
 )
+
+subscriber_events_dropped_total = _get_or_create(
+    Counter,
+    "soroscan_subscriber_events_dropped_total",
+    "Live events dropped or coalesced for subscribers that fell behind",
+    ["transport", "reason"],
+)
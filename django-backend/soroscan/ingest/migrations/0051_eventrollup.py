@@ -0,0 +1,78 @@
+# Generated migration for EventRollup model
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ingest", "0050_transactioncost"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "resolution",
+                    models.CharField(
+                        choices=[("day", "Daily"), ("week", "Weekly"), ("month", "Monthly")],
+                        max_length=8,
+                    ),
+                ),
+                (
+                    "event_type",
+                    models.CharField(
+                        max_length=128,
+                        help_text="Event type name, or '' for the per-contract total bucket.",
+                    ),
+                ),
+                (
+                    "timestamp",
+                    models.DateTimeField(
+                        help_text="Start of the period (UTC; weeks start on Monday).",
+                    ),
+                ),
+                ("event_count", models.BigIntegerField(default=0)),
+                (
+                    "anomaly_count",
+                    models.IntegerField(
+                        default=0,
+                        help_text="Hourly buckets in the period flagged as anomalies.",
+                    ),
+                ),
+                (
+                    "contract",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rollups",
+                        to="ingest.trackedcontract",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-timestamp"],
+                "unique_together": {("resolution", "contract", "event_type", "timestamp")},
+                "indexes": [
+                    models.Index(
+                        fields=["resolution", "event_type", "timestamp"],
+                        name="ingest_evrl_res_type_ts_idx",
+                    ),
+                    models.Index(
+                        fields=["resolution", "contract", "event_type", "timestamp"],
+                        name="ingest_evrl_res_ctr_ts_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated migration for ContractEvent.payload_size and OrganizationUsageDay
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ingest", "0051_eventrollup"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contractevent",
+            name="payload_size",
+            field=models.PositiveIntegerField(
+                blank=True,
+                null=True,
+                help_text="Bytes of the JSON-serialised payload, recorded at ingest",
+            ),
+        ),
+        migrations.CreateModel(
+            name="OrganizationUsageDay",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("rpc_calls", models.PositiveBigIntegerField(default=0)),
+                ("event_count", models.PositiveBigIntegerField(default=0)),
+                ("storage_bytes", models.PositiveBigIntegerField(default=0)),
+                (
+                    "breakdown",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text="Usage by contract and event type.",
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "organization",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="usage_days",
+                        to="ingest.organization",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-day"],
+                "unique_together": {("organization", "day")},
+            },
+        ),
+    ]
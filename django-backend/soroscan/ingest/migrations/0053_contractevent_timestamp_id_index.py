@@ -0,0 +1,17 @@
+# Generated migration for the (timestamp, id) keyset pagination index
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ingest", "0052_contractevent_payload_size_organizationusageday"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="contractevent",
+            index=models.Index(fields=["timestamp", "id"], name="ingest_event_ts_id_idx"),
+        ),
+    ]
@@ -0,0 +1,76 @@
+"""
+Migration: searchable payload text for ContractEvent.
+
+Adds ``payload_text``, a stored generated column holding ``lower(payload::text)``.
+On PostgreSQL it also gets two GIN indexes: a trigram index (``pg_trgm``) for
+substring search and a ``to_tsvector('simple', ...)`` index for ranked
+full-text search. See ``services/event_search.py``.
+
+Other backends only get the column, like the GIN index in 0009.
+
+The migration is not atomic so that the indexes can be built
+``CONCURRENTLY``, without blocking writes. Adding the stored column still
+rewrites the events table under an exclusive lock, so schedule it in a
+maintenance window on large installations. If an index build fails, drop the
+INVALID index it leaves behind before re-running.
+"""
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+from django.db import migrations, models
+
+TRGM_INDEX_NAME = "ingest_event_payload_trgm"
+FTS_INDEX_NAME = "ingest_event_payload_fts"
+
+
+def _search_indexes():
+    from django.contrib.postgres.indexes import GinIndex, OpClass  # noqa: PLC0415
+    from django.contrib.postgres.search import SearchVector  # noqa: PLC0415
+
+    return [
+        GinIndex(OpClass("payload_text", name="gin_trgm_ops"), name=TRGM_INDEX_NAME),
+        GinIndex(SearchVector("payload_text", config="simple"), name=FTS_INDEX_NAME),
+    ]
+
+
+def _add_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    ContractEvent = apps.get_model("ingest", "ContractEvent")
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for index in _search_indexes():
+        schema_editor.add_index(ContractEvent, index, concurrently=True)
+
+
+def _remove_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    ContractEvent = apps.get_model("ingest", "ContractEvent")
+    for index in _search_indexes():
+        schema_editor.remove_index(ContractEvent, index, concurrently=True)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("ingest", "0053_contractevent_timestamp_id_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contractevent",
+            name="payload_text",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.functions.text.Lower(
+                    django.db.models.functions.comparison.Cast(
+                        "payload", output_field=models.TextField()
+                    )
+                ),
+                help_text="Lower-cased payload JSON text; trigram/tsvector indexed for search",
+                output_field=models.TextField(),
+            ),
+        ),
+        migrations.RunPython(_add_search_indexes, _remove_search_indexes, elidable=True),
+    ]
@@ -0,0 +1,43 @@
+"""
+Migration: per-contract ledger coverage index.
+
+Creates ``LedgerCoverage``, the run-length intervals of ledgers with indexed
+events. The table starts empty; migration 0058 seeds it from the events
+already stored.
+"""
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ingest", "0054_contractevent_payload_text"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LedgerCoverage",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("start_ledger", models.PositiveBigIntegerField(help_text="First ledger of the run")),
+                ("end_ledger", models.PositiveBigIntegerField(help_text="Last ledger of the run (inclusive)")),
+                (
+                    "contract",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ledger_coverage",
+                        to="ingest.trackedcontract",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["contract", "start_ledger"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("contract", "start_ledger"), name="unique_ledger_coverage_start"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,197 @@
+"""
+Migration: range-partition ContractEvent by month on PostgreSQL.
+
+The table is rebuilt as ``PARTITION BY RANGE (timestamp)`` with one partition
+per month of existing data (``ingest_contractevent_pYYYY_MM``, the names
+``partitions.py`` manages), the next few months, and a default partition.
+Rows are copied across and every index and constraint is recreated with its
+original name. PostgreSQL requires unique keys on a partitioned table to
+include the partition columns of every level, so the primary key becomes
+``(id, timestamp, contract_id)`` and ``unique_contract_ledger_event_index``
+gains ``timestamp``; ``contract_id`` is there so that months can later be
+hash-split by contract (``EVENT_PARTITION_HASH_BUCKETS``). Duplicates only
+still collide because ingest stores the ledger close time
+(``ledgerClosedAt``), which is the same for every event of a ledger, rather
+than the time the event was indexed; ingest and import also look rows up by
+``(contract, ledger, event_index)`` before inserting.
+
+Foreign keys *to* ContractEvent cannot reference ``id`` alone any more and
+are turned into unconstrained relations first; Django still applies their
+``on_delete`` and ``partitions.drop_partitions_before`` does the same for
+dropped months.
+
+The copy runs inside the migration transaction and holds an exclusive lock
+on the events table, so schedule it in a maintenance window on large
+installations. Other backends only get the relation changes.
+"""
+import re
+from datetime import UTC, datetime, timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+TABLE = "ingest_contractevent"
+OLD_TABLE = f"{TABLE}_unpartitioned"
+PARTITION_KEY = '"timestamp"'
+# Hash sub-partitions of a month (partitions.partition_ddl) split by contract.
+SUBPARTITION_KEY = "contract_id"
+MONTHS_AHEAD = 3
+_KEY_RE = re.compile(r"^(PRIMARY KEY|UNIQUE) \((.*?)\)(.*)$")
+
+
+def _next_month(value):
+    return (value.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _with_partition_key(definition, partitioned):
+    """
+    Add (or remove) the partition columns in a PRIMARY KEY/UNIQUE definition.
+
+    ``contract_id`` is only ever added to (and so only removed from) the
+    primary key; the unique key already starts with it.
+    """
+    match = _KEY_RE.match(definition)
+    if match is None:
+        return definition
+    primary = match[1] == "PRIMARY KEY"
+    columns = [column.strip() for column in match[2].split(",")]
+    columns = [
+        column for column in columns
+        if column.strip('"') != "timestamp"
+        and not (primary and column.strip('"') == SUBPARTITION_KEY)
+    ]
+    if partitioned:
+        columns.append(PARTITION_KEY)
+        if SUBPARTITION_KEY not in (column.strip('"') for column in columns):
+            columns.append(SUBPARTITION_KEY)
+    return f"{match[1]} ({', '.join(columns)}){match[3]}"
+
+
+def _rebuild(cursor, partitioned):
+    cursor.execute(
+        "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'f') ORDER BY contype DESC",
+        [TABLE],
+    )
+    constraints = cursor.fetchall()
+    cursor.execute(
+        "SELECT pg_get_indexdef(i.indexrelid) FROM pg_index i WHERE i.indrelid = %s::regclass "
+        "AND NOT EXISTS (SELECT 1 FROM pg_constraint c "
+        "WHERE c.conindid = i.indexrelid AND c.conrelid = i.indrelid)",
+        [TABLE],
+    )
+    indexes = [row[0].replace(" ON ONLY ", " ON ") for row in cursor.fetchall()]
+    cursor.execute(
+        "SELECT attname, attidentity FROM pg_attribute WHERE attrelid = %s::regclass "
+        "AND attnum > 0 AND NOT attisdropped AND attgenerated = '' ORDER BY attnum",
+        [TABLE],
+    )
+    attributes = cursor.fetchall()
+    columns = ", ".join(f'"{name}"' for name, _ in attributes)
+    identity = dict(attributes)["id"] != ""
+
+    cursor.execute(f'ALTER TABLE "{TABLE}" RENAME TO "{OLD_TABLE}"')
+    if identity:
+        cursor.execute(f'ALTER TABLE "{OLD_TABLE}" ALTER COLUMN "id" DROP IDENTITY')
+        sequence = f"{TABLE}_id_seq"
+        cursor.execute(f'CREATE SEQUENCE "{sequence}"')
+    else:
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [OLD_TABLE])
+        sequence = cursor.fetchone()[0]
+    cursor.execute(
+        f'CREATE TABLE "{TABLE}" (LIKE "{OLD_TABLE}" INCLUDING DEFAULTS INCLUDING GENERATED '
+        "INCLUDING CONSTRAINTS INCLUDING STORAGE INCLUDING COMMENTS)"
+        + (f" PARTITION BY RANGE ({PARTITION_KEY})" if partitioned else "")
+    )
+    cursor.execute(f"ALTER TABLE \"{TABLE}\" ALTER COLUMN \"id\" SET DEFAULT nextval('{sequence}')")
+    cursor.execute(f'ALTER SEQUENCE {sequence} OWNED BY "{TABLE}"."id"')
+
+    if partitioned:
+        cursor.execute(f'SELECT MIN("timestamp") FROM "{OLD_TABLE}"')
+        first = cursor.fetchone()[0] or datetime.now(UTC)
+        month = first.astimezone(UTC).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        last = datetime.now(UTC)
+        for _ in range(MONTHS_AHEAD):
+            last = _next_month(last.replace(day=1))
+        while month <= last:
+            end = _next_month(month)
+            cursor.execute(
+                f'CREATE TABLE "{TABLE}_p{month:%Y_%m}" PARTITION OF "{TABLE}" '
+                "FOR VALUES FROM (%s) TO (%s)",
+                [month, end],
+            )
+            month = end
+        cursor.execute(f'CREATE TABLE "{TABLE}_default" PARTITION OF "{TABLE}" DEFAULT')
+
+    cursor.execute(f'INSERT INTO "{TABLE}" ({columns}) SELECT {columns} FROM "{OLD_TABLE}"')
+    cursor.execute(f'SELECT setval(%s, COALESCE(MAX("id"), 0) + 1, false) FROM "{TABLE}"', [sequence])
+    cursor.execute(f'DROP TABLE "{OLD_TABLE}"')
+
+    for name, kind, definition in constraints:
+        if kind in ("p", "u"):
+            definition = _with_partition_key(definition, partitioned)
+        cursor.execute(f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{name}" {definition}')
+    for statement in indexes:
+        cursor.execute(statement)
+    cursor.execute(f'ANALYZE "{TABLE}"')
+
+
+def partition_events(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        _rebuild(cursor, partitioned=True)
+
+
+def unpartition_events(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        _rebuild(cursor, partitioned=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ingest", "0055_ledgercoverage"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="webhookdeliverylog",
+            name="event",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                help_text="ContractEvent that triggered this delivery",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="delivery_logs",
+                to="ingest.contractevent",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="webhookdeadletter",
+            name="event",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                help_text="Event payload associated with the failed delivery",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="webhook_dead_letters",
+                to="ingest.contractevent",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="alertexecution",
+            name="event",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="alert_executions",
+                to="ingest.contractevent",
+            ),
+        ),
+        migrations.RunPython(partition_events, unpartition_events),
+    ]
@@ -0,0 +1,65 @@
+"""
+Migration: per-partition unique keys on ``(contract_id, ledger, event_index)``.
+
+Migration 0056 had to add ``timestamp`` to ``unique_contract_ledger_event_index``,
+so the database stopped rejecting a second row for an event stored under a
+different timestamp. Each partition (every month and the default partition)
+now gets its own unique index on the original columns; PostgreSQL only
+allows such an index per partition, so the guarantee holds within a month.
+``partitions.partition_ddl`` adds the same index to months created later.
+
+Fails if a partition already holds duplicate keys; remove them first.
+Other backends keep the original unique constraint and are left alone.
+"""
+from django.db import migrations
+
+TABLE = "ingest_contractevent"
+SUFFIX = "_event_key"
+
+
+def _partitions(cursor):
+    cursor.execute(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = %s::regclass",
+        [TABLE],
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _is_partitioned(cursor):
+    cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass", [TABLE])
+    return cursor.fetchone() is not None
+
+
+def add_partition_keys(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        if not _is_partitioned(cursor):
+            return
+        for name in _partitions(cursor):
+            cursor.execute(
+                f'CREATE UNIQUE INDEX IF NOT EXISTS "{name}{SUFFIX}" '
+                f'ON "{name}" (contract_id, ledger, event_index)'
+            )
+
+
+def drop_partition_keys(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        if not _is_partitioned(cursor):
+            return
+        for name in _partitions(cursor):
+            cursor.execute(f'DROP INDEX IF EXISTS "{name}{SUFFIX}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ingest", "0056_partition_contractevent"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_partition_keys, drop_partition_keys),
+    ]
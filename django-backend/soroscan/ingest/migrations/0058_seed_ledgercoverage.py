@@ -0,0 +1,48 @@
+"""
+Migration: seed ``LedgerCoverage`` from the events already stored.
+
+Migration 0055 created the coverage table empty, and ingest only records the
+ledgers it writes from then on. A contract with older history would
+otherwise read as complete over just its new ledgers. Each contract's
+stored runs are merged with the runs of its events, so ledgers recorded by
+ingest while this runs are kept.
+
+The reverse is a no-op: coverage written here is indistinguishable from
+coverage written by ingest.
+"""
+from django.db import migrations
+
+from soroscan.ingest.services.ledger_coverage import merge_runs, runs_from_events
+
+
+def seed_coverage(apps, schema_editor):
+    TrackedContract = apps.get_model("ingest", "TrackedContract")
+    ContractEvent = apps.get_model("ingest", "ContractEvent")
+    LedgerCoverage = apps.get_model("ingest", "LedgerCoverage")
+    db = schema_editor.connection.alias
+
+    contract_pks = (
+        ContractEvent.objects.using(db).order_by().values_list("contract_id", flat=True).distinct()
+    )
+    for contract_pk in contract_pks:
+        runs = runs_from_events(ContractEvent.objects.using(db).filter(contract_id=contract_pk))
+        existing = LedgerCoverage.objects.using(db).filter(contract_id=contract_pk)
+        # Lock the contract as services.ledger_coverage does for its merges.
+        list(TrackedContract.objects.using(db).select_for_update().filter(pk=contract_pk).values("pk"))
+        merged = merge_runs([*runs, *existing.values_list("start_ledger", "end_ledger")])
+        existing.delete()
+        LedgerCoverage.objects.using(db).bulk_create(
+            LedgerCoverage(contract_id=contract_pk, start_ledger=start, end_ledger=end)
+            for start, end in merged
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ingest", "0057_contractevent_partition_unique_keys"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_coverage, migrations.RunPython.noop),
+    ]
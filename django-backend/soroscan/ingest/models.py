@@ -2,12 +2,15 @@
 Database models for SoroScan event indexing.
 """
 import hashlib
+import json
 import secrets
+from datetime import date, datetime
 
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator, RegexValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Cast, Lower
 from django.utils import timezone
 from django.utils.text import slugify
 
@@ -177,6 +180,36 @@ class OrganizationCostSnapshot(models.Model):
         )
 
 
+class OrganizationUsageDay(models.Model):
+    """
+    One day of usage for one organization (UTC), summed into the monthly
+    ``OrganizationCostSnapshot`` so mid-month refreshes only recount new days.
+    """
+
+    organization = models.ForeignKey(
+        Organization,
+        on_delete=models.CASCADE,
+        related_name="usage_days",
+    )
+    day = models.DateField()
+    rpc_calls = models.PositiveBigIntegerField(default=0)
+    event_count = models.PositiveBigIntegerField(default=0)
+    storage_bytes = models.PositiveBigIntegerField(default=0)
+    breakdown = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Usage by contract and event type.",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-day"]
+        unique_together = [("organization", "day")]
+
+    def __str__(self):
+        return f"UsageDay({self.organization.name}, {self.day}, events={self.event_count})"
+
+
 class Team(models.Model):
     """
     Multi-tenant organization: groups users and shared tracked contracts.
@@ -643,6 +676,14 @@ class ContractSigningKey(models.Model):
 class ContractEvent(models.Model):
     """
     Individual events emitted by tracked contracts.
+
+    On PostgreSQL the table is range-partitioned by month on ``timestamp``
+    (migration 0056, see ``partitions.py``); its primary key and unique
+    constraint there also include ``timestamp``. Each partition has its own
+    unique index on (contract, ledger, event_index) (migration 0057), so the
+    database still rejects a second row for an event within a month whatever
+    its timestamp. Across months it does not, so every insert path also looks
+    for the existing row while holding ``lock_for_insert``.
     """
 
     contract = models.ForeignKey(
@@ -677,6 +718,17 @@ class ContractEvent(models.Model):
         db_index=True,
         help_text="SHA-256 hash of the payload",
     )
+    payload_size = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Bytes of the JSON-serialised payload, recorded at ingest",
+    )
+    payload_text = models.GeneratedField(
+        expression=Lower(Cast("payload", output_field=models.TextField())),
+        output_field=models.TextField(),
+        db_persist=True,
+        help_text="Lower-cased payload JSON text; trigram/tsvector indexed for search",
+    )
     ledger = models.PositiveBigIntegerField(
         db_index=True,
         help_text="Ledger sequence number",
@@ -734,6 +786,8 @@ class ContractEvent(models.Model):
             models.Index(fields=["contract", "ledger", "event_index"]),
             models.Index(fields=["invocation"]),
             models.Index(fields=["signature_status"]),
+            # Keyset pagination walks (timestamp, id); see pagination.keyset_page.
+            models.Index(fields=["timestamp", "id"], name="ingest_event_ts_id_idx"),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -745,11 +799,43 @@ class ContractEvent(models.Model):
     def __str__(self):
         return f"{self.event_type}@{self.ledger} ({self.contract.name})"
 
+    @staticmethod
+    def hash_payload(payload) -> str:
+        """Return the SHA-256 hex digest stored in ``payload_hash``."""
+        return hashlib.sha256(str(payload).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def measure_payload(payload) -> int:
+        """Return the size in bytes stored in ``payload_size``."""
+        return len(json.dumps(payload or {}, sort_keys=True).encode("utf-8"))
+
+    @staticmethod
+    def lock_for_insert(contract_pks) -> None:
+        """
+        Serialise event inserts for *contract_pks* until the transaction ends.
+
+        Locks their ``TrackedContract`` rows in primary-key order, so writers
+        covering overlapping contracts cannot deadlock. Must be called inside
+        ``transaction.atomic``.
+        """
+        list(
+            TrackedContract.objects.select_for_update()
+            .filter(pk__in=set(contract_pks))
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
     def save(self, *args, **kwargs):
         # Auto-compute payload hash if not set
         if not self.payload_hash and self.payload:
-            payload_bytes = str(self.payload).encode("utf-8")
-            self.payload_hash = hashlib.sha256(payload_bytes).hexdigest()
+            self.payload_hash = self.hash_payload(self.payload)
+        # Keep the stored size in step with any write of the payload, including
+        # update_or_create, which saves only the fields it was given.
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "payload" in update_fields:
+            self.payload_size = self.measure_payload(self.payload)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "payload_size"}
         super().save(*args, **kwargs)
 
 
@@ -929,11 +1015,13 @@ class WebhookDeliveryLog(models.Model):
         related_name="delivery_logs",
         help_text="Subscription this attempt belongs to",
     )
+    # No database FK: a partitioned events table has no unique key on id alone.
     event = models.ForeignKey(
         "ContractEvent",
         on_delete=models.SET_NULL,
         null=True,
         blank=True,
+        db_constraint=False,
         related_name="delivery_logs",
         help_text="ContractEvent that triggered this delivery",
     )
@@ -1038,6 +1126,7 @@ class WebhookDeadLetter(models.Model):
         on_delete=models.SET_NULL,
         null=True,
         blank=True,
+        db_constraint=False,
         related_name="webhook_dead_letters",
         help_text="Event payload associated with the failed delivery",
     )
@@ -1139,6 +1228,66 @@ class IndexerState(models.Model):
     def __str__(self):
         return f"{self.key}: {self.value}"
 
+    @classmethod
+    def keep_earliest(cls, key: str, value: date | datetime) -> None:
+        """
+        Store *value* (ISO format) under *key* unless an earlier one is stored.
+
+        The stored value is read without a lock first, so the common case of
+        an already earlier mark costs one cheap query and no row lock.
+        """
+        parse = type(value).fromisoformat
+        current = cls.objects.filter(key=key).values_list("value", flat=True).first()
+        if current is not None and parse(current) <= value:
+            return
+        with transaction.atomic():
+            state, created = cls.objects.select_for_update().get_or_create(
+                key=key, defaults={"value": value.isoformat()}
+            )
+            if not created and value < parse(state.value):
+                state.value = value.isoformat()
+                state.save(update_fields=["value", "updated_at"])
+
+    @classmethod
+    def pop(cls, key: str) -> str | None:
+        """Delete *key* and return the value it held, if any."""
+        with transaction.atomic():
+            state = cls.objects.select_for_update().filter(key=key).first()
+            if state is None:
+                return None
+            state.delete()
+            return state.value
+
+
+class LedgerCoverage(models.Model):
+    """
+    A run of consecutive ledgers in which a contract has indexed events.
+
+    A contract's runs never overlap or touch, so completeness and gap lists
+    are read from as many rows as there are gaps. Maintained incrementally by
+    ``services.ledger_coverage``; ``rebuild_ledger_coverage`` recomputes it.
+    """
+
+    contract = models.ForeignKey(
+        TrackedContract,
+        on_delete=models.CASCADE,
+        related_name="ledger_coverage",
+    )
+    start_ledger = models.PositiveBigIntegerField(help_text="First ledger of the run")
+    end_ledger = models.PositiveBigIntegerField(help_text="Last ledger of the run (inclusive)")
+
+    class Meta:
+        ordering = ["contract", "start_ledger"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["contract", "start_ledger"],
+                name="unique_ledger_coverage_start",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.contract_id}: {self.start_ledger}-{self.end_ledger}"
+
 
 class EventDeduplicationConfig(models.Model):
     """
@@ -1341,6 +1490,7 @@ class AlertExecution(models.Model):
     event = models.ForeignKey(
         ContractEvent,
         on_delete=models.CASCADE,
+        db_constraint=False,
         related_name="alert_executions",
     )
     channel = models.CharField(
@@ -2487,12 +2637,13 @@ class EventAggregation(models.Model):
     """
     Pre-computed hourly event counts per contract / event_type bucket.
 
-    Written by the ``aggregate_event_statistics`` Celery task (hourly).
+    Counted at ingest and flushed by ``flush_event_counters``; finalised (drift
+    check and anomaly flag) by the hourly ``aggregate_event_statistics`` task.
     The API layer reads exclusively from this table for analytics queries,
     keeping response time well under 500 ms even over a 1-year window.
 
-    Granularity is always *1 hour* at storage time. The API can roll up to
-    daily / weekly / monthly in Python by grouping on truncated timestamps.
+    Granularity is always *1 hour* at storage time. Coarser periods are
+    served from ``EventRollup``.
     """
 
     contract = models.ForeignKey(
@@ -2541,6 +2692,67 @@ class EventAggregation(models.Model):
         )
 
 
+class EventRollup(models.Model):
+    """
+    Daily, weekly and monthly event counts derived from ``EventAggregation``.
+
+    Written by ``rollup_event_aggregations``: daily rows are summed from the
+    hourly buckets, weekly and monthly rows from the daily ones. A tier only
+    covers completed periods up to its watermark (see ``rollups``); analytics
+    queries read the coarsest tier a range allows and fall back to hourly
+    buckets for partial periods at either end.
+    """
+
+    RESOLUTION_DAY = "day"
+    RESOLUTION_WEEK = "week"
+    RESOLUTION_MONTH = "month"
+    RESOLUTION_CHOICES = [
+        (RESOLUTION_DAY, "Daily"),
+        (RESOLUTION_WEEK, "Weekly"),
+        (RESOLUTION_MONTH, "Monthly"),
+    ]
+
+    resolution = models.CharField(max_length=8, choices=RESOLUTION_CHOICES)
+    contract = models.ForeignKey(
+        TrackedContract,
+        on_delete=models.CASCADE,
+        related_name="rollups",
+    )
+    event_type = models.CharField(
+        max_length=128,
+        help_text="Event type name, or '' for the per-contract total bucket.",
+    )
+    timestamp = models.DateTimeField(
+        help_text="Start of the period (UTC; weeks start on Monday).",
+    )
+    event_count = models.BigIntegerField(default=0)
+    anomaly_count = models.IntegerField(
+        default=0,
+        help_text="Hourly buckets in the period flagged as anomalies.",
+    )
+
+    class Meta:
+        unique_together = ("resolution", "contract", "event_type", "timestamp")
+        indexes = [
+            models.Index(
+                fields=["resolution", "event_type", "timestamp"],
+                name="ingest_evrl_res_type_ts_idx",
+            ),
+            models.Index(
+                fields=["resolution", "contract", "event_type", "timestamp"],
+                name="ingest_evrl_res_ctr_ts_idx",
+            ),
+        ]
+        ordering = ["-timestamp"]
+
+    def __str__(self) -> str:
+        label = self.event_type or "<total>"
+        return (
+            f"EventRollup({self.resolution}, {self.contract.contract_id[:8]}…,"
+            f" {label}, {self.timestamp:%Y-%m-%d}, count={self.event_count})"
+        )
+
+
 # ---------------------------------------------------------------------------
 # Transaction cost tracking
 # ---------------------------------------------------------------------------
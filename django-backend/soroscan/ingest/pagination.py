@@ -0,0 +1,212 @@
+"""
+Keyset (cursor) pagination and cheap counts for the event listing endpoints.
+
+``OFFSET`` pagination makes the database walk every skipped row, so deep
+pages get slower the further a client reads. Keyset pagination instead
+remembers the ``(timestamp, id)`` of the last row served and asks for rows
+strictly after it, which costs the same on page 1 and page 100,000. The
+position is handed to clients as an opaque cursor token.
+
+Counts are chosen with ``count=exact|estimated|none``. ``estimated`` reads the
+planner's row estimate on PostgreSQL and falls back to an exact count cached
+for ``EVENT_COUNT_ESTIMATE_TTL_SECONDS`` on other backends.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .cache_utils import get_or_set_json, stable_cache_key
+
+COUNT_EXACT = "exact"
+COUNT_ESTIMATED = "estimated"
+COUNT_NONE = "none"
+COUNT_MODES = (COUNT_EXACT, COUNT_ESTIMATED, COUNT_NONE)
+
+CURSOR_PARAM = "cursor"
+MODE_PARAM = "pagination"
+CURSOR_MODE = "cursor"
+
+
+def count_estimate_ttl() -> int:
+    return int(getattr(settings, "EVENT_COUNT_ESTIMATE_TTL_SECONDS", 300))
+
+
+def encode_cursor(timestamp: datetime, pk: int) -> str:
+    """Return the opaque token for the position just after ``(timestamp, pk)``."""
+    blob = json.dumps({"t": timestamp.isoformat(), "i": pk}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(blob.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[datetime, int]:
+    """Inverse of ``encode_cursor``; raises ``ValidationError`` for bad tokens."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(data["t"]), int(data["i"])
+    except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError):
+        raise ValidationError({CURSOR_PARAM: "Invalid cursor."}) from None
+
+
+def wants_cursor(params) -> bool:
+    """True when the request asked for keyset pagination."""
+    return CURSOR_PARAM in params or params.get(MODE_PARAM) == CURSOR_MODE
+
+
+def parse_count_mode(params, *, cursor: bool) -> str:
+    """Validate ``count``; keyset pages skip counting unless asked to."""
+    mode = params.get("count") or (COUNT_NONE if cursor else COUNT_EXACT)
+    if mode not in COUNT_MODES:
+        raise ValidationError({"count": f"Must be one of: {', '.join(COUNT_MODES)}."})
+    if mode == COUNT_NONE and not cursor:
+        raise ValidationError({"count": "count=none requires pagination=cursor."})
+    return mode
+
+
+def parse_descending(params) -> bool:
+    """Keyset pages only follow ``timestamp`` ordering, newest first by default."""
+    ordering = params.get("ordering") or "-timestamp"
+    if ordering not in ("timestamp", "-timestamp"):
+        raise ValidationError(
+            {"ordering": "Cursor pagination supports ordering=timestamp or -timestamp only."}
+        )
+    return ordering.startswith("-")
+
+
+def estimate_count(queryset: QuerySet) -> int:
+    """Approximate row count for *queryset* without scanning it."""
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        sql, params = queryset.query.sql_with_params()
+        key = stable_cache_key("count_estimate", {"sql": sql, "params": params})
+        return get_or_set_json(key, count_estimate_ttl(), queryset.count)
+
+    sql, params = queryset.values("pk").query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_rows(queryset: QuerySet, mode: str) -> int | None:
+    if mode == COUNT_EXACT:
+        return queryset.count()
+    if mode == COUNT_ESTIMATED:
+        return estimate_count(queryset)
+    return None
+
+
+def keyset_after(queryset: QuerySet, timestamp, pk: int, *, descending: bool = False) -> QuerySet:
+    """Rows strictly after ``(timestamp, pk)`` in ``(timestamp, id)`` order.
+
+    The predicate keeps a plain range on ``timestamp`` so the timestamp index
+    bounds the scan.
+    """
+    if descending:
+        return queryset.filter(timestamp__lte=timestamp).filter(
+            Q(timestamp__lt=timestamp) | Q(id__lt=pk)
+        )
+    return queryset.filter(timestamp__gte=timestamp).filter(
+        Q(timestamp__gt=timestamp) | Q(id__gt=pk)
+    )
+
+
+def keyset_page(
+    queryset: QuerySet,
+    cursor: str | None,
+    page_size: int,
+    *,
+    descending: bool = True,
+) -> tuple[list, str | None]:
+    """Return one page after *cursor* and the cursor for the page that follows.
+
+    Rows are ordered by ``(timestamp, id)`` so ties on ``timestamp`` still
+    have a total order.
+    """
+    if descending:
+        queryset = queryset.order_by("-timestamp", "-id")
+    else:
+        queryset = queryset.order_by("timestamp", "id")
+    if cursor:
+        queryset = keyset_after(queryset, *decode_cursor(cursor), descending=descending)
+
+    rows = list(queryset[: page_size + 1])
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, encode_cursor(rows[-1].timestamp, rows[-1].pk)
+
+
+class _EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        return estimate_count(self.object_list)
+
+
+class EventPagination(PageNumberPagination):
+    """Page-number pagination with an opt-in keyset mode and count modes.
+
+    ``?pagination=cursor`` (or any ``cursor`` parameter) switches to keyset
+    pages; the response carries ``next_cursor`` and a ``next`` link instead of
+    page numbers.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        self.request = request
+        self.use_cursor = wants_cursor(params)
+        self.count_mode = parse_count_mode(params, cursor=self.use_cursor)
+        if not self.use_cursor:
+            self.django_paginator_class = (
+                _EstimatedCountPaginator if self.count_mode == COUNT_ESTIMATED else Paginator
+            )
+            return super().paginate_queryset(queryset, request, view)
+
+        self.count = count_rows(queryset, self.count_mode)
+        self.page_rows, self.next_cursor = keyset_page(
+            queryset,
+            params.get(CURSOR_PARAM),
+            self.get_page_size(request),
+            descending=parse_descending(params),
+        )
+        return self.page_rows
+
+    def get_next_link(self):
+        if not self.use_cursor:
+            return super().get_next_link()
+        if self.next_cursor is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), MODE_PARAM)
+        return replace_query_param(url, CURSOR_PARAM, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        if not self.use_cursor:
+            response = super().get_paginated_response(data)
+            response.data["count_mode"] = self.count_mode
+            return response
+        return Response(
+            {
+                "count": self.count,
+                "count_mode": self.count_mode,
+                "next": self.get_next_link(),
+                "next_cursor": self.next_cursor,
+                "results": data,
+            }
+        )
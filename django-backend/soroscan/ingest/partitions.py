@@ -0,0 +1,264 @@
+"""
+Monthly range partitions of the ``ContractEvent`` table on PostgreSQL.
+
+Migration 0056 turns ``ingest_contractevent`` into a table partitioned by
+``RANGE (timestamp)``: one partition per calendar month, named
+``ingest_contractevent_pYYYY_MM``, plus a default partition for rows outside
+every month that exists. Queries filtered on ``timestamp`` only scan the
+partitions they overlap, each partition carries its own (small) copy of every
+index, and retention removes whole months by detaching or dropping their
+partition instead of deleting rows.
+
+``ensure_partitions`` (run daily by ``maintain_event_partitions``) creates
+the months ahead so inserts never fall into the default partition. With
+``EVENT_PARTITION_HASH_BUCKETS`` set, new months are further split by hash of
+``contract_id``, so per-contract scans of a busy month touch one bucket.
+
+The table-wide unique key has to include ``timestamp`` (a PostgreSQL rule
+for partitioned tables), so each partition also carries its own unique index
+on ``(contract_id, ledger, event_index)`` (``unique_key_ddl``): within a
+month a second row for the same event is rejected whatever its timestamp.
+
+Other backends keep a plain table: ``is_partitioned`` is False and callers
+fall back to deleting rows.
+"""
+import logging
+import re
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from django.conf import settings
+from django.db import connections, models, transaction
+from django.utils import timezone
+
+from .models import ContractEvent
+
+logger = logging.getLogger(__name__)
+
+TABLE = ContractEvent._meta.db_table
+DEFAULT_PARTITION = f"{TABLE}_default"
+UNIQUE_KEY_SUFFIX = "_event_key"
+_NAME_RE = re.compile(rf"^{TABLE}_p(\d{{4}})_(\d{{2}})$")
+
+
+def _floor_month(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_month(value: datetime) -> datetime:
+    return (value.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+@dataclass(frozen=True)
+class Partition:
+    """One monthly partition covering ``[start, end)``."""
+
+    start: datetime
+    end: datetime
+
+    @classmethod
+    def for_month(cls, value: datetime) -> "Partition":
+        start = _floor_month(value.astimezone(UTC))
+        return cls(start, _next_month(start))
+
+    @classmethod
+    def from_name(cls, name: str) -> "Partition | None":
+        match = _NAME_RE.match(name)
+        if match is None:
+            return None
+        year, month = int(match[1]), int(match[2])
+        return cls.for_month(datetime(year, month, 1, tzinfo=UTC))
+
+    @property
+    def name(self) -> str:
+        return f"{TABLE}_p{self.start:%Y_%m}"
+
+
+def months_between(first: datetime, last: datetime) -> list[Partition]:
+    """Monthly partitions covering *first* through *last*, inclusive."""
+    partitions = []
+    partition = Partition.for_month(first)
+    while partition.start <= last:
+        partitions.append(partition)
+        partition = Partition.for_month(partition.end)
+    return partitions
+
+
+def unique_key_ddl(table: str) -> str:
+    """Statement adding the per-partition ``(contract_id, ledger, event_index)`` key to *table*."""
+    return (
+        f'CREATE UNIQUE INDEX IF NOT EXISTS "{table}{UNIQUE_KEY_SUFFIX}" '
+        f'ON "{table}" (contract_id, ledger, event_index)'
+    )
+
+
+def partition_ddl(partition: Partition, buckets: int = 0) -> list[str]:
+    """Statements creating *partition*, hash-split into *buckets* by contract if non-zero."""
+    statements = [
+        f'CREATE TABLE "{partition.name}" PARTITION OF "{TABLE}" '
+        f"FOR VALUES FROM ('{partition.start.isoformat()}') TO ('{partition.end.isoformat()}')"
+        + (" PARTITION BY HASH (contract_id)" if buckets else "")
+    ]
+    statements.extend(
+        f'CREATE TABLE "{partition.name}_h{remainder}" PARTITION OF "{partition.name}" '
+        f"FOR VALUES WITH (MODULUS {buckets}, REMAINDER {remainder})"
+        for remainder in range(buckets)
+    )
+    # On a hash-split month the index cascades to every bucket; it can, since
+    # it contains the bucket key.
+    statements.append(unique_key_ddl(partition.name))
+    return statements
+
+
+def is_partitioned(using: str = "default") -> bool:
+    """Whether the events table on *using* is a partitioned PostgreSQL table."""
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass", [TABLE]
+        )
+        return cursor.fetchone() is not None
+
+
+def existing_partitions(using: str = "default") -> list[Partition]:
+    """Monthly partitions currently attached to the events table, oldest first."""
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = %s::regclass",
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    return sorted(
+        (partition for partition in map(Partition.from_name, names) if partition),
+        key=lambda partition: partition.start,
+    )
+
+
+def _insert_columns(cursor) -> str:
+    cursor.execute(
+        "SELECT attname FROM pg_attribute WHERE attrelid = %s::regclass "
+        "AND attnum > 0 AND NOT attisdropped AND attgenerated = '' ORDER BY attnum",
+        [TABLE],
+    )
+    return ", ".join(f'"{row[0]}"' for row in cursor.fetchall())
+
+
+def _keys_include_contract(cursor) -> bool:
+    """Whether every unique key of the events table contains ``contract_id``."""
+    cursor.execute(
+        "SELECT NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conrelid = %s::regclass "
+        "AND c.contype IN ('p', 'u') AND NOT (SELECT a.attnum FROM pg_attribute a "
+        "WHERE a.attrelid = c.conrelid AND a.attname = 'contract_id') = ANY (c.conkey))",
+        [TABLE],
+    )
+    return cursor.fetchone()[0]
+
+
+def _create_partition(cursor, partition: Partition, buckets: int) -> None:
+    # Rows already in the default partition for this month must move into it,
+    # or PostgreSQL refuses to create a partition that overlaps them.
+    bounds = [partition.start, partition.end]
+    cursor.execute(
+        f'SELECT EXISTS (SELECT 1 FROM "{DEFAULT_PARTITION}" '
+        'WHERE "timestamp" >= %s AND "timestamp" < %s)',
+        bounds,
+    )
+    occupied = cursor.fetchone()[0]
+    if occupied:
+        cursor.execute(f'ALTER TABLE "{TABLE}" DETACH PARTITION "{DEFAULT_PARTITION}"')
+    for statement in partition_ddl(partition, buckets):
+        cursor.execute(statement)
+    if occupied:
+        columns = _insert_columns(cursor)
+        where = 'WHERE "timestamp" >= %s AND "timestamp" < %s'
+        cursor.execute(
+            f'INSERT INTO "{TABLE}" ({columns}) SELECT {columns} FROM "{DEFAULT_PARTITION}" {where}',
+            bounds,
+        )
+        cursor.execute(f'DELETE FROM "{DEFAULT_PARTITION}" {where}', bounds)
+        cursor.execute(f'ALTER TABLE "{TABLE}" ATTACH PARTITION "{DEFAULT_PARTITION}" DEFAULT')
+
+
+def ensure_partitions(now: datetime | None = None, using: str = "default") -> list[str]:
+    """
+    Create the monthly partitions from the current month through
+    ``EVENT_PARTITIONS_AHEAD`` months ahead; returns the names created.
+    """
+    if not is_partitioned(using):
+        return []
+    now = now or timezone.now()
+    ahead = getattr(settings, "EVENT_PARTITIONS_AHEAD", 3)
+    buckets = getattr(settings, "EVENT_PARTITION_HASH_BUCKETS", 0)
+    last = Partition.for_month(now)
+    for _ in range(ahead):
+        last = Partition.for_month(last.end)
+    if buckets:
+        with connections[using].cursor() as cursor:
+            if not _keys_include_contract(cursor):
+                # PostgreSQL rejects a hash split on a column missing from a
+                # unique key; plain months keep inserts out of the default.
+                logger.error(
+                    "EVENT_PARTITION_HASH_BUCKETS ignored: the keys of %s do not "
+                    "include contract_id (re-run migration 0056)",
+                    TABLE,
+                )
+                buckets = 0
+    existing = {partition.name for partition in existing_partitions(using)}
+    created = []
+    for partition in months_between(now, last.start):
+        if partition.name in existing:
+            continue
+        with transaction.atomic(using=using), connections[using].cursor() as cursor:
+            _create_partition(cursor, partition, buckets)
+        created.append(partition.name)
+        logger.info("Created event partition %s", partition.name)
+    return created
+
+
+def _release_dependents(partition: Partition, using: str) -> None:
+    # Relations to ContractEvent have no database FKs (see migration 0056), so
+    # apply their on_delete to the rows that reference the partition first.
+    for relation in ContractEvent._meta.related_objects:
+        name = relation.field.name
+        related = relation.related_model._base_manager.using(using).filter(
+            **{f"{name}__timestamp__gte": partition.start, f"{name}__timestamp__lt": partition.end}
+        )
+        if relation.on_delete is models.CASCADE:
+            related.delete()
+        elif relation.on_delete is models.SET_NULL:
+            related.update(**{name: None})
+        elif relation.on_delete is not models.DO_NOTHING:
+            raise ValueError(
+                f"Cannot drop {partition.name}: {relation.related_model.__name__}.{name} "
+                "must be CASCADE, SET_NULL or DO_NOTHING"
+            )
+
+
+def drop_partitions_before(cutoff: datetime, using: str = "default") -> list[str]:
+    """
+    Remove every monthly partition that ends at or before *cutoff*.
+
+    Partitions are detached, then dropped unless
+    ``EVENT_PARTITION_RETENTION_ACTION`` is ``"detach"``, which keeps them as
+    standalone tables for offline archiving. Returns the partition names.
+    """
+    if not is_partitioned(using):
+        return []
+    drop = getattr(settings, "EVENT_PARTITION_RETENTION_ACTION", "drop") != "detach"
+    removed = []
+    for partition in existing_partitions(using):
+        if partition.end > cutoff:
+            break
+        with transaction.atomic(using=using), connections[using].cursor() as cursor:
+            _release_dependents(partition, using)
+            cursor.execute(f'ALTER TABLE "{TABLE}" DETACH PARTITION "{partition.name}"')
+            if drop:
+                cursor.execute(f'DROP TABLE "{partition.name}"')
+        removed.append(partition.name)
+        logger.info(
+            "%s event partition %s", "Dropped" if drop else "Detached", partition.name
+        )
+    return removed
@@ -1,22 +1,120 @@
 """
 Ingest-time rate limiting utilities.
+
+Counters are per contract and per minute. Tokens are reserved with an atomic
+``INCRBY`` + ``EXPIRE`` pipeline (one Redis round-trip), and a worker may take
+a few more tokens than it needs and keep them in a local lease for the rest of
+the minute, so ingesting a page costs about one Redis call per contract.
 """
 
 import logging
-from django.utils import timezone
+import threading
+
+from django.conf import settings
 from django.core.cache import cache
+from django.utils import timezone
 from rest_framework.exceptions import Throttled
 
 from .models import TrackedContract
 
 logger = logging.getLogger(__name__)
 
+RATE_WINDOW_SECONDS = 60
+
+# (contract_id, minute) -> tokens reserved in Redis but not yet used here
+_leases: dict[tuple[str, str], int] = {}
+_leases_lock = threading.Lock()
+
+
+def _rate_key(contract_id: str, minute: str) -> str:
+    return f"ingest_rate:{contract_id}:{minute}"
+
+
+def _incr_window(key: str, amount: int) -> int:
+    """Atomically add *amount* to the window counter and return the new total."""
+    backend = getattr(cache, "_cache", None)
+    if hasattr(backend, "get_client"):
+        redis_key = cache.make_and_validate_key(key)
+        pipe = backend.get_client(redis_key, write=True).pipeline()
+        pipe.incrby(redis_key, amount)
+        pipe.expire(redis_key, RATE_WINDOW_SECONDS)
+        count, _ = pipe.execute()
+        return int(count)
+
+    # Non-Redis caches (local memory in tests and dev): add-then-incr is
+    # atomic per process, which is all those backends can offer anyway.
+    cache.add(key, 0, timeout=RATE_WINDOW_SECONDS)
+    return cache.incr(key, amount)
+
+
+def _lease_extra(limit: int) -> int:
+    """
+    Tokens to reserve on top of the request. Leases are never handed back, so
+    all ``INGEST_RATE_LEASE_WORKERS`` together may hold at most a tenth of the
+    limit without using it.
+    """
+    size = int(getattr(settings, "INGEST_RATE_LEASE_SIZE", 100))
+    workers = max(1, int(getattr(settings, "INGEST_RATE_LEASE_WORKERS", 4)))
+    return max(0, min(size, limit // (10 * workers)))
+
+
+def reserve_ingest_tokens(contract: TrackedContract, count: int) -> int:
+    """
+    Reserve up to *count* events against ``contract.max_events_per_minute``.
+
+    Returns how many of the *count* events may be ingested this minute;
+    never raises. Unlimited contracts always get *count*. Tokens are served
+    from this process's lease first and Redis is only asked for the rest.
+    On cache errors everything is granted (fail open).
+    """
+    limit = contract.max_events_per_minute
+    if limit is None or count <= 0:
+        return max(count, 0)
+
+    minute = timezone.now().strftime("%Y%m%d%H%M")
+    lease_key = (contract.contract_id, minute)
+
+    with _leases_lock:
+        leased = _leases.pop(lease_key, 0)
+        for stale in [k for k in _leases if k[1] != minute]:
+            del _leases[stale]
+    if leased >= count:
+        if leased > count:
+            with _leases_lock:
+                _leases[lease_key] = _leases.get(lease_key, 0) + leased - count
+        return count
+
+    wanted = count - leased
+    request = wanted + _lease_extra(limit)
+    try:
+        total = _incr_window(_rate_key(contract.contract_id, minute), request)
+    except Exception as exc:
+        logger.warning(
+            "Rate limit check failed for contract %s: %s",
+            contract.contract_id,
+            exc,
+            extra={"contract_id": contract.contract_id},
+        )
+        return count
+
+    granted = max(0, min(request, limit - (total - request)))
+    if granted > wanted:
+        with _leases_lock:
+            _leases[lease_key] = _leases.get(lease_key, 0) + granted - wanted
+    return leased + min(granted, wanted)
+
+
+def clear_token_leases() -> None:
+    """Drop tokens leased by this process."""
+    with _leases_lock:
+        _leases.clear()
+
 
 def check_ingest_rate(contract: TrackedContract) -> bool:
     """
     Check if the contract has exceeded its max_events_per_minute limit.
 
-    Uses Redis counter with 60-second TTL to track events per minute.
+    Reserves a single token via :func:`reserve_ingest_tokens`.
     Raises Throttled (HTTP 429) if the limit is exceeded.
 
     Args:
@@ -28,36 +126,16 @@ def check_ingest_rate(contract: TrackedContract) -> bool:
     Raises:
         Throttled: If rate limit exceeded.
     """
-    if contract.max_events_per_minute is None:
+    if reserve_ingest_tokens(contract, 1) == 1:
         return True
+    raise ingest_throttled()
 
-    now = timezone.now()
-    now_minute = now.strftime("%Y%m%d%H%M")
-    key = f"ingest_rate:{contract.contract_id}:{now_minute}"
 
-    try:
-        # Increment counter atomically
-        count = cache.get(key, 0) + 1
-        cache.set(key, count, timeout=60)
-
-        if count > contract.max_events_per_minute:
-            # Calculate seconds remaining in the current minute for Retry-After
-            retry_after = 60 - now.second
-            raise Throttled(
-                wait=retry_after,
-                detail=f"Rate limit exceeded. Try again in {retry_after} seconds.",
-            )
-
-        return True
-    except Throttled:
-        # Re-raise the throttled exception so the view can catch it and return 429
-        raise
-    except Exception as exc:
-        logger.warning(
-            "Rate limit check failed for contract %s: %s",
-            contract.contract_id,
-            exc,
-            extra={"contract_id": contract.contract_id},
-        )
-        # On error, allow the event through (fail open)
-        return True
+def ingest_throttled() -> Throttled:
+    """Throttled (HTTP 429) error that retries once the current minute's window ends."""
+    # Calculate seconds remaining in the current minute for Retry-After
+    retry_after = RATE_WINDOW_SECONDS - timezone.now().second
+    return Throttled(
+        wait=retry_after,
+        detail=f"Rate limit exceeded. Try again in {retry_after} seconds.",
+    )
@@ -2,16 +2,49 @@
 
 from __future__ import annotations
 
+import json
 import logging
+import os
+import time
 from dataclasses import dataclass
 
+import billiard
+from typing import Any
+
+from django.conf import settings
 from django.db import transaction
 
-from .models import AdminAction, ContractEvent, TrackedContract
-from .tasks import _try_decode_event, resolve_signature_status, validate_event_payload
+from .cache_utils import set_cached_decoded_payload
+from .decoder import CompiledABI
+from .models import (
+    AdminAction,
+    ContractABI,
+    ContractEvent,
+    ContractSigningKey,
+    EventSchema,
+    IndexerState,
+    TrackedContract,
+)
+from .schema_registry import compile_validator
+from .tasks import verify_event_signature
 
 logger = logging.getLogger(__name__)
 
+# Columns read for each event and the ones the engine may write back.
+_READ_FIELDS = (
+    "id",
+    "event_type",
+    "payload",
+    "raw_xdr",
+    "validation_status",
+    "schema_version",
+    "signature_status",
+    "decoded_payload",
+    "decoding_status",
+)
+# Slices smaller than this are not worth shipping to another process.
+_MIN_ROWS_PER_WORKER = 50
+
 
 @dataclass
 class ReprocessResult:
@@ -23,7 +56,53 @@ class ReprocessResult:
     last_checkpoint_id: int
     progress_percent: int
     dry_run: bool
+    # Chunks commit one by one, so this never means earlier chunks were
+    # undone: it is True when the run wrote nothing (dry runs). See
+    # committed_through_id for what was written.
     rolled_back: bool
+    elapsed_seconds: float = 0.0
+    events_per_second: float = 0.0
+    # Every event with id <= this has had its chunk committed.
+    committed_through_id: int = 0
+
+
+@dataclass(frozen=True)
+class ReprocessContext:
+    """Everything a worker needs to reprocess a contract's events, minus the DB."""
+
+    contract_id: str
+    # event_type -> (latest schema version, JSON schema)
+    schemas: dict[str, tuple[int, dict[str, Any]]]
+    # (algorithm, public_key) of the active signing key
+    signing_key: tuple[str, str] | None
+    abi_json: list[dict[str, Any]] | None
+
+    @classmethod
+    def for_contract(cls, contract: TrackedContract) -> "ReprocessContext":
+        schemas: dict[str, tuple[int, dict[str, Any]]] = {}
+        for event_type, version, json_schema in (
+            EventSchema.objects.filter(contract=contract)
+            .order_by("event_type", "-version")
+            .values_list("event_type", "version", "json_schema")
+        ):
+            schemas.setdefault(event_type, (version, json_schema))
+
+        signing_key = (
+            ContractSigningKey.objects.filter(contract=contract, is_active=True)
+            .values_list("algorithm", "public_key")
+            .first()
+        )
+        abi_json = (
+            ContractABI.objects.filter(contract=contract)
+            .values_list("abi_json", flat=True)
+            .first()
+        )
+        return cls(
+            contract_id=contract.contract_id,
+            schemas=schemas,
+            signing_key=tuple(signing_key) if signing_key else None,
+            abi_json=abi_json,
+        )
 
 
 def _progress(processed: int, total: int) -> int:
@@ -32,21 +111,208 @@ def _progress(processed: int, total: int) -> int:
     return int((processed / total) * 100)
 
 
+def _validate_payload(validators, event_type: str, payload: Any) -> tuple[bool, int | None]:
+    """Same outcome as ``tasks.validate_event_payload``, with pre-built validators."""
+    if payload is None or not isinstance(payload, dict):
+        return (True, None)
+    entry = validators.get(event_type)
+    if entry is None:
+        return (True, None)
+    version, validator = entry
+    return (validator.is_valid(payload), version)
+
+
+def _check_signature(signing_key, contract_id: str, payload: Any) -> str:
+    if signing_key is None:
+        return "missing"
+    payload_dict = payload if isinstance(payload, dict) else {}
+    return verify_event_signature(
+        signing_key,
+        {"signature": payload_dict.get("signature")},
+        payload_dict,
+        contract_id,
+    )
+
+
+def _decode(compiled_abi: CompiledABI | None, event_type: str, raw_xdr: str) -> dict[str, Any]:
+    """Return the decode fields to write; empty when no ABI is registered."""
+    if compiled_abi is None:
+        return {}
+    if not raw_xdr:
+        return {"decoding_status": "no_abi"}
+    try:
+        decoded = compiled_abi.decode(raw_xdr, event_type)
+    except Exception:
+        return {"decoding_status": "failed"}
+    if decoded is None:
+        return {"decoding_status": "failed"}
+    return {"decoded_payload": decoded, "decoding_status": "success"}
+
+
+@dataclass(frozen=True)
+class CompiledContext:
+    """A ``ReprocessContext`` with its validators, signing key and ABI built."""
+
+    contract_id: str
+    validators: dict[str, tuple[int, Any]]
+    signing_key: ContractSigningKey | None
+    compiled_abi: CompiledABI | None
+
+    @classmethod
+    def build(cls, context: ReprocessContext) -> "CompiledContext":
+        signing_key = None
+        if context.signing_key is not None:
+            algorithm, public_key = context.signing_key
+            signing_key = ContractSigningKey(algorithm=algorithm, public_key=public_key)
+        return cls(
+            contract_id=context.contract_id,
+            validators={
+                event_type: (version, compile_validator(json_schema))
+                for event_type, (version, json_schema) in context.schemas.items()
+            },
+            signing_key=signing_key,
+            compiled_abi=CompiledABI(context.abi_json) if context.abi_json is not None else None,
+        )
+
+    def process(self, rows: list[tuple[int, str, Any, str]]) -> list[tuple[int, dict[str, Any]]]:
+        results = []
+        for event_id, event_type, payload, raw_xdr in rows:
+            passed, schema_version = _validate_payload(self.validators, event_type, payload)
+            updates = {
+                "validation_status": "passed" if passed else "failed",
+                "schema_version": schema_version,
+                "signature_status": _check_signature(
+                    self.signing_key, self.contract_id, payload
+                ),
+            }
+            updates.update(_decode(self.compiled_abi, event_type, raw_xdr))
+            results.append((event_id, updates))
+        return results
+
+
+def process_rows(
+    context: ReprocessContext,
+    rows: list[tuple[int, str, Any, str]],
+) -> list[tuple[int, dict[str, Any]]]:
+    """
+    Validate, verify and decode ``(id, event_type, payload, raw_xdr)`` rows.
+
+    Pure CPU work with no database access. Returns ``(id, {field: new
+    value})`` for every row. Compiles *context* on every call; the engine
+    compiles it once per run (and once per pool worker) instead.
+    """
+    return CompiledContext.build(context).process(rows)
+
+
+# Set in each pool worker by _init_worker.
+_worker_context: CompiledContext | None = None
+
+
+def _init_worker(context: ReprocessContext) -> None:
+    global _worker_context
+    _worker_context = CompiledContext.build(context)
+
+
+def _process_in_worker(rows: list[tuple[int, str, Any, str]]) -> list[tuple[int, dict[str, Any]]]:
+    return _worker_context.process(rows)
+
+
+def _resolve_workers(workers: int | None) -> int:
+    if workers is None:
+        workers = int(getattr(settings, "REPROCESS_WORKERS", 0) or 0)
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return workers
+
+
+def _create_pool(workers: int, context: ReprocessContext):
+    """
+    Return a process pool whose workers hold *context* compiled, or ``None``
+    to process rows in this process.
+
+    billiard (Celery's fork of ``multiprocessing``) lets the daemonic
+    children of a prefork Celery worker start processes of their own, so the
+    ``reprocess_events`` task gets the pool too. Only ``fork`` hands workers
+    an already-configured Django.
+    """
+    if workers <= 1 or "fork" not in billiard.get_all_start_methods():
+        return None
+    return billiard.get_context("fork").Pool(
+        processes=workers, initializer=_init_worker, initargs=(context,)
+    )
+
+
+def _run_chunk(pool, workers, compiled, rows):
+    if pool is None or len(rows) < 2 * _MIN_ROWS_PER_WORKER:
+        return compiled.process(rows)
+    slices = min(workers, len(rows) // _MIN_ROWS_PER_WORKER)
+    size = -(-len(rows) // slices)
+    parts = [rows[i:i + size] for i in range(0, len(rows), size)]
+    results = []
+    for part in pool.map(_process_in_worker, parts):
+        results.extend(part)
+    return results
+
+
+def _apply_results(batch, results) -> tuple[list[ContractEvent], set[str]]:
+    by_id = {event.id: event for event in batch}
+    changed: list[ContractEvent] = []
+    fields: set[str] = set()
+    for event_id, updates in results:
+        event = by_id[event_id]
+        dirty = [field for field, value in updates.items() if getattr(event, field) != value]
+        for field in dirty:
+            setattr(event, field, updates[field])
+        if dirty:
+            changed.append(event)
+            fields.update(dirty)
+    return changed, fields
+
+
+def _checkpoint_key(contract: TrackedContract) -> str:
+    return f"reprocess:{contract.pk}"
+
+
+def _saved_checkpoint(key: str) -> int:
+    state = IndexerState.objects.filter(key=key).first()
+    if state is None:
+        return 0
+    try:
+        return int(json.loads(state.value)["last_checkpoint_id"])
+    except (ValueError, KeyError, TypeError):
+        logger.warning("Ignoring malformed reprocess checkpoint %s=%r", key, state.value)
+        return 0
+
+
 def reprocess_contract_events(
     contract_id: str,
     *,
     dry_run: bool = False,
     batch_size: int = 500,
-    checkpoint_id: int = 0,
+    checkpoint_id: int | None = None,
     rollback_on_error: bool = True,
+    workers: int | None = None,
 ) -> ReprocessResult:
     """
     Re-run decode/validation/signature checks on historical events in batches.
 
-    Does not pause live indexing. Reprocessing runs in bounded transactions with
-    checkpoints so progress can be resumed safely.
+    Does not pause live indexing. Events are streamed in ID order; each chunk
+    is validated, signature-checked and decoded on a process pool of
+    *workers* processes (``REPROCESS_WORKERS``; 0 means one per CPU), then
+    written back with ``bulk_update`` in its own transaction together with
+    the checkpoint (``reprocess:<contract pk>`` in ``IndexerState``).
+
+    Without *checkpoint_id*, a run resumes after the saved checkpoint of an
+    interrupted one; ``checkpoint_id=0`` starts over. The checkpoint is
+    cleared once every event has been processed. When a chunk fails with
+    *rollback_on_error*, only that chunk is rolled back: the chunks before it
+    stay committed and the next run resumes after them. Dry runs compute
+    everything but write nothing.
     """
     contract = TrackedContract.objects.get(contract_id=contract_id)
+    checkpoint_key = _checkpoint_key(contract)
+    if checkpoint_id is None:
+        checkpoint_id = _saved_checkpoint(checkpoint_key)
 
     queryset = ContractEvent.objects.filter(contract=contract).order_by("id")
     if checkpoint_id > 0:
@@ -57,7 +323,10 @@ def reprocess_contract_events(
     updated = 0
     failed = 0
     last_checkpoint = checkpoint_id
+    committed_through = checkpoint_id
     rolled_back = False
+    workers = _resolve_workers(workers)
+    started = time.monotonic()
 
     AdminAction.objects.create(
         user=None,
@@ -70,71 +339,70 @@ def reprocess_contract_events(
             "dry_run": dry_run,
             "batch_size": batch_size,
             "checkpoint_id": checkpoint_id,
+            "workers": workers,
         },
     )
 
+    context = ReprocessContext.for_contract(contract)
+    compiled = CompiledContext.build(context)
+    pool = _create_pool(workers, context)
     try:
-        outer_ctx = transaction.atomic()
-        with outer_ctx:
-            while True:
-                batch = list(queryset.filter(id__gt=last_checkpoint)[:batch_size])
-                if not batch:
-                    break
-
-                try:
+        while True:
+            batch = list(
+                queryset.filter(id__gt=last_checkpoint).only(*_READ_FIELDS)[:batch_size]
+            )
+            if not batch:
+                break
+
+            try:
+                rows = [
+                    (event.id, event.event_type, event.payload, event.raw_xdr)
+                    for event in batch
+                ]
+                results = _run_chunk(pool, workers, compiled, rows)
+                changed, fields = _apply_results(batch, results)
+
+                if not dry_run:
                     with transaction.atomic():
-                        for event in batch:
-                            changed_fields: list[str] = []
-
-                            passed, schema_version = validate_event_payload(
-                                contract,
-                                event.event_type,
-                                event.payload,
-                                ledger=event.ledger,
-                            )
-                            new_validation_status = "passed" if passed else "failed"
-                            if event.validation_status != new_validation_status:
-                                event.validation_status = new_validation_status
-                                changed_fields.append("validation_status")
-
-                            if event.schema_version != schema_version:
-                                event.schema_version = schema_version
-                                changed_fields.append("schema_version")
-
-                            payload_dict = event.payload if isinstance(event.payload, dict) else {}
-                            signature_status = resolve_signature_status(
-                                contract,
-                                {"signature": payload_dict.get("signature")},
-                                payload_dict,
-                            )
-                            if event.signature_status != signature_status:
-                                event.signature_status = signature_status
-                                changed_fields.append("signature_status")
-
-                            if changed_fields:
-                                event.save(update_fields=changed_fields)
-                                updated += 1
-
-                            # Re-run ABI decoding with latest ABI.
-                            _try_decode_event(event, contract, event.event_type, event.raw_xdr)
-
-                            processed += 1
-                            last_checkpoint = event.id
-
-                except Exception:
-                    logger.warning(
-                        "Reprocessing batch failed for contract=%s at checkpoint=%s",
-                        contract.contract_id,
-                        last_checkpoint,
-                        exc_info=True,
-                    )
-                    failed += len(batch)
-                    if rollback_on_error:
-                        rolled_back = True
-                        raise
-
-            if dry_run:
-                transaction.set_rollback(True)
+                        if changed:
+                            ContractEvent.objects.bulk_update(changed, sorted(fields))
+                        IndexerState.objects.update_or_create(
+                            key=checkpoint_key,
+                            defaults={
+                                "value": json.dumps(
+                                    {"last_checkpoint_id": batch[-1].id}
+                                )
+                            },
+                        )
+                    committed_through = batch[-1].id
+                    for event in changed:
+                        if event.decoding_status == "success" and "decoded_payload" in fields:
+                            set_cached_decoded_payload(event.pk, event.decoded_payload)
+            except Exception:
+                logger.warning(
+                    "Reprocessing batch failed for contract=%s at checkpoint=%s",
+                    contract.contract_id,
+                    last_checkpoint,
+                    exc_info=True,
+                )
+                failed += len(batch)
+                if rollback_on_error:
+                    rolled_back = True
+                    raise
+            else:
+                updated += len(changed)
+                processed += len(batch)
+
+            last_checkpoint = batch[-1].id
+            elapsed = time.monotonic() - started
+            logger.info(
+                "Reprocessed %s/%s events for contract=%s (%.1f events/sec)",
+                processed,
+                total_events,
+                contract.contract_id,
+                processed / elapsed if elapsed > 0 else 0.0,
+                extra={"contract_id": contract.contract_id},
+            )
     except Exception as exc:
         AdminAction.objects.create(
             user=None,
@@ -145,11 +413,22 @@ def reprocess_contract_events(
             changes={
                 "contract_id": contract.contract_id,
                 "last_checkpoint_id": last_checkpoint,
+                "committed_through_id": committed_through,
                 "error": str(exc),
             },
         )
         raise
+    finally:
+        if pool is not None:
+            # Every map has returned by now; a clean close would wait for
+            # idle workers to exit on their own.
+            pool.terminate()
+            pool.join()
+
+    if not dry_run:
+        IndexerState.objects.filter(key=checkpoint_key).delete()
 
+    elapsed = time.monotonic() - started
     result = ReprocessResult(
         contract_id=contract.contract_id,
         total_events=total_events,
@@ -160,6 +439,9 @@ def reprocess_contract_events(
         progress_percent=_progress(processed, total_events),
         dry_run=dry_run,
         rolled_back=rolled_back or dry_run,
+        elapsed_seconds=round(elapsed, 3),
+        events_per_second=round(processed / elapsed, 1) if elapsed > 0 else 0.0,
+        committed_through_id=committed_through,
     )
 
     AdminAction.objects.create(
@@ -175,9 +457,11 @@ def reprocess_contract_events(
             "updated_events": result.updated_events,
             "failed_events": result.failed_events,
             "last_checkpoint_id": result.last_checkpoint_id,
+            "committed_through_id": result.committed_through_id,
             "progress_percent": result.progress_percent,
             "dry_run": result.dry_run,
             "rolled_back": result.rolled_back,
+            "events_per_second": result.events_per_second,
         },
     )
 
@@ -0,0 +1,295 @@
+"""
+Daily, weekly and monthly rollup tiers over hourly ``EventAggregation`` rows.
+
+Each tier has a watermark in ``IndexerState`` (``rollup:<resolution>``): the
+start of the first period it does not cover yet. ``roll_up`` advances the
+watermarks to the current period and rebuilds periods behind them whose
+hourly buckets changed (``mark_dirty``), so a tier only ever holds completed
+periods. Queries cover a range with the coarsest tier allowed by the
+requested granularity, falling back to finer tiers for the partial periods
+at each end and for anything past a tier's watermark.
+"""
+import logging
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Min, Q, Sum
+from django.db.models.functions import TruncDay, TruncHour, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .models import EventAggregation, EventRollup, IndexerState
+
+logger = logging.getLogger(__name__)
+
+DIRTY_KEY = "rollup:dirty_since"
+WRITE_BATCH_SIZE = 1000
+
+
+def _floor_day(value: datetime) -> datetime:
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _floor_week(value: datetime) -> datetime:
+    return _floor_day(value) - timedelta(days=value.weekday())
+
+
+def _floor_month(value: datetime) -> datetime:
+    return _floor_day(value).replace(day=1)
+
+
+def _next_month(value: datetime) -> datetime:
+    return (value.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+@dataclass(frozen=True)
+class Tier:
+    resolution: str
+    trunc: type
+    floor: Callable[[datetime], datetime]
+    step: Callable[[datetime], datetime]
+    # Tier the rows are summed from; None for the hourly buckets themselves.
+    source: str | None
+
+    @property
+    def watermark_key(self) -> str:
+        return f"rollup:{self.resolution}"
+
+    def ceil(self, value: datetime) -> datetime:
+        floor = self.floor(value)
+        return floor if floor == value else self.step(floor)
+
+
+HOUR = Tier(
+    "hour",
+    TruncHour,
+    lambda value: value.replace(minute=0, second=0, microsecond=0),
+    lambda value: value + timedelta(hours=1),
+    None,
+)
+DAY = Tier(EventRollup.RESOLUTION_DAY, TruncDay, _floor_day, lambda value: value + timedelta(days=1), "hour")
+WEEK = Tier(EventRollup.RESOLUTION_WEEK, TruncWeek, _floor_week, lambda value: value + timedelta(days=7), "day")
+MONTH = Tier(EventRollup.RESOLUTION_MONTH, TruncMonth, _floor_month, _next_month, "day")
+
+TIERS = {tier.resolution: tier for tier in (HOUR, DAY, WEEK, MONTH)}
+
+# Tiers a granularity may be answered from, coarsest first. Weeks straddle
+# month boundaries, so monthly answers skip the weekly tier.
+CHAINS: dict[str, tuple[Tier, ...]] = {
+    "hourly": (HOUR,),
+    "daily": (DAY, HOUR),
+    "weekly": (WEEK, DAY, HOUR),
+    "monthly": (MONTH, DAY, HOUR),
+}
+# For range totals without a time axis.
+TOTALS_CHAIN = CHAINS["monthly"]
+
+
+# ---------------------------------------------------------------------------
+# Watermarks
+# ---------------------------------------------------------------------------
+
+
+def get_watermarks() -> dict[str, datetime]:
+    """Return ``{resolution: watermark}`` for tiers that have been rolled up."""
+    keys = [tier.watermark_key for tier in (DAY, WEEK, MONTH)]
+    return {
+        key.split(":", 1)[1]: datetime.fromisoformat(value)
+        for key, value in IndexerState.objects.filter(key__in=keys).values_list("key", "value")
+    }
+
+
+def _set_watermark(tier: Tier, value: datetime) -> None:
+    IndexerState.objects.update_or_create(
+        key=tier.watermark_key, defaults={"value": value.isoformat()}
+    )
+
+
+def mark_dirty(bucket_start: datetime) -> None:
+    """
+    Record that the hourly bucket at *bucket_start* changed.
+
+    Only buckets before the start of the current day can be covered by a
+    tier, so later ones are ignored without a query.
+    """
+    if bucket_start >= _floor_day(timezone.now()):
+        return
+    IndexerState.keep_earliest(DIRTY_KEY, bucket_start)
+
+
+def _pop_dirty() -> datetime | None:
+    value = IndexerState.pop(DIRTY_KEY)
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+# ---------------------------------------------------------------------------
+# Rolling up
+# ---------------------------------------------------------------------------
+
+
+def _source_queryset(tier: Tier):
+    if tier.source == HOUR.resolution:
+        return EventAggregation.objects.all()
+    return EventRollup.objects.filter(resolution=tier.source)
+
+
+def _rebuild(tier: Tier, start: datetime, end: datetime) -> int:
+    """Replace *tier* rows in ``[start, end)`` with sums of its source rows."""
+    anomaly = (
+        Count("id", filter=Q(is_anomaly=True))
+        if tier.source == HOUR.resolution
+        else Sum("anomaly_count")
+    )
+    rows = (
+        _source_queryset(tier)
+        .filter(timestamp__gte=start, timestamp__lt=end)
+        .annotate(period=tier.trunc("timestamp"))
+        .values("contract_id", "event_type", "period")
+        .annotate(total=Sum("event_count"), anomalies=anomaly)
+        .order_by()
+    )
+    written = 0
+    with transaction.atomic():
+        EventRollup.objects.filter(
+            resolution=tier.resolution, timestamp__gte=start, timestamp__lt=end
+        ).delete()
+        batch: list[EventRollup] = []
+        for row in rows.iterator(chunk_size=WRITE_BATCH_SIZE):
+            batch.append(
+                EventRollup(
+                    resolution=tier.resolution,
+                    contract_id=row["contract_id"],
+                    event_type=row["event_type"],
+                    timestamp=row["period"],
+                    event_count=row["total"] or 0,
+                    anomaly_count=row["anomalies"] or 0,
+                )
+            )
+            if len(batch) >= WRITE_BATCH_SIZE:
+                EventRollup.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            EventRollup.objects.bulk_create(batch)
+            written += len(batch)
+        _set_watermark(tier, end)
+    return written
+
+
+def roll_up(now: datetime | None = None, rebuild: bool = False) -> dict[str, int]:
+    """
+    Bring every tier up to the start of its current period.
+
+    Covers completed periods since the last run plus periods holding buckets
+    marked dirty. A tier that was never built (or ``rebuild=True``) starts
+    from the oldest hourly bucket. Returns rows written per resolution.
+    """
+    now = now or timezone.now()
+    dirty = _pop_dirty()
+    watermarks = {} if rebuild else get_watermarks()
+    if rebuild or len(watermarks) < 3:
+        oldest = EventAggregation.objects.aggregate(oldest=Min("timestamp"))["oldest"]
+    else:
+        oldest = None
+
+    written: dict[str, int] = {}
+    try:
+        for tier in (DAY, WEEK, MONTH):
+            end = tier.floor(now)
+            start = watermarks.get(tier.resolution)
+            if start is None:
+                start = tier.floor(oldest) if oldest is not None else end
+            if dirty is not None:
+                start = min(start, tier.floor(dirty))
+            if start < end or tier.resolution not in watermarks:
+                written[tier.resolution] = _rebuild(tier, start, end)
+    except Exception:
+        if dirty is not None:
+            mark_dirty(dirty)
+        raise
+    return written
+
+
+# ---------------------------------------------------------------------------
+# Querying
+# ---------------------------------------------------------------------------
+
+
+def _plan(
+    chain: tuple[Tier, ...],
+    start: datetime | None,
+    end: datetime | None,
+    watermarks: dict[str, datetime],
+) -> list[tuple[Tier, datetime | None, datetime | None]]:
+    """Split ``[start, end)`` (None = unbounded) into per-tier sub-ranges."""
+    if start is not None and end is not None and start >= end:
+        return []
+    tier, finer = chain[0], chain[1:]
+    watermark = watermarks.get(tier.resolution)
+    if not finer:
+        return [(tier, start, end)]
+    if watermark is None:
+        return _plan(finer, start, end, watermarks)
+
+    lo = tier.ceil(start) if start is not None else None
+    hi = watermark if end is None else min(watermark, tier.floor(end))
+    if lo is not None and lo >= hi:
+        return _plan(finer, start, end, watermarks)
+    head = _plan(finer, start, lo, watermarks) if lo is not None else []
+    return head + [(tier, lo, hi)] + _plan(finer, hi, end, watermarks)
+
+
+def query_counts(
+    chain: tuple[Tier, ...],
+    fields: Iterable[str],
+    since: datetime | None = None,
+    bucket: str | None = None,
+    exclude_totals: bool = False,
+    **filters,
+) -> list[dict]:
+    """
+    Sum ``event_count`` and anomaly buckets grouped by *fields* over ``[since, now)``.
+
+    *filters* are applied to both models (``contract``, ``event_type``, ...).
+    With *bucket* set to a granularity (``"daily"`` ...), rows are also grouped
+    by the period start under the ``"bucket"`` key. ``exclude_totals`` drops
+    the per-contract total rows (``event_type=''``). Each row carries
+    ``event_count`` and ``anomaly_count``.
+    """
+    fields = list(fields)
+    trunc = CHAINS[bucket][0].trunc if bucket else None
+    group = fields + (["bucket"] if trunc else [])
+    merged: dict[tuple, dict] = {}
+
+    for tier, lo, hi in _plan(chain, since, None, get_watermarks()):
+        if tier is HOUR:
+            qs = EventAggregation.objects.all()
+            anomaly = Count("id", filter=Q(is_anomaly=True))
+        else:
+            qs = EventRollup.objects.filter(resolution=tier.resolution)
+            anomaly = Sum("anomaly_count")
+        qs = qs.filter(**filters)
+        if exclude_totals:
+            qs = qs.exclude(event_type="")
+        if lo is not None:
+            qs = qs.filter(timestamp__gte=lo)
+        if hi is not None:
+            qs = qs.filter(timestamp__lt=hi)
+        if trunc:
+            qs = qs.annotate(bucket=trunc("timestamp"))
+
+        for row in qs.values(*group).annotate(
+            total=Sum("event_count"), anomalies=anomaly
+        ).order_by():
+            key = tuple(row[name] for name in group)
+            entry = merged.get(key)
+            if entry is None:
+                entry = merged[key] = {
+                    **{name: row[name] for name in group},
+                    "event_count": 0,
+                    "anomaly_count": 0,
+                }
+            entry["event_count"] += row["total"] or 0
+            entry["anomaly_count"] += row["anomalies"] or 0
+    return list(merged.values())
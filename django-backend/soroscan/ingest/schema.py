@@ -29,13 +29,28 @@ from .models import (
     ContractEvent,
     ContractInvocation,
     ContractMetadata,
-    ContractVerification,
     Notification,
     TrackedContract,
     WebhookDeliveryLog,
 )
+from .loaders import DataLoaderExtension, get_loaders
 from .services.contract_state import decode_state_payload, get_state_at_ledger
+from .services.event_search import (
+    SEARCH_OPS,
+    filter_payload_contains,
+    filter_payload_field,
+    search_ranked,
+    search_text,
+)
 from .services.timeline import build_timeline
+from .subscriptions import (
+    SubscriberQueue,
+    envelope_to_event,
+    event_type_filter,
+    message_event_type,
+    subscription_overflow_policy,
+    subscription_queue_size,
+)
 from ..graphql_extensions import (
     GraphQLRateLimitExtension,
     GraphQLResolverLoggingExtension,
@@ -81,15 +96,12 @@ class ContractType:
     deprecation_reason: auto
     event_filter_type: auto
     event_filter_list: strawberry.scalars.JSON
-    metadata: strawberry.scalars.JSON
     created_at: auto
 
     @strawberry.field
     def verification_status(self) -> Optional[str]:
-        try:
-            return self.verification.status
-        except ContractVerification.DoesNotExist:
-            return None
+        verification = get_loaders().verification(self)
+        return verification.status if verification is not None else None
 
     @strawberry.field
     def team_id(self) -> Optional[int]:
@@ -103,7 +115,7 @@ class ContractType:
 
     @strawberry.field
     def event_count(self) -> int:
-        return self.events.count()
+        return get_loaders().event_count(self)
 
     @strawberry.field
     def warnings(self) -> list["WarningType"]:
@@ -119,18 +131,17 @@ class ContractType:
 
     @strawberry.field
     def metadata(self) -> Optional["ContractMetadataType"]:
-        try:
-            m = self.contractmetadata
-            return ContractMetadataType(
-                name=m.name,
-                description=m.description,
-                tags=m.tags,
-                documentation_url=m.documentation_url,
-                github_repo=m.github_repo,
-                team_email=m.team_email,
-            )
-        except ContractMetadata.DoesNotExist:
+        m = get_loaders().metadata(self)
+        if m is None:
             return None
+        return ContractMetadataType(
+            name=m.name,
+            description=m.description,
+            tags=m.tags,
+            documentation_url=m.documentation_url,
+            github_repo=m.github_repo,
+            team_email=m.team_email,
+        )
 
 
 @strawberry.type
@@ -185,11 +196,11 @@ class EventType:
 
     @strawberry.field
     def contract_id(self) -> str:
-        return self.contract.contract_id
+        return get_loaders().contract(self).contract_id
 
     @strawberry.field
     def contract_name(self) -> str:
-        return self.contract.name
+        return get_loaders().contract(self).name
 
     @strawberry.field
     def transaction_id(self) -> str:
@@ -209,16 +220,16 @@ class InvocationType:
 
     @strawberry.field
     def contract_id(self) -> str:
-        return self.contract.contract_id
+        return get_loaders().contract(self).contract_id
 
     @strawberry.field
     def contract_name(self) -> str:
-        return self.contract.name
+        return get_loaders().contract(self).name
 
     @strawberry.field
     def events(self) -> list[EventType]:
         """Nested events generated by this invocation."""
-        return list(self.events.all())
+        return list(get_loaders().invocation_events(self))
 
 
 @strawberry.type
@@ -265,6 +276,8 @@ class EventSearchQuery:
     payload_contains: Optional[str] = None
     event_type: Optional[str] = None
     filters: Optional[strawberry.scalars.JSON] = None
+    query: Optional[str] = None
+    rank: bool = False
     first: int = 20
     after: Optional[str] = None
 
@@ -612,15 +625,15 @@ class Query:
         Supports:
         - ``contractId`` — filter by contract address
         - ``eventType`` — filter by event type
-        - ``payloadContains`` — case-insensitive substring in JSON payload text
+        - ``payloadContains`` — JSON object (containment) or case-insensitive substring
         - ``filters`` — dict mapping dot-notation field paths to comparison objects
           Supported operators per field: eq, neq, gte, lte, gt, lt, contains,
           startswith, in
+        - ``query`` — case-insensitive substring match on the payload text
+        - ``rank`` — full-text match on ``query`` ordered by ``relevanceScore``;
+          returns the best ``first`` hits and ignores ``after``
         - Cursor-based pagination via ``first`` / ``after``
         """
-        from django.db.models import TextField
-        from django.db.models.functions import Cast
-
         qs = ContractEvent.objects.select_related("contract").all()
 
         if query.contract_id:
@@ -629,44 +642,37 @@ class Query:
             qs = qs.filter(event_type=query.event_type)
 
         if query.payload_contains:
-            qs = qs.annotate(_pt=Cast("payload", output_field=TextField())).filter(
-                _pt__icontains=query.payload_contains
-            )
+            qs = filter_payload_contains(qs, query.payload_contains)
 
         if query.filters and isinstance(query.filters, dict):
             for field_path, ops in query.filters.items():
                 if not isinstance(ops, dict):
                     continue
-                orm_base = "payload__" + field_path.replace(".", "__")
                 for op, val in ops.items():
                     if val is None:
                         continue
-                    if op == "eq":
-                        qs = qs.filter(**{orm_base: val})
-                    elif op == "neq":
-                        qs = qs.exclude(**{orm_base: val})
-                    elif op in ("gte", "lte", "gt", "lt"):
-                        qs = qs.filter(**{f"{orm_base}__{op}": val})
-                    elif op == "contains":
-                        qs = qs.filter(**{f"{orm_base}__icontains": val})
-                    elif op == "startswith":
-                        qs = qs.filter(**{f"{orm_base}__istartswith": val})
-                    elif op in ("in", "in_list"):
-                        values = val if isinstance(val, list) else [val]
-                        qs = qs.filter(**{f"{orm_base}__in": values})
-
-        # Cursor pagination (max 1000 per page)
-        first = max(0, min(query.first, 1000))
-        if query.after:
-            try:
-                decoded = base64.b64decode(query.after).decode()
-                after_id = int(decoded.split(":", 1)[1])
-                qs = qs.filter(id__gt=after_id)
-            except (ValueError, IndexError, UnicodeDecodeError):
-                pass
+                    op = "in" if op == "in_list" else op
+                    if op in SEARCH_OPS:
+                        qs = filter_payload_field(qs, field_path, op, val)
 
-        qs = qs.order_by("id")
-        items = list(qs[:first])
+        first = max(0, min(query.first, 1000))
+        text = (query.query or "").strip()
+        if query.rank:
+            if not text:
+                raise ValueError("rank requires query")
+            items = list(search_ranked(qs, text)[:first])
+        else:
+            if text:
+                qs = search_text(qs, text)
+            # Cursor pagination (max 1000 per page)
+            if query.after:
+                try:
+                    decoded = base64.b64decode(query.after).decode()
+                    after_id = int(decoded.split(":", 1)[1])
+                    qs = qs.filter(id__gt=after_id)
+                except (ValueError, IndexError, UnicodeDecodeError):
+                    pass
+            items = list(qs.order_by("id")[:first])
 
         return [
             EventSearchResult(
@@ -677,7 +683,7 @@ class Query:
                 ledger=e.ledger,
                 timestamp=e.timestamp,
                 tx_hash=e.tx_hash,
-                relevance_score=1.0,
+                relevance_score=float(getattr(e, "relevance_score", 1.0)),
             )
             for e in items
         ]
@@ -773,8 +779,13 @@ class Query:
         timezone: str = "UTC",
         limit_groups: int = 500,
         include_events: bool = True,
+        events_per_group: int = 100,
     ) -> EventTimelineResult:
-        """Return grouped timeline data for contract event history."""
+        """
+        Return grouped timeline data for contract event history.
+
+        Each group lists at most ``events_per_group`` of its newest events.
+        """
         bucket_seconds = BUCKET_SECONDS_BY_SIZE[bucket_size]
         timeline = build_timeline(
             contract_id=contract_id,
@@ -785,6 +796,7 @@ class Query:
             timezone_name=timezone,
             limit_groups=limit_groups,
             include_events=include_events,
+            events_per_group=events_per_group,
         )
 
         groups = [
@@ -1169,55 +1181,71 @@ class Subscription:
     @strawberry.subscription
     @log_graphql_resolver
     async def contract_events(
-        self, info: Info, contract_id: str
+        self, info: Info, contract_id: str, event_types: Optional[List[str]] = None
     ) -> AsyncGenerator[EventType, None]:
         """
         Subscribe to real-time events for a specific contract.
-        
+
         Args:
             contract_id: The contract ID to subscribe to
-            
+            event_types: Only push events of these types (all types when omitted)
+
         Yields:
-            EventType: Real-time contract events as they occur
+            EventType: Real-time contract events as they occur, built from the
+            envelope carried by the channel message without touching the database
         """
+        import asyncio
+
         from channels.db import database_sync_to_async
-        
+
         channel_layer = get_channel_layer()
         if not channel_layer:
             # If no channel layer, exit gracefully
             return
-            
+
         channel_name = await channel_layer.new_channel()
         group_name = f"events_{contract_id}"
-        
         await channel_layer.group_add(group_name, channel_name)
-        
-        try:
+
+        wanted = event_type_filter(event_types)
+        queue = SubscriberQueue(
+            subscription_queue_size(), subscription_overflow_policy(), key=message_event_type
+        )
+
+        async def read_channel():
             while True:
                 message = await channel_layer.receive(channel_name)
-                event_data = message.get("data", {})
-                
-                # Create EventType from the message data
-                try:
-                    # Fetch the actual event from database to get proper EventType instance
-                    @database_sync_to_async
-                    def get_event():
-                        return ContractEvent.objects.select_related("contract").get(
-                            contract__contract_id=event_data.get("contract_id"),
-                            ledger=event_data.get("ledger"),
-                            event_index=event_data.get("event_index", 0)
-                        )
-                    
-                    event = await get_event()
-                    yield event
-                except ContractEvent.DoesNotExist:
-                    # If event not found, skip this message
-                    continue
-                except Exception:
-                    # Skip any other errors and continue listening
+                if wanted is None or wanted(message_event_type(message)):
+                    queue.put(message)
+
+        @database_sync_to_async
+        def get_event(event_data):
+            return ContractEvent.objects.select_related("contract").filter(
+                contract__contract_id=event_data.get("contract_id"),
+                ledger=event_data.get("ledger"),
+                event_index=event_data.get("event_index", 0),
+            ).first()
+
+        def reader_done(task):
+            # A failed receive must end the subscription, not leave it waiting.
+            if not task.cancelled() and task.exception() is not None:
+                queue.fail(task.exception())
+
+        reader = asyncio.ensure_future(read_channel())
+        reader.add_done_callback(reader_done)
+        try:
+            while True:
+                message = await queue.get()
+                envelope = message.get("event")
+                if envelope is not None:
+                    yield envelope_to_event(envelope)
                     continue
-                    
+                # Sent by a worker that predates envelopes: fall back to a lookup.
+                event = await get_event(message.get("data") or {})
+                if event is not None:
+                    yield event
         finally:
+            reader.cancel()
             await channel_layer.group_discard(group_name, channel_name)
 
 
@@ -1229,5 +1257,6 @@ schema = strawberry.Schema(
         GraphQLRateLimitExtension,
         GraphQLResolverLoggingExtension,
         N1QueryDetectorExtension,
+        DataLoaderExtension,
     ],
 )
@@ -0,0 +1,138 @@
+"""
+Compiled JSON Schema validators for event payload validation.
+
+``jsonschema.validate`` checks the schema and builds a new validator on every
+call, and the ingest path used to query ``EventSchema`` per event on top of
+that. Validators here are compiled once per (contract, event_type, version)
+and kept in-process; a per-contract version stamp in the Django cache is
+bumped whenever ``EventSchema`` rows change, so every worker reloads on its
+next lookup.
+"""
+import json
+from collections.abc import Sequence
+from threading import Lock
+from typing import Any
+
+import jsonschema
+from jsonschema.exceptions import best_match
+
+_CACHE_SIZE = 4096
+
+# contract pk → (version stamp, {event_type: latest (version, json_schema)})
+_latest_schemas: dict[int, tuple[str, dict[str, tuple[int, Any]]]] = {}
+# (contract pk, event_type, version) → compiled validator
+_event_validators: dict[tuple[int, str, int], Any] = {}
+# canonical JSON of a TrackedContract.json_schema → compiled validator
+_contract_validators: dict[str, Any] = {}
+_lock = Lock()
+
+
+def compile_validator(json_schema: Any):
+    """Check *json_schema* and return a ready-to-use ``Draft*Validator``.
+
+    The draft is picked from ``$schema`` (latest draft when absent), exactly
+    as ``jsonschema.validate`` does. Raises ``jsonschema.SchemaError`` if the
+    schema itself is invalid.
+    """
+    validator_cls = jsonschema.validators.validator_for(json_schema)
+    validator_cls.check_schema(json_schema)
+    return validator_cls(json_schema)
+
+
+def first_error(validator, payload: Any) -> jsonschema.ValidationError | None:
+    """Return the error ``jsonschema.validate`` would raise, or ``None``."""
+    if validator.is_valid(payload):
+        return None
+    return best_match(validator.iter_errors(payload))
+
+
+def _store(cache: dict, key, value) -> None:
+    with _lock:
+        if len(cache) >= _CACHE_SIZE:
+            cache.clear()
+        cache[key] = value
+
+
+def _latest_schemas_for(contract) -> dict[str, tuple[int, Any]]:
+    from .cache_utils import get_event_schema_version
+    from .models import EventSchema
+
+    version = get_event_schema_version(contract.pk)
+    entry = _latest_schemas.get(contract.pk)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+
+    schemas: dict[str, tuple[int, Any]] = {}
+    for event_type, schema_version, json_schema in (
+        EventSchema.objects.filter(contract_id=contract.pk)
+        .order_by("event_type", "-version")
+        .values_list("event_type", "version", "json_schema")
+    ):
+        schemas.setdefault(event_type, (schema_version, json_schema))
+
+    # A new stamp may mean a schema version was edited in place.
+    with _lock:
+        for key in [k for k in _event_validators if k[0] == contract.pk]:
+            del _event_validators[key]
+    _store(_latest_schemas, contract.pk, (version, schemas))
+    return schemas
+
+
+def get_event_validator(contract, event_type: str) -> tuple[int, Any] | None:
+    """Return ``(version, validator)`` for the latest schema of *event_type*.
+
+    Returns ``None`` when the contract has no schema for that event type.
+    """
+    latest = _latest_schemas_for(contract).get(event_type)
+    if latest is None:
+        return None
+    version, json_schema = latest
+    key = (contract.pk, event_type, version)
+    validator = _event_validators.get(key)
+    if validator is None:
+        validator = compile_validator(json_schema)
+        _store(_event_validators, key, validator)
+    return version, validator
+
+
+def get_contract_validator(contract):
+    """Return the validator for ``contract.json_schema``, or ``None`` if unset."""
+    json_schema = contract.json_schema
+    if json_schema in (None, {}):
+        return None
+    key = json.dumps(json_schema, sort_keys=True, default=str)
+    validator = _contract_validators.get(key)
+    if validator is None:
+        validator = compile_validator(json_schema)
+        _store(_contract_validators, key, validator)
+    return validator
+
+
+def validate_payloads(
+    contract,
+    event_type: str,
+    payloads: Sequence[Any],
+) -> list[tuple[bool, int | None]]:
+    """Validate many payloads of one event type against its latest schema.
+
+    Returns one ``(passed, version_used)`` per payload with the same meaning
+    as ``tasks.validate_event_payload``: non-dict payloads and event types
+    without a schema pass with ``version_used=None``.
+    """
+    entry = get_event_validator(contract, event_type)
+    results: list[tuple[bool, int | None]] = []
+    for payload in payloads:
+        if entry is None or payload is None or not isinstance(payload, dict):
+            results.append((True, None))
+            continue
+        version, validator = entry
+        results.append((validator.is_valid(payload), version))
+    return results
+
+
+def clear_validators() -> None:
+    """Drop every compiled validator held by this process."""
+    with _lock:
+        _latest_schemas.clear()
+        _event_validators.clear()
+        _contract_validators.clear()
@@ -567,6 +567,45 @@ class RecordEventRequestSerializer(serializers.Serializer):
     )
 
 
+class RestoreArchiveRequestSerializer(serializers.Serializer):
+    """
+    Which archived event batches to restore, and optionally which part of them.
+    Exactly one of ``batch_id``, ``batch_ids`` or ``policy_id`` is required.
+    """
+
+    batch_id = serializers.IntegerField(required=False, help_text="Single ArchivedEventBatch ID")
+    batch_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        allow_empty=False,
+        help_text="Several ArchivedEventBatch IDs",
+    )
+    policy_id = serializers.IntegerField(
+        required=False,
+        help_text="Restore every batch of this retention policy overlapping since/until",
+    )
+    since = serializers.DateTimeField(required=False, help_text="Restore events from this timestamp")
+    until = serializers.DateTimeField(required=False, help_text="Restore events up to this timestamp")
+    start_ledger = serializers.IntegerField(required=False, min_value=0)
+    end_ledger = serializers.IntegerField(required=False, min_value=0)
+
+    def validate(self, attrs):
+        targets = [name for name in ("batch_id", "batch_ids", "policy_id") if name in attrs]
+        if len(targets) != 1:
+            raise serializers.ValidationError(
+                "Provide exactly one of batch_id, batch_ids or policy_id."
+            )
+        if "since" in attrs and "until" in attrs and attrs["since"] > attrs["until"]:
+            raise serializers.ValidationError("since must be <= until.")
+        if (
+            "start_ledger" in attrs
+            and "end_ledger" in attrs
+            and attrs["start_ledger"] > attrs["end_ledger"]
+        ):
+            raise serializers.ValidationError("start_ledger must be <= end_ledger.")
+        return attrs
+
+
 class APIKeySerializer(serializers.ModelSerializer):
     """
     Serializer for APIKey model.
@@ -594,7 +633,7 @@ class APIKeySerializer(serializers.ModelSerializer):
 class EventSearchSerializer(serializers.ModelSerializer):
     """
     Read-only serializer for event search results.
-    Includes a ``relevance_score`` placeholder for future ranking support.
+    ``relevance_score`` comes from ranked search and is 1.0 otherwise.
     """
 
     contract_id = serializers.CharField(source="contract.contract_id", read_only=True)
@@ -623,8 +662,7 @@ class EventSearchSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
     def get_relevance_score(self, obj) -> float:
-        # Placeholder — set to 1.0 until full-text ranking is implemented.
-        return 1.0
+        return float(getattr(obj, "relevance_score", 1.0))
 
 
 class ContractSourceSerializer(serializers.ModelSerializer):
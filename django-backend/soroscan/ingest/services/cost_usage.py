@@ -0,0 +1,39 @@
+"""
+Days whose organization usage must be recounted.
+
+``aggregate_organization_costs`` normally recounts only the days since its
+previous run. Events can still arrive for older days (backfill, imports,
+archive restores), so every insert path records the earliest day it wrote
+to (``mark_dirty``) and the next run recounts from there (``pop_dirty``).
+"""
+from datetime import date, datetime
+
+from django.utils import timezone
+
+from ..models import IndexerState
+
+DIRTY_KEY = "org_costs:dirty_since"
+
+
+def mark_dirty(timestamp: datetime | date) -> None:
+    """
+    Record that an event dated *timestamp* (or on that day) was inserted.
+
+    The current day is recounted by every run, so it is ignored without a
+    query.
+    """
+    if not isinstance(timestamp, datetime):
+        day = timestamp
+    elif timezone.is_aware(timestamp):
+        day = timezone.localdate(timestamp)
+    else:
+        day = timestamp.date()
+    if day >= timezone.localdate():
+        return
+    IndexerState.keep_earliest(DIRTY_KEY, day)
+
+
+def pop_dirty() -> date | None:
+    """Return and clear the earliest day marked dirty, if any."""
+    value = IndexerState.pop(DIRTY_KEY)
+    return date.fromisoformat(value) if value is not None else None
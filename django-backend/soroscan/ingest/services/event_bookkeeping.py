@@ -0,0 +1,80 @@
+"""
+Coverage and cost-usage bookkeeping for events created one at a time.
+
+Bulk insert paths call ``record_ledgers`` and ``cost_usage.mark_dirty``
+themselves. Rows created through the ORM one by one are picked up by the
+``post_save`` receivers below, connected when ``IngestConfig.ready`` imports
+this module.
+
+Each ``record_ledgers`` call locks the event's ``TrackedContract`` row while
+it merges coverage, so paths that create many events wrap them in
+``defer_event_bookkeeping`` and pay for that once per page or window.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from ..models import ContractEvent
+from .cost_usage import mark_dirty
+from .ledger_coverage import record_ledgers
+
+
+@dataclass
+class _DeferredEventWrites:
+    ledgers: list[tuple[int, int]] = field(default_factory=list)
+    earliest: datetime | None = None
+
+
+_deferred_event_writes: ContextVar[_DeferredEventWrites | None] = ContextVar(
+    "deferred_event_writes", default=None
+)
+
+
+@contextmanager
+def defer_event_bookkeeping():
+    """
+    Batch the coverage and cost-usage writes of events created one at a time.
+
+    Inside the block the two receivers below only collect; on exit the
+    ledgers go to ``record_ledgers`` in one call and the earliest timestamp
+    to ``cost_usage.mark_dirty``.
+    """
+    deferred = _DeferredEventWrites()
+    token = _deferred_event_writes.set(deferred)
+    try:
+        yield
+    finally:
+        _deferred_event_writes.reset(token)
+        # Rows saved before an error are committed, so record them regardless.
+        record_ledgers(deferred.ledgers)
+        if deferred.earliest is not None:
+            mark_dirty(deferred.earliest)
+
+
+@receiver(post_save, sender=ContractEvent)
+def record_ledger_coverage_on_create(sender, instance, created=False, **kwargs):
+    """Add a singly created event's ledger to the coverage index (bulk paths call it directly)."""
+    if created:
+        deferred = _deferred_event_writes.get()
+        if deferred is not None:
+            deferred.ledgers.append((instance.contract_id, instance.ledger))
+            return
+        record_ledgers([(instance.contract_id, instance.ledger)])
+
+
+@receiver(post_save, sender=ContractEvent)
+def mark_usage_dirty_on_create(sender, instance, created=False, **kwargs):
+    """Have cost aggregation recount the day of a singly created event (bulk paths call it directly)."""
+    if created and instance.timestamp:
+        # The raw value is kept as given, e.g. an ISO string passed to create().
+        timestamp = ContractEvent._meta.get_field("timestamp").to_python(instance.timestamp)
+        deferred = _deferred_event_writes.get()
+        if deferred is not None:
+            if deferred.earliest is None or timestamp < deferred.earliest:
+                deferred.earliest = timestamp
+            return
+        mark_dirty(timestamp)
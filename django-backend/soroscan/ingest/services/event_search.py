@@ -0,0 +1,209 @@
+"""Indexed payload search for contract events.
+
+Free-text matching runs against ``ContractEvent.payload_text``, a stored
+generated column holding the lower-cased JSON text of the payload. On
+PostgreSQL it carries two GIN indexes (migration 0054):
+
+- a trigram index (``gin_trgm_ops``), which serves ``LIKE '%term%'``;
+- a ``to_tsvector('simple', payload_text)`` index, which serves the ranked
+  full-text mode and its ``ts_rank`` relevance scores.
+
+Field filters are rewritten into operators that the payload GIN index from
+migration 0009 understands. Equality and ``in`` become JSONB containment
+(``@>``). Ordering and substring comparisons become jsonpath existence
+checks (``@?``).
+
+Other backends (SQLite in tests and local development) get the same results
+through plain ORM lookups, so callers never branch on the database.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterable
+from typing import Any
+
+from django.db import connections
+from django.db.models import (
+    BooleanField,
+    F,
+    FloatField,
+    Func,
+    Q,
+    QuerySet,
+    Value,
+)
+from django.db.models.functions import Cast, Length, Replace
+
+SEARCH_OPS = ("eq", "neq", "gte", "lte", "gt", "lt", "contains", "startswith", "in")
+TRGM_INDEX_NAME = "ingest_event_payload_trgm"
+FTS_INDEX_NAME = "ingest_event_payload_fts"
+FTS_CONFIG = "simple"
+
+_JSONPATH_COMPARISONS = {"gte": ">=", "lte": "<=", "gt": ">", "lt": "<"}
+
+
+class _JSONPathExists(Func):
+    """``payload @? '<jsonpath>'`` — GIN-indexable on a jsonb column."""
+
+    template = "%(expressions)s"
+    arg_joiner = " @? "
+    output_field = BooleanField()
+
+    def __init__(self, column: str, path: str):
+        super().__init__(F(column), Func(Value(path), template="%(expressions)s::jsonpath"))
+
+
+def _is_postgres(queryset: QuerySet) -> bool:
+    return connections[queryset.db].vendor == "postgresql"
+
+
+def _segments(field_path: str) -> list[str]:
+    return [segment for segment in field_path.split(".") if segment]
+
+
+def _coerce(value: Any) -> Any:
+    """Read numbers, booleans and null out of query-string values."""
+    if not isinstance(value, str):
+        return value
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        return value
+    return parsed if parsed is None or isinstance(parsed, (bool, int, float)) else value
+
+
+def _candidates(value: Any) -> list[Any]:
+    """The raw value plus its coerced scalar, when they differ."""
+    coerced = _coerce(value)
+    return [value] if coerced is value else [value, coerced]
+
+
+def _jsonpath(segments: list[str]) -> str:
+    parts = ["$"]
+    for segment in segments:
+        parts.append(f"[{segment}]" if segment.isdigit() else "." + json.dumps(segment))
+    return "".join(parts)
+
+
+def _nest(segments: list[str], value: Any) -> Any:
+    for segment in reversed(segments):
+        value = {segment: value}
+    return value
+
+
+def _orm_path(segments: list[str]) -> str:
+    return "__".join(["payload", *segments])
+
+
+def _equals(queryset: QuerySet, segments: list[str], values: Iterable[Any]) -> Q:
+    match = Q()
+    for value in values:
+        for candidate in _candidates(value):
+            if not _is_postgres(queryset):
+                match |= Q(**{_orm_path(segments): candidate})
+            elif any(segment.isdigit() for segment in segments):
+                path = f"{_jsonpath(segments)} ? (@ == {json.dumps(candidate)})"
+                match |= Q(_JSONPathExists("payload", path))
+            else:
+                match |= Q(payload__contains=_nest(segments, candidate))
+    return match
+
+
+def _text_prefilter(queryset: QuerySet, value: str) -> QuerySet:
+    """Narrow with the trigram index when *value* appears verbatim in the JSON text."""
+    if json.dumps(value, ensure_ascii=False)[1:-1] != value:
+        return queryset
+    return queryset.filter(payload_text__contains=value.lower())
+
+
+def filter_payload_field(queryset: QuerySet, field_path: str, op: str, value: Any) -> QuerySet:
+    """Apply one ``payload_field``/``payload_op``/``payload_value`` comparison."""
+    if op not in SEARCH_OPS:
+        raise ValueError(f"Unsupported payload operator: {op}")
+    segments = _segments(field_path)
+    if not segments:
+        return queryset
+
+    if op in ("eq", "neq", "in"):
+        if op == "in":
+            values = value if isinstance(value, list) else str(value).split(",")
+            values = [v.strip() if isinstance(v, str) else v for v in values]
+        else:
+            values = [value]
+        match = _equals(queryset, segments, values)
+        return queryset.exclude(match) if op == "neq" else queryset.filter(match)
+
+    if not _is_postgres(queryset):
+        if op in _JSONPATH_COMPARISONS:
+            return queryset.filter(**{f"{_orm_path(segments)}__{op}": _coerce(value)})
+        lookup = "icontains" if op == "contains" else "istartswith"
+        return queryset.filter(**{f"{_orm_path(segments)}__{lookup}": value})
+
+    if op in _JSONPATH_COMPARISONS:
+        literal = json.dumps(_coerce(value))
+        predicate = f"@ {_JSONPATH_COMPARISONS[op]} {literal}"
+    else:
+        text = str(value)
+        pattern = re.escape(text) if op == "contains" else "^" + re.escape(text)
+        predicate = f"@ like_regex {json.dumps(pattern)} flag \"i\""
+        queryset = _text_prefilter(queryset, text)
+    return queryset.filter(_JSONPathExists("payload", f"{_jsonpath(segments)} ? ({predicate})"))
+
+
+def filter_payload_contains(queryset: QuerySet, value: str) -> QuerySet:
+    """JSON objects match by containment (``@>``); anything else is a substring."""
+    try:
+        document = json.loads(value)
+    except ValueError:
+        document = None
+    if not isinstance(document, dict) or not document:
+        return search_text(queryset, value)
+    if _is_postgres(queryset):
+        return queryset.filter(payload__contains=document)
+
+    def _leaves(node, path):
+        for key, child in node.items():
+            if isinstance(child, dict) and child:
+                yield from _leaves(child, [*path, key])
+            else:
+                yield [*path, key], child
+
+    for segments, leaf in _leaves(document, []):
+        queryset = queryset.filter(**{_orm_path(segments): leaf})
+    return queryset
+
+
+def search_text(queryset: QuerySet, text: str) -> QuerySet:
+    """Case-insensitive substring match, served by the trigram index."""
+    return queryset.filter(payload_text__contains=text.lower())
+
+
+def search_ranked(queryset: QuerySet, text: str) -> QuerySet:
+    """Full-text match annotated with ``relevance_score`` and ordered by it.
+
+    PostgreSQL matches words through the tsvector index and scores with
+    ``ts_rank``. Elsewhere the score is the number of substring hits.
+    """
+    if _is_postgres(queryset):
+        from django.contrib.postgres.search import (  # noqa: PLC0415
+            SearchQuery,
+            SearchRank,
+            SearchVector,
+        )
+
+        vector = SearchVector("payload_text", config=FTS_CONFIG)
+        query = SearchQuery(text, config=FTS_CONFIG, search_type="websearch")
+        queryset = queryset.annotate(_search=vector).filter(_search=query).annotate(
+            relevance_score=SearchRank(vector, query)
+        )
+    else:
+        needle = text.lower()
+        hits = (
+            Length("payload_text") - Length(Replace("payload_text", Value(needle), Value("")))
+        ) / len(needle)
+        queryset = search_text(queryset, text).annotate(
+            relevance_score=Cast(hits, output_field=FloatField())
+        )
+    return queryset.order_by("-relevance_score", "-timestamp", "-id")
@@ -1,18 +1,33 @@
 """
 Streaming export/import service for ContractEvent data.
 
-Supports Parquet, CSV, JSON, and Avro formats with idempotent import
+Supports Parquet, CSV, JSON, NDJSON and Avro formats with idempotent import
 (deduplication via the unique_contract_ledger_event_index constraint).
+Imports stream their input and, on PostgreSQL, load each batch with COPY.
 """
 
 import csv
+import hashlib
+import io
+import itertools
 import json
 import logging
+import os
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import IO, Iterator
 
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max, Min, TextField
+from django.db.models.functions import Cast
+
 from soroscan.ingest.cache_utils import invalidate_event_count_cache
-from soroscan.ingest.models import ContractEvent, TrackedContract
+from soroscan.ingest.event_counters import record_events
+from soroscan.ingest.models import ContractEvent, IndexerState, TrackedContract
+from soroscan.ingest.services.cost_usage import mark_dirty as mark_usage_dirty
+from soroscan.ingest.services.ledger_coverage import record_ledgers
 
 logger = logging.getLogger(__name__)
 
@@ -35,49 +50,42 @@ EXPORT_FIELDS = [
 ]
 
 CHUNK_SIZE = 500  # rows per DB query batch
+IMPORT_STAGING_TABLE = "soroscan_import_staging"
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-
-def _event_to_dict(event: ContractEvent) -> dict:
-    return {
-        "contract_id": event.contract.contract_id,
-        "event_type": event.event_type,
-        "schema_version": event.schema_version,
-        "validation_status": event.validation_status,
-        "payload": json.dumps(event.payload),
-        "payload_hash": event.payload_hash,
-        "ledger": event.ledger,
-        "event_index": event.event_index,
-        "timestamp": event.timestamp.isoformat(),
-        "tx_hash": event.tx_hash,
-        "raw_xdr": event.raw_xdr,
-        "decoded_payload": (
-            json.dumps(event.decoded_payload)
-            if event.decoded_payload is not None
-            else None
-        ),
-        "decoding_status": event.decoding_status,
-        "signature_status": event.signature_status,
-    }
+# Database columns read for EXPORT_FIELDS[1:] (contract_id is constant per
+# export). JSON columns are cast to text in the database, so rows are never
+# decoded and re-encoded in Python.
+_ROW_COLUMNS = [
+    "event_type",
+    "schema_version",
+    "validation_status",
+    "payload_json",
+    "payload_hash",
+    "ledger",
+    "event_index",
+    "timestamp",
+    "tx_hash",
+    "raw_xdr",
+    "decoded_payload_json",
+    "decoding_status",
+    "signature_status",
+]
+_TIMESTAMP = EXPORT_FIELDS.index("timestamp")
 
 
-def _iter_events(
+def _filtered_events(
     contract_id: str,
     start_ledger: int | None,
     end_ledger: int | None,
     start_date: datetime | None = None,
     end_date: datetime | None = None,
-) -> Iterator[ContractEvent]:
-    """Yield events in (ledger, event_index) order using pk-based pagination to avoid loading all rows."""
-    qs = (
-        ContractEvent.objects.filter(contract__contract_id=contract_id)
-        .select_related("contract")
-        .order_by("ledger", "event_index", "pk")
-    )
+):
+    qs = ContractEvent.objects.filter(contract__contract_id=contract_id)
     if start_ledger is not None:
         qs = qs.filter(ledger__gte=start_ledger)
     if end_ledger is not None:
@@ -86,15 +94,52 @@ def _iter_events(
         qs = qs.filter(timestamp__gte=start_date)
     if end_date is not None:
         qs = qs.filter(timestamp__lte=end_date)
+    return qs
 
-    last_pk = 0
-    while True:
-        chunk = list(qs.filter(pk__gt=last_pk)[:CHUNK_SIZE])
-        if not chunk:
-            break
-        for event in chunk:
-            yield event
-        last_pk = chunk[-1].pk
+
+def _event_rows(
+    contract_id: str,
+    start_ledger: int | None,
+    end_ledger: int | None,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    batch_size: int = CHUNK_SIZE,
+) -> Iterator[tuple]:
+    """
+    Yield export rows as tuples in ``EXPORT_FIELDS`` order, sorted by
+    ``(ledger, event_index)``.
+
+    Only the exported columns are selected, and on PostgreSQL ``iterator()``
+    streams them through a named server-side cursor *batch_size* rows at a time.
+    """
+    qs = (
+        _filtered_events(contract_id, start_ledger, end_ledger, start_date, end_date)
+        .annotate(
+            payload_json=Cast("payload", output_field=TextField()),
+            decoded_payload_json=Cast("decoded_payload", output_field=TextField()),
+        )
+        .order_by("ledger", "event_index", "pk")
+        .values_list(*_ROW_COLUMNS)
+    )
+    for row in qs.iterator(chunk_size=batch_size):
+        yield (contract_id, *row)
+
+
+def _iter_events(
+    contract_id: str,
+    start_ledger: int | None,
+    end_ledger: int | None,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    batch_size: int = CHUNK_SIZE,
+) -> Iterator[dict]:
+    """Yield export rows as ``EXPORT_FIELDS`` dicts with ISO-8601 timestamps."""
+    for row in _event_rows(
+        contract_id, start_ledger, end_ledger, start_date, end_date, batch_size
+    ):
+        record = dict(zip(EXPORT_FIELDS, row))
+        record["timestamp"] = row[_TIMESTAMP].isoformat()
+        yield record
 
 
 def _count_events(
@@ -104,16 +149,9 @@ def _count_events(
     start_date: datetime | None = None,
     end_date: datetime | None = None,
 ) -> int:
-    qs = ContractEvent.objects.filter(contract__contract_id=contract_id)
-    if start_ledger is not None:
-        qs = qs.filter(ledger__gte=start_ledger)
-    if end_ledger is not None:
-        qs = qs.filter(ledger__lte=end_ledger)
-    if start_date is not None:
-        qs = qs.filter(timestamp__gte=start_date)
-    if end_date is not None:
-        qs = qs.filter(timestamp__lte=end_date)
-    return qs.count()
+    return _filtered_events(
+        contract_id, start_ledger, end_ledger, start_date, end_date
+    ).count()
 
 
 # ---------------------------------------------------------------------------
@@ -128,16 +166,17 @@ def export_json(
     end_ledger=None,
     start_date: datetime | None = None,
     end_date: datetime | None = None,
+    batch_size: int = CHUNK_SIZE,
 ) -> int:
     """Stream events as a JSON array to *out*. Returns event count."""
     out.write("[\n")
     count = 0
-    for event in _iter_events(
-        contract_id, start_ledger, end_ledger, start_date, end_date
+    for record in _iter_events(
+        contract_id, start_ledger, end_ledger, start_date, end_date, batch_size
     ):
         if count > 0:
             out.write(",\n")
-        out.write(json.dumps(_event_to_dict(event)))
+        out.write(json.dumps(record))
         count += 1
     out.write("\n]\n")
     return count
@@ -150,35 +189,22 @@ def export_csv(
     end_ledger=None,
     start_date: datetime | None = None,
     end_date: datetime | None = None,
+    batch_size: int = CHUNK_SIZE,
 ) -> int:
     """Stream events as CSV to *out*. Returns event count."""
     writer = csv.DictWriter(out, fieldnames=EXPORT_FIELDS, lineterminator="\n")
     writer.writeheader()
     count = 0
-    for event in _iter_events(
-        contract_id, start_ledger, end_ledger, start_date, end_date
+    for record in _iter_events(
+        contract_id, start_ledger, end_ledger, start_date, end_date, batch_size
     ):
-        writer.writerow(_event_to_dict(event))
+        writer.writerow(record)
         count += 1
     return count
 
 
-def export_parquet(
-    contract_id: str,
-    path: str,
-    start_ledger=None,
-    end_ledger=None,
-    start_date: datetime | None = None,
-    end_date: datetime | None = None,
-) -> int:
-    """Write events to a Parquet file at *path*. Returns event count."""
-    try:
-        import pyarrow as pa
-        import pyarrow.parquet as pq
-    except ImportError:
-        raise ImportError("pyarrow is required for Parquet export: pip install pyarrow")
-
-    schema = pa.schema(
+def _arrow_schema(pa):
+    return pa.schema(
         [
             pa.field("contract_id", pa.string()),
             pa.field("event_type", pa.string()),
@@ -197,29 +223,81 @@ def export_parquet(
         ]
     )
 
-    writer = pq.ParquetWriter(path, schema)
-    count = 0
-    batch: list[dict] = []
 
-    def _flush(rows):
-        arrays = {f: [r[f] for r in rows] for f in EXPORT_FIELDS}
-        table = pa.table(arrays, schema=schema)
-        writer.write_table(table)
+def export_parquet(
+    contract_id: str,
+    path: str,
+    start_ledger=None,
+    end_ledger=None,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    batch_size: int = CHUNK_SIZE,
+    compression: str | None = None,
+    row_group_size: int | None = None,
+) -> int:
+    """
+    Write events to a Parquet file at *path*. Returns event count.
+
+    Each row group is built as one Arrow record batch straight from the
+    cursor's row tuples, fetched *batch_size* at a time. *compression* and
+    *row_group_size* default to ``EXPORT_PARQUET_COMPRESSION`` and
+    ``EXPORT_PARQUET_ROW_GROUP_SIZE``.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("pyarrow is required for Parquet export: pip install pyarrow")
 
-    for event in _iter_events(
-        contract_id, start_ledger, end_ledger, start_date, end_date
-    ):
-        batch.append(_event_to_dict(event))
-        count += 1
-        if len(batch) >= CHUNK_SIZE:
-            _flush(batch)
-            batch = []
+    compression = compression or getattr(settings, "EXPORT_PARQUET_COMPRESSION", "zstd")
+    row_group_size = max(
+        1, row_group_size or getattr(settings, "EXPORT_PARQUET_ROW_GROUP_SIZE", 100_000)
+    )
+    schema = _arrow_schema(pa)
+    rows = _event_rows(
+        contract_id,
+        start_ledger,
+        end_ledger,
+        start_date,
+        end_date,
+        batch_size,
+    )
+    count = 0
+    with pq.ParquetWriter(path, schema, compression=compression) as writer:
+        while batch := list(itertools.islice(rows, row_group_size)):
+            columns = [list(column) for column in zip(*batch)]
+            columns[_TIMESTAMP] = [value.isoformat() for value in columns[_TIMESTAMP]]
+            writer.write_batch(
+                pa.RecordBatch.from_arrays(
+                    [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                    schema=schema,
+                ),
+                row_group_size=row_group_size,
+            )
+            count += len(batch)
+    return count
 
-    if batch:
-        _flush(batch)
 
-    writer.close()
-    return count
+AVRO_SCHEMA = {
+    "type": "record",
+    "name": "ContractEvent",
+    "fields": [
+        {"name": "contract_id", "type": "string"},
+        {"name": "event_type", "type": "string"},
+        {"name": "schema_version", "type": ["null", "long"], "default": None},
+        {"name": "validation_status", "type": "string"},
+        {"name": "payload", "type": "string"},
+        {"name": "payload_hash", "type": "string"},
+        {"name": "ledger", "type": "long"},
+        {"name": "event_index", "type": "int"},
+        {"name": "timestamp", "type": "string"},
+        {"name": "tx_hash", "type": "string"},
+        {"name": "raw_xdr", "type": "string"},
+        {"name": "decoded_payload", "type": ["null", "string"], "default": None},
+        {"name": "decoding_status", "type": "string"},
+        {"name": "signature_status", "type": "string"},
+    ],
+}
 
 
 def export_avro(
@@ -229,55 +307,140 @@ def export_avro(
     end_ledger=None,
     start_date: datetime | None = None,
     end_date: datetime | None = None,
+    batch_size: int = CHUNK_SIZE,
+    codec: str = "deflate",
 ) -> int:
-    """Write events to an Avro file at *path*. Returns event count."""
+    """Stream events into a single Avro container file at *path*. Returns event count."""
     try:
         import fastavro
     except ImportError:
         raise ImportError("fastavro is required for Avro export: pip install fastavro")
 
-    avro_schema = {
-        "type": "record",
-        "name": "ContractEvent",
-        "fields": [
-            {"name": "contract_id", "type": "string"},
-            {"name": "event_type", "type": "string"},
-            {"name": "schema_version", "type": ["null", "long"], "default": None},
-            {"name": "validation_status", "type": "string"},
-            {"name": "payload", "type": "string"},
-            {"name": "payload_hash", "type": "string"},
-            {"name": "ledger", "type": "long"},
-            {"name": "event_index", "type": "int"},
-            {"name": "timestamp", "type": "string"},
-            {"name": "tx_hash", "type": "string"},
-            {"name": "raw_xdr", "type": "string"},
-            {"name": "decoded_payload", "type": ["null", "string"], "default": None},
-            {"name": "decoding_status", "type": "string"},
-            {"name": "signature_status", "type": "string"},
-        ],
-    }
-    parsed_schema = fastavro.parse_schema(avro_schema)
-
     count = 0
-    records = []
-    for event in _iter_events(
-        contract_id, start_ledger, end_ledger, start_date, end_date
-    ):
-        records.append(_event_to_dict(event))
-        count += 1
-        if len(records) >= CHUNK_SIZE:
-            with open(path, "ab") as f:
-                fastavro.writer(f, parsed_schema, records)
-            records = []
 
-    if records:
-        mode = "ab" if count > len(records) else "wb"
-        with open(path, mode) as f:
-            fastavro.writer(f, parsed_schema, records)
+    def _records():
+        nonlocal count
+        for record in _iter_events(
+            contract_id, start_ledger, end_ledger, start_date, end_date, batch_size
+        ):
+            count += 1
+            yield record
 
+    with open(path, "wb") as f:
+        fastavro.writer(f, fastavro.parse_schema(AVRO_SCHEMA), _records(), codec=codec)
     return count
 
 
+EXPORT_EXTENSIONS = {"json": ".json", "csv": ".csv", "parquet": ".parquet", "avro": ".avro"}
+
+
+def export_to_path(
+    fmt: str,
+    contract_id: str,
+    path: str,
+    start_ledger=None,
+    end_ledger=None,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    **options,
+) -> int:
+    """
+    Export in *fmt* to the file at *path*. *options* may carry ``batch_size``
+    for every format, plus ``compression`` and ``row_group_size`` for Parquet.
+    """
+    filters = (start_ledger, end_ledger, start_date, end_date)
+    batch_size = options.pop("batch_size", CHUNK_SIZE)
+    if fmt == "json":
+        with open(path, "w", encoding="utf-8") as f:
+            return export_json(contract_id, f, *filters, batch_size)
+    if fmt == "csv":
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            return export_csv(contract_id, f, *filters, batch_size)
+    if fmt == "parquet":
+        return export_parquet(contract_id, path, *filters, batch_size, **options)
+    if fmt == "avro":
+        return export_avro(contract_id, path, *filters, batch_size)
+    raise ValueError(f"Unknown format: {fmt}")
+
+
+def ledger_shards(first: int, last: int, shards: int) -> list[tuple[int, int]]:
+    """Split ``[first, last]`` into at most *shards* contiguous, non-empty ledger ranges."""
+    shards = max(1, min(shards, last - first + 1))
+    step = -(-(last - first + 1) // shards)
+    return [
+        (start, min(start + step - 1, last)) for start in range(first, last + 1, step)
+    ]
+
+
+def export_sharded(
+    fmt: str,
+    contract_id: str,
+    directory: str,
+    shards: int,
+    workers: int = 1,
+    start_ledger=None,
+    end_ledger=None,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    **options,
+) -> dict:
+    """
+    Export into *directory* as one file per ledger-range shard, written by up
+    to *workers* threads, plus ``manifest.json`` describing the files.
+
+    Returns the manifest.
+    """
+    bounds = _filtered_events(
+        contract_id, start_ledger, end_ledger, start_date, end_date
+    ).aggregate(first=Min("ledger"), last=Max("ledger"))
+    ranges = (
+        ledger_shards(bounds["first"], bounds["last"], shards)
+        if bounds["first"] is not None
+        else []
+    )
+    os.makedirs(directory, exist_ok=True)
+
+    def _export(shard):
+        index, (first, last) = shard
+        name = f"part-{index:05d}{EXPORT_EXTENSIONS[fmt]}"
+        path = os.path.join(directory, name)
+        try:
+            events = export_to_path(
+                fmt, contract_id, path, first, last, start_date, end_date, **options
+            )
+        finally:
+            if workers > 1:
+                connection.close()
+        return {
+            "path": name,
+            "start_ledger": first,
+            "end_ledger": last,
+            "events": events,
+            "bytes": os.path.getsize(path),
+        }
+
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            files = list(pool.map(_export, enumerate(ranges)))
+    else:
+        files = [_export(shard) for shard in enumerate(ranges)]
+
+    manifest = {
+        "contract_id": contract_id,
+        "format": fmt,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "start_ledger": bounds["first"],
+        "end_ledger": bounds["last"],
+        "start_date": start_date.isoformat() if start_date else None,
+        "end_date": end_date.isoformat() if end_date else None,
+        "events": sum(entry["events"] for entry in files),
+        "files": files,
+    }
+    with open(os.path.join(directory, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
 # ---------------------------------------------------------------------------
 # Import
 # ---------------------------------------------------------------------------
@@ -290,6 +453,18 @@ class ImportResult:
         self.errors = 0
         self.error_details: list[str] = []
 
+    @property
+    def rows(self) -> int:
+        """Input rows consumed so far."""
+        return self.imported + self.skipped + self.errors
+
+    def merge(self, other: "ImportResult") -> "ImportResult":
+        self.imported += other.imported
+        self.skipped += other.skipped
+        self.errors += other.errors
+        self.error_details.extend(other.error_details)
+        return self
+
 
 def _parse_dt(val: str) -> datetime:
     """Parse ISO-8601 datetime string; make timezone-aware (UTC) if naive."""
@@ -322,13 +497,15 @@ def _row_to_event(row: dict, contracts: dict[str, TrackedContract]) -> ContractE
     def _parse_int(val):
         return int(val) if val not in (None, "") else None
 
+    payload = _parse_json(row["payload"])
     return ContractEvent(
         contract=contract,
         event_type=row["event_type"],
         schema_version=_parse_int(row.get("schema_version")),
         validation_status=row.get("validation_status", "passed"),
-        payload=_parse_json(row["payload"]),
-        payload_hash=row.get("payload_hash", ""),
+        payload=payload,
+        payload_hash=row.get("payload_hash") or ContractEvent.hash_payload(payload),
+        payload_size=ContractEvent.measure_payload(payload),
         ledger=int(row["ledger"]),
         event_index=int(row.get("event_index", 0)),
         timestamp=_parse_dt(row["timestamp"]),
@@ -340,6 +517,109 @@ def _row_to_event(row: dict, contracts: dict[str, TrackedContract]) -> ContractE
     )
 
 
+# Columns written by COPY; ``id`` comes from the sequence and ``payload_text``
+# is generated.
+COPY_COLUMNS = [
+    "contract_id",
+    "event_type",
+    "schema_version",
+    "validation_status",
+    "payload",
+    "payload_hash",
+    "payload_size",
+    "ledger",
+    "event_index",
+    "timestamp",
+    "tx_hash",
+    "raw_xdr",
+    "decoded_payload",
+    "decoding_status",
+    "signature_status",
+]
+_JSON_COLUMNS = {"payload", "decoded_payload"}
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_value(column: str, value) -> str:
+    """Encode *value* as a field of PostgreSQL's COPY text format."""
+    if value is None:
+        return "\\N"
+    if column in _JSON_COLUMNS:
+        value = json.dumps(value)
+    elif isinstance(value, datetime):
+        value = value.isoformat()
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def _copy_insert(events: list[ContractEvent]) -> list[tuple[int, int, int]]:
+    """
+    COPY *events* into a temporary staging table, then move them into the
+    events table with ``ON CONFLICT DO NOTHING RETURNING``, so the rows that
+    were actually inserted are known exactly. Rows whose ``(contract, ledger,
+    event_index)`` already exists, or repeats within the batch, are skipped
+    whatever their timestamp, since the partitioned unique key also includes
+    ``timestamp``. The existence check is deliberately not bounded by the
+    batch's timestamps: files and archives written before ingest stored ledger
+    close times carry later, indexing-time timestamps than the rows they
+    duplicate. Must run inside a transaction holding
+    ``ContractEvent.lock_for_insert``.
+    """
+    table = ContractEvent._meta.db_table
+    columns = ", ".join(f'"{column}"' for column in COPY_COLUMNS)
+    buffer = io.StringIO()
+    for event in events:
+        buffer.write("\t".join(_copy_value(column, getattr(event, column)) for column in COPY_COLUMNS))
+        buffer.write("\n")
+    buffer.seek(0)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TEMP TABLE "{IMPORT_STAGING_TABLE}" AS '
+            f'SELECT {columns} FROM "{table}" WITH NO DATA'
+        )
+        cursor.copy_expert(f'COPY "{IMPORT_STAGING_TABLE}" ({columns}) FROM STDIN', buffer)
+        cursor.execute(
+            f'INSERT INTO "{table}" ({columns}) '
+            f"SELECT DISTINCT ON (contract_id, ledger, event_index) {columns} "
+            f'FROM "{IMPORT_STAGING_TABLE}" s '
+            f'WHERE NOT EXISTS (SELECT 1 FROM "{table}" e WHERE e.contract_id = s.contract_id '
+            "AND e.ledger = s.ledger AND e.event_index = s.event_index) "
+            "ORDER BY contract_id, ledger, event_index "
+            "ON CONFLICT DO NOTHING RETURNING contract_id, ledger, event_index"
+        )
+        inserted = cursor.fetchall()
+        cursor.execute(f'DROP TABLE "{IMPORT_STAGING_TABLE}"')
+    return inserted
+
+
+def _bulk_insert(events: list[ContractEvent]) -> list[tuple[int, int, int]]:
+    """Portable fallback: skip keys that already exist, then ``bulk_create`` the rest."""
+    unique: dict[tuple[int, int, int], ContractEvent] = {}
+    for event in events:
+        unique.setdefault((event.contract_id, event.ledger, event.event_index), event)
+    existing = set(
+        ContractEvent.objects.filter(
+            contract_id__in={key[0] for key in unique},
+            ledger__gte=min(key[1] for key in unique),
+            ledger__lte=max(key[1] for key in unique),
+        ).values_list("contract_id", "ledger", "event_index")
+    )
+    new = {key: event for key, event in unique.items() if key not in existing}
+    ContractEvent.objects.bulk_create(new.values(), ignore_conflicts=True)
+    return list(new)
+
+
+def _insert_events(events: list[ContractEvent]) -> list[tuple[int, int, int]]:
+    """
+    Insert *events*, ignoring duplicates; returns ``(contract_pk, ledger,
+    event_index)`` of the new rows.
+    """
+    with transaction.atomic():
+        ContractEvent.lock_for_insert({event.contract_id for event in events})
+        if connection.vendor == "postgresql":
+            return _copy_insert(events)
+        return _bulk_insert(events)
+
+
 def _import_batch(
     batch: list[dict], contracts: dict, result: ImportResult, dry_run: bool
 ):
@@ -357,89 +637,170 @@ def _import_batch(
             result.imported += len(events)
         return
 
-    # Use ignore_conflicts for idempotent import (unique_contract_ledger_event_index).
-    # bulk_create with ignore_conflicts=True on PostgreSQL returns all objects with PKs
-    # set (both inserted and skipped), so we can't use len(created) to count inserts.
-    # Instead, snapshot the count before and after to get the true insert count.
-    contract_pks = {e.contract_id for e in events}
-    before = ContractEvent.objects.filter(contract_id__in=contract_pks).count()
-    ContractEvent.objects.bulk_create(events, ignore_conflicts=True)
-    after = ContractEvent.objects.filter(contract_id__in=contract_pks).count()
+    # Idempotent import: rows colliding with unique_contract_ledger_event_index
+    # are skipped, and only the rows really inserted are counted.
+    inserted = set(_insert_events(events))
+    new_events = [
+        event
+        for event in events
+        if (event.contract_id, event.ledger, event.event_index) in inserted
+    ]
+    record_ledgers({(event.contract_id, event.ledger) for event in new_events})
+    if new_events:
+        mark_usage_dirty(min(event.timestamp for event in new_events))
+    # Keep the hourly counters in step, as the ingest paths do.
+    record_events(
+        (event.contract_id, event.event_type, event.timestamp) for event in new_events
+    )
 
     # Invalidate event count cache for affected contracts
-    for contract_id in contract_pks:
+    for contract_id in {contract_pk for contract_pk, _, _ in inserted}:
         invalidate_event_count_cache(contract_id)
 
-    actually_inserted = after - before
-    result.imported += actually_inserted
-    result.skipped += len(events) - actually_inserted
+    result.imported += len(inserted)
+    result.skipped += len(events) - len(inserted)
 
 
-def import_json(src: IO, result: ImportResult, dry_run: bool = False) -> ImportResult:
-    data = json.load(src)
-    if not isinstance(data, list):
-        raise ValueError("JSON import expects a top-level array")
-    contracts: dict[str, TrackedContract] = {}
-    batch = []
-    for row in data:
-        batch.append(row)
-        if len(batch) >= CHUNK_SIZE:
-            _import_batch(batch, contracts, result, dry_run)
-            batch = []
-    if batch:
-        _import_batch(batch, contracts, result, dry_run)
-    return result
+def checkpoint_key(path: str) -> str:
+    """``IndexerState`` key holding the resume position of an import of *path*."""
+    digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:32]
+    return f"import:{digest}"
 
 
-def import_csv(src: IO, result: ImportResult, dry_run: bool = False) -> ImportResult:
-    reader = csv.DictReader(src)
+def import_rows(
+    rows: Iterable[dict],
+    result: ImportResult,
+    dry_run: bool = False,
+    checkpoint: str | None = None,
+) -> ImportResult:
+    """
+    Import *rows* in ``IMPORT_BATCH_SIZE`` batches, each in its own transaction.
+
+    With a *checkpoint* key, the number of rows consumed is saved in
+    ``IndexerState`` together with each batch; a later run with the same key
+    skips them, and the checkpoint is cleared once the input is exhausted.
+    """
+    batch_size = max(1, int(getattr(settings, "IMPORT_BATCH_SIZE", 5000)))
     contracts: dict[str, TrackedContract] = {}
-    batch = []
-    for row in reader:
-        batch.append(dict(row))
-        if len(batch) >= CHUNK_SIZE:
+    done = 0
+    if checkpoint and not dry_run:
+        state = IndexerState.objects.filter(key=checkpoint).first()
+        done = int(state.value) if state else 0
+    rows = iter(rows)
+    for _ in itertools.islice(rows, done):
+        pass
+    while batch := list(itertools.islice(rows, batch_size)):
+        if dry_run:
+            _import_batch(batch, contracts, result, dry_run)
+            continue
+        with transaction.atomic():
             _import_batch(batch, contracts, result, dry_run)
-            batch = []
-    if batch:
-        _import_batch(batch, contracts, result, dry_run)
+            done += len(batch)
+            if checkpoint:
+                IndexerState.objects.update_or_create(key=checkpoint, defaults={"value": str(done)})
+    if checkpoint and not dry_run:
+        IndexerState.objects.filter(key=checkpoint).delete()
     return result
 
 
+def iter_json_array(src: IO, chunk_size: int = 1 << 16) -> Iterator[dict]:
+    """Yield the elements of a top-level JSON array without loading the whole document."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    started = False
+    eof = False
+    while True:
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if position >= len(buffer) and not eof:
+            chunk = src.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        if not started:
+            if buffer[position:position + 1] != "[":
+                raise ValueError("JSON import expects a top-level array")
+            started = True
+            position += 1
+            continue
+        if position >= len(buffer):
+            raise ValueError("JSON import: unterminated array")
+        if buffer[position] == "]":
+            return
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = src.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        if end == len(buffer) and not eof:
+            # A number may continue in the next chunk; decode it again with more input.
+            chunk = src.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        position = end
+        yield value
+
+
+def iter_ndjson(src: IO) -> Iterator[dict]:
+    """Yield one object per non-blank line of newline-delimited JSON."""
+    for line in src:
+        if line.strip():
+            yield json.loads(line)
+
+
+def import_json(
+    src: IO, result: ImportResult, dry_run: bool = False, checkpoint: str | None = None
+) -> ImportResult:
+    return import_rows(iter_json_array(src), result, dry_run, checkpoint)
+
+
+def import_ndjson(
+    src: IO, result: ImportResult, dry_run: bool = False, checkpoint: str | None = None
+) -> ImportResult:
+    return import_rows(iter_ndjson(src), result, dry_run, checkpoint)
+
+
+def import_csv(
+    src: IO, result: ImportResult, dry_run: bool = False, checkpoint: str | None = None
+) -> ImportResult:
+    return import_rows(csv.DictReader(src), result, dry_run, checkpoint)
+
+
 def import_parquet(
-    path: str, result: ImportResult, dry_run: bool = False
+    path: str, result: ImportResult, dry_run: bool = False, checkpoint: str | None = None
 ) -> ImportResult:
     try:
         import pyarrow.parquet as pq
     except ImportError:
         raise ImportError("pyarrow is required for Parquet import: pip install pyarrow")
 
-    contracts: dict[str, TrackedContract] = {}
-    pf = pq.ParquetFile(path)
-    for batch in pf.iter_batches(batch_size=CHUNK_SIZE):
-        rows = batch.to_pydict()
-        n = len(next(iter(rows.values())))
-        dicts = [
-            {k: (rows[k][i] if rows[k][i] is not None else None) for k in rows}
-            for i in range(n)
-        ]
-        _import_batch(dicts, contracts, result, dry_run)
-    return result
+    def _rows():
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=CHUNK_SIZE):
+            yield from batch.to_pylist()
+
+    return import_rows(_rows(), result, dry_run, checkpoint)
 
 
-def import_avro(path: str, result: ImportResult, dry_run: bool = False) -> ImportResult:
+def import_avro(
+    path: str, result: ImportResult, dry_run: bool = False, checkpoint: str | None = None
+) -> ImportResult:
     try:
         import fastavro
     except ImportError:
         raise ImportError("fastavro is required for Avro import: pip install fastavro")
 
-    contracts: dict[str, TrackedContract] = {}
-    batch: list[dict] = []
-    with open(path, "rb") as src:
-        for record in fastavro.reader(src):
-            batch.append(dict(record))
-            if len(batch) >= CHUNK_SIZE:
-                _import_batch(batch, contracts, result, dry_run)
-                batch = []
-    if batch:
-        _import_batch(batch, contracts, result, dry_run)
-    return result
+    def _rows():
+        with open(path, "rb") as src:
+            for record in fastavro.reader(src):
+                yield dict(record)
+
+    return import_rows(_rows(), result, dry_run, checkpoint)
@@ -0,0 +1,182 @@
+"""
+Per-contract ledger coverage index.
+
+``LedgerCoverage`` stores, for each contract, the runs of consecutive
+ledgers in which it has indexed events. Ingest and backfill merge the
+ledgers of each batch into the runs they touch, so the index stays current
+without rescanning ``ContractEvent``; completeness and gap lists are then
+computed from the runs alone, in O(number of gaps). Migration 0058 seeded
+the runs of events stored before the index existed.
+
+Coverage records what has been indexed. Deleting events (retention,
+archival, pruning) does not shrink it; ``rebuild_ledger_coverage``
+recomputes it from the events table when that is wanted.
+"""
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from django.db import connections, transaction
+from django.db.models import BigIntegerField, ExpressionWrapper, F, QuerySet, Window
+from django.db.models.functions import DenseRank
+
+from ..models import ContractEvent, LedgerCoverage, TrackedContract
+
+Run = tuple[int, int]
+
+
+def merge_runs(runs: Iterable[Run]) -> list[Run]:
+    """Sort *runs* and merge the ones that overlap or touch."""
+    merged: list[list[int]] = []
+    for start, end in sorted(runs):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def ledger_runs(ledgers: Iterable[int]) -> list[Run]:
+    """Compress ledger numbers into sorted runs of consecutive ledgers."""
+    return merge_runs((ledger, ledger) for ledger in set(ledgers))
+
+
+def record_ledgers(rows: Iterable[tuple[int, int]]) -> None:
+    """
+    Merge newly indexed ``(contract_pk, ledger)`` pairs into the coverage index.
+
+    Only the runs that overlap or touch a batch's ledger span are read and
+    rewritten. Merges for one contract are serialised by locking its
+    ``TrackedContract`` row, so concurrent workers cannot leave overlapping runs.
+    """
+    by_contract: dict[int, set[int]] = defaultdict(set)
+    for contract_pk, ledger in rows:
+        if ledger is not None:
+            by_contract[contract_pk].add(ledger)
+    for contract_pk, ledgers in by_contract.items():
+        _merge_contract(contract_pk, ledger_runs(ledgers))
+
+
+def _merge_contract(contract_pk: int, runs: Sequence[Run]) -> None:
+    with transaction.atomic():
+        list(TrackedContract.objects.select_for_update().filter(pk=contract_pk).values("pk"))
+        existing = list(
+            LedgerCoverage.objects.filter(
+                contract_id=contract_pk,
+                start_ledger__lte=runs[-1][1] + 1,
+                end_ledger__gte=runs[0][0] - 1,
+            ).values_list("pk", "start_ledger", "end_ledger")
+        )
+        current = {(start, end): pk for pk, start, end in existing}
+        merged = merge_runs([*runs, *current])
+        stale = [pk for run, pk in current.items() if run not in merged]
+        if stale:
+            LedgerCoverage.objects.filter(pk__in=stale).delete()
+        LedgerCoverage.objects.bulk_create(
+            LedgerCoverage(contract_id=contract_pk, start_ledger=start, end_ledger=end)
+            for start, end in merged
+            if (start, end) not in current
+        )
+
+
+def runs_from_events(queryset: QuerySet) -> list[Run]:
+    """
+    Ledger runs of the events in *queryset*, computed in the database.
+
+    Uses the gaps-and-islands trick: ``ledger - dense_rank()`` is constant
+    within a run, so grouping by it yields one row per run.
+    """
+    ranked = (
+        queryset.order_by()
+        .annotate(
+            run=ExpressionWrapper(
+                F("ledger") - Window(DenseRank(), order_by=F("ledger").asc()),
+                output_field=BigIntegerField(),
+            )
+        )
+        .values("ledger", "run")
+    )
+    sql, params = ranked.query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(
+            f"SELECT MIN(ledger), MAX(ledger) FROM ({sql}) ranked GROUP BY run ORDER BY 1",
+            params,
+        )
+        return [(start, end) for start, end in cursor.fetchall()]
+
+
+def rebuild_coverage(contract: TrackedContract) -> int:
+    """Replace *contract*'s coverage with the runs of its stored events."""
+    runs = runs_from_events(ContractEvent.objects.filter(contract=contract))
+    with transaction.atomic():
+        list(TrackedContract.objects.select_for_update().filter(pk=contract.pk).values("pk"))
+        LedgerCoverage.objects.filter(contract=contract).delete()
+        LedgerCoverage.objects.bulk_create(
+            LedgerCoverage(contract=contract, start_ledger=start, end_ledger=end)
+            for start, end in runs
+        )
+    return len(runs)
+
+
+def coverage_runs(contract_pks: Iterable[int]) -> dict[int, list[Run]]:
+    """Stored runs for several contracts in one query, each list sorted."""
+    runs: dict[int, list[Run]] = defaultdict(list)
+    for contract_pk, start, end in (
+        LedgerCoverage.objects.filter(contract_id__in=list(contract_pks))
+        .order_by("contract_id", "start_ledger")
+        .values_list("contract_id", "start_ledger", "end_ledger")
+    ):
+        runs[contract_pk].append((start, end))
+    return runs
+
+
+def summarize_runs(runs: Sequence[Run]) -> dict[str, Any]:
+    """Range, observed and missing ledger counts and gaps for sorted, merged *runs*."""
+    if not runs:
+        return {
+            "min_ledger": None,
+            "max_ledger": None,
+            "observed_ledgers": 0,
+            "expected_ledgers": 0,
+            "missing_ledgers": 0,
+            "gaps": [],
+        }
+    observed = sum(end - start + 1 for start, end in runs)
+    expected = runs[-1][1] - runs[0][0] + 1
+    return {
+        "min_ledger": runs[0][0],
+        "max_ledger": runs[-1][1],
+        "observed_ledgers": observed,
+        "expected_ledgers": expected,
+        "missing_ledgers": expected - observed,
+        "gaps": [
+            {"from_ledger": previous[1] + 1, "to_ledger": current[0] - 1}
+            for previous, current in zip(runs, runs[1:])
+        ],
+    }
+
+
+def completeness_from_runs(contract: TrackedContract, runs: Sequence[Run]) -> dict[str, Any]:
+    summary = summarize_runs(runs)
+    expected = summary["expected_ledgers"]
+    percentage = 100.0 if expected == 0 else summary["observed_ledgers"] / expected * 100.0
+    return {
+        "contract_id": contract.contract_id,
+        "completeness_percentage": round(percentage, 4),
+        "observed_ledgers": summary["observed_ledgers"],
+        "expected_ledgers": expected,
+        "missing_ledgers": summary["missing_ledgers"],
+        "gaps": summary["gaps"],
+    }
+
+
+def contract_completeness(contract: TrackedContract) -> dict[str, Any]:
+    """Completeness summary of one contract, read from its coverage runs."""
+    return contracts_completeness([contract])[0]
+
+
+def contracts_completeness(contracts: Iterable[TrackedContract]) -> list[dict[str, Any]]:
+    """``contract_completeness`` for many contracts with a single query."""
+    contracts = list(contracts)
+    runs = coverage_runs(contract.pk for contract in contracts)
+    return [completeness_from_runs(contract, runs.get(contract.pk, [])) for contract in contracts]
@@ -5,9 +5,18 @@ from __future__ import annotations
 from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
-from typing import Iterable, Sequence
+from typing import Sequence
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
+from django.db.models import Count, F, Window
+from django.db.models.functions import (
+    ExtractHour,
+    ExtractMinute,
+    ExtractSecond,
+    Floor,
+    RowNumber,
+    TruncDay,
+)
 from django.utils import timezone
 
 from soroscan.ingest.models import ContractEvent
@@ -16,6 +25,8 @@ from soroscan.ingest.models import ContractEvent
 MAX_GROUP_LIMIT = 1000
 DEFAULT_GROUP_LIMIT = 500
 DEFAULT_WINDOW_HOURS = 24
+MAX_EVENTS_PER_GROUP = 1000
+DEFAULT_EVENTS_PER_GROUP = 100
 
 
 @dataclass(frozen=True, slots=True)
@@ -48,15 +59,6 @@ class TimelineResult:
     groups: list[TimelineGroup]
 
 
-@dataclass(slots=True)
-class _MutableGroup:
-    start: datetime
-    end: datetime
-    event_count: int = 0
-    event_type_counts: dict[str, int] = field(default_factory=dict)
-    events: list[ContractEvent] = field(default_factory=list)
-
-
 def resolve_tz(timezone_name: str) -> ZoneInfo:
     """Resolve an IANA timezone name into a ZoneInfo object."""
 
@@ -89,6 +91,14 @@ def clamp_group_limit(limit_groups: int) -> int:
     return min(limit_groups, MAX_GROUP_LIMIT)
 
 
+def clamp_events_per_group(events_per_group: int) -> int:
+    """Clamp the number of events returned per timeline group."""
+
+    if events_per_group <= 0:
+        return 1
+    return min(events_per_group, MAX_EVENTS_PER_GROUP)
+
+
 def build_timeline(
     *,
     contract_id: str,
@@ -99,8 +109,15 @@ def build_timeline(
     timezone_name: str,
     limit_groups: int = DEFAULT_GROUP_LIMIT,
     include_events: bool = False,
+    events_per_group: int = DEFAULT_EVENTS_PER_GROUP,
 ) -> TimelineResult:
-    """Build grouped timeline data for a contract."""
+    """
+    Build grouped timeline data for a contract.
+
+    Buckets and per-type counts come from one aggregate query; events are
+    only loaded when ``include_events`` is set, and then at most
+    ``events_per_group`` of the newest per retained group.
+    """
 
     if bucket_seconds <= 0:
         raise ValueError("bucket_seconds must be greater than 0")
@@ -109,84 +126,129 @@ def build_timeline(
     normalized_since, normalized_until = normalize_time_window(since=since, until=until)
     bounded_group_limit = clamp_group_limit(limit_groups)
 
-    queryset = (
-        ContractEvent.objects.filter(
-            contract__contract_id=contract_id,
-            timestamp__gte=normalized_since,
-            timestamp__lte=normalized_until,
-        )
-        .select_related("contract")
-        .order_by("-timestamp", "-event_index")
+    queryset = ContractEvent.objects.filter(
+        contract__contract_id=contract_id,
+        timestamp__gte=normalized_since,
+        timestamp__lte=normalized_until,
     )
 
     if event_types:
         queryset = queryset.filter(event_type__in=event_types)
 
-    events = list(queryset)
-    grouped = _group_events(
-        events=events,
-        bucket_seconds=bucket_seconds,
-        selected_timezone=selected_timezone,
-        include_events=include_events,
-    )
+    day, slot = _bucket_expressions(bucket_seconds, selected_timezone)
+    grouped: dict[tuple[datetime, int], dict[str, int]] = defaultdict(dict)
+    total_events = 0
+    for row in (
+        queryset.annotate(bucket_day=day, bucket_slot=slot)
+        .values("bucket_day", "bucket_slot", "event_type")
+        .annotate(count=Count("id"))
+        .order_by()
+    ):
+        key = (row["bucket_day"], int(row["bucket_slot"]))
+        grouped[key][row["event_type"]] = row["count"]
+        total_events += row["count"]
+
+    retained = sorted(
+        (
+            (_slot_start(key[0], key[1], bucket_seconds, selected_timezone), key)
+            for key in grouped
+        ),
+        reverse=True,
+    )[:bounded_group_limit]
+
+    events_by_key: dict[tuple[datetime, int], list[ContractEvent]] = defaultdict(list)
+    if include_events and retained:
+        events_by_key = _top_events(
+            queryset.filter(timestamp__gte=retained[-1][0]),
+            day,
+            slot,
+            clamp_events_per_group(events_per_group),
+            {key for _, key in retained},
+        )
 
     groups = [
         TimelineGroup(
-            start=item.start,
-            end=item.end,
-            event_count=item.event_count,
-            event_type_counts=_sorted_type_counts(item.event_type_counts),
-            events=item.events if include_events else [],
+            start=start,
+            end=start + timedelta(seconds=bucket_seconds),
+            event_count=sum(grouped[key].values()),
+            event_type_counts=_sorted_type_counts(grouped[key]),
+            events=events_by_key.get(key, []),
         )
-        for item in grouped[:bounded_group_limit]
+        for start, key in retained
     ]
 
     return TimelineResult(
         contract_id=contract_id,
         since=normalized_since,
         until=normalized_until,
-        total_events=len(events),
+        total_events=total_events,
         groups=groups,
     )
 
 
-def _group_events(
-    *,
-    events: Iterable[ContractEvent],
-    bucket_seconds: int,
-    selected_timezone: ZoneInfo,
-    include_events: bool,
-) -> list[_MutableGroup]:
-    grouped: dict[datetime, _MutableGroup] = {}
-
-    for event in events:
-        bucket_start = floor_bucket_start(
-            timestamp=event.timestamp,
-            bucket_seconds=bucket_seconds,
-            selected_timezone=selected_timezone,
-        )
-        current_group = grouped.get(bucket_start)
-        if current_group is None:
-            current_group = _MutableGroup(
-                start=bucket_start,
-                end=bucket_start + timedelta(seconds=bucket_seconds),
-                event_type_counts=defaultdict(int),
-            )
-            grouped[bucket_start] = current_group
+def _bucket_expressions(bucket_seconds: int, selected_timezone: ZoneInfo):
+    """
+    SQL expressions for the local day and the bucket slot within it.
+
+    Mirrors :func:`floor_bucket_start`: buckets are anchored at local
+    midnight, so a bucket start is ``day + slot * bucket_seconds``.
+    """
+
+    day = TruncDay("timestamp", tzinfo=selected_timezone)
+    seconds_since_midnight = (
+        ExtractHour("timestamp", tzinfo=selected_timezone) * 3600
+        + ExtractMinute("timestamp", tzinfo=selected_timezone) * 60
+        + ExtractSecond("timestamp", tzinfo=selected_timezone)
+    )
+    return day, Floor(seconds_since_midnight / bucket_seconds)
 
-        current_group.event_count += 1
-        current_group.event_type_counts[event.event_type] += 1
 
-        if include_events:
-            current_group.events.append(event)
+def _slot_start(
+    day: datetime,
+    slot: int,
+    bucket_seconds: int,
+    selected_timezone: ZoneInfo,
+) -> datetime:
+    floored_since_midnight = slot * bucket_seconds
+    return day.astimezone(selected_timezone).replace(
+        hour=floored_since_midnight // 3600,
+        minute=(floored_since_midnight % 3600) // 60,
+        second=floored_since_midnight % 60,
+        microsecond=0,
+    )
 
-    groups = sorted(grouped.values(), key=lambda item: item.start, reverse=True)
 
-    if include_events:
-        for group in groups:
-            group.events.sort(key=lambda event: (event.timestamp, event.event_index), reverse=True)
+def _top_events(
+    queryset,
+    day,
+    slot,
+    events_per_group: int,
+    keys: set[tuple[datetime, int]],
+) -> dict[tuple[datetime, int], list[ContractEvent]]:
+    """Newest ``events_per_group`` events of each bucket, ranked with a window function."""
+
+    partition = [day, slot]
+    ranked = (
+        queryset.annotate(
+            bucket_day=day,
+            bucket_slot=slot,
+            bucket_rank=Window(
+                RowNumber(),
+                partition_by=partition,
+                order_by=[F("timestamp").desc(), F("event_index").desc()],
+            ),
+        )
+        .filter(bucket_rank__lte=events_per_group)
+        .select_related("contract")
+        .order_by("-timestamp", "-event_index")
+    )
 
-    return groups
+    events: dict[tuple[datetime, int], list[ContractEvent]] = defaultdict(list)
+    for event in ranked:
+        key = (event.bucket_day, int(event.bucket_slot))
+        if key in keys:
+            events[key].append(event)
+    return events
 
 
 def floor_bucket_start(
@@ -8,8 +8,27 @@ from django.contrib.auth.signals import user_logged_in, user_login_failed
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from .cache_utils import invalidate_cached_contract
-from .models import TrackedContract, Organization
+from .cache_utils import (
+    bump_abi_plan_version,
+    bump_event_routes_version,
+    bump_event_schema_version,
+    invalidate_cached_contract,
+)
+from .models import (
+    AlertRule,
+    ContractABI,
+    ContractABIVersion,
+    EventSchema,
+    Organization,
+    TrackedContract,
+    WebhookSubscription,
+)
+
+# WebhookSubscription fields the event router does not depend on; saves that
+# only touch these (delivery bookkeeping) keep the routing tables valid.
+_NON_ROUTING_WEBHOOK_FIELDS = frozenset(
+    {"last_triggered", "failure_count", "updated_at"}
+)
 
 logger = logging.getLogger("soroscan.security_audit")
 
@@ -46,10 +65,40 @@ def on_user_login_failed(sender, credentials, request, **kwargs):
 
 
 @receiver([post_save, post_delete], sender=TrackedContract)
-def invalidate_contract_on_update(sender, instance, **kwargs):
+def invalidate_contract_on_update(sender, instance, created=True, **kwargs):
     """Invalidate the Redis cache for a TrackedContract when it is modified or deleted."""
     if instance.contract_id:
         invalidate_cached_contract(instance.contract_id)
+    # Compiled per-contract state only needs resetting when a contract row
+    # appears or disappears (ids can be reused); routine saves such as the
+    # ingest cursor update must not force every worker to recompile.
+    if created:
+        if instance.pk:
+            bump_abi_plan_version(instance.pk)
+            bump_event_schema_version(instance.pk)
+        bump_event_routes_version()
+
+
+@receiver([post_save, post_delete], sender=ContractABI)
+@receiver([post_save, post_delete], sender=ContractABIVersion)
+def invalidate_compiled_abi_on_change(sender, instance, **kwargs):
+    """Make workers recompile a contract's decoder plan after its ABI changes."""
+    bump_abi_plan_version(instance.contract_id)
+
+
+@receiver([post_save, post_delete], sender=EventSchema)
+def invalidate_event_validators_on_change(sender, instance, **kwargs):
+    """Make workers reload a contract's compiled payload validators after a schema change."""
+    bump_event_schema_version(instance.contract_id)
+
+
+@receiver([post_save, post_delete], sender=WebhookSubscription)
+@receiver([post_save, post_delete], sender=AlertRule)
+def invalidate_event_routes_on_change(sender, instance, update_fields=None, **kwargs):
+    """Make workers rebuild their webhook/alert routing tables."""
+    if update_fields and set(update_fields) <= _NON_ROUTING_WEBHOOK_FIELDS:
+        return
+    bump_event_routes_version()
 
 
 @receiver([post_save, post_delete], sender=Organization)
@@ -4,11 +4,14 @@ Stellar/Soroban client for interacting with the SoroScan contract.
 import logging
 import time
 import requests  # noqa: F401
-from dataclasses import dataclass
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from threading import Lock
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
 from django.conf import settings
+from django.core.cache import cache
 from stellar_sdk import Keypair, TransactionBuilder
 from stellar_sdk.soroban_server import SorobanServer
 
@@ -25,6 +28,24 @@ from stellar_sdk.xdr import (
 
 logger = logging.getLogger(__name__)
 
+# Events requested per getEvents call; the RPC caps this at 10,000.
+EVENTS_PAGE_LIMIT = 200
+
+_invocation_pool: ThreadPoolExecutor | None = None
+_invocation_pool_lock = Lock()
+
+
+def _get_invocation_pool() -> ThreadPoolExecutor:
+    """Return the process-wide pool used for concurrent get_transaction calls."""
+    global _invocation_pool
+    with _invocation_pool_lock:
+        if _invocation_pool is None:
+            _invocation_pool = ThreadPoolExecutor(
+                max_workers=getattr(settings, "INVOCATION_FETCH_WORKERS", 8),
+                thread_name_prefix="invocation-fetch",
+            )
+        return _invocation_pool
+
 
 @dataclass
 class TransactionResult:
@@ -66,20 +87,123 @@ class RateLimiter:
         self.last_update = time.time()
         self.lock = Lock()
 
-    def acquire(self):
-        """Block until a token is available."""
+    def reserve(self) -> float:
+        """
+        Take one token and return how many seconds the caller must wait
+        before using it.
+
+        The bucket may go negative, so concurrent callers queue up behind
+        each other without holding the lock while they wait.
+        """
         with self.lock:
             now = time.time()
             elapsed = now - self.last_update
             self.tokens = min(self.rate, self.tokens + elapsed * self.rate)
             self.last_update = now
+            self.tokens -= 1
+            return max(0.0, -self.tokens / self.rate)
 
-            if self.tokens < 1:
-                sleep_time = (1 - self.tokens) / self.rate
-                time.sleep(sleep_time)
-                self.tokens = 0
-            else:
-                self.tokens -= 1
+    def acquire(self):
+        """Block until a token is available."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+class InvocationCache:
+    """
+    Process-wide LRU + TTL cache of ``InvocationData`` keyed by tx hash.
+
+    The in-process tier is an ``OrderedDict`` so lookups, inserts and
+    evictions are O(1). When ``use_shared_cache`` is set, misses fall through
+    to the Django cache (Redis in production), so workers share lookups.
+    Hits, misses and evictions are exported through ``ingest.metrics``.
+    """
+
+    def __init__(self, max_size: int = 1000, ttl: int = 300, use_shared_cache: bool = True):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.use_shared_cache = use_shared_cache
+        self._entries: OrderedDict[str, tuple[InvocationData, float]] = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def _shared_key(tx_hash: str) -> str:
+        return f"invocation:{tx_hash}"
+
+    def get(self, tx_hash: str) -> Optional[InvocationData]:
+        from soroscan.ingest import metrics  # noqa: PLC0415
+
+        with self._lock:
+            entry = self._entries.get(tx_hash)
+            if entry is not None:
+                data, expires_at = entry
+                if time.monotonic() < expires_at:
+                    self._entries.move_to_end(tx_hash)
+                    metrics.cache_hits_total.labels(cache_type="invocation").inc()
+                    return data
+                del self._entries[tx_hash]
+        metrics.cache_misses_total.labels(cache_type="invocation").inc()
+
+        if not self.use_shared_cache:
+            return None
+        try:
+            stored = cache.get(self._shared_key(tx_hash))
+        except Exception:
+            logger.warning("Shared invocation cache read failed", exc_info=True)
+            stored = None
+        if stored is None:
+            metrics.cache_misses_total.labels(cache_type="invocation_shared").inc()
+            return None
+        metrics.cache_hits_total.labels(cache_type="invocation_shared").inc()
+        data = InvocationData(**stored)
+        self._put_local(tx_hash, data)
+        return data
+
+    def set(self, tx_hash: str, data: InvocationData) -> None:
+        self._put_local(tx_hash, data)
+        if self.use_shared_cache:
+            try:
+                cache.set(self._shared_key(tx_hash), asdict(data), timeout=self.ttl)
+            except Exception:
+                logger.warning("Shared invocation cache write failed", exc_info=True)
+
+    def _put_local(self, tx_hash: str, data: InvocationData) -> None:
+        from soroscan.ingest import metrics  # noqa: PLC0415
+
+        evicted = 0
+        with self._lock:
+            self._entries[tx_hash] = (data, time.monotonic() + self.ttl)
+            self._entries.move_to_end(tx_hash)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                evicted += 1
+        if evicted:
+            metrics.cache_evictions_total.labels(cache_type="invocation").inc(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_invocation_cache: InvocationCache | None = None
+_invocation_cache_lock = Lock()
+
+
+def get_invocation_cache() -> InvocationCache:
+    """Return the invocation cache shared by every SorobanClient in this process."""
+    global _invocation_cache
+    with _invocation_cache_lock:
+        if _invocation_cache is None:
+            _invocation_cache = InvocationCache(
+                max_size=getattr(settings, "INVOCATION_CACHE_MAX_SIZE", 10_000),
+                ttl=getattr(settings, "INVOCATION_CACHE_TTL", 300),
+                use_shared_cache=getattr(settings, "INVOCATION_CACHE_SHARED", True),
+            )
+        return _invocation_cache
 
 
 class SorobanClient:
@@ -104,9 +228,7 @@ class SorobanClient:
 
         # Invocation tracking infrastructure
         self._rate_limiter = RateLimiter(rate=10)
-        self._invocation_cache = {}  # tx_hash -> (InvocationData, timestamp)
-        self._cache_ttl = 300  # 5 minutes
-        self._cache_max_size = 1000
+        self._invocation_cache = get_invocation_cache()
 
     def _address_to_sc_val(self, address: str) -> SCVal:
         """Convert a Stellar address string to SCVal."""
@@ -279,20 +401,23 @@ class SorobanClient:
             logger.exception("Failed to get total events")
             return None
 
-    def get_events_range(
+    def iter_events_range(
         self,
         contract_id: str,
         start_ledger: int,
         end_ledger: int,
-    ) -> list[Any]:
+        page_size: int = EVENTS_PAGE_LIMIT,
+    ) -> Iterator[list[Any]]:
         """
-        Fetch contract events in an inclusive ledger range.
+        Yield pages of contract events for an inclusive ledger range.
 
-        The caller is responsible for pagination strategy; this method fetches the
-        requested range and returns raw SDK event objects.
+        Follows the RPC pagination cursor until an empty page, an exhausted
+        cursor or an event past *end_ledger* is seen, so busy ranges are not
+        truncated at the first page. A short page is not the end: the RPC
+        may stop scanning before the page is full and still return a cursor.
         """
         if start_ledger > end_ledger:
-            return []
+            return
 
         filters = [
             {
@@ -300,55 +425,87 @@ class SorobanClient:
                 "contractIds": [contract_id],
             }
         ]
-        pagination = {"limit": 200}
+        cursor = None
 
-        try:
-            response = execute_with_circuit_breaker(
-                "soroban_rpc",
-                self.server.get_events,
-                start_ledger=start_ledger,
-                end_ledger=end_ledger,
-                filters=filters,
-                pagination=pagination,
-            )
-        except TypeError:
-            # Some SDK variants do not support end_ledger.
-            response = execute_with_circuit_breaker(
-                "soroban_rpc",
-                self.server.get_events,
-                start_ledger=start_ledger,
-                filters=filters,
-                pagination=pagination,
+        while True:
+            if cursor is None:
+                # RPC treats endLedger as exclusive.
+                query = {"start_ledger": start_ledger, "end_ledger": end_ledger + 1}
+            else:
+                query = {"cursor": cursor}
+
+            try:
+                response = execute_with_circuit_breaker(
+                    "soroban_rpc",
+                    self.server.get_events,
+                    filters=filters,
+                    limit=page_size,
+                    **query,
+                )
+            except TypeError:
+                # Some SDK variants do not support end_ledger.
+                query.pop("end_ledger", None)
+                response = execute_with_circuit_breaker(
+                    "soroban_rpc",
+                    self.server.get_events,
+                    filters=filters,
+                    limit=page_size,
+                    **query,
+                )
+
+            events = list(getattr(response, "events", []) or [])
+            page = [
+                event
+                for event in events
+                if start_ledger <= int(getattr(event, "ledger", start_ledger)) <= end_ledger
+            ]
+            if page:
+                yield page
+
+            # Events later than end_ledger mean the range is exhausted; a page
+            # ending exactly on it may continue with that ledger's other events.
+            if not events or int(getattr(events[-1], "ledger", start_ledger)) > end_ledger:
+                return
+
+            next_cursor = getattr(response, "cursor", None) or getattr(
+                events[-1], "paging_token", None
             )
+            if not next_cursor or next_cursor == cursor:
+                logger.warning(
+                    "RPC cursor did not advance for contract=%s ledgers=%s-%s; "
+                    "stopping pagination",
+                    contract_id,
+                    start_ledger,
+                    end_ledger,
+                    extra={"contract_id": contract_id},
+                )
+                return
+            cursor = next_cursor
 
-        events = list(getattr(response, "events", []) or [])
-        return [
-            event
-            for event in events
-            if start_ledger <= int(getattr(event, "ledger", start_ledger)) <= end_ledger
-        ]
+    def get_events_range(
+        self,
+        contract_id: str,
+        start_ledger: int,
+        end_ledger: int,
+    ) -> list[Any]:
+        """
+        Fetch all contract events in an inclusive ledger range.
+
+        Every RPC page is fetched; see :meth:`iter_events_range` to consume
+        pages as they arrive.
+        """
+        events: list[Any] = []
+        for page in self.iter_events_range(contract_id, start_ledger, end_ledger):
+            events.extend(page)
+        return events
 
     def _get_from_cache(self, tx_hash: str) -> Optional[InvocationData]:
-        """Check cache for unexpired entry."""
-        if tx_hash in self._invocation_cache:
-            data, timestamp = self._invocation_cache[tx_hash]
-            if time.time() - timestamp < self._cache_ttl:
-                return data
-            else:
-                del self._invocation_cache[tx_hash]
-        return None
+        """Check the shared invocation cache for an unexpired entry."""
+        return self._invocation_cache.get(tx_hash)
 
     def _add_to_cache(self, tx_hash: str, data: InvocationData):
-        """Add entry to cache with LRU eviction."""
-        if len(self._invocation_cache) >= self._cache_max_size:
-            # Evict oldest entry
-            oldest_key = min(
-                self._invocation_cache.keys(),
-                key=lambda k: self._invocation_cache[k][1],
-            )
-            del self._invocation_cache[oldest_key]
-
-        self._invocation_cache[tx_hash] = (data, time.time())
+        """Add an entry to the shared invocation cache."""
+        self._invocation_cache.set(tx_hash, data)
 
     def _parse_transaction_response(self, tx_response) -> InvocationData:
         """
@@ -426,7 +583,7 @@ class SorobanClient:
         Fetch invocation details for a transaction.
 
         Implements:
-        - LRU caching with 5-minute TTL
+        - Shared LRU + TTL caching (see :class:`InvocationCache`)
         - Rate limiting at 10 req/s
         - XDR parsing for caller, contract, function, params, result
 
@@ -440,7 +597,10 @@ class SorobanClient:
         cached = self._get_from_cache(tx_hash)
         if cached:
             return cached
+        return self._fetch_invocation(tx_hash)
 
+    def _fetch_invocation(self, tx_hash: str) -> InvocationData:
+        """Fetch and parse a transaction from RPC, caching the result (no cache lookup)."""
         # Rate limit
         self._rate_limiter.acquire()
 
@@ -485,6 +645,34 @@ class SorobanClient:
                 error=str(e),
             )
 
+    def get_invocations(self, tx_hashes) -> dict[str, InvocationData]:
+        """
+        Fetch invocation details for many transactions concurrently.
+
+        Hashes are de-duplicated, cache hits are served directly and the
+        remaining ``get_transaction`` calls run on a shared thread pool. Each
+        call still takes a rate-limiter token, but waiting for one only
+        delays that call rather than the whole batch.
+
+        Returns a mapping of tx hash to InvocationData.
+        """
+        results: dict[str, InvocationData] = {}
+        missing: list[str] = []
+        for tx_hash in dict.fromkeys(h for h in tx_hashes if h):
+            cached = self._get_from_cache(tx_hash)
+            if cached:
+                results[tx_hash] = cached
+            else:
+                missing.append(tx_hash)
+
+        if len(missing) == 1:
+            results[missing[0]] = self._fetch_invocation(missing[0])
+        elif missing:
+            pool = _get_invocation_pool()
+            for tx_hash, invocation in zip(missing, pool.map(self._fetch_invocation, missing)):
+                results[tx_hash] = invocation
+        return results
+
     def get_contract_state(
         self,
         contract_id: str,
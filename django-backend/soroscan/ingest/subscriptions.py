@@ -0,0 +1,174 @@
+"""
+Fan-out-once delivery for live event subscriptions.
+
+``process_new_event`` builds one serialised *envelope* per event, with every
+field a subscriber can select, and sends it with the ``contract_event``
+channel message. Subscribers turn the envelope back into an unsaved
+``ContractEvent`` with ``envelope_to_event``, so resolving a pushed event
+needs no database access no matter how many clients listen.
+
+Each subscriber reads the channel layer into a bounded ``SubscriberQueue``.
+When a slow client lets it fill, the overflow policy decides what gives:
+
+* ``drop_oldest`` — discard the oldest queued event.
+* ``coalesce`` — replace the queued events of the same ``event_type`` with
+  the newest one, falling back to ``drop_oldest`` when there are none.
+"""
+import asyncio
+from collections import deque
+from collections.abc import Callable, Hashable, Iterable
+from datetime import datetime
+from typing import Any
+
+from django.conf import settings
+
+from .models import ContractEvent, TrackedContract
+
+OVERFLOW_POLICIES = ("drop_oldest", "coalesce")
+
+ENVELOPE_ROW_FIELDS = (
+    "id",
+    "contract_id",
+    "contract__contract_id",
+    "contract__name",
+    "event_type",
+    "payload",
+    "payload_hash",
+    "decoded_payload",
+    "decoding_status",
+    "ledger",
+    "event_index",
+    "timestamp",
+    "tx_hash",
+    "schema_version",
+    "validation_status",
+    "signature_status",
+)
+
+_EVENT_FIELDS = (
+    "id",
+    "event_type",
+    "payload",
+    "payload_hash",
+    "decoded_payload",
+    "decoding_status",
+    "ledger",
+    "event_index",
+    "tx_hash",
+    "schema_version",
+    "validation_status",
+    "signature_status",
+)
+
+
+def build_envelope(row: dict[str, Any]) -> dict[str, Any]:
+    """Serialise a ``ENVELOPE_ROW_FIELDS`` row into a channel-layer-safe dict."""
+    envelope = {name: row[name] for name in _EVENT_FIELDS}
+    envelope["timestamp"] = row["timestamp"].isoformat()
+    envelope["contract"] = {
+        "pk": row["contract_id"],
+        "contract_id": row["contract__contract_id"],
+        "name": row["contract__name"],
+    }
+    return envelope
+
+
+def envelope_to_event(envelope: dict[str, Any]) -> ContractEvent:
+    """Rebuild the event (and its contract) from an envelope without a query."""
+    contract = envelope["contract"]
+    return ContractEvent(
+        contract=TrackedContract(
+            pk=contract["pk"],
+            contract_id=contract["contract_id"],
+            name=contract["name"],
+        ),
+        timestamp=datetime.fromisoformat(envelope["timestamp"]),
+        **{name: envelope[name] for name in _EVENT_FIELDS},
+    )
+
+
+def subscription_queue_size() -> int:
+    return max(1, int(getattr(settings, "GRAPHQL_SUBSCRIPTION_QUEUE_SIZE", 100)))
+
+
+def subscription_overflow_policy() -> str:
+    policy = getattr(settings, "GRAPHQL_SUBSCRIPTION_OVERFLOW", "drop_oldest")
+    return policy if policy in OVERFLOW_POLICIES else "drop_oldest"
+
+
+def message_event_type(message: dict[str, Any]) -> str | None:
+    """``event_type`` of a ``contract_event`` channel message, with or without an envelope."""
+    return (message.get("event") or message.get("data") or {}).get("event_type")
+
+
+def event_type_filter(event_types: Iterable[str] | None) -> Callable[[str | None], bool] | None:
+    """Return a predicate over event types, or ``None`` when every type is wanted."""
+    wanted = frozenset(event_types or ())
+    if not wanted:
+        return None
+    return wanted.__contains__
+
+
+class SubscriberQueue:
+    """
+    Bounded per-subscriber buffer between the channel layer and the client.
+
+    *key* names the coalescing group of an item; by default its ``event_type``.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        policy: str = "drop_oldest",
+        transport: str = "graphql",
+        key: Callable[[Any], Hashable] | None = None,
+    ):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy!r}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.transport = transport
+        self.key = key or (lambda item: item.get("event_type"))
+        self.dropped = 0
+        self._items: deque[Any] = deque()
+        self._ready = asyncio.Event()
+        self._error: BaseException | None = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, item: Any) -> None:
+        if len(self._items) >= self.maxsize and not (
+            self.policy == "coalesce" and self._coalesce(self.key(item))
+        ):
+            self._items.popleft()
+            self._record_drop("overflow", 1)
+        self._items.append(item)
+        self._ready.set()
+
+    def fail(self, error: BaseException) -> None:
+        """End the stream: ``get`` raises *error* once buffered items are consumed."""
+        self._error = error
+        self._ready.set()
+
+    async def get(self) -> Any:
+        while not self._items:
+            if self._error is not None:
+                raise self._error
+            self._ready.clear()
+            await self._ready.wait()
+        return self._items.popleft()
+
+    def _coalesce(self, key: Hashable) -> bool:
+        kept = deque(item for item in self._items if self.key(item) != key)
+        removed = len(self._items) - len(kept)
+        if removed:
+            self._items = kept
+            self._record_drop("coalesced", removed)
+        return bool(removed)
+
+    def _record_drop(self, reason: str, count: int) -> None:
+        from .metrics import subscriber_events_dropped_total  # noqa: PLC0415
+
+        self.dropped += count
+        subscriber_events_dropped_total.labels(transport=self.transport, reason=reason).inc(count)
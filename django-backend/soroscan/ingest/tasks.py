@@ -14,26 +14,29 @@ import logging
 import pstats
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta, timezone as dt_timezone
 from decimal import Decimal, ROUND_HALF_UP
 from typing import Any
 
-import jsonschema
 import requests
-from celery import shared_task
+from celery import chord, shared_task
 from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import ec, ed25519
 from celery.signals import task_postrun, task_prerun, task_retry
 from django.conf import settings
 from django.core.cache import cache
-from django.db.models import Avg, Count, F, Max, Min
+from django.db import IntegrityError, transaction
+from django.db.models import Avg, Count, F, Func, IntegerField, Sum, TextField
+from django.db.models.functions import Cast, Coalesce, TruncDate
 from django.utils import timezone
 
 from soroscan.circuit_breaker import execute_with_circuit_breaker
 from soroscan.webhook_signing import build_x_signature_header
 
 from .cache_utils import (
+    bump_event_routes_version,
     invalidate_event_count_cache,
     get_cached_decoded_payload,
     set_cached_decoded_payload,
@@ -46,13 +49,11 @@ from .cache_utils import (
 from .telemetry import inject_trace_headers, payload_compression_ratio, tracer
 from .models import (
     BlacklistedContract,
-    ContractABI,
     ContractEvent,
     ContractSigningKey,
     TrackedContract,
     WebhookSubscription,
     IndexerState,
-    EventSchema,
     RemediationRule,
     RemediationIncident,
     AdminAction,
@@ -63,16 +64,35 @@ from .models import (
     Organization,
     OrganizationBudget,
     OrganizationCostSnapshot,
+    OrganizationUsageDay,
     WebhookDeadLetter,
 )
 from stellar_sdk import SorobanServer
-from .rate_limit import check_ingest_rate
-from .stellar_client import SorobanClient
+from .event_counters import (
+    drifted_buckets,
+    flush_event_counters as _flush_event_counters,
+    hour_bucket,
+    mark_recount,
+    pop_recount,
+    record_events,
+    recount_buckets,
+)
+from .services.cost_usage import mark_dirty as mark_usage_dirty, pop_dirty as pop_usage_dirty
+from .services.event_bookkeeping import defer_event_bookkeeping
+from .services.ledger_coverage import contracts_completeness, record_ledgers
+from .rate_limit import check_ingest_rate, ingest_throttled, reserve_ingest_tokens
+from .rollups import mark_dirty as mark_rollups_dirty, roll_up
+from .schema_registry import first_error, get_contract_validator, get_event_validator
+from .stellar_client import EVENTS_PAGE_LIMIT, InvocationData, SorobanClient
 from .metrics import webhook_payload_bytes
 from .streaming import get_producer
 
 logger = logging.getLogger(__name__)
 BATCH_LEDGER_SIZE = 200
+# Adaptive backfill windows aim for roughly one RPC page of events each.
+BACKFILL_MIN_WINDOW_LEDGERS = 10
+BACKFILL_MAX_WINDOW_LEDGERS = 10_000
+BACKFILL_TARGET_EVENTS_PER_WINDOW = EVENTS_PAGE_LIMIT
 _SLOW_TASK_THRESHOLD_S = 5.0  # log profiling stats when task exceeds this
 
 # ---------------------------------------------------------------------------
@@ -301,6 +321,29 @@ def _event_attr(event: Any, *names: str, default: Any = None) -> Any:
     return default
 
 
+def _event_timestamp(event: Any) -> datetime | None:
+    """
+    Return the close time of the ledger that emitted *event*.
+
+    Every event of a ledger gets the same value, so re-ingesting an event
+    still collides on ``unique_contract_ledger_event_index`` (which includes
+    ``timestamp`` on partitioned PostgreSQL). None when the RPC gave no close
+    time; callers then store the current time.
+    """
+    for name in ("ledger_close_at", "ledgerClosedAt", "timestamp"):
+        value = _event_attr(event, name)
+        if isinstance(value, str):
+            try:
+                value = datetime.fromisoformat(value)
+            except ValueError:
+                continue
+        if isinstance(value, datetime):
+            if timezone.is_naive(value):
+                value = timezone.make_aware(value, dt_timezone.utc)
+            return value
+    return None
+
+
 def _safe_int(value: Any, default: int = 0) -> int:
     try:
         return int(value)
@@ -308,56 +351,6 @@ def _safe_int(value: Any, default: int = 0) -> int:
         return default
 
 
-def _calculate_completeness(contract: TrackedContract) -> dict[str, Any]:
-    stats = ContractEvent.objects.filter(contract=contract).aggregate(
-        min_ledger=Min("ledger"),
-        max_ledger=Max("ledger"),
-        observed_ledgers=Count("ledger", distinct=True),
-    )
-    min_ledger = stats["min_ledger"]
-    max_ledger = stats["max_ledger"]
-    observed_ledgers = stats["observed_ledgers"] or 0
-    if min_ledger is None or max_ledger is None:
-        return {
-            "contract_id": contract.contract_id,
-            "completeness_percentage": 100.0,
-            "observed_ledgers": 0,
-            "expected_ledgers": 0,
-            "missing_ledgers": 0,
-            "gaps": [],
-        }
-
-    expected_ledgers = (max_ledger - min_ledger + 1) if max_ledger >= min_ledger else 0
-    missing_ledgers = max(expected_ledgers - observed_ledgers, 0)
-
-    ledgers = (
-        ContractEvent.objects.filter(contract=contract)
-        .order_by("ledger")
-        .values_list("ledger", flat=True)
-        .distinct()
-    )
-    gaps: list[dict[str, int]] = []
-    previous = None
-    for ledger in ledgers:
-        if previous is not None and ledger > previous + 1:
-            gaps.append({"from_ledger": previous + 1, "to_ledger": ledger - 1})
-        previous = ledger
-
-    completeness_percentage = (
-        100.0
-        if expected_ledgers == 0
-        else (observed_ledgers / expected_ledgers) * 100.0
-    )
-    return {
-        "contract_id": contract.contract_id,
-        "completeness_percentage": round(completeness_percentage, 4),
-        "observed_ledgers": observed_ledgers,
-        "expected_ledgers": expected_ledgers,
-        "missing_ledgers": missing_ledgers,
-        "gaps": gaps,
-    }
-
-
 def _extract_event_index(event: Any, fallback_index: int = 0) -> int:
     direct_index = _event_attr(event, "event_index", "index")
     if direct_index is not None:
@@ -462,26 +455,26 @@ def validate_contract_payload_schema(
             "ledger": ledger or 0,
         },
     ):
-        if contract.json_schema in (None, {}):
+        validator = get_contract_validator(contract)
+        if validator is None:
             return True
 
-        try:
-            jsonschema.validate(instance=payload, schema=contract.json_schema)
+        error = first_error(validator, payload)
+        if error is None:
             return True
-        except jsonschema.ValidationError as exc:
-            logger.error(
-                "Contract JSON schema validation failed for contract_id=%s event_type=%s ledger=%s: %s",
-                contract.contract_id,
-                event_type,
-                ledger,
-                exc.message,
-                extra={
-                    "contract_id": contract.contract_id,
-                    "event_type": event_type,
-                    "ledger": ledger,
-                },
-            )
-            return False
+        logger.error(
+            "Contract JSON schema validation failed for contract_id=%s event_type=%s ledger=%s: %s",
+            contract.contract_id,
+            event_type,
+            ledger,
+            error.message,
+            extra={
+                "contract_id": contract.contract_id,
+                "event_type": event_type,
+                "ledger": ledger,
+            },
+        )
+        return False
 
 
 def _load_signing_public_key(key: ContractSigningKey):
@@ -525,7 +518,20 @@ def resolve_signature_status(
     )
     if signing_key is None:
         return "missing"
+    return verify_event_signature(signing_key, event, payload, contract.contract_id)
+
+
+def verify_event_signature(
+    signing_key: ContractSigningKey,
+    event: Any,
+    payload: dict[str, Any],
+    contract_id: str = "",
+) -> str:
+    """
+    Check an event signature against *signing_key* without touching the database.
 
+    Returns one of: valid, invalid, missing.
+    """
     signature_value = _extract_signature(event, payload)
     signature = _decode_key_or_sig(signature_value)
     if not signature:
@@ -538,8 +544,8 @@ def resolve_signature_status(
         if public_key is None:
             logger.warning(
                 "Signing key not usable for contract=%s",
-                contract.contract_id,
-                extra={"contract_id": contract.contract_id},
+                contract_id,
+                extra={"contract_id": contract_id},
             )
             return "invalid"
 
@@ -552,15 +558,15 @@ def resolve_signature_status(
     except InvalidSignature:
         logger.warning(
             "Invalid event signature for contract=%s",
-            contract.contract_id,
-            extra={"contract_id": contract.contract_id},
+            contract_id,
+            extra={"contract_id": contract_id},
         )
         return "invalid"
     except Exception:
         logger.warning(
             "Event signature verification error for contract=%s",
-            contract.contract_id,
-            extra={"contract_id": contract.contract_id},
+            contract_id,
+            extra={"contract_id": contract_id},
             exc_info=True,
         )
         return "invalid"
@@ -572,6 +578,7 @@ def _upsert_contract_event(
     fallback_event_index: int = 0,
     client: SorobanClient | None = None,
     batch_cache: dict | None = None,
+    check_rate: bool = True,
 ) -> tuple[ContractEvent, bool]:
     with tracer.start_as_current_span(
         "ingest.upsert_contract_event",
@@ -580,8 +587,9 @@ def _upsert_contract_event(
             "network": _network_label(),
         },
     ):
-        # Check rate limit before processing
-        if not check_ingest_rate(contract):
+        # Check rate limit before processing; callers that reserved tokens
+        # for a whole page pass check_rate=False.
+        if check_rate and not check_ingest_rate(contract):
             m = _get_metrics()
             m.events_rate_limited_total.labels(
                 contract_id=_short_contract_id(contract.contract_id),
@@ -637,25 +645,23 @@ def _upsert_contract_event(
         raw_xdr = str(_event_attr(event, "xdr", "raw_xdr", default="") or "")
         signature_status = resolve_signature_status(contract, event, payload)
 
-        timestamp = _event_attr(event, "timestamp", default=timezone.now())
-        if isinstance(timestamp, datetime) and timezone.is_naive(timestamp):
-            timestamp = timezone.make_aware(timestamp, dt_timezone.utc)
-        if not isinstance(timestamp, datetime):
-            timestamp = timezone.now()
+        timestamp = _event_timestamp(event) or timezone.now()
 
-        result = ContractEvent.objects.update_or_create(
-            contract=contract,
-            ledger=ledger,
-            event_index=event_index,
-            defaults={
-                "tx_hash": tx_hash,
-                "event_type": event_type,
-                "payload": payload,
-                "timestamp": timestamp,
-                "raw_xdr": raw_xdr,
-                "signature_status": signature_status,
-            },
-        )
+        with transaction.atomic():
+            ContractEvent.lock_for_insert([contract.pk])
+            result = ContractEvent.objects.update_or_create(
+                contract=contract,
+                ledger=ledger,
+                event_index=event_index,
+                defaults={
+                    "tx_hash": tx_hash,
+                    "event_type": event_type,
+                    "payload": payload,
+                    "timestamp": timestamp,
+                    "raw_xdr": raw_xdr,
+                    "signature_status": signature_status,
+                },
+            )
 
         # Update contract last activity timestamp if this event is newer
         if not contract.last_event_at or timestamp > contract.last_event_at:
@@ -666,6 +672,7 @@ def _upsert_contract_event(
         if created:
             # Invalidate event count cache
             invalidate_event_count_cache(contract.contract_id)
+            record_events([(contract.pk, event_type, timestamp)])
 
             m = _get_metrics()
             m.events_ingested_total.labels(
@@ -698,7 +705,7 @@ def _try_decode_event(
     Checks Redis cache first (key: decoded:{event_id}, TTL 24h).
     Never raises — failures are recorded via ``decoding_status``.
     """
-    from .decoder import decode_event_payload
+    from .decoder import get_compiled_abi
 
     # Check cache first
     cached = get_cached_decoded_payload(obj.pk)
@@ -709,9 +716,8 @@ def _try_decode_event(
             obj.save(update_fields=["decoded_payload", "decoding_status"])
         return
 
-    try:
-        abi = ContractABI.objects.get(contract=contract)
-    except ContractABI.DoesNotExist:
+    compiled_abi = get_compiled_abi(contract)
+    if compiled_abi is None:
         # No ABI registered — leave default decoding_status="no_abi"
         return
 
@@ -721,7 +727,7 @@ def _try_decode_event(
         return
 
     try:
-        decoded = decode_event_payload(raw_xdr, abi.abi_json, event_type)
+        decoded = compiled_abi.decode(raw_xdr, event_type)
         if decoded is not None:
             obj.decoded_payload = decoded
             obj.decoding_status = "success"
@@ -764,32 +770,24 @@ def validate_event_payload(
     ):
         if payload is None or not isinstance(payload, dict):
             return (True, None)
-        schema = (
-            EventSchema.objects.filter(
-                contract=contract,
-                event_type=event_type,
-            )
-            .order_by("-version")
-            .first()
-        )
-        if schema is None:
+        entry = get_event_validator(contract, event_type)
+        if entry is None:
             return (True, None)
-        try:
-            jsonschema.validate(instance=payload, schema=schema.json_schema)
-            return (True, schema.version)
-        except jsonschema.ValidationError:
-            logger.warning(
-                "Event payload schema validation failed for contract_id=%s event_type=%s ledger=%s",
-                contract.contract_id,
-                event_type,
-                ledger,
-                extra={
-                    "contract_id": contract.contract_id,
-                    "event_type": event_type,
-                    "ledger": ledger,
-                },
-            )
-            return (False, schema.version)
+        version, validator = entry
+        if validator.is_valid(payload):
+            return (True, version)
+        logger.warning(
+            "Event payload schema validation failed for contract_id=%s event_type=%s ledger=%s",
+            contract.contract_id,
+            event_type,
+            ledger,
+            extra={
+                "contract_id": contract.contract_id,
+                "event_type": event_type,
+                "ledger": ledger,
+            },
+        )
+        return (False, version)
 
 
 @shared_task(
@@ -1614,6 +1612,7 @@ def _on_delivery_failure(
             status=WebhookSubscription.STATUS_SUSPENDED,
             is_active=False,
         )
+        bump_event_routes_version()
         _enqueue_webhook_dead_letter(
             webhook=webhook,
             event=event,
@@ -1764,115 +1763,106 @@ def cleanup_old_dedup_logs(dry_run: bool = False) -> int:
     return deleted_count
 
 
-@shared_task
-def process_new_event(event_data: dict[str, Any]) -> None:
+def _fan_out_new_events(event_batch: list[dict[str, Any]]) -> int:
     """
-    Process a newly indexed event and trigger webhooks.
+    Publish new events to subscribers and enqueue matching webhooks and alerts.
+
+    The batch is read from the database once: the rows feed both the
+    subscriber envelopes (see :mod:`.subscriptions`) and the in-memory
+    routing tables in :mod:`.event_router`. Each channel message also carries
+    the event's JSON text so WebSocket consumers can forward it as-is.
+    Returns the number of webhook deliveries enqueued.
     """
     from asgiref.sync import async_to_sync
     from channels.layers import get_channel_layer
 
-    contract_id = event_data.get("contract_id")
-    event_type = event_data.get("event_type")
-
-    if not contract_id:
-        logger.warning("Event missing contract_id", extra={})
-        return
+    from .event_router import event_key, event_time_range, load_event_rows, route_events
+    from .subscriptions import ENVELOPE_ROW_FIELDS, build_envelope
 
     channel_layer = get_channel_layer()
+    producer = get_producer()
+    rows = None
     if channel_layer:
-        try:
-            async_to_sync(channel_layer.group_send)(
-                f"events_{contract_id}",
-                {
-                    "type": "contract_event",
-                    "data": event_data,
-                },
-            )
-        except Exception as e:
-            logger.error(
-                "Failed to publish event to channel layer: %s",
-                e,
-                extra={"contract_id": contract_id},
-            )
-
-    webhooks = WebhookSubscription.objects.filter(
-        contract__contract_id=contract_id,
-        is_active=True,
-        status=WebhookSubscription.STATUS_ACTIVE,
-    ).filter(event_type__in=[event_type, ""])
+        rows = load_event_rows(
+            [key for key in map(event_key, event_batch) if key is not None],
+            ENVELOPE_ROW_FIELDS,
+            event_time_range(event_batch),
+        )
+    routable = []
+    for event_data in event_batch:
+        contract_id = event_data.get("contract_id")
+        if not contract_id:
+            logger.warning("Event missing contract_id", extra={})
+            continue
 
-    # CDC streaming should not depend on webhook subscriptions.
-    producer = get_producer()
-    if producer:
-        try:
-            producer.publish(contract_id, event_data)
-        except Exception:
-            logger.exception(
-                "Failed to stream event to backend", extra={"contract_id": contract_id}
-            )
+        if channel_layer:
+            row = rows.get(event_key(event_data))
+            try:
+                async_to_sync(channel_layer.group_send)(
+                    f"events_{contract_id}",
+                    {
+                        "type": "contract_event",
+                        "data": event_data,
+                        "frame": json.dumps(event_data),
+                        "event": build_envelope(row) if row is not None else None,
+                    },
+                )
+            except Exception as e:
+                logger.error(
+                    "Failed to publish event to channel layer: %s",
+                    e,
+                    extra={"contract_id": contract_id},
+                )
 
-    if not webhooks.exists():
-        logger.info(
-            "No active webhooks for contract %s event_type %s",
-            contract_id,
-            event_type,
-            extra={"contract_id": contract_id},
-        )
-        return
+        # CDC streaming should not depend on webhook subscriptions.
+        if producer:
+            try:
+                producer.publish(contract_id, event_data)
+            except Exception:
+                logger.exception(
+                    "Failed to stream event to backend", extra={"contract_id": contract_id}
+                )
 
-    ledger = event_data.get("ledger")
-    event_index = event_data.get("event_index", 0)
-    event_obj = None
-    if ledger is not None:
-        try:
-            event_obj = ContractEvent.objects.get(
-                contract__contract_id=contract_id,
-                ledger=ledger,
-                event_index=event_index,
-            )
-        except ContractEvent.DoesNotExist:
+        if event_data.get("ledger") is None:
             logger.warning(
-                "ContractEvent not found for contract=%s ledger=%s index=%s — skipping webhook dispatch",
-                contract_id,
-                ledger,
-                event_index,
+                "No ledger/event_index in event_data — cannot dispatch webhooks",
                 extra={"contract_id": contract_id},
             )
-            return
-
-    if event_obj is None:
-        logger.warning(
-            "No ledger/event_index in event_data — cannot dispatch webhooks",
-            extra={"contract_id": contract_id},
-        )
-        return
-
-    dispatched = 0
-    for webhook in webhooks:
-        if webhook.filter_condition:
-            event_context = {
-                "contract_id": event_obj.contract.contract_id,
-                "event_type": event_obj.event_type,
-                "payload": event_obj.payload,
-                "decodedPayload": event_obj.decoded_payload or {},
-                "ledger": event_obj.ledger,
-                "event_index": event_obj.event_index,
-                "tx_hash": event_obj.tx_hash,
-            }
-            if not evaluate_condition(webhook.filter_condition, event_context):
-                continue
-        dispatch_webhook.delay(webhook.id, event_obj.id)
-        dispatched += 1
+            continue
+        routable.append(event_data)
 
-    # Evaluate alert rules asynchronously (separate queue, non-blocking)
-    evaluate_alert_rules.apply_async(args=[event_obj.id], queue="default")
+    deliveries, alerts = route_events(routable, rows=rows)
+    for webhook_id, event_id in deliveries:
+        dispatch_webhook.delay(webhook_id, event_id)
+    for rule_id, event_id in alerts:
+        # Fire-and-forget; exponential backoff handled inside send_alert
+        send_alert.apply_async(args=[rule_id, event_id], queue="default")
 
     logger.info(
-        "Dispatched event to %s webhooks",
-        dispatched,
-        extra={"contract_id": contract_id},
+        "Dispatched %s events to %s webhooks and %s alerts",
+        len(routable),
+        len(deliveries),
+        len(alerts),
     )
+    return len(deliveries)
+
+
+@shared_task
+def process_new_event(event_data: dict[str, Any]) -> None:
+    """
+    Process a newly indexed event and trigger webhooks.
+    """
+    _fan_out_new_events([event_data])
+
+
+@shared_task(name="ingest.tasks.process_new_events")
+def process_new_events(event_batch: list[dict[str, Any]]) -> int:
+    """
+    Process a page of newly indexed events and trigger webhooks and alerts.
+
+    Returns the number of webhook deliveries enqueued.
+    """
+    return _fan_out_new_events(event_batch)
 
 
 @shared_task(name="ingest.tasks.analyze_contract_dependencies")
@@ -2162,198 +2152,283 @@ def alert_downstream_contract_change(contract_id: str, change_type: str = "modif
     return notified
 
 
-@shared_task(name="ingest.tasks.ingest_latest_events", soft_time_limit=120)
-def ingest_latest_events() -> int:
+def _iter_ingest_records(
+    events: list[Any],
+    network: str,
+    client: SorobanClient | None = None,
+):
     """
-    Sync events from Horizon/Soroban RPC.
+    Run the per-event ingest checks over one ``get_events`` page.
+
+    Yields ``(contract, record)`` pairs where *record* is an unsaved
+    ``ContractEvent`` carrying validation, signature and invocation results.
+    Events for untracked contracts, rate-limited contracts, filtered event
+    types and contract-level schema failures are skipped and counted.
+    Contract lookups are memoised for the page, and invocations for the
+    page are resolved together by :func:`_attach_invocations`.
     """
-    _start = time.monotonic()
     m = _get_metrics()
+    contracts: dict[str, TrackedContract | None] = {}
+    pending: list[tuple[TrackedContract, ContractEvent]] = []
+
+    page_counts: dict[str, int] = {}
+    for event in events:
+        event_contract_id = getattr(event, "contract_id", "") or ""
+        if event_contract_id not in contracts:
+            contracts[event_contract_id] = (
+                get_cached_contract(event_contract_id) if event_contract_id else None
+            )
+        page_counts[event_contract_id] = page_counts.get(event_contract_id, 0) + 1
 
-    cursor_state, _ = IndexerState.objects.get_or_create(
-        key="horizon_cursor",
-        defaults={"value": "now"},
-    )
-    cursor = cursor_state.value
-    server = SorobanServer(settings.SOROBAN_RPC_URL)
-    new_events = 0
+    # One rate-limit reservation per contract for the whole page.
+    tokens = {
+        contract_id: reserve_ingest_tokens(contract, page_counts[contract_id])
+        for contract_id, contract in contracts.items()
+        if contract
+    }
 
-    try:
-        blacklisted_ids = set(
-            BlacklistedContract.objects.values_list("contract_id", flat=True)
-        )
-        all_active_ids = list(
-            TrackedContract.objects.filter(is_active=True, is_paused=False).values_list(
-                "contract_id", flat=True
+    for fallback_event_index, event in enumerate(events):
+        event_contract_id = getattr(event, "contract_id", "") or ""
+        contract = contracts[event_contract_id]
+        if not contract:
+            m.events_skipped_total.labels(
+                contract_id=_short_contract_id(event_contract_id),
+                network=network,
+                reason="no_contract",
+            ).inc()
+            continue
+
+        if tokens[event_contract_id] <= 0:
+            m.events_rate_limited_total.labels(
+                contract_id=_short_contract_id(contract.contract_id),
+                network=network,
+            ).inc()
+            logger.warning(
+                "Rate limit exceeded for contract %s — skipping event",
+                contract.contract_id,
+                extra={"contract_id": contract.contract_id},
             )
-        )
-        for cid in all_active_ids:
-            if cid in blacklisted_ids:
-                logger.info(
-                    "Skipping blacklisted contract %s — not indexing events",
-                    cid,
-                    extra={"contract_id": cid, "reason": "blacklisted"},
-                )
-        contract_ids = [cid for cid in all_active_ids if cid not in blacklisted_ids]
+            continue
+        tokens[event_contract_id] -= 1
 
-        # Always update the gauge, even when there are no active contracts.
-        m.active_contracts_gauge.set(len(contract_ids))
+        # Check whitelist/blacklist filter before persisting
+        if not contract.should_ingest_event(event.type):
+            m.events_filtered_total.labels(
+                contract_id=_short_contract_id(contract.contract_id),
+                network=network,
+                filter_type=contract.event_filter_type,
+                event_type=event.type,
+            ).inc()
+            logger.debug(
+                "Event type '%s' filtered (%s) for contract %s — skipping",
+                event.type,
+                contract.event_filter_type,
+                contract.contract_id,
+                extra={
+                    "contract_id": contract.contract_id,
+                    "event_type": event.type,
+                },
+            )
+            continue
 
-        if not contract_ids:
-            logger.info("No active contracts to index", extra={})
-            return 0
+        payload = event.value
 
-        events_response = execute_with_circuit_breaker(
-            "horizon",
-            server.get_events,
-            start_ledger=int(cursor) if cursor.isdigit() else None,
-            filters=[
-                {
-                    "type": "contract",
-                    "contractIds": contract_ids,
-                }
-            ],
-            pagination={"limit": 100},
+        if not validate_contract_payload_schema(
+            contract,
+            payload,
+            event.type,
+            ledger=event.ledger,
+        ):
+            m.events_validation_failures_total.labels(
+                contract_id=_short_contract_id(contract.contract_id),
+                network=network,
+            ).inc()
+            continue
+
+        passed, version_used = validate_event_payload(
+            contract, event.type, payload, ledger=event.ledger
+        )
+        validation_status = "passed" if passed else "failed"
+        # Emit validation counter immediately after the decision.
+        m.events_validated_total.labels(
+            status=validation_status,
+            network=network,
+        ).inc()
+        signature_status = resolve_signature_status(
+            contract,
+            event,
+            payload,
         )
 
-        network = _network_label()
-        # Track distinct ledger sequences visited in this poll.
-        scanned_ledgers: set[int] = set()
-        client = None
+        record = ContractEvent(
+            contract=contract,
+            ledger=_safe_int(event.ledger),
+            event_index=_extract_event_index(event, fallback_event_index),
+            tx_hash=event.tx_hash,
+            event_type=event.type,
+            payload=payload,
+            timestamp=_event_timestamp(event) or timezone.now(),
+            raw_xdr=event.xdr if hasattr(event, "xdr") else "",
+            validation_status=validation_status,
+            schema_version=version_used,
+            signature_status=signature_status,
+        )
+        pending.append((contract, record))
 
-        for fallback_event_index, event in enumerate(events_response.events):
-            scanned_ledgers.add(getattr(event, "ledger", 0))
-            try:
-                contract = get_cached_contract(event.contract_id)
-                if not contract:
-                    raise TrackedContract.DoesNotExist()
-            except TrackedContract.DoesNotExist:
-                m.events_skipped_total.labels(
-                    contract_id=_short_contract_id(
-                        getattr(event, "contract_id", "") or ""
-                    ),
-                    network=network,
-                    reason="no_contract",
-                ).inc()
-                continue
+    if pending:
+        _attach_invocations(pending, client)
+    yield from pending
 
-            # Check rate limit before processing
-            if not check_ingest_rate(contract):
-                m.events_rate_limited_total.labels(
-                    contract_id=_short_contract_id(contract.contract_id),
-                    network=network,
-                ).inc()
-                logger.warning(
-                    "Rate limit exceeded for contract %s — skipping event",
-                    contract.contract_id,
-                    extra={"contract_id": contract.contract_id},
-                )
-                continue
 
-            # Check whitelist/blacklist filter before persisting
-            if not contract.should_ingest_event(event.type):
-                m.events_filtered_total.labels(
-                    contract_id=_short_contract_id(contract.contract_id),
-                    network=network,
-                    filter_type=contract.event_filter_type,
-                    event_type=event.type,
-                ).inc()
-                logger.debug(
-                    "Event type '%s' filtered (%s) for contract %s — skipping",
-                    event.type,
-                    contract.event_filter_type,
-                    contract.contract_id,
-                    extra={
-                        "contract_id": contract.contract_id,
-                        "event_type": event.type,
-                    },
-                )
-                continue
-
-            payload = event.value
+def _attach_invocations(
+    pending: list[tuple[TrackedContract, ContractEvent]],
+    client: SorobanClient | None = None,
+) -> None:
+    """
+    Link a page of unsaved events to their ``ContractInvocation`` rows.
 
-            if not validate_contract_payload_schema(
-                contract,
-                payload,
-                event.type,
-                ledger=event.ledger,
-            ):
-                m.events_validation_failures_total.labels(
-                    contract_id=_short_contract_id(contract.contract_id),
-                    network=network,
-                ).inc()
-                continue
+    Only (tx hash, contract) pairs without a stored invocation are looked up.
+    Their distinct tx hashes are fetched concurrently through
+    ``SorobanClient.get_invocations``, and the new rows are written with a
+    single ``bulk_create``.
+    """
+    first_seen: dict[tuple[str, int], tuple[TrackedContract, int]] = {}
+    for contract, record in pending:
+        if record.tx_hash:
+            first_seen.setdefault((record.tx_hash, contract.pk), (contract, record.ledger))
+    if not first_seen:
+        return
 
-            passed, version_used = validate_event_payload(
-                contract, event.type, payload, ledger=event.ledger
-            )
-            validation_status = "passed" if passed else "failed"
-            schema_version = version_used
-            # Emit validation counter immediately after the decision.
-            m.events_validated_total.labels(
-                status=validation_status,
-                network=network,
-            ).inc()
-            signature_status = resolve_signature_status(
-                contract,
-                event,
-                payload,
-            )
+    def load(keys) -> dict[tuple[str, int], ContractInvocation]:
+        rows = ContractInvocation.objects.filter(
+            tx_hash__in={tx_hash for tx_hash, _ in keys},
+            contract_id__in={contract_pk for _, contract_pk in keys},
+        )
+        return {
+            (row.tx_hash, row.contract_id): row
+            for row in rows
+            if (row.tx_hash, row.contract_id) in keys
+        }
 
-            # --- ContractInvocation tracking (issue #X) ---
-            # Fetch or create the invocation record for this transaction
-            invocation_record = None
-            try:
-                # Use cached client if available, or create new one
-                if client is None:
-                    client = SorobanClient()
-
-                invocation_data = client.get_invocation(event.tx_hash)
-                if invocation_data.success:
-                    invocation_record, _ = ContractInvocation.objects.get_or_create(
-                        tx_hash=event.tx_hash,
+    invocations: dict[tuple[str, int], ContractInvocation] = {}
+    try:
+        invocations = load(first_seen.keys())
+        missing = [key for key in first_seen if key not in invocations]
+        if missing:
+            if client is None:
+                client = SorobanClient()
+            fetched = client.get_invocations([tx_hash for tx_hash, _ in missing])
+
+            new_rows = []
+            for key in missing:
+                data = fetched.get(key[0])
+                if not isinstance(data, InvocationData) or not data.success:
+                    continue
+                contract, ledger = first_seen[key]
+                new_rows.append(
+                    ContractInvocation(
+                        tx_hash=key[0],
                         contract=contract,
-                        defaults={
-                            "caller": invocation_data.caller,
-                            "function_name": invocation_data.function_name,
-                            "parameters": invocation_data.parameters,
-                            "result": invocation_data.result,
-                            "ledger_sequence": event.ledger,
-                        },
+                        caller=data.caller,
+                        function_name=data.function_name,
+                        parameters=data.parameters,
+                        result=data.result,
+                        ledger_sequence=ledger,
                     )
-            except Exception:
-                logger.warning(
-                    "Failed to create invocation record for tx=%s",
-                    event.tx_hash,
-                    exc_info=True,
                 )
+            if new_rows:
+                ContractInvocation.objects.bulk_create(new_rows, ignore_conflicts=True)
+                invocations.update(load({(row.tx_hash, row.contract.pk) for row in new_rows}))
+    except Exception:
+        logger.warning(
+            "Failed to create invocation records for %s transactions",
+            len(first_seen),
+            exc_info=True,
+        )
 
-            event_record, created = ContractEvent.objects.get_or_create(
-                tx_hash=event.tx_hash,
-                ledger=event.ledger,
-                event_type=event.type,
-                defaults={
-                    "contract": contract,
-                    "payload": payload,
-                    "timestamp": timezone.now(),
-                    "raw_xdr": event.xdr if hasattr(event, "xdr") else "",
-                    "validation_status": validation_status,
-                    "schema_version": schema_version,
-                    "signature_status": signature_status,
-                    "invocation": invocation_record,
-                },
-            )
+    for contract, record in pending:
+        record.invocation = invocations.get((record.tx_hash, contract.pk))
+
+
+def _new_event_payload(contract: TrackedContract, record: ContractEvent) -> dict[str, Any]:
+    return {
+        "contract_id": contract.contract_id,
+        "event_type": record.event_type,
+        "payload": record.payload,
+        "ledger": record.ledger,
+        "event_index": record.event_index,
+        "tx_hash": record.tx_hash,
+        "timestamp": record.timestamp.isoformat(),
+    }
+
+
+def _advance_last_indexed_ledger(contract: TrackedContract, ledger: int) -> None:
+    """Move ``last_indexed_ledger`` forward, counting any skipped ledgers as gaps."""
+    if contract.last_indexed_ledger is not None and ledger <= contract.last_indexed_ledger:
+        return
+    if (
+        contract.last_indexed_ledger is not None
+        and ledger > contract.last_indexed_ledger + 1
+    ):
+        _get_metrics().ledger_gaps_total.labels(
+            contract_id=_short_contract_id(contract.contract_id)
+        ).inc()
+        _get_metrics().missing_events_total.labels(
+            contract_id=_short_contract_id(contract.contract_id)
+        ).inc(ledger - contract.last_indexed_ledger - 1)
+    contract.last_indexed_ledger = ledger
+    contract.save(update_fields=["last_indexed_ledger"])
+
+
+def _ingest_events_serial(
+    events: list[Any],
+    network: str,
+    client: SorobanClient | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Persist a ``get_events`` page one row at a time.
+
+    This is the pre-batching code path, kept behind ``INGEST_BATCH_MODE=False``
+    as a fallback and as the baseline for ``benchmark_ingest``. Returns the
+    ``process_new_event`` payloads for newly created rows.
+    """
+    m = _get_metrics()
+    new_payloads: list[dict[str, Any]] = []
+    counted: list[tuple[int, str, datetime]] = []
+
+    # Coverage and cost-usage marks are written once per page, so the page
+    # takes each contract's coverage lock once rather than once per event.
+    with defer_event_bookkeeping():
+        for contract, record in _iter_ingest_records(events, network, client):
+            with transaction.atomic():
+                ContractEvent.lock_for_insert([contract.pk])
+                event_record, created = ContractEvent.objects.get_or_create(
+                    contract=contract,
+                    ledger=record.ledger,
+                    event_index=record.event_index,
+                    defaults={
+                        "tx_hash": record.tx_hash,
+                        "event_type": record.event_type,
+                        "payload": record.payload,
+                        "timestamp": record.timestamp,
+                        "raw_xdr": record.raw_xdr,
+                        "validation_status": record.validation_status,
+                        "schema_version": record.schema_version,
+                        "signature_status": record.signature_status,
+                        "invocation": record.invocation,
+                    },
+                )
 
             # Update validation status if needed
             if not created:
                 if (
-                    event_record.validation_status != validation_status
-                    or event_record.schema_version != schema_version
-                    or event_record.signature_status != signature_status
+                    event_record.validation_status != record.validation_status
+                    or event_record.schema_version != record.schema_version
+                    or event_record.signature_status != record.signature_status
                 ):
-                    event_record.validation_status = validation_status
-                    event_record.schema_version = schema_version
-                    event_record.signature_status = signature_status
+                    event_record.validation_status = record.validation_status
+                    event_record.schema_version = record.schema_version
+                    event_record.signature_status = record.signature_status
                     event_record.save(
                         update_fields=[
                             "validation_status",
@@ -2363,39 +2438,228 @@ def ingest_latest_events() -> int:
                     )
 
             if created:
-                new_events += 1
                 m.events_ingested_total.labels(
                     contract_id=_short_contract_id(contract.contract_id),
                     network=network,
                     event_type=event_record.event_type,
                 ).inc()
-                process_new_event.delay(
-                    {
-                        "contract_id": contract.contract_id,
-                        "event_type": event_record.event_type,
-                        "payload": event_record.payload,
-                        "ledger": event_record.ledger,
-                        "event_index": event_record.event_index,
-                        "tx_hash": event_record.tx_hash,
-                    }
+                new_payloads.append(_new_event_payload(contract, event_record))
+                counted.append((contract.pk, event_record.event_type, event_record.timestamp))
+
+            _advance_last_indexed_ledger(contract, event_record.ledger)
+
+    record_events(counted)
+    return new_payloads
+
+
+_STATUS_FIELDS = ("validation_status", "schema_version", "signature_status")
+
+
+def _ingest_events_batch(
+    events: list[Any],
+    network: str,
+    client: SorobanClient | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Persist a ``get_events`` page with set-based writes.
+
+    The page is deduplicated in memory on (contract, ledger, event_index) and
+    checked against existing rows with one query. New rows go through a single
+    ``bulk_create`` and rows whose validation/signature status changed through
+    a single ``bulk_update``. Each contract's ``last_indexed_ledger`` is
+    advanced once per batch. Returns the ``process_new_event`` payloads for
+    the rows this call actually inserted.
+    """
+    m = _get_metrics()
+    contracts: dict[int, TrackedContract] = {}
+    pending: dict[tuple[int, int, int], ContractEvent] = {}
+
+    for contract, record in _iter_ingest_records(events, network, client):
+        contracts.setdefault(contract.pk, contract)
+        pending[(contract.pk, record.ledger, record.event_index)] = record
+
+    if not pending:
+        return []
+
+    with transaction.atomic():
+        # The existence check and the insert must not interleave with another
+        # writer's: on partitioned PostgreSQL the unique key includes timestamp.
+        ContractEvent.lock_for_insert(contracts)
+        existing_rows = ContractEvent.objects.filter(
+            contract_id__in={key[0] for key in pending},
+            ledger__in={key[1] for key in pending},
+        )
+        close_times = [_event_timestamp(event) for event in events]
+        if all(close_times):
+            # A stored row is never older than its ledger's close time (rows
+            # kept from before close times were stored carry their later
+            # indexing time), so this bound only prunes older partitions.
+            existing_rows = existing_rows.filter(timestamp__gte=min(close_times))
+        existing = {
+            (contract_pk, ledger, event_index): (pk, statuses)
+            for pk, contract_pk, ledger, event_index, *statuses in existing_rows.values_list(
+                "pk", "contract_id", "ledger", "event_index", *_STATUS_FIELDS
+            )
+        }
+
+        to_create: list[ContractEvent] = []
+        to_update: list[ContractEvent] = []
+        for key, record in pending.items():
+            match = existing.get(key)
+            if match is None:
+                if record.payload:
+                    record.payload_hash = ContractEvent.hash_payload(record.payload)
+                record.payload_size = ContractEvent.measure_payload(record.payload)
+                to_create.append(record)
+                continue
+            pk, statuses = match
+            if statuses != [getattr(record, field) for field in _STATUS_FIELDS]:
+                record.pk = pk
+                to_update.append(record)
+
+        to_create = _insert_new_events(to_create)
+        if to_update:
+            ContractEvent.objects.bulk_update(to_update, list(_STATUS_FIELDS))
+
+        highest_ledger: dict[int, int] = {}
+        for contract_pk, ledger, _ in pending:
+            highest_ledger[contract_pk] = max(ledger, highest_ledger.get(contract_pk, ledger))
+        for contract_pk, ledger in highest_ledger.items():
+            _advance_last_indexed_ledger(contracts[contract_pk], ledger)
+        record_ledgers((record.contract_id, record.ledger) for record in to_create)
+        if to_create:
+            mark_usage_dirty(min(record.timestamp for record in to_create))
+
+    ingested: dict[tuple[int, str], int] = {}
+    for record in to_create:
+        label_key = (record.contract_id, record.event_type)
+        ingested[label_key] = ingested.get(label_key, 0) + 1
+    for (contract_pk, event_type), count in ingested.items():
+        m.events_ingested_total.labels(
+            contract_id=_short_contract_id(contracts[contract_pk].contract_id),
+            network=network,
+            event_type=event_type,
+        ).inc(count)
+    for contract_pk in {record.contract_id for record in to_create}:
+        invalidate_event_count_cache(contracts[contract_pk].contract_id)
+    record_events(
+        (record.contract_id, record.event_type, record.timestamp) for record in to_create
+    )
+
+    return [_new_event_payload(contracts[record.contract_id], record) for record in to_create]
+
+
+def _insert_new_events(records: list[ContractEvent]) -> list[ContractEvent]:
+    """
+    Insert *records* and return the ones actually written.
+
+    ``bulk_create`` without ``ignore_conflicts`` writes every row or none, so
+    when another writer inserted one of the keys first the keys that now
+    exist are dropped and the rest retried. Only the returned rows may be
+    counted or fanned out.
+    """
+    while records:
+        try:
+            with transaction.atomic():
+                ContractEvent.objects.bulk_create(records)
+            return records
+        except IntegrityError:
+            taken = set(
+                ContractEvent.objects.filter(
+                    contract_id__in={record.contract_id for record in records},
+                    ledger__in={record.ledger for record in records},
+                ).values_list("contract_id", "ledger", "event_index")
+            )
+            remaining = [
+                record for record in records
+                if (record.contract_id, record.ledger, record.event_index) not in taken
+            ]
+            if len(remaining) == len(records):
+                raise
+            records = remaining
+    return records
+
+
+@shared_task(name="ingest.tasks.ingest_latest_events", soft_time_limit=120)
+def ingest_latest_events() -> int:
+    """
+    Sync events from Horizon/Soroban RPC.
+
+    Each polled page is persisted through ``_ingest_events_batch`` unless
+    ``INGEST_BATCH_MODE`` is disabled, in which case rows are written one at
+    a time by ``_ingest_events_serial``.
+    """
+    _start = time.monotonic()
+    m = _get_metrics()
+
+    cursor_state, _ = IndexerState.objects.get_or_create(
+        key="horizon_cursor",
+        defaults={"value": "now"},
+    )
+    cursor = cursor_state.value
+    server = SorobanServer(settings.SOROBAN_RPC_URL)
+    new_events = 0
+
+    try:
+        blacklisted_ids = set(
+            BlacklistedContract.objects.values_list("contract_id", flat=True)
+        )
+        all_active_ids = list(
+            TrackedContract.objects.filter(is_active=True, is_paused=False).values_list(
+                "contract_id", flat=True
+            )
+        )
+        for cid in all_active_ids:
+            if cid in blacklisted_ids:
+                logger.info(
+                    "Skipping blacklisted contract %s — not indexing events",
+                    cid,
+                    extra={"contract_id": cid, "reason": "blacklisted"},
                 )
+        contract_ids = [cid for cid in all_active_ids if cid not in blacklisted_ids]
 
-            if (
-                contract.last_indexed_ledger is None
-                or event_record.ledger > contract.last_indexed_ledger
-            ):
-                if (
-                    contract.last_indexed_ledger is not None
-                    and event_record.ledger > contract.last_indexed_ledger + 1
-                ):
-                    _get_metrics().ledger_gaps_total.labels(
-                        contract_id=_short_contract_id(contract.contract_id)
-                    ).inc()
-                    _get_metrics().missing_events_total.labels(
-                        contract_id=_short_contract_id(contract.contract_id)
-                    ).inc(event_record.ledger - contract.last_indexed_ledger - 1)
-                contract.last_indexed_ledger = event_record.ledger
-                contract.save(update_fields=["last_indexed_ledger"])
+        # Always update the gauge, even when there are no active contracts.
+        m.active_contracts_gauge.set(len(contract_ids))
+
+        if not contract_ids:
+            logger.info("No active contracts to index", extra={})
+            return 0
+
+        # The state holds either a ledger sequence or an RPC paging cursor;
+        # the RPC rejects a request carrying both.
+        if cursor.isdigit():
+            position = {"start_ledger": int(cursor)}
+        elif cursor != "now":
+            position = {"cursor": cursor}
+        else:
+            position = {}
+        events_response = execute_with_circuit_breaker(
+            "horizon",
+            server.get_events,
+            filters=[
+                {
+                    "type": "contract",
+                    "contractIds": contract_ids,
+                }
+            ],
+            limit=100,
+            **position,
+        )
+
+        network = _network_label()
+        events = list(events_response.events)
+        # Track distinct ledger sequences visited in this poll.
+        scanned_ledgers = {getattr(event, "ledger", 0) for event in events}
+
+        if getattr(settings, "INGEST_BATCH_MODE", True):
+            new_payloads = _ingest_events_batch(events, network)
+        else:
+            new_payloads = _ingest_events_serial(events, network)
+        new_events = len(new_payloads)
+
+        # Fan the page out to webhooks/subscribers in one routed batch.
+        if new_payloads:
+            process_new_events.delay(new_payloads)
 
         if scanned_ledgers:
             m.ledgers_scanned_total.labels(network=network).inc(len(scanned_ledgers))
@@ -2405,9 +2669,9 @@ def ingest_latest_events() -> int:
             analyze_contract_dependencies.delay()
 
         last_ledger = None
-        if events_response.events:
-            last_ledger = events_response.events[-1].ledger
-            cursor_state.value = str(last_ledger)
+        if events:
+            last_ledger = events[-1].ledger
+            cursor_state.value = getattr(events_response, "cursor", None) or str(last_ledger)
             cursor_state.save()
 
         logger.info(
@@ -2438,28 +2702,90 @@ def ingest_latest_events() -> int:
     return new_events
 
 
+@shared_task(name="ingest.tasks.flush_event_counters", soft_time_limit=60)
+def flush_event_counters() -> int:
+    """
+    Add ingest-time event counters to ``EventAggregation``.
+
+    Runs every ``EVENT_COUNTER_FLUSH_SECONDS`` so hourly buckets — including
+    the one still in progress — trail ingest by seconds. Returns the number
+    of buckets touched.
+    """
+    _start = time.monotonic()
+    flushed = _flush_event_counters()
+    _get_metrics().task_duration_seconds.labels(task_name="flush_event_counters").observe(
+        time.monotonic() - _start
+    )
+    return flushed
+
+
+def _reconcile_event_buckets(now: datetime, bucket_end: datetime) -> list[datetime]:
+    """
+    Recount the buckets marked by ``mark_recount`` that drifted from ``ContractEvent``.
+
+    Always covers the last completed bucket. Buckets ending less than
+    ``EVENT_RECOUNT_DELAY_SECONDS`` ago are left for a later run, since
+    counters for their newest rows may still be on their way; at most
+    ``EVENT_RECOUNT_MAX_HOURS`` buckets are checked per run and the rest stay
+    marked. Returns the buckets recounted.
+    """
+    delay = timedelta(seconds=int(getattr(settings, "EVENT_RECOUNT_DELAY_SECONDS", 330)))
+    max_hours = int(getattr(settings, "EVENT_RECOUNT_MAX_HOURS", 168))
+
+    since = pop_recount()
+    start = bucket_end - timedelta(hours=1)
+    if since is not None:
+        start = min(start, since)
+    end = min(bucket_end, hour_bucket(now - delay), start + timedelta(hours=max_hours))
+    end = max(start, end)
+    if end < bucket_end:
+        mark_recount(end)
+
+    drifted = drifted_buckets(start, end) if start < end else []
+    if not drifted:
+        return []
+    logger.warning(
+        "Event counters drifted for %d bucket(s) from %s — recounting",
+        len(drifted),
+        drifted[0].isoformat(),
+        extra={"bucket_start": drifted[0].isoformat()},
+    )
+    if not recount_buckets(drifted):
+        # A counter flush holds the lock; try again on the next run.
+        mark_recount(drifted[0])
+        return []
+    return drifted
+
+
 @shared_task(name="ingest.tasks.aggregate_event_statistics", soft_time_limit=180)
 def aggregate_event_statistics() -> dict[str, Any]:
     """
-    Hourly task: aggregate ContractEvent rows from the last hour into
-    EventAggregation pre-computed buckets and run anomaly detection.
+    Hourly task: finalise the last completed EventAggregation bucket and run
+    anomaly detection.
 
     Strategy
     --------
-    1. Determine the current 1-hour bucket (timestamp rounded down to :00:00).
-    2. Query ContractEvent for that bucket grouped by (contract, event_type).
-    3. Upsert EventAggregation rows (update_or_create on unique_together key).
-    4. Also upsert a per-contract *total* bucket (event_type='').
-    5. Compare each new bucket against the 7-day rolling average for the same
-       hour-of-week slot.  Flag as anomaly when the count drops by more than
+    1. Flush pending ingest-time counters (``flush_event_counters``) so the
+       bucket holds every event recorded at ingest.
+    2. Drift check (``_reconcile_event_buckets``): compare per-contract
+       totals (event_type='') with counts of ContractEvent rows for the last
+       completed bucket and every bucket marked since the previous run —
+       late counts from backfill, import or restore, deletions by archival
+       or pruning. Only drifted buckets are recounted with a GROUP BY, under
+       the flush lock so pending counters are not applied twice.
+    3. Compare each bucket row against the 7-day rolling average for the same
+       hour-of-day slot.  Flag as anomaly when the count drops by more than
        ANALYTICS_ANOMALY_DROP_PCT % (default 50 %) and the baseline is >= MIN.
-    6. Fire a Notification for the contract owner when an anomaly is detected.
+    4. Write the anomaly flags back with a single bulk update; counts are
+       left to the counter flush and the recount.
+    5. Fire a Notification for the contract owner when an anomaly is detected.
 
     Constraints
     -----------
     - Runs on the low_priority Celery queue.
-    - Completed in < 5 seconds even with thousands of contracts because it
-      uses a single GROUP BY query, not per-contract loops.
+    - Without drift the work is proportional to the buckets checked, not to
+      the number of events: two grouped queries plus queries on
+      EventAggregation.
     """
     from .models import EventAggregation  # noqa: PLC0415
 
@@ -2472,36 +2798,19 @@ def aggregate_event_statistics() -> dict[str, Any]:
     bucket_end = now.replace(minute=0, second=0, microsecond=0)
     bucket_start = bucket_end - timedelta(hours=1)
 
-    # ── 1. Aggregate last-hour events by (contract, event_type) ──────────────
-    raw_aggs = (
-        ContractEvent.objects.filter(
-            timestamp__gte=bucket_start,
-            timestamp__lt=bucket_end,
-        )
-        .values("contract_id", "event_type")
-        .annotate(count=Count("id"))
-    )
-
-    # Accumulate per-contract totals while iterating
-    contract_totals: dict[int, int] = {}
-    per_type_rows: list[dict] = []
-
-    for row in raw_aggs:
-        cid = row["contract_id"]
-        contract_totals[cid] = contract_totals.get(cid, 0) + row["count"]
-        per_type_rows.append(row)
+    # ── 1. Flush counters and reconcile drifted buckets ──────────────────────
+    try:
+        _flush_event_counters()
+    except Exception:
+        logger.warning("Event counter flush failed before aggregation", exc_info=True)
 
-    # Add synthetic total buckets (event_type='')
-    for contract_pk, total in contract_totals.items():
-        per_type_rows.append(
-            {"contract_id": contract_pk, "event_type": "", "count": total}
-        )
+    recounted = _reconcile_event_buckets(now, bucket_end)
+    bucket_rows = list(EventAggregation.objects.filter(timestamp=bucket_start))
 
-    # ── 2. Upsert aggregation rows ────────────────────────────────────────────
+    # ── 2. Anomaly detection ──────────────────────────────────────────────────
     anomaly_drop_pct = int(getattr(settings, "ANALYTICS_ANOMALY_DROP_PCT", 50))
     anomaly_min_baseline = int(getattr(settings, "ANALYTICS_ANOMALY_MIN_BASELINE", 10))
 
-    upserted = 0
     anomalies: list[int] = []  # contract_id list
 
     # Pre-compute 7-day rolling average for each (contract, event_type) for the
@@ -2522,43 +2831,45 @@ def aggregate_event_statistics() -> dict[str, Any]:
             rolling_row["avg_count"] or 0.0
         )
 
-    for row in per_type_rows:
-        contract_pk: int = row["contract_id"]
-        event_type: str = row["event_type"]
-        count: int = row["count"]
-
-        rolling_avg = rolling_map.get((contract_pk, event_type), 0.0)
-        is_anomaly = False
+    for row in bucket_rows:
+        rolling_avg = rolling_map.get((row.contract_id, row.event_type), 0.0)
+        row.is_anomaly = False
         if (
             rolling_avg >= anomaly_min_baseline
-            and count < rolling_avg * (1 - anomaly_drop_pct / 100.0)
+            and row.event_count < rolling_avg * (1 - anomaly_drop_pct / 100.0)
         ):
-            is_anomaly = True
-            if event_type == "":  # fire alert only on the per-contract total
-                anomalies.append(contract_pk)
-
-        EventAggregation.objects.update_or_create(
-            contract_id=contract_pk,
-            event_type=event_type,
-            timestamp=bucket_start,
-            defaults={"event_count": count, "is_anomaly": is_anomaly},
-        )
-        upserted += 1
-
-    # ── 3. Fire anomaly alerts ────────────────────────────────────────────────
+            row.is_anomaly = True
+            if row.event_type == "":  # fire alert only on the per-contract total
+                anomalies.append(row.contract_id)
+
+    # ── 3. Bulk update ────────────────────────────────────────────────────────
+    # Only the flags are written: counts belong to flush_event_counters and
+    # recount_buckets, and a flush may have landed since the rows were read.
+    if bucket_rows:
+        with transaction.atomic():
+            EventAggregation.objects.bulk_update(bucket_rows, ["is_anomaly"])
+            mark_rollups_dirty(bucket_start)
+    upserted = len(bucket_rows)
+
+    # ── 4. Fire anomaly alerts ────────────────────────────────────────────────
     if anomalies:
         _fire_volume_anomaly_alerts(anomalies, bucket_start, rolling_map, anomaly_drop_pct)
 
-    # ── 4. Metrics + summary ──────────────────────────────────────────────────
+    # ── 5. Metrics + summary ──────────────────────────────────────────────────
     elapsed = time.monotonic() - _start
     m.task_duration_seconds.labels(task_name="aggregate_event_statistics").observe(elapsed)
 
-    total_events = ContractEvent.objects.count()
+    total_events = (
+        EventAggregation.objects.filter(event_type="").aggregate(total=Sum("event_count"))["total"]
+        or 0
+    )
     active_contracts = TrackedContract.objects.filter(is_active=True).count()
 
     summary = {
         "bucket_start": bucket_start.isoformat(),
         "upserted": upserted,
+        "recounted": bucket_start in recounted,
+        "recounted_buckets": len(recounted),
         "anomalies": len(anomalies),
         "total_events": total_events,
         "active_contracts": active_contracts,
@@ -2567,8 +2878,9 @@ def aggregate_event_statistics() -> dict[str, Any]:
     }
 
     logger.info(
-        "aggregate_event_statistics complete: upserted=%d anomalies=%d elapsed=%.3fs",
+        "aggregate_event_statistics complete: upserted=%d recounted=%d anomalies=%d elapsed=%.3fs",
         upserted,
+        len(recounted),
         len(anomalies),
         elapsed,
         extra=summary,
@@ -2576,6 +2888,25 @@ def aggregate_event_statistics() -> dict[str, Any]:
     return summary
 
 
+@shared_task(name="ingest.tasks.rollup_event_aggregations", soft_time_limit=300)
+def rollup_event_aggregations(rebuild: bool = False) -> dict[str, Any]:
+    """
+    Maintain the daily, weekly and monthly ``EventRollup`` tiers.
+
+    Rolls up periods completed since the last run and rebuilds earlier ones
+    whose hourly buckets changed; ``rebuild=True`` recomputes every tier from
+    the oldest bucket.
+    """
+    _start = time.monotonic()
+    written = roll_up(rebuild=rebuild)
+    elapsed = time.monotonic() - _start
+    _get_metrics().task_duration_seconds.labels(task_name="rollup_event_aggregations").observe(elapsed)
+    summary = {"written": written, "elapsed_seconds": round(elapsed, 3)}
+    if written:
+        logger.info("rollup_event_aggregations complete: written=%s", written, extra=summary)
+    return summary
+
+
 def _fire_volume_anomaly_alerts(
     contract_pks: list[int],
     bucket_start,
@@ -2707,14 +3038,17 @@ def log_daily_platform_stats() -> dict[str, Any]:
 def reconcile_event_completeness() -> dict[str, Any]:
     """
     Detect ledger gaps, record completeness, and trigger backfill repairs.
+
+    Completeness comes from the ``LedgerCoverage`` index, one query for all
+    contracts, rather than from scanning each contract's events.
     """
     _start = time.monotonic()
     m = _get_metrics()
     summaries: list[dict[str, Any]] = []
     repair_jobs = 0
 
-    for contract in TrackedContract.objects.filter(is_active=True):
-        summary = _calculate_completeness(contract)
+    contracts = list(TrackedContract.objects.filter(is_active=True))
+    for contract, summary in zip(contracts, contracts_completeness(contracts)):
         summaries.append(summary)
 
         IndexerState.objects.update_or_create(
@@ -2782,6 +3116,146 @@ def snapshot_contract_state() -> dict[str, int]:
     return {"captured": captured, "skipped": skipped, "interval": interval}
 
 
+def _next_backfill_window(window: int, event_count: int, ledger_span: int) -> int:
+    """
+    Return the ledger span for the next backfill window.
+
+    Sizes the window so it holds about ``BACKFILL_TARGET_EVENTS_PER_WINDOW``
+    events at the density just observed, changing by at most 2x per step.
+    """
+    if event_count <= 0:
+        target = window * 2
+    else:
+        density = event_count / max(ledger_span, 1)
+        target = round(BACKFILL_TARGET_EVENTS_PER_WINDOW / density)
+        target = min(max(target, window // 2), window * 2)
+    return min(max(target, BACKFILL_MIN_WINDOW_LEDGERS), BACKFILL_MAX_WINDOW_LEDGERS)
+
+
+def _backfill_ledger_windows(
+    contract: TrackedContract,
+    client: SorobanClient,
+    start_ledger: int,
+    end_ledger: int,
+    checkpoint,
+) -> tuple[int, int, int]:
+    """
+    Fetch and persist events for ``start_ledger..end_ledger`` in adaptive windows.
+
+    The next window is fetched on a worker thread while the current one is
+    persisted, so RPC latency overlaps with database writes. ``checkpoint`` is
+    called with the last ledger of every persisted window. Rate-limit tokens
+    are reserved once per window; when the grant falls short, the events it
+    covers are written, the checkpoint stops before the first ledger left
+    out and ``Throttled`` is raised so the task retries from there.
+
+    Returns ``(processed, created, updated)`` event counts.
+    """
+    m = _get_metrics()
+    short_cid = _short_contract_id(contract.contract_id)
+    processed_events = created_events = updated_events = 0
+    window = BATCH_LEDGER_SIZE
+    batch_start = start_ledger
+    batch_end = min(batch_start + window - 1, end_ledger)
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="backfill-prefetch") as prefetch:
+        pending = None
+        if batch_start <= end_ledger:
+            pending = prefetch.submit(
+                client.get_events_range, contract.contract_id, batch_start, batch_end
+            )
+
+        while pending is not None:
+            _batch_start_time = time.monotonic()
+            batch_events = pending.result()
+            ledger_span = batch_end - batch_start + 1
+
+            window = _next_backfill_window(window, len(batch_events), ledger_span)
+            next_start = batch_end + 1
+            next_end = min(next_start + window - 1, end_ledger)
+            pending = None
+            if next_start <= end_ledger:
+                pending = prefetch.submit(
+                    client.get_events_range, contract.contract_id, next_start, next_end
+                )
+
+            # Create batch_cache for this batch to avoid redundant RPC calls
+            batch_cache = {}
+
+            if not batch_events:
+                logger.warning(
+                    "No events returned for contract=%s ledgers=%s-%s",
+                    contract.contract_id,
+                    batch_start,
+                    batch_end,
+                )
+
+            # One rate-limit reservation for the whole window. Events past the
+            # grant are left for a retry after the window checkpoints up to them.
+            granted = reserve_ingest_tokens(contract, len(batch_events))
+            throttled_at = None
+            if granted < len(batch_events):
+                m.events_rate_limited_total.labels(
+                    contract_id=short_cid,
+                    network=_network_label(),
+                ).inc(len(batch_events) - granted)
+                throttled_at = min(
+                    _safe_int(_event_attr(event, "ledger", "ledger_sequence"), default=batch_start)
+                    for event in batch_events[granted:]
+                )
+
+            # Coverage and cost-usage marks are written once per window rather
+            # than once per historical event.
+            with defer_event_bookkeeping():
+                for fallback_event_index, event in enumerate(batch_events[:granted]):
+                    result = _upsert_contract_event(
+                        contract,
+                        event,
+                        fallback_event_index,
+                        client=client,
+                        batch_cache=batch_cache,
+                        check_rate=False,
+                    )
+                    # Handle rate-limited events (returns None, False)
+                    if result[0] is None:
+                        continue
+                    _, created = result
+                    processed_events += 1
+                    if created:
+                        created_events += 1
+                    else:
+                        updated_events += 1
+
+            if throttled_at is not None:
+                if throttled_at > batch_start:
+                    checkpoint(throttled_at - 1)
+                logger.warning(
+                    "Rate limit exceeded for contract %s — backfill resumes at ledger %s",
+                    contract.contract_id,
+                    throttled_at,
+                    extra={"contract_id": contract.contract_id},
+                )
+                raise ingest_throttled()
+
+            checkpoint(batch_end)
+
+            # Record per-batch metrics.
+            m.backfill_ledgers_processed_total.labels(contract_id=short_cid).inc(
+                ledger_span
+            )
+            m.backfill_events_fetched_total.labels(contract_id=short_cid).inc(
+                len(batch_events)
+            )
+            m.backfill_window_ledgers.labels(contract_id=short_cid).observe(ledger_span)
+            m.backfill_batch_duration_seconds.labels(contract_id=short_cid).observe(
+                time.monotonic() - _batch_start_time
+            )
+
+            batch_start, batch_end = next_start, next_end
+
+    return processed_events, created_events, updated_events
+
+
 @shared_task(bind=True, queue="backfill", max_retries=3, default_retry_delay=60, soft_time_limit=300)
 def backfill_contract_events(
     self,
@@ -2813,59 +3287,15 @@ def backfill_contract_events(
         next_ledger = max(next_ledger, contract.last_indexed_ledger + 1)
 
     client = SorobanClient()
-    processed_events = 0
-    created_events = 0
-    updated_events = 0
-
-    try:
-        short_cid = _short_contract_id(contract.contract_id)
-        for batch_start in range(next_ledger, end_ledger + 1, BATCH_LEDGER_SIZE):
-            batch_end = min(batch_start + BATCH_LEDGER_SIZE - 1, end_ledger)
-            _batch_start_time = time.monotonic()
-            batch_events = client.get_events_range(
-                contract.contract_id, batch_start, batch_end
-            )
 
-            # Create batch_cache for this batch to avoid redundant RPC calls
-            batch_cache = {}
+    def checkpoint(ledger: int) -> None:
+        contract.last_indexed_ledger = ledger
+        contract.save(update_fields=["last_indexed_ledger"])
 
-            if not batch_events:
-                logger.warning(
-                    "No events returned for contract=%s ledgers=%s-%s",
-                    contract.contract_id,
-                    batch_start,
-                    batch_end,
-                )
-
-            for fallback_event_index, event in enumerate(batch_events):
-                result = _upsert_contract_event(
-                    contract,
-                    event,
-                    fallback_event_index,
-                    client=client,
-                    batch_cache=batch_cache,
-                )
-                # Handle rate-limited events (returns None, False)
-                if result[0] is None:
-                    continue
-                _, created = result
-                processed_events += 1
-                if created:
-                    created_events += 1
-                else:
-                    updated_events += 1
-
-            contract.last_indexed_ledger = batch_end
-            contract.save(update_fields=["last_indexed_ledger"])
-
-            # Record per-batch metrics.
-            ledger_span = batch_end - batch_start + 1
-            m.backfill_ledgers_processed_total.labels(contract_id=short_cid).inc(
-                ledger_span
-            )
-            m.backfill_batch_duration_seconds.labels(contract_id=short_cid).observe(
-                time.monotonic() - _batch_start_time
-            )
+    try:
+        processed_events, created_events, updated_events = _backfill_ledger_windows(
+            contract, client, next_ledger, end_ledger, checkpoint
+        )
 
         # Ensure gauge is fresh after a bulk backfill.
         m.active_contracts_gauge.set(
@@ -2910,6 +3340,257 @@ def backfill_contract_events(
             time.monotonic() - _start
         )
 
+# ---------------------------------------------------------------------------
+# Sharded backfill
+# ---------------------------------------------------------------------------
+
+
+def _backfill_shard_key(contract_pk: int, shard_start: int, shard_end: int) -> str:
+    return f"backfill:{contract_pk}:{shard_start}-{shard_end}"
+
+
+def _backfill_shard_states(contract_pk: int) -> list[tuple[str, dict[str, Any]]]:
+    """Return ``(key, state)`` for every recorded shard of a contract."""
+    states = []
+    for key, value in IndexerState.objects.filter(
+        key__startswith=f"backfill:{contract_pk}:"
+    ).values_list("key", "value"):
+        try:
+            states.append((key, json.loads(value)))
+        except (TypeError, ValueError):
+            logger.warning("Ignoring malformed backfill shard state %s", key)
+    return states
+
+
+def _advance_backfill_low_watermark(contract_pk: int) -> int | None:
+    """
+    Move ``last_indexed_ledger`` up to the end of the contiguous run of
+    completed shard ledgers, and drop shard states the watermark has passed.
+
+    The run starts at the lowest recorded shard's ``from_ledger`` and only
+    follows shard checkpoints. ``last_indexed_ledger`` is not a starting
+    point: live ingest moves it to the chain tip while shards below the tip
+    are still running, and their states must survive for them to resume.
+    """
+    with transaction.atomic():
+        contract = TrackedContract.objects.select_for_update().get(pk=contract_pk)
+        states = sorted(
+            _backfill_shard_states(contract_pk),
+            key=lambda item: item[1]["from_ledger"],
+        )
+        if not states:
+            return contract.last_indexed_ledger
+
+        watermark = states[0][1]["from_ledger"] - 1
+        passed = []
+        for key, state in states:
+            if state["from_ledger"] > watermark + 1:
+                break
+            checkpoint = state.get("checkpoint")
+            if checkpoint is None:
+                break
+            watermark = max(watermark, checkpoint)
+            if checkpoint < state["to_ledger"]:
+                break
+            passed.append(key)
+
+        if contract.last_indexed_ledger is None or watermark > contract.last_indexed_ledger:
+            contract.last_indexed_ledger = watermark
+            contract.save(update_fields=["last_indexed_ledger"])
+
+        if passed:
+            IndexerState.objects.filter(key__in=passed).delete()
+
+    return contract.last_indexed_ledger
+
+
+@shared_task(
+    bind=True,
+    name="ingest.tasks.backfill_contract_shard",
+    queue="backfill",
+    max_retries=3,
+    default_retry_delay=60,
+    soft_time_limit=300,
+)
+def backfill_contract_shard(self, contract_id: str, shard_key: str) -> dict[str, Any]:
+    """
+    Backfill one ledger shard created by :func:`orchestrate_backfill`.
+
+    Progress is checkpointed in the shard's ``IndexerState`` row after every
+    window, so a retried or re-dispatched shard resumes where it stopped.
+    """
+    _start = time.monotonic()
+    m = _get_metrics()
+
+    try:
+        contract = TrackedContract.objects.get(contract_id=contract_id)
+    except TrackedContract.DoesNotExist as exc:
+        raise ValueError(f"Tracked contract not found: {contract_id}") from exc
+
+    state_row = IndexerState.objects.filter(key=shard_key).first()
+    if state_row is None:
+        # The low watermark already passed this shard.
+        return {"shard": shard_key, "processed_events": 0, "created_events": 0, "updated_events": 0}
+    state = json.loads(state_row.value)
+
+    resume_from = state["from_ledger"]
+    if state.get("checkpoint") is not None:
+        resume_from = max(resume_from, state["checkpoint"] + 1)
+
+    def checkpoint(ledger: int) -> None:
+        state["checkpoint"] = ledger
+        IndexerState.objects.filter(key=shard_key).update(
+            value=json.dumps(state), updated_at=timezone.now()
+        )
+        _advance_backfill_low_watermark(contract.pk)
+
+    try:
+        processed_events, created_events, updated_events = _backfill_ledger_windows(
+            contract, SorobanClient(), resume_from, state["to_ledger"], checkpoint
+        )
+        return {
+            "shard": shard_key,
+            "processed_events": processed_events,
+            "created_events": created_events,
+            "updated_events": updated_events,
+        }
+    except Exception as exc:
+        logger.exception(
+            "Backfill shard %s failed for contract=%s", shard_key, contract_id
+        )
+        m.ingest_errors_total.labels(
+            task_name="backfill_contract_shard",
+            error_type=type(exc).__name__,
+        ).inc()
+        if self.request.retries < self.max_retries:
+            _log_task_retry(
+                "backfill_contract_shard",
+                self.request.retries + 2,
+                type(exc).__name__,
+                countdown=60,
+            )
+        raise self.retry(exc=exc)
+    finally:
+        m.task_duration_seconds.labels(task_name="backfill_contract_shard").observe(
+            time.monotonic() - _start
+        )
+
+
+@shared_task(name="ingest.tasks.finalize_backfill_shards", queue="backfill")
+def finalize_backfill_shards(
+    shard_results: list[dict[str, Any]], contract_id: str
+) -> dict[str, Any]:
+    """
+    Chord callback for :func:`orchestrate_backfill`: settle the low watermark
+    and total up the shard results.
+    """
+    contract = TrackedContract.objects.get(contract_id=contract_id)
+    last_indexed_ledger = _advance_backfill_low_watermark(contract.pk)
+
+    m = _get_metrics()
+    m.active_contracts_gauge.set(TrackedContract.objects.filter(is_active=True).count())
+
+    totals = {"processed_events": 0, "created_events": 0, "updated_events": 0}
+    for result in shard_results or []:
+        for field in totals:
+            totals[field] += result.get(field, 0)
+    return {
+        "contract_id": contract_id,
+        "shards": len(shard_results or []),
+        "last_indexed_ledger": last_indexed_ledger,
+        **totals,
+    }
+
+
+@shared_task(name="ingest.tasks.orchestrate_backfill", queue="backfill")
+def orchestrate_backfill(
+    contract_id: str,
+    from_ledger: int,
+    to_ledger: int,
+    shard_size: int | None = None,
+) -> dict[str, Any]:
+    """
+    Split a backfill into ledger shards and run them as a chord on the
+    ``backfill`` queue.
+
+    Shards are aligned to multiples of ``shard_size`` so a re-run maps onto
+    the same ``IndexerState`` rows: finished shards are skipped and partial
+    ones resume from their checkpoint. ``last_indexed_ledger`` advances only
+    as the low watermark of completed shards moves.
+    """
+    start_ledger = _safe_int(from_ledger, default=0)
+    end_ledger = _safe_int(to_ledger, default=0)
+    if start_ledger <= 0 or end_ledger <= 0 or start_ledger > end_ledger:
+        raise ValueError("Invalid ledger range provided")
+
+    shard_size = _safe_int(
+        shard_size or getattr(settings, "BACKFILL_SHARD_LEDGERS", 10_000), default=0
+    )
+    if shard_size <= 0:
+        raise ValueError("shard_size must be greater than 0")
+
+    try:
+        contract = TrackedContract.objects.get(contract_id=contract_id)
+    except TrackedContract.DoesNotExist as exc:
+        raise ValueError(f"Tracked contract not found: {contract_id}") from exc
+
+    next_ledger = start_ledger
+    if contract.last_indexed_ledger is not None:
+        next_ledger = max(next_ledger, contract.last_indexed_ledger + 1)
+
+    existing = dict(_backfill_shard_states(contract.pk))
+    shard_keys: list[str] = []
+    skipped = 0
+    aligned_start = (next_ledger // shard_size) * shard_size
+    # Unfinished shards below next_ledger were passed by live ingest, not by
+    # the backfill; resume them from their checkpoints.
+    for key, state in sorted(existing.items(), key=lambda item: item[1]["from_ledger"]):
+        if state["to_ledger"] >= aligned_start or state["to_ledger"] < start_ledger:
+            continue
+        if state.get("checkpoint") is None or state["checkpoint"] < state["to_ledger"]:
+            shard_keys.append(key)
+    for shard_start in range(aligned_start, end_ledger + 1, shard_size):
+        shard_end = shard_start + shard_size - 1
+        key = _backfill_shard_key(contract.pk, shard_start, shard_end)
+        state = existing.get(key, {"checkpoint": None})
+        state["from_ledger"] = min(
+            max(shard_start, next_ledger),
+            state.get("from_ledger", shard_end),
+        )
+        state["to_ledger"] = min(shard_end, end_ledger)
+        if state["checkpoint"] is not None and state["checkpoint"] >= state["to_ledger"]:
+            skipped += 1
+            continue
+        IndexerState.objects.update_or_create(
+            key=key, defaults={"value": json.dumps(state)}
+        )
+        shard_keys.append(key)
+
+    summary = {
+        "contract_id": contract.contract_id,
+        "from_ledger": start_ledger,
+        "to_ledger": end_ledger,
+        "shards_dispatched": len(shard_keys),
+        "shards_skipped": skipped,
+    }
+    if not shard_keys:
+        summary["last_indexed_ledger"] = _advance_backfill_low_watermark(contract.pk)
+        return summary
+
+    logger.info(
+        "Dispatching %s backfill shards for contract=%s ledgers=%s-%s",
+        len(shard_keys),
+        contract.contract_id,
+        next_ledger,
+        end_ledger,
+        extra={"contract_id": contract.contract_id},
+    )
+    chord(
+        backfill_contract_shard.s(contract.contract_id, key).set(queue="backfill")
+        for key in shard_keys
+    )(finalize_backfill_shards.s(contract.contract_id).set(queue="backfill"))
+    return summary
+
 
 @shared_task(bind=True, queue="backfill", soft_time_limit=300)
 def reprocess_events(
@@ -2917,8 +3598,9 @@ def reprocess_events(
     contract_id: str,
     dry_run: bool = False,
     batch_size: int = 500,
-    checkpoint_id: int = 0,
+    checkpoint_id: int | None = None,
     rollback_on_error: bool = True,
+    workers: int | None = None,
 ) -> dict[str, Any]:
     """Reprocess historical events for a contract in batches."""
     from .reprocessing import reprocess_contract_events  # noqa: PLC0415
@@ -2929,6 +3611,7 @@ def reprocess_events(
         batch_size=batch_size,
         checkpoint_id=checkpoint_id,
         rollback_on_error=rollback_on_error,
+        workers=workers,
     )
     return {
         "contract_id": result.contract_id,
@@ -2937,9 +3620,11 @@ def reprocess_events(
         "updated_events": result.updated_events,
         "failed_events": result.failed_events,
         "last_checkpoint_id": result.last_checkpoint_id,
+        "committed_through_id": result.committed_through_id,
         "progress_percent": result.progress_percent,
         "dry_run": result.dry_run,
         "rolled_back": result.rolled_back,
+        "events_per_second": result.events_per_second,
     }
 
 
@@ -3253,52 +3938,25 @@ def evaluate_alert_rules(event_id: int) -> int:
     Dispatches ``send_alert`` tasks for every matching rule.
     Returns the number of rules that matched.
     """
-    from .models import AlertRule
+    from .event_router import get_routes, match_alert_rules
 
-    try:
-        event = ContractEvent.objects.select_related("contract").get(id=event_id)
-    except ContractEvent.DoesNotExist:
+    row = (
+        ContractEvent.objects.filter(id=event_id)
+        .values("contract__contract_id", "event_type", "ledger", "payload")
+        .first()
+    )
+    if row is None:
         return 0
 
-    rules = AlertRule.objects.filter(
-        contract=event.contract,
-        is_active=True,
-    ).order_by(
-        "id"
-    )[: AlertRule.MAX_RULES_PER_CONTRACT]
-
-    event_data = {
-        "event_type": event.event_type,
-        "ledger": event.ledger,
-        "payload": event.payload or {},
-        # Flatten payload fields under decodedPayload for AST compatibility
-        "decodedPayload": event.payload or {},
-    }
-
-    m = _get_metrics()
-    matched = 0
-    no_match = 0
-    for rule in rules:
-        try:
-            if evaluate_condition(rule.condition, event_data):
-                # Fire-and-forget; exponential backoff handled inside send_alert
-                send_alert.apply_async(
-                    args=[rule.id, event_id],
-                    queue="default",
-                )
-                matched += 1
-                m.alert_rules_evaluated_total.labels(outcome="matched").inc()
-            else:
-                no_match += 1
-                m.alert_rules_evaluated_total.labels(outcome="no_match").inc()
-        except Exception:
-            logger.exception(
-                "Error evaluating condition for rule %s",
-                rule.id,
-                extra={"rule_id": rule.id},
-            )
-
-    return matched
+    contract_id = row["contract__contract_id"]
+    rule_ids = match_alert_rules(get_routes([contract_id])[contract_id], row)
+    for rule_id in rule_ids:
+        # Fire-and-forget; exponential backoff handled inside send_alert
+        send_alert.apply_async(
+            args=[rule_id, event_id],
+            queue="default",
+        )
+    return len(rule_ids)
 
 
 def _month_start(value: date | None = None) -> date:
@@ -3368,10 +4026,122 @@ def _emit_budget_alerts(
     return sent
 
 
+class _OctetLength(Func):
+    function = "OCTET_LENGTH"
+    output_field = IntegerField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection, template="LENGTH(CAST(%(expressions)s AS BLOB))", **extra_context
+        )
+
+
+def _payload_bytes():
+    """Stored payload size, or the serialised JSON length for rows ingested before it existed."""
+    return Coalesce("payload_size", _OctetLength(Cast("payload", TextField())))
+
+
+def _usage_cell(breakdown: dict[str, Any], contract_id: str) -> dict[str, int]:
+    return breakdown["contracts"].setdefault(
+        contract_id, {"events": 0, "storage_bytes": 0, "rpc_calls": 0}
+    )
+
+
+def _empty_usage() -> dict[str, Any]:
+    return {
+        "rpc_calls": 0,
+        "event_count": 0,
+        "storage_bytes": 0,
+        "breakdown": {"contracts": {}, "event_types": {}},
+    }
+
+
+def _count_usage_days(first_day: date, last_day: date) -> int:
+    """
+    Recount ``OrganizationUsageDay`` rows for ``first_day``..``last_day``.
+
+    Events and invocations of every organization are counted with one grouped
+    query each; payload sizes are summed in the database. Returns the number
+    of rows written.
+    """
+    start_dt = timezone.make_aware(datetime.combine(first_day, datetime.min.time()))
+    end_dt = timezone.make_aware(datetime.combine(last_day + timedelta(days=1), datetime.min.time()))
+
+    usage: dict[tuple[int, date], OrganizationUsageDay] = {}
+
+    def _day_row(org_id: int, day: date) -> OrganizationUsageDay:
+        row = usage.get((org_id, day))
+        if row is None:
+            row = usage[(org_id, day)] = OrganizationUsageDay(
+                organization_id=org_id,
+                day=day,
+                breakdown={"contracts": {}, "event_types": {}},
+            )
+        return row
+
+    for item in (
+        ContractEvent.objects.filter(
+            timestamp__gte=start_dt,
+            timestamp__lt=end_dt,
+            contract__organization__isnull=False,
+        )
+        .annotate(day=TruncDate("timestamp"))
+        .values("contract__organization_id", "contract__contract_id", "event_type", "day")
+        .annotate(events=Count("id"), storage=Sum(_payload_bytes()))
+        .order_by()
+    ):
+        row = _day_row(item["contract__organization_id"], item["day"])
+        storage = int(item["storage"] or 0)
+        row.event_count += item["events"]
+        row.storage_bytes += storage
+        cell = _usage_cell(row.breakdown, item["contract__contract_id"])
+        cell["events"] += item["events"]
+        cell["storage_bytes"] += storage
+        event_types = row.breakdown["event_types"]
+        event_types[item["event_type"]] = event_types.get(item["event_type"], 0) + item["events"]
+
+    for item in (
+        ContractInvocation.objects.filter(
+            created_at__gte=start_dt,
+            created_at__lt=end_dt,
+            contract__organization__isnull=False,
+        )
+        .annotate(day=TruncDate("created_at"))
+        .values("contract__organization_id", "contract__contract_id", "day")
+        .annotate(calls=Count("id"))
+        .order_by()
+    ):
+        row = _day_row(item["contract__organization_id"], item["day"])
+        row.rpc_calls += item["calls"]
+        _usage_cell(row.breakdown, item["contract__contract_id"])["rpc_calls"] += item["calls"]
+
+    with transaction.atomic():
+        OrganizationUsageDay.objects.filter(day__gte=first_day, day__lte=last_day).delete()
+        OrganizationUsageDay.objects.bulk_create(usage.values(), batch_size=500)
+    return len(usage)
+
+
+def _cost_refresh_start(start_date: date, state_key: str, full: bool) -> date:
+    if full:
+        return start_date
+    state = IndexerState.objects.filter(key=state_key).first()
+    if state is None:
+        return start_date
+    # Recount the last counted day as well to pick up late-arriving events.
+    return max(start_date, date.fromisoformat(state.value) - timedelta(days=1))
+
+
 @shared_task(name="ingest.tasks.aggregate_organization_costs")
-def aggregate_organization_costs(month: str | None = None) -> dict[str, Any]:
+def aggregate_organization_costs(month: str | None = None, full: bool = False) -> dict[str, Any]:
     """
     Aggregate organization usage into monthly cost snapshots and projections.
+
+    Usage is kept per organization and day in ``OrganizationUsageDay``. Each
+    run only recounts days since the previous run, plus any older days that
+    late events were inserted into (see ``services.cost_usage``); months
+    before this one that received such events are recounted in full.
+    ``full=True`` recounts the whole month. Snapshots for every organization
+    are then summed from the daily rows and written with a single bulk upsert.
     """
     if month:
         parsed = datetime.strptime(month, "%Y-%m").date()
@@ -3380,100 +4150,97 @@ def aggregate_organization_costs(month: str | None = None) -> dict[str, Any]:
         start_date = _month_start()
     end_date = _month_end(start_date)
 
-    start_dt = timezone.make_aware(datetime.combine(start_date, datetime.min.time()))
-    end_dt = timezone.make_aware(datetime.combine(end_date, datetime.max.time()))
-
     pricing = _cost_pricing()
     results: list[dict[str, Any]] = []
 
-    for org in Organization.objects.all():
-        contract_ids = list(
-            TrackedContract.objects.filter(organization=org).values_list("id", flat=True)
-        )
-        if not contract_ids:
-            snapshot, _ = OrganizationCostSnapshot.objects.update_or_create(
-                organization=org,
-                month=start_date,
-                defaults={
-                    "rpc_calls": 0,
-                    "storage_bytes": 0,
-                    "compute_units": 0,
-                    "rpc_cost_usd": Decimal("0"),
-                    "storage_cost_usd": Decimal("0"),
-                    "compute_cost_usd": Decimal("0"),
-                    "actual_cost_usd": Decimal("0"),
-                    "projected_monthly_cost_usd": Decimal("0"),
-                    "breakdown": {"contracts": {}, "event_types": {}, "storage": {}},
-                },
-            )
-            results.append({"organization_id": org.id, "projected_monthly_cost_usd": str(snapshot.projected_monthly_cost_usd)})
-            continue
-
-        invocations = ContractInvocation.objects.filter(
-            contract_id__in=contract_ids,
-            created_at__gte=start_dt,
-            created_at__lte=end_dt,
-        )
-        events = ContractEvent.objects.filter(
-            contract_id__in=contract_ids,
-            timestamp__gte=start_dt,
-            timestamp__lte=end_dt,
-        ).select_related("contract")
-
-        rpc_calls = invocations.count()
-        event_count = events.count()
-        storage_bytes = 0
-        by_contract: dict[str, dict[str, Any]] = {}
-        by_event_type: dict[str, int] = {}
-
-        for event in events.iterator(chunk_size=500):
-            payload_blob = json.dumps(event.payload or {}, sort_keys=True)
-            payload_size = len(payload_blob.encode("utf-8"))
-            storage_bytes += payload_size
-
-            contract_key = event.contract.contract_id
-            info = by_contract.setdefault(
-                contract_key,
-                {
-                    "events": 0,
-                    "storage_bytes": 0,
-                    "rpc_calls": 0,
-                },
+    today = timezone.now().date()
+    state_key = f"org_costs:{start_date:%Y-%m}"
+    refresh_from = _cost_refresh_start(start_date, state_key, full)
+    refresh_to = min(end_date, today)
+    dirty = None if full else pop_usage_dirty()
+    try:
+        if dirty is not None and dirty > end_date:
+            # Only the run for that later month can recount it.
+            mark_usage_dirty(dirty)
+        elif dirty is not None:
+            earlier = _month_start(dirty)
+            while earlier < start_date:
+                aggregate_organization_costs(month=f"{earlier:%Y-%m}", full=True)
+                earlier = _month_end(earlier) + timedelta(days=1)
+            refresh_from = min(refresh_from, max(dirty, start_date))
+        if refresh_from <= refresh_to:
+            _count_usage_days(refresh_from, refresh_to)
+            IndexerState.objects.update_or_create(
+                key=state_key, defaults={"value": refresh_to.isoformat()}
             )
-            info["events"] += 1
-            info["storage_bytes"] += payload_size
-
-            by_event_type[event.event_type] = by_event_type.get(event.event_type, 0) + 1
+    except Exception:
+        if dirty is not None:
+            mark_usage_dirty(dirty)
+        raise
+
+    month_usage: dict[int, dict[str, Any]] = {}
+    for org_id, rpc_calls, event_count, storage_bytes, day_breakdown in (
+        OrganizationUsageDay.objects.filter(day__gte=start_date, day__lte=end_date)
+        .values_list("organization_id", "rpc_calls", "event_count", "storage_bytes", "breakdown")
+    ):
+        totals = month_usage.setdefault(org_id, _empty_usage())
+        totals["rpc_calls"] += rpc_calls
+        totals["event_count"] += event_count
+        totals["storage_bytes"] += storage_bytes
+        for contract_key, info in day_breakdown.get("contracts", {}).items():
+            cell = _usage_cell(totals["breakdown"], contract_key)
+            for field_name in ("events", "storage_bytes", "rpc_calls"):
+                cell[field_name] += info.get(field_name, 0)
+        event_types = totals["breakdown"]["event_types"]
+        for event_type, count in day_breakdown.get("event_types", {}).items():
+            event_types[event_type] = event_types.get(event_type, 0) + count
+
+    if today < start_date:
+        days_elapsed = 1
+    elif today > end_date:
+        days_elapsed = (end_date - start_date).days + 1
+    else:
+        days_elapsed = max(1, (today - start_date).days + 1)
+    days_in_month = (end_date - start_date).days + 1
 
-        invocations_per_contract = invocations.values("contract__contract_id").annotate(count=Count("id"))
-        for row in invocations_per_contract:
-            contract_key = row["contract__contract_id"]
-            info = by_contract.setdefault(
-                contract_key,
-                {
-                    "events": 0,
-                    "storage_bytes": 0,
-                    "rpc_calls": 0,
-                },
+    orgs_with_contracts = set(
+        TrackedContract.objects.filter(organization__isnull=False)
+        .values_list("organization_id", flat=True)
+        .distinct()
+    )
+    snapshots: list[OrganizationCostSnapshot] = []
+
+    for org_id in Organization.objects.order_by("id").values_list("id", flat=True):
+        if org_id not in orgs_with_contracts:
+            snapshots.append(
+                OrganizationCostSnapshot(
+                    organization_id=org_id,
+                    month=start_date,
+                    rpc_calls=0,
+                    storage_bytes=0,
+                    compute_units=0,
+                    rpc_cost_usd=Decimal("0"),
+                    storage_cost_usd=Decimal("0"),
+                    compute_cost_usd=Decimal("0"),
+                    actual_cost_usd=Decimal("0"),
+                    projected_monthly_cost_usd=Decimal("0"),
+                    breakdown={"contracts": {}, "event_types": {}, "storage": {}},
+                )
             )
-            info["rpc_calls"] = row["count"]
+            results.append({"organization_id": org_id, "projected_monthly_cost_usd": "0"})
+            continue
 
-        compute_units = rpc_calls + (event_count * 2)
+        totals = month_usage.get(org_id) or _empty_usage()
+        rpc_calls = totals["rpc_calls"]
+        storage_bytes = totals["storage_bytes"]
+        by_contract: dict[str, dict[str, Any]] = totals["breakdown"]["contracts"]
+        compute_units = rpc_calls + (totals["event_count"] * 2)
 
         storage_gb = _decimal(storage_bytes) / _decimal(1024**3)
         rpc_cost = _round_cost(_decimal(rpc_calls) * pricing["rpc_per_call"])
         storage_cost = _round_cost(storage_gb * pricing["storage_per_gb"])
         compute_cost = _round_cost(_decimal(compute_units) * pricing["compute_per_unit"])
         actual_cost = _round_cost(rpc_cost + storage_cost + compute_cost)
-
-        today = timezone.now().date()
-        if today < start_date:
-            days_elapsed = 1
-        elif today > end_date:
-            days_elapsed = (end_date - start_date).days + 1
-        else:
-            days_elapsed = max(1, (today - start_date).days + 1)
-        days_in_month = (end_date - start_date).days + 1
         projected_cost = _round_cost(actual_cost * _decimal(days_in_month) / _decimal(days_elapsed))
 
         total_contract_events = sum(v["events"] for v in by_contract.values()) or 1
@@ -3486,43 +4253,73 @@ def aggregate_organization_costs(month: str | None = None) -> dict[str, Any]:
 
         breakdown = {
             "contracts": by_contract,
-            "event_types": by_event_type,
+            "event_types": totals["breakdown"]["event_types"],
             "storage": {
                 "bytes": storage_bytes,
                 "gigabytes": float(storage_gb.quantize(Decimal("0.000001"), rounding=ROUND_HALF_UP)),
             },
         }
 
-        snapshot, _ = OrganizationCostSnapshot.objects.update_or_create(
-            organization=org,
-            month=start_date,
-            defaults={
-                "rpc_calls": rpc_calls,
-                "storage_bytes": storage_bytes,
-                "compute_units": compute_units,
-                "rpc_cost_usd": rpc_cost,
-                "storage_cost_usd": storage_cost,
-                "compute_cost_usd": compute_cost,
-                "actual_cost_usd": actual_cost,
-                "projected_monthly_cost_usd": projected_cost,
-                "breakdown": breakdown,
-            },
+        snapshots.append(
+            OrganizationCostSnapshot(
+                organization_id=org_id,
+                month=start_date,
+                rpc_calls=rpc_calls,
+                storage_bytes=storage_bytes,
+                compute_units=compute_units,
+                rpc_cost_usd=rpc_cost,
+                storage_cost_usd=storage_cost,
+                compute_cost_usd=compute_cost,
+                actual_cost_usd=actual_cost,
+                projected_monthly_cost_usd=projected_cost,
+                breakdown=breakdown,
+            )
         )
-
-        budget = OrganizationBudget.objects.filter(organization=org).first()
-        alerts_sent = _emit_budget_alerts(org, snapshot, budget) if budget else 0
         results.append(
             {
-                "organization_id": org.id,
+                "organization_id": org_id,
                 "rpc_calls": rpc_calls,
                 "storage_bytes": storage_bytes,
                 "compute_units": compute_units,
                 "actual_cost_usd": str(actual_cost),
                 "projected_monthly_cost_usd": str(projected_cost),
-                "alerts_sent": alerts_sent,
+                "alerts_sent": 0,
             }
         )
 
+    OrganizationCostSnapshot.objects.bulk_create(
+        snapshots,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["organization", "month"],
+        update_fields=[
+            "rpc_calls",
+            "storage_bytes",
+            "compute_units",
+            "rpc_cost_usd",
+            "storage_cost_usd",
+            "compute_cost_usd",
+            "actual_cost_usd",
+            "projected_monthly_cost_usd",
+            "breakdown",
+            "updated_at",
+        ],
+    )
+
+    budgets = {
+        budget.organization_id: budget
+        for budget in OrganizationBudget.objects.filter(
+            organization_id__in=orgs_with_contracts
+        ).select_related("organization__owner")
+    }
+    by_org = {result["organization_id"]: result for result in results}
+    for snapshot in snapshots:
+        budget = budgets.get(snapshot.organization_id)
+        if budget is not None:
+            by_org[snapshot.organization_id]["alerts_sent"] = _emit_budget_alerts(
+                budget.organization, snapshot, budget
+            )
+
     return {
         "month": start_date.isoformat(),
         "organizations": results,
@@ -3846,122 +4643,18 @@ def evaluate_remediation_rules(dry_run: bool = False) -> dict[str, Any]:
 # Data Retention — archive_old_events periodic task
 # ---------------------------------------------------------------------------
 
-_MAX_BATCH_BYTES = 100 * 1024 * 1024  # 100 MB compressed limit per S3 object
-
-
-def _upload_to_s3(bucket: str, key: str, data: bytes) -> int:
-    """Upload *data* to S3 and return the byte size uploaded."""
-    import boto3  # noqa: PLC0415
-
-    s3 = boto3.client(
-        "s3",
-        region_name=getattr(settings, "AWS_S3_REGION_NAME", None),
-        endpoint_url=getattr(settings, "AWS_S3_ENDPOINT_URL", None),
-        aws_access_key_id=getattr(settings, "AWS_ACCESS_KEY_ID", None),
-        aws_secret_access_key=getattr(settings, "AWS_SECRET_ACCESS_KEY", None),
-    )
-    s3.put_object(
-        Bucket=bucket,
-        Key=key,
-        Body=data,
-        ContentEncoding="gzip",
-        ContentType="application/json",
-    )
-    return len(data)
-
-
-def _export_batch_to_s3(
-    events_qs,
-    policy,
-    batch_index: int,
-) -> Any:
-    """
-    Serialize up to 10 000 events from *events_qs* into a gzip-compressed
-    JSON batch, upload to S3, and return an ArchivedEventBatch record.
-
-    Returns None if the queryset is empty.
-    """
-    import gzip  # noqa: PLC0415
-    from .models import ArchivedEventBatch, ArchivalAuditLog  # noqa: PLC0415
-
-    rows = list(
-        events_qs.values(
-            "id",
-            "contract__contract_id",
-            "event_type",
-            "payload",
-            "payload_hash",
-            "ledger",
-            "event_index",
-            "timestamp",
-            "tx_hash",
-        )
-    )
-    if not rows:
-        return None
-
-    # Serialize timestamps to ISO strings for JSON compatibility
-    for row in rows:
-        ts = row.get("timestamp")
-        if ts is not None:
-            row["timestamp"] = ts.isoformat()
-
-    raw_json = json.dumps(rows, default=str).encode("utf-8")
-    compressed = gzip.compress(raw_json)
-
-    if len(compressed) > _MAX_BATCH_BYTES:
-        logger.warning(
-            "Archive batch %d for policy %d exceeds 100 MB (%d bytes) — splitting not yet supported",
-            batch_index,
-            policy.id,
-            len(compressed),
-        )
-
-    contract_slug = policy.contract.contract_id[:12] if policy.contract else "global"
-    key = (
-        f"{policy.s3_prefix.rstrip('/')}/{contract_slug}/"
-        f"batch_{policy.id}_{batch_index}_{int(timezone.now().timestamp())}.json.gz"
-    )
-
-    size_bytes = _upload_to_s3(policy.s3_bucket, key, compressed)
-
-    timestamps = [r["timestamp"] for r in rows if r.get("timestamp")]
-    timestamps_sorted = sorted(timestamps)
-
-    from django.utils.dateparse import parse_datetime  # noqa: PLC0415
-
-    batch = ArchivedEventBatch.objects.create(
-        policy=policy,
-        s3_key=key,
-        event_count=len(rows),
-        size_bytes=size_bytes,
-        min_timestamp=(
-            parse_datetime(timestamps_sorted[0]) if timestamps_sorted else None
-        ),
-        max_timestamp=(
-            parse_datetime(timestamps_sorted[-1]) if timestamps_sorted else None
-        ),
-    )
-
-    ArchivalAuditLog.objects.create(
-        action=ArchivalAuditLog.ACTION_ARCHIVE,
-        batch=batch,
-        policy=policy,
-        event_count=len(rows),
-        detail=f"Uploaded to s3://{policy.s3_bucket}/{key}",
-    )
-
-    return batch
-
-
 @shared_task
 def archive_old_events() -> dict:
     """
     Periodic task: for each active DataRetentionPolicy, archive events older
-    than retention_days to S3 (gzip-compressed JSON) then delete them from PG.
+    than retention_days to S3 then delete them from PG.
+
+    Events are streamed into S3 multipart uploads (see :mod:`.archival`), so
+    memory use does not depend on how many events a policy archives.
 
     Runs daily via Celery Beat.
     """
+    from .archival import archive_policy_events  # noqa: PLC0415
     from .models import DataRetentionPolicy, ArchivalAuditLog  # noqa: PLC0415
 
     _start = time.monotonic()
@@ -3977,34 +4670,18 @@ def archive_old_events() -> dict:
     for policy in policies:
         try:
             cutoff = timezone.now() - timedelta(days=policy.retention_days)
-            base_qs = ContractEvent.objects.filter(timestamp__lt=cutoff)
-            if policy.contract:
-                base_qs = base_qs.filter(contract=policy.contract)
-
-            batch_index = 0
-            while True:
-                batch_qs = base_qs.order_by("timestamp")[:10000]
-                batch = _export_batch_to_s3(batch_qs, policy, batch_index)
-                if batch is None:
-                    break
-
-                # Delete only the IDs we just archived
-                archived_ids = list(
-                    base_qs.order_by("timestamp").values_list("id", flat=True)[:10000]
-                )
-                deleted_count, _ = ContractEvent.objects.filter(
-                    id__in=archived_ids
-                ).delete()
+            for batch_index, (batch, deleted_count) in enumerate(
+                archive_policy_events(policy, cutoff)
+            ):
                 total_archived += batch.event_count
                 total_deleted += deleted_count
-                batch_index += 1
 
                 m.archive_events_total.labels(outcome="archived").inc(batch.event_count)
                 m.archive_events_total.labels(outcome="deleted").inc(deleted_count)
 
                 logger.info(
                     "Archived batch %d for policy %d: %d events → s3://%s/%s",
-                    batch_index,
+                    batch_index + 1,
                     policy.id,
                     batch.event_count,
                     policy.s3_bucket,
@@ -4035,6 +4712,50 @@ def archive_old_events() -> dict:
     return {"archived": total_archived, "deleted": total_deleted, "errors": errors}
 
 
+@shared_task(queue="backfill")
+def restore_archived_batches(
+    job_id: str,
+    batch_ids: list[int],
+    start: str | None = None,
+    end: str | None = None,
+    start_ledger: int | None = None,
+    end_ledger: int | None = None,
+    user_id: int | None = None,
+) -> dict[str, Any]:
+    """
+    Restore archived event batches from S3, optionally only a timestamp
+    (ISO-8601) and/or ledger sub-range. Progress is readable through
+    ``archival.restore_job_status(job_id)`` while the job runs.
+    """
+    from django.contrib.auth import get_user_model  # noqa: PLC0415
+
+    from .archival import run_restore_job  # noqa: PLC0415
+
+    _start = time.monotonic()
+    user = get_user_model().objects.filter(pk=user_id).first() if user_id else None
+    state = run_restore_job(
+        job_id,
+        batch_ids,
+        start=datetime.fromisoformat(start) if start else None,
+        end=datetime.fromisoformat(end) if end else None,
+        start_ledger=start_ledger,
+        end_ledger=end_ledger,
+        user=user,
+    )
+    _get_metrics().task_duration_seconds.labels(task_name="restore_archived_batches").observe(
+        time.monotonic() - _start
+    )
+    logger.info(
+        "restore_archived_batches %s complete: batches=%d restored=%d skipped=%d failed=%d",
+        job_id,
+        state["batches"],
+        state["restored"],
+        state["skipped"],
+        state["failed"],
+    )
+    return state
+
+
 @shared_task
 def cleanup_silk_data() -> int:
     """
@@ -4070,9 +4791,14 @@ def enforce_retention_policies() -> dict[str, int]:
     """
     Delete ContractEvent rows that exceed their retention policy TTL.
     Runs per-contract policy first; falls back to the global policy (contract=None).
+
+    On a partitioned events table, months older than every contract's cutoff
+    are dropped as whole partitions first; rows are only deleted from the
+    months that remain.
     Returns a summary dict: {contract_id: deleted_count}.
     """
     from .models import DataRetentionPolicy, ContractEvent
+    from .partitions import drop_partitions_before, is_partitioned
 
     now = timezone.now()
     summary: dict[str, int] = {}
@@ -4087,12 +4813,22 @@ def enforce_retention_policies() -> dict[str, int]:
         else:
             policy_map[policy.contract_id] = policy.retention_days
 
-    contracts = TrackedContract.objects.values_list("id", "contract_id")
-    for contract_pk, contract_id in contracts:
+    cutoffs: dict[tuple[int, str], datetime | None] = {}
+    for contract_pk, contract_id in TrackedContract.objects.values_list("id", "contract_id"):
         days = policy_map.get(contract_pk, global_days)
-        if days is None:
+        cutoffs[(contract_pk, contract_id)] = (
+            None if days is None else now - timedelta(days=days)
+        )
+
+    # A partition can only go once it is past the cutoff of every contract.
+    if cutoffs and None not in cutoffs.values() and is_partitioned():
+        dropped = drop_partitions_before(min(cutoffs.values()))
+        if dropped:
+            logger.info("Retention: removed event partitions %s", ", ".join(dropped))
+
+    for (contract_pk, contract_id), cutoff in cutoffs.items():
+        if cutoff is None:
             continue
-        cutoff = now - timedelta(days=days)
         deleted, _ = ContractEvent.objects.filter(
             contract_id=contract_pk, timestamp__lt=cutoff
         ).delete()
@@ -4105,6 +4841,14 @@ def enforce_retention_policies() -> dict[str, int]:
     return summary
 
 
+@shared_task(name="ingest.tasks.maintain_event_partitions")
+def maintain_event_partitions() -> dict[str, Any]:
+    """Create the upcoming monthly ContractEvent partitions (PostgreSQL only)."""
+    from .partitions import ensure_partitions
+
+    return {"created": ensure_partitions()}
+
+
 @shared_task
 def process_deletion_requests() -> dict[str, Any]:
     """
@@ -0,0 +1,311 @@
+"""
+Tests for streaming S3 archival (``archive_old_events``) and restore against
+an in-memory S3.
+"""
+import gzip
+import io
+import json
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.utils import timezone
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from soroscan.ingest.archival import MultipartUpload, iter_archive_rows
+from soroscan.ingest.models import (
+    ArchivalAuditLog,
+    ArchivedEventBatch,
+    ContractEvent,
+    DataRetentionPolicy,
+)
+from soroscan.ingest.tasks import archive_old_events
+
+from .factories import ContractEventFactory
+
+
+class FakeS3:
+    """Just enough of the boto3 S3 client for archival and restore."""
+
+    def __init__(self):
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.uploads: dict[str, dict] = {}
+        self.part_sizes: list[int] = []
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[(Bucket, Key)] = bytes(Body)
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        upload_id = f"upload-{len(self.uploads)}"
+        self.uploads[upload_id] = {"parts": {}, "done": False}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.uploads[UploadId]["parts"][PartNumber] = bytes(Body)
+        self.part_sizes.append(len(Body))
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        parts = self.uploads[UploadId]["parts"]
+        numbers = [part["PartNumber"] for part in MultipartUpload["Parts"]]
+        self.objects[(Bucket, Key)] = b"".join(parts[number] for number in numbers)
+        self.uploads[UploadId]["done"] = True
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        del self.uploads[UploadId]
+
+    def get_object(self, Bucket, Key):
+        return {"Body": io.BytesIO(self.objects[(Bucket, Key)])}
+
+
+@pytest.fixture
+def s3():
+    fake = FakeS3()
+    with patch("soroscan.ingest.archival.s3_client", return_value=fake):
+        yield fake
+
+
+@pytest.fixture
+def policy(contract):
+    return DataRetentionPolicy.objects.create(
+        contract=contract, retention_days=30, s3_bucket="archive", s3_prefix="events/"
+    )
+
+
+def _old_events(contract, count, days=60):
+    start = timezone.now() - timedelta(days=days)
+    return [
+        ContractEventFactory(
+            contract=contract,
+            timestamp=start + timedelta(seconds=index // 2),  # pairs share a timestamp
+            ledger=1000 + index,
+            payload={"n": index, "pad": "x" * 40},
+        )
+        for index in range(count)
+    ]
+
+
+def _rows(s3, batch):
+    body = io.BytesIO(s3.objects[("archive", batch.s3_key)])
+    return list(iter_archive_rows(body, batch.s3_key))
+
+
+class TestMultipartUpload:
+    def test_small_objects_use_a_single_put(self):
+        s3 = FakeS3()
+        upload = MultipartUpload(s3, "b", "k", part_size=100)
+        upload.write(b"abc")
+        upload.close()
+
+        assert s3.objects[("b", "k")] == b"abc"
+        assert not s3.uploads
+
+    def test_large_objects_stream_in_parts(self):
+        s3 = FakeS3()
+        upload = MultipartUpload(s3, "b", "k", part_size=10)
+        for _ in range(5):
+            upload.write(b"0123456")
+        upload.close()
+
+        assert s3.objects[("b", "k")] == b"0123456" * 5
+        assert s3.part_sizes == [10, 10, 10, 5]
+
+    def test_abort_discards_the_upload(self):
+        s3 = FakeS3()
+        upload = MultipartUpload(s3, "b", "k", part_size=4)
+        upload.write(b"0123456789")
+        upload.abort()
+
+        assert not s3.uploads and not s3.objects
+
+
+@pytest.mark.django_db
+class TestArchiveOldEvents:
+    def test_archives_and_deletes_exactly_the_old_events(self, s3, policy, settings):
+        settings.ARCHIVE_CHUNK_SIZE = 7
+        old = _old_events(policy.contract, 25)
+        recent = ContractEventFactory(contract=policy.contract, timestamp=timezone.now())
+
+        result = archive_old_events.apply().result
+
+        assert result == {"archived": 25, "deleted": 25, "errors": []}
+        assert list(ContractEvent.objects.values_list("id", flat=True)) == [recent.id]
+        (batch,) = ArchivedEventBatch.objects.all()
+        assert batch.s3_key.endswith(".ndjson.gz")
+        assert batch.size_bytes == len(s3.objects[("archive", batch.s3_key)])
+        rows = _rows(s3, batch)
+        assert [row["id"] for row in rows] == [event.id for event in old]
+        assert rows[3]["payload"]["n"] == 3
+        assert batch.min_timestamp == min(e.timestamp for e in old)
+
+    def test_splits_objects_at_the_size_threshold(self, s3, policy, settings):
+        settings.ARCHIVE_CHUNK_SIZE = 10
+        settings.ARCHIVE_MAX_OBJECT_BYTES = 1
+        old = _old_events(policy.contract, 3)
+
+        archive_old_events.apply()
+
+        batches = ArchivedEventBatch.objects.order_by("min_timestamp", "id")
+        assert batches.count() == 3
+        archived = [row["id"] for batch in batches for row in _rows(s3, batch)]
+        assert archived == [event.id for event in old]
+        assert not ContractEvent.objects.exists()
+
+    def test_rows_inserted_during_the_run_are_not_deleted(self, s3, policy, settings):
+        settings.ARCHIVE_CHUNK_SIZE = 2
+        _old_events(policy.contract, 4)
+        late = []
+        original = s3.put_object
+
+        def put_object(**kwargs):
+            # A backfill lands inside the archived time range mid-run.
+            late.extend(_old_events(policy.contract, 1, days=59))
+            original(**kwargs)
+
+        s3.put_object = put_object
+
+        result = archive_old_events.apply().result
+
+        assert result["deleted"] == 4
+        assert list(ContractEvent.objects.values_list("id", flat=True)) == [late[0].id]
+
+    def test_upload_failure_keeps_the_events(self, s3, policy):
+        _old_events(policy.contract, 3)
+
+        with patch.object(FakeS3, "put_object", side_effect=RuntimeError("boom")):
+            result = archive_old_events.apply().result
+
+        assert result["archived"] == 0 and len(result["errors"]) == 1
+        assert ContractEvent.objects.count() == 3
+        assert not ArchivedEventBatch.objects.exists()
+
+    def test_legacy_json_array_objects_are_still_readable(self):
+        body = io.BytesIO(gzip.compress(json.dumps([{"id": 1}, {"id": 2}]).encode()))
+
+        assert list(iter_archive_rows(body, "old/batch_1_0_0.json.gz")) == [{"id": 1}, {"id": 2}]
+
+
+@pytest.mark.django_db
+class TestRestoreArchive:
+    @pytest.fixture
+    def client(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @pytest.fixture
+    def archived(self, s3, policy, settings):
+        settings.ARCHIVE_MAX_OBJECT_BYTES = 1
+        settings.RESTORE_WORKERS = 1
+        settings.IMPORT_BATCH_SIZE = 2
+        events = _old_events(policy.contract, 6)
+        archive_old_events.apply()
+        return events
+
+    def _restore(self, client, **params):
+        response = client.post(reverse("restore-archive"), params, format="json")
+        assert response.status_code == 202, response.data
+        return response
+
+    def test_restores_every_batch_of_a_policy_as_a_job(self, client, policy, archived):
+        response = self._restore(client, policy_id=policy.id)
+
+        assert len(response.data["batch_ids"]) == 6
+        job = client.get(response.data["status_url"]).data
+        assert job["status"] == "completed"
+        assert (job["done"], job["restored"], job["progress_percent"]) == (6, 6, 100)
+        assert sorted(ContractEvent.objects.values_list("ledger", flat=True)) == [
+            event.ledger for event in archived
+        ]
+        assert not ArchivedEventBatch.objects.exclude(status=ArchivedEventBatch.STATUS_RESTORED)
+        assert ArchivalAuditLog.objects.filter(action=ArchivalAuditLog.ACTION_RESTORE).count() == 6
+
+    def test_time_range_only_fetches_overlapping_batches(self, client, s3, policy, archived):
+        fetched = []
+        original = s3.get_object
+
+        def get_object(Bucket, Key):
+            fetched.append(Key)
+            return original(Bucket=Bucket, Key=Key)
+
+        s3.get_object = get_object
+
+        response = self._restore(
+            client,
+            policy_id=policy.id,
+            since=archived[2].timestamp.isoformat(),
+            until=archived[3].timestamp.isoformat(),
+        )
+
+        assert len(fetched) == 2
+        assert sorted(ContractEvent.objects.values_list("ledger", flat=True)) == [1002, 1003]
+        # A partial restore leaves the batches archived.
+        assert ArchivedEventBatch.objects.filter(
+            id__in=response.data["batch_ids"], status=ArchivedEventBatch.STATUS_ARCHIVED
+        ).count() == 2
+
+    def test_ledger_range_and_existing_rows_are_skipped(self, client, policy, archived):
+        batch_ids = list(ArchivedEventBatch.objects.values_list("id", flat=True))
+        self._restore(client, batch_ids=batch_ids, start_ledger=1001, end_ledger=1003)
+
+        response = self._restore(client, batch_ids=batch_ids)
+
+        job = client.get(response.data["status_url"]).data
+        assert (job["restored"], job["skipped"]) == (3, 3)
+        assert ContractEvent.objects.count() == 6
+
+    def test_repeated_form_batch_ids_are_all_restored(self, client, archived):
+        batch_ids = list(ArchivedEventBatch.objects.values_list("id", flat=True)[:3])
+
+        response = client.post(reverse("restore-archive"), {"batch_ids": batch_ids})
+
+        assert response.status_code == 202, response.data
+        assert sorted(response.data["batch_ids"]) == sorted(batch_ids)
+        assert ContractEvent.objects.count() == 3
+
+    def test_batch_with_rejected_rows_stays_archived(self, client, s3, archived):
+        batch = ArchivedEventBatch.objects.first()
+        row = {"contract__contract_id": archived[0].contract.contract_id, "event_type": "x"}
+        s3.objects[("archive", batch.s3_key)] = gzip.compress(json.dumps(row).encode() + b"\n")
+
+        self._restore(client, batch_id=batch.id)
+
+        batch.refresh_from_db()
+        assert batch.status == ArchivedEventBatch.STATUS_ARCHIVED
+        restore_log = ArchivalAuditLog.objects.get(batch=batch, action=ArchivalAuditLog.ACTION_RESTORE)
+        assert "1 rows rejected" in restore_log.detail
+
+    def test_already_restored_batch_is_a_noop(self, client, archived):
+        batch = ArchivedEventBatch.objects.first()
+        batch.status = ArchivedEventBatch.STATUS_RESTORED
+        batch.save()
+
+        response = client.post(reverse("restore-archive"), {"batch_id": batch.id}, format="json")
+
+        assert response.status_code == 200
+        assert response.data["detail"] == "Batch already restored."
+
+    def test_requires_exactly_one_target(self, client):
+        response = client.post(reverse("restore-archive"), {}, format="json")
+
+        assert response.status_code == 400
+
+    def test_unknown_job(self, client):
+        response = client.get(reverse("restore-archive-status", args=["nope"]))
+
+        assert response.status_code == 404
+
+    def test_ndjson_reading_stops_after_the_window(self):
+        start = timezone.now()
+        rows = [
+            {"id": index, "timestamp": (start + timedelta(seconds=index)).isoformat()}
+            for index in range(5)
+        ]
+        body = io.BytesIO(gzip.compress(b"".join(json.dumps(r).encode() + b"\n" for r in rows)))
+
+        window = iter_archive_rows(
+            body, "k.ndjson.gz", start + timedelta(seconds=1), start + timedelta(seconds=2)
+        )
+
+        assert [row["id"] for row in window] == [1, 2]
@@ -0,0 +1,361 @@
+"""
+Tests for the batched ingest_latest_events persistence path.
+"""
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, create_autospec, patch
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from stellar_sdk import SorobanServer
+
+from soroscan.ingest.models import (
+    ContractEvent,
+    ContractInvocation,
+    IndexerState,
+    TrackedContract,
+)
+from soroscan.ingest.services import event_bookkeeping
+from soroscan.ingest.stellar_client import InvocationData
+from soroscan.ingest.tasks import (
+    _ingest_events_batch,
+    _ingest_events_serial,
+    _insert_new_events,
+    ingest_latest_events,
+)
+
+from .factories import EventSchemaFactory, TrackedContractFactory
+
+
+def _event(contract_id, ledger, index, event_type="transfer", value=None):
+    return SimpleNamespace(
+        contract_id=contract_id,
+        ledger=ledger,
+        id=f"{ledger:019d}-{index:010d}",
+        tx_hash=f"{ledger:032x}{index:032x}",
+        type=event_type,
+        value=value if value is not None else {"amount": index},
+        xdr="",
+    )
+
+
+@pytest.fixture
+def offline_client():
+    client = MagicMock()
+    client.get_invocation.return_value = InvocationData(
+        caller="",
+        contract="",
+        function_name="",
+        parameters={},
+        result=None,
+        ledger_sequence=0,
+        success=False,
+        error="offline",
+    )
+    return client
+
+
+@pytest.mark.django_db
+class TestIngestEventsBatch:
+    def test_inserts_page_and_returns_new_payloads(self, contract, offline_client):
+        events = [_event(contract.contract_id, 100, i) for i in range(3)]
+
+        payloads = _ingest_events_batch(events, "testnet", offline_client)
+
+        assert len(payloads) == 3
+        assert ContractEvent.objects.filter(contract=contract).count() == 3
+        assert {p["event_index"] for p in payloads} == {0, 1, 2}
+        assert all(
+            row.payload_hash == ContractEvent.hash_payload(row.payload)
+            for row in ContractEvent.objects.filter(contract=contract)
+        )
+
+    def test_duplicates_in_page_are_collapsed(self, contract, offline_client):
+        events = [
+            _event(contract.contract_id, 100, 0),
+            _event(contract.contract_id, 100, 0),
+            _event(contract.contract_id, 100, 1),
+        ]
+
+        payloads = _ingest_events_batch(events, "testnet", offline_client)
+
+        assert len(payloads) == 2
+        assert ContractEvent.objects.filter(contract=contract).count() == 2
+
+    def test_replayed_page_creates_nothing(self, contract, offline_client):
+        events = [_event(contract.contract_id, 100, i) for i in range(3)]
+        _ingest_events_batch(events, "testnet", offline_client)
+
+        payloads = _ingest_events_batch(events, "testnet", offline_client)
+
+        assert payloads == []
+        assert ContractEvent.objects.filter(contract=contract).count() == 3
+
+    def test_changed_validation_status_is_written_back(self, contract, offline_client):
+        events = [_event(contract.contract_id, 100, 0, event_type="test_event")]
+        _ingest_events_batch(events, "testnet", offline_client)
+        EventSchemaFactory(contract=contract, event_type="test_event")
+
+        _ingest_events_batch(
+            [_event(contract.contract_id, 100, 0, event_type="test_event", value={})],
+            "testnet",
+            offline_client,
+        )
+
+        row = ContractEvent.objects.get(contract=contract)
+        assert row.validation_status == "failed"
+        assert row.schema_version == 1
+
+    def test_last_indexed_ledger_advanced_once_per_contract(self, offline_client):
+        first = TrackedContractFactory(last_indexed_ledger=99)
+        second = TrackedContractFactory()
+        events = [
+            _event(first.contract_id, 100, 0),
+            _event(second.contract_id, 100, 1),
+            _event(first.contract_id, 105, 0),
+            _event(second.contract_id, 103, 0),
+        ]
+
+        with patch.object(
+            TrackedContract, "save", autospec=True, side_effect=TrackedContract.save
+        ) as save:
+            _ingest_events_batch(events, "testnet", offline_client)
+
+        assert save.call_count == 2
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert first.last_indexed_ledger == 105
+        assert second.last_indexed_ledger == 103
+
+    def test_untracked_contract_events_are_skipped(self, contract, offline_client):
+        events = [
+            _event("C" + "Z" * 55, 100, 0),
+            _event(contract.contract_id, 100, 1),
+        ]
+
+        payloads = _ingest_events_batch(events, "testnet", offline_client)
+
+        assert [p["contract_id"] for p in payloads] == [contract.contract_id]
+
+    def test_matches_serial_path(self, offline_client):
+        serial_contract = TrackedContractFactory()
+        batch_contract = TrackedContractFactory()
+
+        serial = _ingest_events_serial(
+            [_event(serial_contract.contract_id, 200 + i // 2, i % 2) for i in range(6)],
+            "testnet",
+            offline_client,
+        )
+        batch = _ingest_events_batch(
+            [_event(batch_contract.contract_id, 200 + i // 2, i % 2) for i in range(6)],
+            "testnet",
+            offline_client,
+        )
+
+        def strip(payloads):
+            return [
+                {k: v for k, v in p.items() if k not in ("contract_id", "timestamp")}
+                for p in payloads
+            ]
+
+        assert strip(serial) == strip(batch)
+
+    def test_rows_lost_to_another_writer_are_not_reported(self, contract):
+        def record(index):
+            return ContractEvent(
+                contract=contract,
+                ledger=100,
+                event_index=index,
+                tx_hash=f"{index:064x}",
+                event_type="transfer",
+                payload={},
+                timestamp=datetime(2026, 2, 3, tzinfo=UTC),
+            )
+
+        record(0).save()
+
+        inserted = _insert_new_events([record(0), record(1)])
+
+        assert [row.event_index for row in inserted] == [1]
+        assert ContractEvent.objects.filter(contract=contract).count() == 2
+
+    @pytest.mark.parametrize("ingest", [_ingest_events_batch, _ingest_events_serial])
+    def test_inserts_hold_the_contract_lock(self, ingest, contract, offline_client):
+        events = [_event(contract.contract_id, 100, i) for i in range(2)]
+        with patch.object(
+            ContractEvent, "lock_for_insert", wraps=ContractEvent.lock_for_insert
+        ) as lock:
+            ingest(events, "testnet", offline_client)
+
+        assert lock.called
+        assert all(set(call.args[0]) == {contract.pk} for call in lock.call_args_list)
+
+    @pytest.mark.parametrize("ingest", [_ingest_events_batch, _ingest_events_serial])
+    def test_timestamp_is_the_ledger_close_time(self, ingest, contract, offline_client):
+        closed_at = datetime(2026, 2, 3, 4, 5, 6, tzinfo=UTC)
+        events = [_event(contract.contract_id, 100, i) for i in range(2)]
+        events[0].ledger_close_at = closed_at
+        events[1].ledger_close_at = "2026-02-03T04:05:06Z"
+
+        ingest(events, "testnet", offline_client)
+        # A replay must find the same rows rather than insert new ones.
+        ingest(events, "testnet", offline_client)
+
+        rows = ContractEvent.objects.filter(contract=contract)
+        assert [row.timestamp for row in rows] == [closed_at, closed_at]
+
+    def test_existing_rows_lookup_is_bounded_by_close_time(self, contract, offline_client):
+        events = [_event(contract.contract_id, 100, i) for i in range(2)]
+        for event in events:
+            event.ledger_close_at = datetime(2026, 2, 3, tzinfo=UTC)
+
+        with CaptureQueriesContext(connection) as queries:
+            _ingest_events_batch(events, "testnet", offline_client)
+
+        lookup = next(
+            query["sql"] for query in queries
+            if query["sql"].startswith('SELECT "ingest_contractevent"."id"')
+        )
+        assert '"ingest_contractevent"."timestamp" >=' in lookup
+
+
+def _invocation(tx_hash):
+    return InvocationData(
+        caller="G" + "A" * 55,
+        contract="",
+        function_name="transfer",
+        parameters={},
+        result=None,
+        ledger_sequence=0,
+        success=True,
+    )
+
+
+@pytest.mark.django_db
+class TestInvocationEnrichment:
+    def test_distinct_hashes_fetched_once_and_bulk_created(self, contract):
+        client = MagicMock()
+        client.get_invocations.side_effect = lambda hashes: {
+            tx_hash: _invocation(tx_hash) for tx_hash in hashes
+        }
+        events = [_event(contract.contract_id, 100, i) for i in range(3)]
+        events[1].tx_hash = events[0].tx_hash
+
+        _ingest_events_batch(events, "testnet", client)
+
+        client.get_invocations.assert_called_once()
+        assert len(client.get_invocations.call_args[0][0]) == 2
+        assert ContractInvocation.objects.filter(contract=contract).count() == 2
+        rows = ContractEvent.objects.filter(contract=contract).order_by("event_index")
+        assert rows[0].invocation_id == rows[1].invocation_id is not None
+        assert rows[2].invocation_id not in (None, rows[0].invocation_id)
+
+    def test_existing_invocations_are_not_refetched(self, contract):
+        event = _event(contract.contract_id, 100, 0)
+        existing = ContractInvocation.objects.create(
+            tx_hash=event.tx_hash,
+            contract=contract,
+            caller="G" + "B" * 55,
+            function_name="mint",
+            parameters={},
+            ledger_sequence=100,
+        )
+        client = MagicMock()
+
+        _ingest_events_batch([event], "testnet", client)
+
+        client.get_invocations.assert_not_called()
+        assert ContractEvent.objects.get(contract=contract).invocation == existing
+
+    def test_failed_lookups_leave_events_unlinked(self, contract, offline_client):
+        offline_client.get_invocations.side_effect = lambda hashes: {
+            tx_hash: offline_client.get_invocation(tx_hash) for tx_hash in hashes
+        }
+
+        _ingest_events_batch([_event(contract.contract_id, 100, 0)], "testnet", offline_client)
+
+        assert ContractInvocation.objects.count() == 0
+        assert ContractEvent.objects.get(contract=contract).invocation is None
+
+
+@pytest.mark.django_db
+class TestIngestLatestEventsFanOut:
+    def _run(self, events, cursor="0000001288490192896-0000000003"):
+        server = create_autospec(SorobanServer, instance=True)
+        server.get_events.return_value = SimpleNamespace(events=events, cursor=cursor)
+        self.server = server
+        with patch("soroscan.ingest.tasks.SorobanServer", return_value=server), \
+             patch("soroscan.ingest.tasks.SorobanClient") as client_cls, \
+             patch("soroscan.ingest.tasks.process_new_events") as fan_out_mock, \
+             patch("soroscan.ingest.tasks.analyze_contract_dependencies"):
+            client_cls.return_value.get_invocation.return_value = MagicMock(success=False)
+            created = ingest_latest_events()
+        return created, fan_out_mock
+
+    def test_new_events_dispatched_in_one_batch(self, contract):
+        events = [_event(contract.contract_id, 300, i) for i in range(4)]
+
+        created, fan_out_mock = self._run(events)
+
+        assert created == 4
+        fan_out_mock.delay.assert_called_once()
+        assert len(fan_out_mock.delay.call_args[0][0]) == 4
+
+    def test_polls_with_the_sdk_signature(self, contract):
+        IndexerState.objects.create(key="horizon_cursor", value="300")
+
+        created, _ = self._run([_event(contract.contract_id, 300, 0)])
+
+        assert created == 1
+        kwargs = self.server.get_events.call_args.kwargs
+        assert kwargs["start_ledger"] == 300
+        assert kwargs["limit"] == 100
+        assert "cursor" not in kwargs
+
+    def test_resumes_from_the_stored_paging_cursor(self, contract):
+        self._run([_event(contract.contract_id, 300, 0)], cursor="page-1")
+
+        self._run([_event(contract.contract_id, 301, 0)], cursor="page-2")
+
+        kwargs = self.server.get_events.call_args.kwargs
+        assert kwargs["cursor"] == "page-1"
+        assert "start_ledger" not in kwargs
+        assert IndexerState.objects.get(key="horizon_cursor").value == "page-2"
+
+    @override_settings(INGEST_BATCH_MODE=False)
+    def test_serial_mode_still_supported(self, contract):
+        events = [_event(contract.contract_id, 300, i) for i in range(4)]
+
+        created, _ = self._run(events)
+
+        assert created == 4
+        assert ContractEvent.objects.filter(contract=contract).count() == 4
+
+    @override_settings(INGEST_BATCH_MODE=False)
+    def test_serial_mode_records_coverage_once_per_page(self, contract):
+        events = [_event(contract.contract_id, 300 + i, 0) for i in range(4)]
+
+        with patch.object(
+            event_bookkeeping, "record_ledgers", wraps=event_bookkeeping.record_ledgers
+        ) as record:
+            self._run(events)
+
+        record.assert_called_once()
+        assert sorted(record.call_args.args[0]) == [
+            (contract.pk, ledger) for ledger in range(300, 304)
+        ]
+
+
+@pytest.mark.django_db
+def test_benchmark_ingest_command_reports_throughput(capsys):
+    call_command("benchmark_ingest", events=50, contracts=2, page_size=20)
+
+    out = capsys.readouterr().out
+    assert "serial:" in out
+    assert "batch:" in out
+    assert "events/sec" in out
+    assert ContractEvent.objects.count() == 0
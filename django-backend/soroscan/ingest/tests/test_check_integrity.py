@@ -5,6 +5,8 @@ import pytest
 from django.core.management import call_command
 from django.test import TestCase
 
+from soroscan.ingest.models import ContractEvent, LedgerCoverage
+from soroscan.ingest.services.ledger_coverage import ledger_runs, summarize_runs
 from soroscan.ingest.tests.factories import ContractEventFactory, TrackedContractFactory
 
 
@@ -177,55 +179,51 @@ class TestCheckIntegrityCommand(TestCase):
 
 
 class TestCheckIntegrityGapFinding(TestCase):
-    """Test the gap-finding algorithm directly."""
+    """Test the run-based gap summary the command reports from."""
 
-    def test_find_gaps_no_gaps(self):
-        """Test _find_gaps with continuous sequence."""
-        from soroscan.ingest.management.commands.check_integrity import Command
+    def _gaps(self, ledgers):
+        runs = ledger_runs(ledgers)
+        return [(gap["from_ledger"], gap["to_ledger"]) for gap in summarize_runs(runs)["gaps"]]
 
-        ledgers = set(range(100, 106))
-        gaps = Command._find_gaps(100, 105, ledgers)
-        self.assertEqual(gaps, [])
+    def test_no_gaps(self):
+        """Test a continuous sequence."""
+        self.assertEqual(self._gaps(range(100, 106)), [])
 
-    def test_find_gaps_single_gap(self):
-        """Test _find_gaps with single gap."""
-        from soroscan.ingest.management.commands.check_integrity import Command
+    def test_single_gap(self):
+        """Test a single gap."""
+        self.assertEqual(self._gaps({100, 101, 105, 106}), [(102, 104)])
 
-        ledgers = {100, 101, 105, 106}
-        gaps = Command._find_gaps(100, 106, ledgers)
-        self.assertEqual(gaps, [(102, 104)])
+    def test_multiple_gaps(self):
+        """Test multiple gaps."""
+        self.assertEqual(self._gaps({100, 101, 105, 110, 111}), [(102, 104), (106, 109)])
 
-    def test_find_gaps_multiple_gaps(self):
-        """Test _find_gaps with multiple gaps."""
-        from soroscan.ingest.management.commands.check_integrity import Command
+    def test_single_value(self):
+        """Test a single ledger."""
+        self.assertEqual(self._gaps({100}), [])
 
-        ledgers = {100, 101, 105, 110, 111}
-        gaps = Command._find_gaps(100, 111, ledgers)
-        self.assertEqual(gaps, [(102, 104), (106, 109)])
-
-    def test_find_gaps_all_missing(self):
-        """Test _find_gaps with all values missing."""
-        from soroscan.ingest.management.commands.check_integrity import Command
+    def test_deleted_events_are_reported_as_gaps(self):
+        """Rows removed after coverage was recorded show up as missing."""
+        contract = TrackedContractFactory()
+        for ledger in range(1000, 1006):
+            ContractEventFactory(contract=contract, ledger=ledger)
+        ContractEvent.objects.filter(contract=contract, ledger__in=[1002, 1003]).delete()
 
-        ledgers = set()
-        gaps = Command._find_gaps(100, 105, ledgers)
-        self.assertEqual(gaps, [(100, 105)])
+        out = StringIO()
+        call_command("check_integrity", f"--contract={contract.id}", stdout=out)
 
-    def test_find_gaps_single_value(self):
-        """Test _find_gaps with single value."""
-        from soroscan.ingest.management.commands.check_integrity import Command
+        self.assertIn("Gap: Ledger 1,002 - 1,003", out.getvalue())
 
-        ledgers = {100}
-        gaps = Command._find_gaps(100, 100, ledgers)
-        self.assertEqual(gaps, [])
+    def test_events_without_coverage_rows_are_found(self):
+        """The command reads the events, not the coverage index."""
+        contract = TrackedContractFactory()
+        for ledger in range(1000, 1003):
+            ContractEventFactory(contract=contract, ledger=ledger)
+        LedgerCoverage.objects.filter(contract=contract).delete()
 
-    def test_find_gaps_empty_ledgers(self):
-        """Test _find_gaps with no ledgers in range."""
-        from soroscan.ingest.management.commands.check_integrity import Command
+        out = StringIO()
+        call_command("check_integrity", f"--contract={contract.id}", stdout=out)
 
-        ledgers = {100, 101, 102}
-        gaps = Command._find_gaps(100, 110, ledgers)
-        self.assertEqual(gaps, [(103, 110)])
+        self.assertIn("Ledger Range: 1,000 to 1,002", out.getvalue())
 
 
 @pytest.mark.django_db
@@ -0,0 +1,149 @@
+"""
+Tests for the ``/ws/events/<contract_id>/`` WebSocket consumer.
+"""
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+
+from soroscan.ingest.consumers import EventConsumer, batch_frame, parse_event_filter
+from soroscan.ingest.routing import websocket_urlpatterns
+
+CONTRACT_ID = "C" + "W" * 55
+
+
+def _message(event_id, event_type="transfer", **payload):
+    data = {
+        "contract_id": CONTRACT_ID,
+        "event_type": event_type,
+        "payload": {"id": event_id, **payload},
+        "ledger": 100 + event_id,
+        "event_index": 0,
+    }
+    return {"type": "contract_event", "data": data, "frame": json.dumps(data)}
+
+
+async def _connect(query=""):
+    application = URLRouter(websocket_urlpatterns)
+    communicator = WebsocketCommunicator(application, f"/ws/events/{CONTRACT_ID}/{query}")
+    connected, code = await communicator.connect()
+    return communicator, connected, code
+
+
+async def _publish(*messages):
+    layer = get_channel_layer()
+    for message in messages:
+        await layer.group_send(f"events_{CONTRACT_ID}", message)
+
+
+@pytest.fixture(autouse=True)
+def _active_contract():
+    with patch.object(EventConsumer, "get_contract", AsyncMock(return_value=object())):
+        yield
+
+
+class TestFilters:
+    def test_event_types_and_payload_conditions(self):
+        types, predicate = parse_event_filter(
+            b"event_type=swap,mint&event_type=burn&payload.amount__gte=10&payload.to__in=GA,GB"
+        )
+
+        assert types == {"swap", "mint", "burn"}
+        assert predicate({"payload": {"amount": 25, "to": "GB"}})
+        assert not predicate({"payload": {"amount": 5, "to": "GB"}})
+        assert not predicate({"payload": {"amount": 25, "to": "GC"}})
+
+    def test_no_filters(self):
+        assert parse_event_filter(b"mode=stream") == (frozenset(), None)
+
+    def test_unknown_operator_is_rejected(self):
+        with pytest.raises(ValueError):
+            parse_event_filter(b"payload.amount__regex=.*")
+
+    def test_batch_frame_reuses_event_frames(self):
+        frames = [_message(1)["frame"], _message(2)["frame"]]
+
+        decoded = json.loads(batch_frame(CONTRACT_ID, frames))
+
+        assert decoded["type"] == "events"
+        assert [e["payload"]["id"] for e in decoded["events"]] == [1, 2]
+
+
+class TestEventConsumer:
+    async def test_forwards_the_shared_frame(self):
+        communicator, connected, _ = await _connect()
+        assert connected
+        message = _message(1)
+        message["frame"] = '{"shared": true}'
+
+        await _publish(message)
+
+        assert await communicator.receive_from(timeout=2) == '{"shared": true}'
+        await communicator.disconnect()
+
+    async def test_filters_by_types_and_payload(self):
+        communicator, _, _ = await _connect("?event_type=swap,mint&payload.amount__gt=10")
+
+        await _publish(
+            _message(1, "transfer", amount=50),
+            _message(2, "swap", amount=5),
+            _message(3, "mint", amount=50),
+        )
+
+        assert (await communicator.receive_json_from(timeout=2))["payload"]["id"] == 3
+        assert await communicator.receive_nothing(timeout=0.1)
+        await communicator.disconnect()
+
+    async def test_invalid_filter_closes_the_socket(self):
+        _, connected, code = await _connect("?payload.amount__regex=x")
+
+        assert not connected
+        assert code == 4400
+
+    async def test_stream_mode_batches_a_window(self, settings):
+        settings.WEBSOCKET_BATCH_WINDOW_MS = 100
+        communicator, _, _ = await _connect("?mode=stream")
+
+        await _publish(*(_message(event_id) for event_id in range(5)))
+
+        frame = await communicator.receive_json_from(timeout=2)
+        assert frame["type"] == "events"
+        assert [e["payload"]["id"] for e in frame["events"]] == [0, 1, 2, 3, 4]
+        await communicator.disconnect()
+
+    async def test_stream_mode_caps_the_batch_size(self, settings):
+        settings.WEBSOCKET_BATCH_WINDOW_MS = 100
+        settings.WEBSOCKET_MAX_BATCH_SIZE = 2
+        communicator, _, _ = await _connect("?mode=stream")
+
+        await _publish(*(_message(event_id) for event_id in range(3)))
+
+        sizes = [len((await communicator.receive_json_from(timeout=2))["events"]) for _ in range(2)]
+        assert sizes == [2, 1]
+        await communicator.disconnect()
+
+    async def test_slow_client_drops_its_oldest_events(self, settings):
+        settings.WEBSOCKET_SEND_QUEUE_SIZE = 2
+        settings.WEBSOCKET_BATCH_WINDOW_MS = 0
+        communicator, _, _ = await _connect("?mode=stream")
+        release = asyncio.Event()
+        sent = []
+
+        async def slow_send(self, text_data=None, bytes_data=None, close=False):
+            await release.wait()
+            sent.append(json.loads(text_data))
+
+        with patch.object(EventConsumer, "send", slow_send):
+            await _publish(*(_message(event_id) for event_id in range(6)))
+            await asyncio.sleep(0.1)
+            release.set()
+            await asyncio.sleep(0.1)
+
+        ids = [e["payload"]["id"] for frame in sent for e in frame["events"]]
+        # The first event was already in flight; of the rest only the newest two survive.
+        assert ids == [0, 4, 5]
+        await communicator.disconnect()
@@ -0,0 +1,157 @@
+"""
+Tests for grouped, incremental organization cost aggregation.
+"""
+from datetime import UTC, date, datetime
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from soroscan.ingest.models import (
+    ContractEvent,
+    ContractInvocation,
+    IndexerState,
+    Organization,
+    OrganizationCostSnapshot,
+    OrganizationUsageDay,
+)
+from soroscan.ingest.services.cost_usage import DIRTY_KEY
+from soroscan.ingest.tasks import aggregate_organization_costs
+
+from .factories import ContractEventFactory, TrackedContractFactory
+
+MONTH = "2026-01"
+PAYLOAD = {"amount": 100, "to": "GABC"}
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _org_contract(user, name="Org"):
+    org = Organization.objects.create(name=name, owner=user)
+    return org, TrackedContractFactory(owner=user, organization=org)
+
+
+def _event(contract, day, event_type="transfer", ledger=None):
+    return ContractEventFactory(
+        contract=contract,
+        event_type=event_type,
+        payload=PAYLOAD,
+        timestamp=datetime(2026, 1, day, 12, 0, tzinfo=UTC),
+        ledger=ledger or ContractEvent.objects.count() + 1000,
+    )
+
+
+@pytest.mark.django_db
+class TestAggregateOrganizationCosts:
+    def test_usage_is_summed_per_contract_and_event_type(self, user):
+        org, contract = _org_contract(user)
+        _event(contract, 3)
+        _event(contract, 3, event_type="mint")
+        _event(contract, 20)
+        invocation = ContractInvocation.objects.create(
+            tx_hash="a" * 64,
+            caller="G" * 56,
+            contract=contract,
+            function_name="swap",
+            parameters={},
+            ledger_sequence=1,
+        )
+        ContractInvocation.objects.filter(pk=invocation.pk).update(
+            created_at=datetime(2026, 1, 4, tzinfo=UTC)
+        )
+
+        result = aggregate_organization_costs(month=MONTH)
+
+        snapshot = OrganizationCostSnapshot.objects.get(organization=org)
+        assert snapshot.storage_bytes == 3 * ContractEvent.measure_payload(PAYLOAD)
+        assert snapshot.rpc_calls == 1
+        assert snapshot.compute_units == 1 + 3 * 2
+        assert snapshot.breakdown["event_types"] == {"transfer": 2, "mint": 1}
+        cell = snapshot.breakdown["contracts"][contract.contract_id]
+        assert (cell["events"], cell["rpc_calls"]) == (3, 1)
+        assert OrganizationUsageDay.objects.filter(organization=org).count() == 3
+        assert result["organizations"][0]["storage_bytes"] == snapshot.storage_bytes
+
+    def test_rows_without_stored_size_are_measured_in_the_database(self, user):
+        org, contract = _org_contract(user)
+        _event(contract, 5)
+        ContractEvent.objects.update(payload_size=None)
+
+        aggregate_organization_costs(month=MONTH)
+
+        snapshot = OrganizationCostSnapshot.objects.get(organization=org)
+        assert snapshot.storage_bytes == ContractEvent.measure_payload(PAYLOAD)
+
+    def test_payload_size_follows_payload_updates(self, user):
+        _, contract = _org_contract(user)
+        event = _event(contract, 5)
+        bigger = {**PAYLOAD, "memo": "x" * 100}
+
+        ContractEvent.objects.update_or_create(
+            contract=contract,
+            ledger=event.ledger,
+            event_index=event.event_index,
+            defaults={"payload": bigger},
+        )
+
+        event.refresh_from_db()
+        assert event.payload_size == ContractEvent.measure_payload(bigger)
+
+    def test_later_runs_only_recount_recent_days(self, user):
+        org, contract = _org_contract(user)
+        _event(contract, 2)
+        aggregate_organization_costs(month=MONTH)
+
+        # A day counted earlier that nothing was inserted into since.
+        OrganizationUsageDay.objects.filter(organization=org).update(event_count=5)
+        aggregate_organization_costs(month=MONTH)
+        assert OrganizationCostSnapshot.objects.get(organization=org).compute_units == 10
+
+        aggregate_organization_costs(month=MONTH, full=True)
+        assert OrganizationCostSnapshot.objects.get(organization=org).compute_units == 2
+
+    def test_late_events_are_counted_by_the_next_run(self, user):
+        org, contract = _org_contract(user)
+        _event(contract, 20)
+        aggregate_organization_costs(month=MONTH)
+
+        # Backfilled into a day that was already counted.
+        _event(contract, 3)
+        aggregate_organization_costs(month=MONTH)
+
+        assert OrganizationCostSnapshot.objects.get(organization=org).compute_units == 4
+        assert not IndexerState.objects.filter(key=DIRTY_KEY).exists()
+
+    def test_late_events_in_an_earlier_month_refresh_its_snapshot(self, user):
+        org, contract = _org_contract(user)
+        _event(contract, 20)
+        aggregate_organization_costs(month=MONTH)
+        aggregate_organization_costs(month="2026-02")
+
+        _event(contract, 3)
+        aggregate_organization_costs(month="2026-02")
+
+        january = OrganizationCostSnapshot.objects.get(organization=org, month=date(2026, 1, 1))
+        assert january.compute_units == 4
+
+    def test_query_count_does_not_grow_with_organizations(self, user):
+        _, contract = _org_contract(user, "First")
+        _event(contract, 2)
+        aggregate_organization_costs(month=MONTH)
+        with CaptureQueriesContext(connection) as one_org:
+            aggregate_organization_costs(month=MONTH, full=True)
+
+        for index in range(5):
+            _, other = _org_contract(user, f"Org {index}")
+            _event(other, 2)
+        with CaptureQueriesContext(connection) as six_orgs:
+            aggregate_organization_costs(month=MONTH, full=True)
+
+        assert len(six_orgs) == len(one_org)
+        assert OrganizationCostSnapshot.objects.count() == 6
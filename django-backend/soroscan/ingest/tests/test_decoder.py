@@ -11,10 +11,12 @@ import pytest
 from django.test import TestCase
 
 from soroscan.ingest.decoder import (
+    CompiledABI,
     decode_event_payload,
+    get_compiled_abi,
     validate_abi_json,
 )
-from soroscan.ingest.models import ContractABI
+from soroscan.ingest.models import ContractABI, ContractABIVersion
 
 from .factories import TrackedContractFactory, UserFactory
 
@@ -211,6 +213,138 @@ class DecodeEventPayloadTest(TestCase):
         self.assertEqual(result, {})
 
 
+# ---------------------------------------------------------------------------
+# Compiled decoder plans
+# ---------------------------------------------------------------------------
+
+class CompiledABITest(TestCase):
+    """CompiledABI must decode exactly like decode_event_payload."""
+
+    ACCOUNT = "GAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAWHF"
+    ABI = [
+        {
+            "name": "transfer",
+            "fields": [
+                {"name": "from", "type": "Address"},
+                {"name": "amount", "type": "I128"},
+                {"name": "memo", "type": "String"},
+                {"name": "ok", "type": "Bool"},
+                {"name": "missing", "type": "U32"},
+            ],
+        },
+        {"name": "count", "fields": [{"name": "value", "type": "I32"}]},
+    ]
+
+    def _transfer_xdr(self, amount=5):
+        from stellar_sdk import scval
+
+        return scval.to_vec(
+            [
+                scval.to_address(self.ACCOUNT),
+                scval.to_int128(amount),
+                scval.to_string("hello"),
+                scval.to_bool(True),
+            ]
+        ).to_xdr()
+
+    def test_matches_uncompiled_decoder(self):
+        raw_xdr = self._transfer_xdr()
+
+        compiled = CompiledABI(self.ABI).decode(raw_xdr, "transfer")
+
+        self.assertEqual(compiled, decode_event_payload(raw_xdr, self.ABI, "transfer"))
+        self.assertEqual(
+            compiled,
+            {"from": self.ACCOUNT, "amount": 5, "memo": "hello", "ok": True, "missing": None},
+        )
+
+    def test_unknown_event_type_returns_none(self):
+        self.assertIsNone(CompiledABI(self.ABI).decode("AAAA", "nonexistent"))
+
+    def test_decode_many_mixes_types_and_failures(self):
+        from stellar_sdk import scval
+
+        results = CompiledABI(self.ABI).decode_many(
+            [self._transfer_xdr(7), scval.to_int32(3).to_xdr(), "garbage", ""],
+            ["transfer", "count", "count", "count"],
+        )
+
+        self.assertEqual(results[0]["amount"], 7)
+        self.assertEqual(results[1], {"value": 3})
+        self.assertIsNone(results[2])
+        self.assertIsNone(results[3])
+
+    def test_decode_many_single_event_type(self):
+        results = CompiledABI(self.ABI).decode_many(
+            [self._transfer_xdr(1), self._transfer_xdr(2)], "transfer"
+        )
+
+        self.assertEqual([r["amount"] for r in results], [1, 2])
+
+
+@pytest.mark.django_db
+class CompiledABICacheTest(TestCase):
+    """get_compiled_abi caches plans per (contract, ABI version)."""
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.contract = TrackedContractFactory(owner=UserFactory())
+        self.abi = ContractABI.objects.create(
+            contract=self.contract,
+            abi_json=[{"name": "count", "fields": [{"name": "value", "type": "I32"}]}],
+        )
+
+    def test_plan_is_reused_without_queries(self):
+        first = get_compiled_abi(self.contract)
+
+        with self.assertNumQueries(0):
+            second = get_compiled_abi(self.contract)
+
+        self.assertIs(first, second)
+
+    def test_abi_update_invalidates_plan(self):
+        first = get_compiled_abi(self.contract)
+        self.abi.abi_json = [{"name": "swap", "fields": []}]
+        self.abi.save()
+
+        second = get_compiled_abi(self.contract)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(set(second.plans), {"swap"})
+
+    def test_abi_version_change_invalidates_plan(self):
+        first = get_compiled_abi(self.contract)
+        ContractABIVersion.objects.create(
+            contract=self.contract,
+            version_number=1,
+            valid_from_ledger=1,
+            abi_json=self.abi.abi_json,
+        )
+
+        self.assertIsNot(get_compiled_abi(self.contract), first)
+
+    def test_missing_abi_is_cached_as_none(self):
+        self.abi.delete()
+        self.assertIsNone(get_compiled_abi(self.contract))
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_compiled_abi(self.contract))
+
+
+@pytest.mark.django_db
+def test_benchmark_decoder_command_reports_throughput(capsys):
+    from django.core.management import call_command
+
+    call_command("benchmark_decoder", events=20, event_types=3)
+
+    out = capsys.readouterr().out
+    assert "per-event:" in out
+    assert "decode_many:" in out
+    assert not ContractABI.objects.exists()
+
+
 # ---------------------------------------------------------------------------
 # Integration: decoding via _upsert_contract_event
 # ---------------------------------------------------------------------------
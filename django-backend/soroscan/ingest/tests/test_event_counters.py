@@ -0,0 +1,267 @@
+"""
+Tests for ingest-time event counters and the incremental aggregation rollup.
+"""
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from soroscan.ingest.event_counters import (
+    clear_pending,
+    flush_event_counters,
+    hour_bucket,
+    mark_recount,
+    pop_recount,
+    record_events,
+)
+from soroscan.ingest.models import ContractEvent, EventAggregation
+from soroscan.ingest.services.export_import import ImportResult, import_rows
+from soroscan.ingest.tasks import _ingest_events_batch, aggregate_event_statistics
+
+from .factories import ContractEventFactory
+
+
+@pytest.fixture(autouse=True)
+def _clean_counters():
+    cache.clear()
+    clear_pending()
+    yield
+    clear_pending()
+
+
+def _last_bucket():
+    return timezone.now().replace(minute=0, second=0, microsecond=0) - timedelta(hours=1)
+
+
+def _ingested(contract, event_type, timestamp):
+    """Create an event and count it the way the ingest paths do."""
+    event = ContractEventFactory(contract=contract, event_type=event_type, timestamp=timestamp)
+    record_events([(contract.pk, event_type, timestamp)])
+    return event
+
+
+def _counts(contract, bucket):
+    return dict(
+        EventAggregation.objects.filter(contract=contract, timestamp=bucket).values_list(
+            "event_type", "event_count"
+        )
+    )
+
+
+@pytest.mark.django_db
+class TestFlush:
+    def test_flush_writes_type_and_total_buckets(self, contract):
+        bucket = _last_bucket()
+        record_events(
+            [
+                (contract.pk, "swap", bucket + timedelta(minutes=5)),
+                (contract.pk, "swap", bucket + timedelta(minutes=50)),
+                (contract.pk, "mint", bucket + timedelta(minutes=10)),
+            ]
+        )
+
+        assert flush_event_counters() == 3
+        assert _counts(contract, bucket) == {"swap": 2, "mint": 1, "": 3}
+
+    def test_flush_adds_to_existing_rows(self, contract):
+        bucket = _last_bucket()
+        record_events([(contract.pk, "swap", bucket)])
+        flush_event_counters()
+        record_events([(contract.pk, "swap", bucket), (contract.pk, "swap", bucket)])
+        flush_event_counters()
+
+        assert _counts(contract, bucket) == {"swap": 3, "": 3}
+
+    def test_nothing_pending(self):
+        assert flush_event_counters() == 0
+        assert not EventAggregation.objects.exists()
+
+    def test_counts_survive_a_failed_flush(self, contract):
+        bucket = _last_bucket()
+        record_events([(contract.pk, "swap", bucket)])
+
+        with patch(
+            "soroscan.ingest.models.EventAggregation.objects.bulk_create",
+            side_effect=RuntimeError("db down"),
+        ):
+            with pytest.raises(RuntimeError):
+                flush_event_counters()
+
+        flush_event_counters()
+        assert _counts(contract, bucket) == {"swap": 1, "": 1}
+
+    def test_batch_ingest_records_counters(self, contract):
+        client = MagicMock()
+        client.get_invocation.side_effect = RuntimeError("offline")
+        events = [
+            SimpleNamespace(
+                contract_id=contract.contract_id,
+                ledger=100,
+                id=f"{100:019d}-{index:010d}",
+                tx_hash=f"{index:064x}",
+                type="transfer",
+                value={"amount": index},
+                xdr="",
+            )
+            for index in range(4)
+        ]
+
+        _ingest_events_batch(events, "testnet", client)
+        flush_event_counters()
+
+        bucket = hour_bucket(ContractEvent.objects.filter(contract=contract).first().timestamp)
+        assert _counts(contract, bucket) == {"transfer": 4, "": 4}
+
+
+@pytest.mark.django_db
+class TestIncrementalAggregation:
+    def test_counted_bucket_is_not_recounted(self, contract):
+        bucket = _last_bucket()
+        _ingested(contract, "swap", bucket + timedelta(minutes=5))
+        _ingested(contract, "mint", bucket + timedelta(minutes=15))
+
+        result = aggregate_event_statistics.apply().get()
+
+        assert result["recounted"] is False
+        assert result["upserted"] == 3
+        assert result["total_events"] == 2
+        assert _counts(contract, bucket) == {"swap": 1, "mint": 1, "": 2}
+
+    def test_uncounted_events_trigger_a_recount(self, contract):
+        bucket = _last_bucket()
+        _ingested(contract, "swap", bucket + timedelta(minutes=5))
+        ContractEventFactory(
+            contract=contract, event_type="swap", timestamp=bucket + timedelta(minutes=20)
+        )
+
+        result = aggregate_event_statistics.apply().get()
+
+        assert result["recounted"] is True
+        assert _counts(contract, bucket) == {"swap": 2, "": 2}
+
+    def test_recount_drops_rows_for_deleted_events(self, contract):
+        bucket = _last_bucket()
+        _ingested(contract, "swap", bucket + timedelta(minutes=5))
+        burn = _ingested(contract, "burn", bucket + timedelta(minutes=10))
+        flush_event_counters()
+        burn.delete()
+
+        result = aggregate_event_statistics.apply().get()
+
+        assert result["recounted"] is True
+        assert _counts(contract, bucket) == {"swap": 1, "": 1}
+
+    def test_flush_during_the_run_is_not_overwritten(self, contract, settings):
+        bucket = _last_bucket()
+        _ingested(contract, "swap", bucket + timedelta(minutes=5))
+
+        class FlushOnRead:
+            """Anomaly threshold that lands a counter flush when it is read."""
+
+            def __int__(self):
+                _ingested(contract, "swap", bucket + timedelta(minutes=30))
+                flush_event_counters()
+                return 50
+
+        settings.ANALYTICS_ANOMALY_DROP_PCT = FlushOnRead()
+
+        result = aggregate_event_statistics.apply().get()
+
+        assert result["recounted"] is False
+        assert _counts(contract, bucket) == {"swap": 2, "": 2}
+
+    def test_imported_events_are_counted(self, contract):
+        bucket = _last_bucket()
+        rows = [
+            {
+                "contract_id": contract.contract_id,
+                "event_type": "swap",
+                "payload": "{}",
+                "ledger": ledger,
+                "timestamp": (bucket + timedelta(minutes=ledger)).isoformat(),
+            }
+            for ledger in (1, 2)
+        ]
+
+        import_rows(rows, ImportResult())
+        result = aggregate_event_statistics.apply().get()
+
+        assert result["recounted"] is False
+        assert _counts(contract, bucket) == {"swap": 2, "": 2}
+
+    def test_current_hour_is_visible_before_the_rollup(self, contract):
+        now = timezone.now()
+        _ingested(contract, "swap", now)
+
+        flush_event_counters()
+
+        assert _counts(contract, hour_bucket(now)) == {"swap": 1, "": 1}
+
+    def test_recount_drops_counters_pending_for_the_bucket(self, contract):
+        bucket = _last_bucket()
+        # Committed and recorded, but not flushed before the recount runs.
+        _ingested(contract, "swap", bucket + timedelta(minutes=59))
+        ContractEventFactory(
+            contract=contract, event_type="swap", timestamp=bucket + timedelta(minutes=20)
+        )
+
+        with patch("soroscan.ingest.tasks._flush_event_counters", return_value=0):
+            result = aggregate_event_statistics.apply().get()
+        flush_event_counters()
+
+        assert result["recounted"] is True
+        assert _counts(contract, bucket) == {"swap": 2, "": 2}
+
+    def test_recount_keeps_counters_pending_for_other_buckets(self, contract):
+        bucket = _last_bucket()
+        now = timezone.now()
+        ContractEventFactory(contract=contract, event_type="swap", timestamp=bucket)
+        _ingested(contract, "mint", now)
+
+        with patch("soroscan.ingest.tasks._flush_event_counters", return_value=0):
+            aggregate_event_statistics.apply().get()
+        flush_event_counters()
+
+        assert _counts(contract, bucket) == {"swap": 1, "": 1}
+        assert _counts(contract, hour_bucket(now)) == {"mint": 1, "": 1}
+
+    def test_marked_older_buckets_are_recounted(self, contract):
+        old = _last_bucket() - timedelta(hours=5)
+        _ingested(contract, "swap", old + timedelta(minutes=5))
+        flush_event_counters()
+        ContractEventFactory(contract=contract, event_type="swap", timestamp=old)
+
+        result = aggregate_event_statistics.apply().get()
+
+        assert result["recounted_buckets"] == 1
+        assert _counts(contract, old) == {"swap": 2, "": 2}
+        assert result["total_events"] == 2
+
+    def test_recount_range_is_bounded_per_run(self, contract, settings):
+        settings.EVENT_RECOUNT_MAX_HOURS = 2
+        old = _last_bucket() - timedelta(hours=5)
+        for hours in (0, 3):
+            ContractEventFactory(
+                contract=contract, event_type="swap", timestamp=old + timedelta(hours=hours)
+            )
+        mark_recount(old)
+
+        first = aggregate_event_statistics.apply().get()
+        second = aggregate_event_statistics.apply().get()
+
+        assert first["recounted_buckets"] == 1
+        assert second["recounted_buckets"] == 1
+        assert _counts(contract, old + timedelta(hours=3)) == {"swap": 1, "": 1}
+
+    def test_unsettled_bucket_stays_marked(self, contract, settings):
+        settings.EVENT_RECOUNT_DELAY_SECONDS = 2 * 3600
+        bucket = _last_bucket()
+        ContractEventFactory(contract=contract, event_type="swap", timestamp=bucket)
+
+        result = aggregate_event_statistics.apply().get()
+
+        assert result["recounted"] is False
+        assert pop_recount() <= bucket
@@ -0,0 +1,224 @@
+"""
+Tests for the in-memory webhook/alert routing tables.
+"""
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from soroscan.ingest.event_router import (
+    clear_routes,
+    compile_condition,
+    event_time_range,
+    get_routes,
+    route_events,
+)
+from soroscan.ingest.models import AlertRule, WebhookSubscription
+from soroscan.ingest.tasks import evaluate_condition, process_new_events
+
+from .factories import ContractEventFactory, WebhookSubscriptionFactory
+
+
+@pytest.fixture(autouse=True)
+def _clear_routes():
+    clear_routes()
+    yield
+    clear_routes()
+
+
+def _event_data(event):
+    return {
+        "contract_id": event.contract.contract_id,
+        "event_type": event.event_type,
+        "payload": event.payload,
+        "ledger": event.ledger,
+        "event_index": event.event_index,
+    }
+
+
+_EVENT = {
+    "event_type": "transfer",
+    "ledger": 42,
+    "payload": {"amount": "1000", "to": "GABC", "flag": True, "tags": ["a"]},
+    "decodedPayload": {"amount": 1000.0, "memo": None},
+}
+
+
+@pytest.mark.parametrize(
+    "condition",
+    [
+        {"op": "eq", "field": "event_type", "value": "transfer"},
+        {"op": "eq", "field": "payload.amount", "value": 1000},
+        {"op": "eq", "field": "payload.flag", "value": 1},
+        {"op": "neq", "field": "decodedPayload.amount", "value": "1000.00"},
+        {"op": "gt", "field": "payload.amount", "value": 999},
+        {"op": "lte", "field": "ledger", "value": "41"},
+        {"op": "gte", "field": "payload.to", "value": 1},
+        {"op": "lt", "field": "ledger", "value": "not-a-number"},
+        {"op": "contains", "field": "payload.to", "value": "ab"},
+        {"op": "contains", "field": "decodedPayload.memo", "value": "x"},
+        {"op": "startswith", "field": "payload.to", "value": "GA"},
+        {"op": "in", "field": "payload.amount", "value": [5, 1000]},
+        {"op": "in", "field": "event_type", "value": "transfer"},
+        {"op": "regex", "field": "payload.to", "value": "^G[A-Z]+$"},
+        {"op": "regex", "field": "payload.to", "value": "("},
+        {"op": "regex", "field": "payload.missing", "value": "."},
+        {"op": "bogus", "field": "event_type", "value": "transfer"},
+        {"op": "NOT", "condition": {"op": "eq", "field": "ledger", "value": 42}},
+        {
+            "op": "and",
+            "conditions": [
+                {"op": "eq", "field": "event_type", "value": "transfer"},
+                {"op": "or", "conditions": [
+                    {"op": "gt", "field": "payload.amount", "value": 5000},
+                    {"op": "startswith", "field": "payload.to", "value": "G"},
+                ]},
+            ],
+        },
+        {"op": "or", "conditions": []},
+    ],
+)
+def test_compiled_condition_matches_evaluate_condition(condition):
+    assert compile_condition(condition)(_EVENT) == evaluate_condition(condition, _EVENT)
+
+
+@pytest.mark.django_db
+class TestRouteEvents:
+    def test_routes_by_event_type_wildcard_and_filter(self, contract):
+        swap = WebhookSubscriptionFactory(
+            contract=contract, event_type="swap", target_url="https://example.com/swap"
+        )
+        everything = WebhookSubscriptionFactory(
+            contract=contract, event_type="", target_url="https://example.com/all"
+        )
+        WebhookSubscriptionFactory(
+            contract=contract, event_type="transfer", target_url="https://example.com/transfer"
+        )
+        WebhookSubscriptionFactory(
+            contract=contract,
+            event_type="swap",
+            target_url="https://example.com/big-swaps",
+            filter_condition={"op": "gt", "field": "payload.amount", "value": 1000},
+        )
+        event = ContractEventFactory(contract=contract, event_type="swap")
+
+        deliveries, alerts = route_events([_event_data(event)])
+
+        assert deliveries == [(swap.id, event.id), (everything.id, event.id)]
+        assert alerts == []
+
+    def test_suspended_webhooks_are_not_routed(self, contract):
+        WebhookSubscriptionFactory(
+            contract=contract,
+            is_active=False,
+            status=WebhookSubscription.STATUS_SUSPENDED,
+        )
+        event = ContractEventFactory(contract=contract)
+
+        assert route_events([_event_data(event)]) == ([], [])
+
+    def test_batch_costs_one_event_query(self, contract):
+        WebhookSubscriptionFactory(contract=contract, event_type="")
+        events = [ContractEventFactory(contract=contract) for _ in range(20)]
+        get_routes([contract.contract_id])
+
+        with CaptureQueriesContext(connection) as queries:
+            deliveries, _ = route_events([_event_data(event) for event in events])
+
+        assert len(deliveries) == 20
+        assert len(queries) == 1
+
+    def test_event_query_is_bounded_by_the_batch_timestamps(self, contract):
+        WebhookSubscriptionFactory(contract=contract, event_type="")
+        events = [ContractEventFactory(contract=contract) for _ in range(3)]
+        batch = [
+            {**_event_data(event), "timestamp": event.timestamp.isoformat()} for event in events
+        ]
+        get_routes([contract.contract_id])
+
+        with CaptureQueriesContext(connection) as queries:
+            deliveries, _ = route_events(batch)
+
+        assert len(deliveries) == 3
+        assert "BETWEEN" in queries[0]["sql"]
+        assert event_time_range(batch) == (
+            min(event.timestamp for event in events),
+            max(event.timestamp for event in events),
+        )
+        assert event_time_range([_event_data(events[0])]) is None
+
+    def test_contracts_without_routes_skip_the_event_query(self, contract):
+        event = ContractEventFactory(contract=contract)
+        get_routes([contract.contract_id])
+
+        with CaptureQueriesContext(connection) as queries:
+            assert route_events([_event_data(event)]) == ([], [])
+
+        assert len(queries) == 0
+
+    def test_alert_rules_are_routed(self, contract):
+        rule = AlertRule.objects.create(
+            contract=contract,
+            name="Big swap",
+            condition={"op": "gte", "field": "payload.amount", "value": 100},
+            action_type="webhook",
+            action_target="https://example.com/hook",
+        )
+        AlertRule.objects.create(
+            contract=contract,
+            name="Never",
+            condition={"op": "eq", "field": "event_type", "value": "other"},
+            action_type="webhook",
+            action_target="https://example.com/hook",
+        )
+        event = ContractEventFactory(contract=contract)
+
+        assert route_events([_event_data(event)]) == ([], [(rule.id, event.id)])
+
+    def test_subscription_changes_rebuild_the_table(self, contract):
+        event = ContractEventFactory(contract=contract)
+        assert route_events([_event_data(event)]) == ([], [])
+
+        webhook = WebhookSubscriptionFactory(contract=contract)
+        assert route_events([_event_data(event)])[0] == [(webhook.id, event.id)]
+
+        webhook.is_active = False
+        webhook.save()
+        assert route_events([_event_data(event)]) == ([], [])
+
+    def test_delivery_bookkeeping_does_not_rebuild_the_table(self, contract):
+        webhook = WebhookSubscriptionFactory(contract=contract)
+        get_routes([contract.contract_id])
+
+        webhook.failure_count = 1
+        webhook.save(update_fields=["failure_count"])
+
+        with patch("soroscan.ingest.event_router._build_routes") as build:
+            get_routes([contract.contract_id])
+        build.assert_not_called()
+
+
+@pytest.mark.django_db
+class TestProcessNewEvents:
+    @patch("soroscan.ingest.tasks.send_alert.apply_async")
+    @patch("soroscan.ingest.tasks.dispatch_webhook.delay")
+    def test_batch_enqueues_deliveries_and_alerts(self, mock_delay, mock_alert, contract):
+        webhook = WebhookSubscriptionFactory(contract=contract, event_type="")
+        rule = AlertRule.objects.create(
+            contract=contract,
+            name="Any",
+            condition={"op": "eq", "field": "event_type", "value": "swap"},
+            action_type="webhook",
+            action_target="https://example.com/hook",
+        )
+        events = [ContractEventFactory(contract=contract) for _ in range(3)]
+
+        dispatched = process_new_events([_event_data(event) for event in events])
+
+        assert dispatched == 3
+        assert sorted(c.args for c in mock_delay.call_args_list) == sorted(
+            (webhook.id, event.id) for event in events
+        )
+        assert mock_alert.call_count == 3
+        assert mock_alert.call_args.kwargs["args"][0] == rule.id
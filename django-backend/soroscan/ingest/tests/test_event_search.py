@@ -0,0 +1,223 @@
+"""
+Tests for the indexed payload search used by REST ``search`` and GraphQL ``searchEvents``.
+"""
+import importlib
+from datetime import UTC, datetime, timedelta
+from io import StringIO
+from unittest.mock import MagicMock
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from soroscan.ingest.models import ContractEvent
+from soroscan.ingest.schema import schema
+from soroscan.ingest.services.event_search import (
+    filter_payload_contains,
+    filter_payload_field,
+    search_ranked,
+    search_text,
+)
+
+from .factories import ContractEventFactory
+
+search_migration = importlib.import_module("soroscan.ingest.migrations.0054_contractevent_payload_text")
+
+SEARCH_URL = "/api/ingest/events/search/"
+START = datetime(2026, 2, 1, tzinfo=UTC)
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def client(user):
+    api_client = APIClient()
+    api_client.force_authenticate(user=user)
+    return api_client
+
+
+@pytest.fixture
+def events(contract):
+    payloads = [
+        {"to": "GALICE", "amount": 5, "memo": "Coffee for Alice", "asset": {"code": "XLM"}},
+        {"to": "GBOB", "amount": 50, "memo": "alice alice alice rent", "asset": {"code": "USDC"}},
+        {"to": "GCAROL", "amount": 500, "memo": "salary", "asset": {"code": "USDC"}},
+        {"to": "100", "amount": 7, "memo": "numeric-looking string"},
+    ]
+    return [
+        ContractEventFactory(
+            contract=contract,
+            payload=payload,
+            timestamp=START + timedelta(minutes=index),
+            ledger=7000 + index,
+        )
+        for index, payload in enumerate(payloads)
+    ]
+
+
+def _ids(queryset):
+    return sorted(queryset.values_list("id", flat=True))
+
+
+@pytest.mark.django_db
+class TestPayloadText:
+    def test_generated_column_tracks_the_payload(self, events):
+        event = events[0]
+        stored = ContractEvent.objects.values_list("payload_text", flat=True).get(pk=event.pk)
+        assert "coffee for alice" in stored
+
+        ContractEvent.objects.filter(pk=event.pk).update(payload={"memo": "Updated"})
+
+        stored = ContractEvent.objects.values_list("payload_text", flat=True).get(pk=event.pk)
+        assert "updated" in stored and "alice" not in stored
+
+
+class TestSearchIndexMigration:
+    def test_indexes_are_built_concurrently_outside_a_transaction(self):
+        editor = MagicMock()
+        editor.connection.vendor = "postgresql"
+
+        search_migration._add_search_indexes(MagicMock(), editor)
+
+        assert search_migration.Migration.atomic is False
+        assert editor.add_index.call_count == 2
+        assert all(call.kwargs == {"concurrently": True} for call in editor.add_index.call_args_list)
+
+
+@pytest.mark.django_db
+class TestFilters:
+    def test_text_search_is_case_insensitive(self, events):
+        assert _ids(search_text(ContractEvent.objects.all(), "ALICE")) == [
+            events[0].pk,
+            events[1].pk,
+        ]
+
+    def test_payload_contains_object_uses_containment(self, events):
+        qs = filter_payload_contains(ContractEvent.objects.all(), '{"asset": {"code": "USDC"}}')
+
+        assert _ids(qs) == [events[1].pk, events[2].pk]
+
+    def test_payload_contains_plain_text_is_a_substring(self, events):
+        qs = filter_payload_contains(ContractEvent.objects.all(), "salary")
+
+        assert _ids(qs) == [events[2].pk]
+
+    @pytest.mark.parametrize(
+        ("op", "value", "expected"),
+        [
+            ("eq", "GBOB", [1]),
+            ("neq", "GBOB", [0, 2, 3]),
+            ("in", "GALICE, GCAROL", [0, 2]),
+            ("startswith", "gca", [2]),
+            ("contains", "aro", [2]),
+        ],
+    )
+    def test_string_operators(self, events, op, value, expected):
+        qs = filter_payload_field(ContractEvent.objects.all(), "to", op, value)
+
+        assert _ids(qs) == [events[index].pk for index in expected]
+
+    def test_numeric_comparisons_coerce_query_strings(self, events):
+        qs = filter_payload_field(ContractEvent.objects.all(), "amount", "gte", "50")
+
+        assert _ids(qs) == [events[1].pk, events[2].pk]
+
+    def test_eq_matches_string_and_number_forms(self, events):
+        strings = filter_payload_field(ContractEvent.objects.all(), "to", "eq", "100")
+        numbers = filter_payload_field(ContractEvent.objects.all(), "amount", "eq", "50")
+
+        assert _ids(strings) == [events[3].pk]
+        assert _ids(numbers) == [events[1].pk]
+
+    def test_nested_paths(self, events):
+        qs = filter_payload_field(ContractEvent.objects.all(), "asset.code", "eq", "XLM")
+
+        assert _ids(qs) == [events[0].pk]
+
+    def test_unknown_operator_is_rejected(self, events):
+        with pytest.raises(ValueError):
+            filter_payload_field(ContractEvent.objects.all(), "to", "regex", "x")
+
+
+@pytest.mark.django_db
+class TestRanking:
+    def test_scores_order_the_results(self, events):
+        ranked = list(search_ranked(ContractEvent.objects.all(), "alice"))
+
+        assert [event.pk for event in ranked] == [events[1].pk, events[0].pk]
+        assert ranked[0].relevance_score > ranked[1].relevance_score
+
+    def test_rest_rank_populates_relevance_score(self, client, events):
+        response = client.get(SEARCH_URL, {"q": "alice", "rank": "true"})
+
+        assert response.status_code == 200
+        scores = [row["relevance_score"] for row in response.data["results"]]
+        assert [row["id"] for row in response.data["results"]] == [events[1].pk, events[0].pk]
+        assert scores == sorted(scores, reverse=True) and scores[0] > 1.0
+
+    def test_rest_rank_needs_a_query_and_page_numbers(self, client, events):
+        assert client.get(SEARCH_URL, {"rank": "true"}).status_code == 400
+        response = client.get(SEARCH_URL, {"q": "alice", "rank": "true", "pagination": "cursor"})
+        assert response.status_code == 400
+
+    def test_graphql_rank(self, events):
+        result = schema.execute_sync(
+            """
+            query {
+              searchEvents(query: {query: "alice", rank: true}) { id relevanceScore }
+            }
+            """
+        )
+
+        assert result.errors is None
+        rows = result.data["searchEvents"]
+        assert [int(row["id"]) for row in rows] == [events[1].pk, events[0].pk]
+        assert rows[0]["relevanceScore"] > rows[1]["relevanceScore"]
+
+
+@pytest.mark.django_db
+class TestRestSearch:
+    def test_field_filter_via_query_params(self, client, events):
+        response = client.get(
+            SEARCH_URL, {"payload_field": "amount", "payload_op": "gt", "payload_value": "10"}
+        )
+
+        assert response.status_code == 200
+        assert sorted(row["id"] for row in response.data["results"]) == [
+            events[1].pk,
+            events[2].pk,
+        ]
+
+    def test_graphql_filters_and_payload_contains(self, events):
+        result = schema.execute_sync(
+            """
+            query {
+              searchEvents(query: {
+                payloadContains: "{\\"asset\\": {\\"code\\": \\"USDC\\"}}",
+                filters: {amount: {gt: "100"}}
+              }) { id }
+            }
+            """
+        )
+
+        assert result.errors is None
+        assert [int(row["id"]) for row in result.data["searchEvents"]] == [events[2].pk]
+
+
+@pytest.mark.django_db
+def test_benchmark_command_runs_on_a_small_table():
+    out = StringIO()
+
+    call_command("benchmark_search", events=300, batch_size=100, runs=1, stdout=out)
+    call_command("benchmark_search", drop=True, stdout=out)
+
+    output = out.getvalue()
+    assert "Seeding 300 events" in output
+    assert "field gte" in output and "ranked" in output
+    assert not ContractEvent.objects.exists()
@@ -11,14 +11,23 @@ from datetime import datetime, timezone as dt_timezone
 import pytest
 from django.core.management import call_command
 from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
-from soroscan.ingest.models import ContractEvent
+from soroscan.ingest.models import ContractEvent, IndexerState, LedgerCoverage
+from soroscan.ingest.services.cost_usage import DIRTY_KEY as USAGE_DIRTY_KEY
 from soroscan.ingest.services.export_import import (
     ImportResult,
+    _copy_value,
     export_csv,
     export_json,
+    export_sharded,
     import_csv,
     import_json,
+    import_ndjson,
+    import_rows,
+    iter_json_array,
+    ledger_shards,
 )
 from soroscan.ingest.tests.factories import ContractEventFactory, TrackedContractFactory
 
@@ -407,6 +416,67 @@ class TestStreamingExport:
         assert chunk_calls["count"] == 5
         assert len(json.loads(buf.getvalue())) == 5
 
+    def test_rows_follow_ledger_order_across_batches(self):
+        contract = TrackedContractFactory()
+        for ledger in (30, 10, 20, 10):
+            ContractEventFactory(contract=contract, ledger=ledger)
+
+        buf = io.StringIO()
+        export_json(contract.contract_id, buf, batch_size=1)
+        rows = json.loads(buf.getvalue())
+
+        assert [(r["ledger"], r["event_index"]) for r in rows] == sorted(
+            (r["ledger"], r["event_index"]) for r in rows
+        )
+        assert json.loads(rows[0]["payload"]) == ContractEvent.objects.get(
+            ledger=rows[0]["ledger"], event_index=rows[0]["event_index"]
+        ).payload
+
+    def test_ledger_shards(self):
+        assert ledger_shards(1, 10, 3) == [(1, 4), (5, 8), (9, 10)]
+        assert ledger_shards(5, 6, 4) == [(5, 5), (6, 6)]
+
+    def test_sharded_export_writes_files_and_manifest(self, tmp_path):
+        contract = TrackedContractFactory()
+        for ledger in range(100, 110):
+            ContractEventFactory(contract=contract, ledger=ledger)
+
+        call_command(
+            "export_events",
+            contract_id=contract.contract_id,
+            format="csv",
+            output=str(tmp_path),
+            shards=3,
+            workers=1,
+        )
+        manifest = json.loads((tmp_path / "manifest.json").read_text())
+
+        assert manifest["events"] == 10
+        assert (manifest["start_ledger"], manifest["end_ledger"]) == (100, 109)
+        assert [f["path"] for f in manifest["files"]] == [
+            "part-00000.csv",
+            "part-00001.csv",
+            "part-00002.csv",
+        ]
+        exported = []
+        for entry in manifest["files"]:
+            with open(tmp_path / entry["path"], newline="") as f:
+                rows = list(csv.DictReader(f))
+            assert len(rows) == entry["events"]
+            assert all(
+                entry["start_ledger"] <= int(r["ledger"]) <= entry["end_ledger"] for r in rows
+            )
+            exported.extend(int(r["ledger"]) for r in rows)
+        assert exported == list(range(100, 110))
+
+    def test_sharded_export_of_empty_range(self, tmp_path):
+        contract = TrackedContractFactory()
+
+        manifest = export_sharded("json", contract.contract_id, str(tmp_path), shards=4)
+
+        assert manifest["files"] == []
+        assert manifest["events"] == 0
+
 
 @pytest.mark.django_db
 class TestImportValidation:
@@ -419,3 +489,128 @@ class TestImportValidation:
         with pytest.raises(CommandError, match="validation error"):
             call_command("import_events", file=bad_file, format="json", fail_fast=True)
         assert ContractEvent.objects.filter(contract=contract).count() == 0
+
+
+def _rows(contract, ledgers):
+    return [
+        {
+            "contract_id": contract.contract_id,
+            "event_type": "transfer",
+            "payload": json.dumps({"ledger": ledger}),
+            "ledger": ledger,
+            "event_index": 0,
+            "timestamp": "2026-01-01T00:00:00+00:00",
+            "tx_hash": f"{ledger:064x}",
+        }
+        for ledger in ledgers
+    ]
+
+
+class TestStreamingParsers:
+    def test_json_array_is_parsed_across_chunk_boundaries(self):
+        data = [{"n": n, "text": "a,]\"[" * n} for n in range(20)] + [12345, "x"]
+        src = io.StringIO(json.dumps(data, indent=1))
+
+        assert list(iter_json_array(src, chunk_size=7)) == data
+
+    def test_json_must_be_an_array(self):
+        with pytest.raises(ValueError, match="top-level array"):
+            list(iter_json_array(io.StringIO('{"a": 1}')))
+
+    def test_truncated_json_is_rejected(self):
+        with pytest.raises(ValueError):
+            list(iter_json_array(io.StringIO('[{"a": 1}, {"b"'), chunk_size=4))
+
+    def test_copy_values_are_escaped(self):
+        assert _copy_value("raw_xdr", "a\tb\\c\nd") == "a\\tb\\\\c\\nd"
+        assert _copy_value("decoded_payload", None) == "\\N"
+        assert _copy_value("payload", "text") == '"text"'
+
+
+@pytest.mark.django_db
+class TestStreamingImport:
+    def test_counts_exactly_without_scanning_the_contract(self, settings):
+        settings.IMPORT_BATCH_SIZE = 2
+        contract = TrackedContractFactory()
+        ContractEventFactory(contract=contract, ledger=2, event_index=0)
+        ContractEventFactory(contract=contract, ledger=999, event_index=0)
+        rows = _rows(contract, [1, 2, 3, 3, 4])
+
+        with CaptureQueriesContext(connection) as queries:
+            result = import_rows(rows, ImportResult())
+
+        assert (result.imported, result.skipped) == (3, 2)
+        assert not any("COUNT(" in query["sql"].upper() for query in queries)
+        assert sorted(ContractEvent.objects.values_list("ledger", flat=True)) == [1, 2, 3, 4, 999]
+        assert list(
+            LedgerCoverage.objects.filter(contract=contract).values_list("start_ledger", "end_ledger")
+        ) == [(1, 4), (999, 999)]
+
+    def test_skips_rows_stored_with_an_earlier_timestamp(self):
+        # A file written before close times were stored carries the later
+        # indexing time of events already re-ingested with their close time.
+        contract = TrackedContractFactory()
+        ContractEventFactory(
+            contract=contract,
+            ledger=1,
+            event_index=0,
+            timestamp=datetime(2025, 12, 31, 23, 0, tzinfo=dt_timezone.utc),
+        )
+
+        result = import_rows(_rows(contract, [1, 2]), ImportResult())
+
+        assert (result.imported, result.skipped) == (1, 1)
+        assert sorted(ContractEvent.objects.values_list("ledger", flat=True)) == [1, 2]
+
+    def test_imported_days_are_marked_for_cost_recount(self):
+        contract = TrackedContractFactory()
+
+        import_rows(_rows(contract, [1, 2]), ImportResult())
+
+        assert IndexerState.objects.get(key=USAGE_DIRTY_KEY).value == "2026-01-01"
+
+    def test_ndjson(self):
+        contract = TrackedContractFactory()
+        src = io.StringIO("\n".join(json.dumps(row) for row in _rows(contract, [5, 6])) + "\n\n")
+
+        result = import_ndjson(src, ImportResult())
+
+        assert result.imported == 2
+
+    def test_resumes_after_the_checkpointed_rows(self, settings):
+        settings.IMPORT_BATCH_SIZE = 2
+        contract = TrackedContractFactory()
+        IndexerState.objects.create(key="import:test", value="3")
+
+        result = import_rows(_rows(contract, [1, 2, 3, 4, 5]), ImportResult(), checkpoint="import:test")
+
+        assert result.imported == 2
+        assert sorted(ContractEvent.objects.values_list("ledger", flat=True)) == [4, 5]
+        assert not IndexerState.objects.filter(key="import:test").exists()
+
+    def test_checkpoint_survives_a_failed_batch(self, settings):
+        settings.IMPORT_BATCH_SIZE = 2
+        contract = TrackedContractFactory()
+
+        def rows():
+            yield from _rows(contract, [1, 2, 3])
+            raise OSError("disk went away")
+
+        with pytest.raises(OSError):
+            import_rows(rows(), ImportResult(), checkpoint="import:test")
+
+        assert IndexerState.objects.get(key="import:test").value == "2"
+
+    def test_command_imports_several_files(self, tmp_path):
+        contract = TrackedContractFactory()
+        paths = []
+        for index, ledgers in enumerate([[1, 2], [3]]):
+            path = tmp_path / f"part{index}.ndjson"
+            path.write_text("\n".join(json.dumps(row) for row in _rows(contract, ledgers)))
+            paths.append(str(path))
+        out = io.StringIO()
+
+        call_command("import_events", "--file", paths[0], "--file", paths[1], "--resume", stdout=out)
+
+        assert "imported=3 skipped_duplicates=0 errors=0" in out.getvalue()
+        assert ContractEvent.objects.count() == 3
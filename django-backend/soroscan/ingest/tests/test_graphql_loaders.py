@@ -0,0 +1,141 @@
+"""
+Tests for the per-operation GraphQL batch loaders.
+"""
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from soroscan.ingest.loaders import Loaders
+from soroscan.ingest.models import (
+    ContractEvent,
+    ContractInvocation,
+    ContractMetadata,
+    ContractSource,
+    ContractVerification,
+    TrackedContract,
+)
+from soroscan.ingest.schema import schema
+
+from .factories import ContractEventFactory, TrackedContractFactory
+
+CONTRACTS_QUERY = """
+    query {
+      contracts {
+        contractId
+        eventCount
+        verificationStatus
+        metadata { name tags }
+      }
+    }
+"""
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _contracts(user, count, start=0):
+    contracts = []
+    for index in range(start, start + count):
+        contract = TrackedContractFactory(owner=user)
+        ContractEventFactory.create_batch(index % 3, contract=contract)
+        if index % 2:
+            ContractMetadata.objects.create(contract=contract, name=f"meta {index}", tags=["t"])
+        source = ContractSource.objects.create(
+            contract=contract, source_file="contract_sources/x.wasm", uploaded_by=user
+        )
+        ContractVerification.objects.create(
+            contract=contract, source=source, status=ContractVerification.Status.VERIFIED
+        )
+        contracts.append(contract)
+    return contracts
+
+
+def _run(query):
+    cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        result = schema.execute_sync(query)
+    assert result.errors is None, result.errors
+    return result.data, len(queries)
+
+
+@pytest.mark.django_db
+class TestContractFields:
+    def test_query_count_does_not_grow_with_contracts(self, user):
+        _contracts(user, 3)
+        _, few = _run(CONTRACTS_QUERY)
+
+        _contracts(user, 30, start=3)
+        data, many = _run(CONTRACTS_QUERY)
+
+        assert len(data["contracts"]) == 33
+        assert many == few
+
+    def test_values_match_per_object_lookups(self, user):
+        _contracts(user, 6)
+        data, _ = _run(CONTRACTS_QUERY)
+
+        for row in data["contracts"]:
+            contract = TrackedContract.objects.get(contract_id=row["contractId"])
+            assert row["eventCount"] == contract.events.count()
+            assert row["verificationStatus"] == contract.verification.status
+            metadata = ContractMetadata.objects.filter(contract=contract).first()
+            assert row["metadata"] == (
+                {"name": metadata.name, "tags": metadata.tags} if metadata else None
+            )
+
+    def test_event_count_is_served_from_the_count_cache(self, user):
+        contract = _contracts(user, 3)[2]
+        cache.set(f"event_count:{contract.contract_id}", 99)
+
+        with CaptureQueriesContext(connection):
+            result = schema.execute_sync(CONTRACTS_QUERY)
+
+        counts = {row["contractId"]: row["eventCount"] for row in result.data["contracts"]}
+        assert counts[contract.contract_id] == 99
+
+
+@pytest.mark.django_db
+class TestEventAndInvocationFields:
+    def test_contract_of_many_events_loads_once(self, user):
+        contracts = [TrackedContractFactory(owner=user) for _ in range(4)]
+        for contract in contracts:
+            ContractEventFactory(contract=contract, tx_hash="f" * 64)
+        loaders = Loaders()
+        events = list(ContractEvent.objects.filter(tx_hash="f" * 64))
+        loaders.register(events)
+
+        with CaptureQueriesContext(connection) as queries:
+            names = {loaders.contract(event).name for event in events}
+
+        assert names == {contract.name for contract in contracts}
+        assert len(queries) == 1
+
+    def test_invocation_events_and_their_contracts_are_batched(self, contract):
+        invocations = []
+        for index in range(5):
+            invocation = ContractInvocation.objects.create(
+                tx_hash=f"{index:064x}",
+                caller="G" * 56,
+                contract=contract,
+                function_name="swap",
+                parameters={},
+                ledger_sequence=index,
+            )
+            ContractEventFactory.create_batch(2, contract=contract, invocation=invocation)
+            invocations.append(invocation)
+        loaders = Loaders()
+        invocations = list(ContractInvocation.objects.filter(pk__in=[i.pk for i in invocations]))
+        loaders.register(invocations)
+
+        with CaptureQueriesContext(connection) as queries:
+            nested = [loaders.invocation_events(invocation) for invocation in invocations]
+            contract_ids = {loaders.contract(event).contract_id for events in nested for event in events}
+
+        assert [len(events) for events in nested] == [2] * 5
+        assert contract_ids == {contract.contract_id}
+        assert len(queries) == 2
@@ -1,10 +1,19 @@
 from dataclasses import dataclass
+from datetime import UTC, datetime
 
 import pytest
 from django.contrib.auth import get_user_model
 
-from soroscan.ingest.models import ContractEvent, TrackedContract
-from soroscan.ingest.tasks import BATCH_LEDGER_SIZE, backfill_contract_events
+from soroscan.ingest.models import ContractEvent, IndexerState, LedgerCoverage, TrackedContract
+from soroscan.ingest.services import event_bookkeeping
+from soroscan.ingest.services.cost_usage import DIRTY_KEY as USAGE_DIRTY_KEY
+from soroscan.ingest.tasks import (
+    BACKFILL_MAX_WINDOW_LEDGERS,
+    BACKFILL_MIN_WINDOW_LEDGERS,
+    BATCH_LEDGER_SIZE,
+    _next_backfill_window,
+    backfill_contract_events,
+)
 
 User = get_user_model()
 
@@ -18,6 +27,7 @@ class MockEvent:
     type: str
     value: dict
     xdr: str = ""
+    ledger_close_at: datetime | None = None
 
 
 @pytest.mark.django_db
@@ -77,3 +87,77 @@ def test_backfill_contract_events_1000_ledger_range(mocker):
     assert second_run["processed_events"] == 0
     assert ContractEvent.objects.filter(contract=contract).count() == 1000
     assert client_mock.get_events_range.call_count == 0
+
+
+@pytest.mark.parametrize(
+    ("window", "event_count", "ledger_span", "expected"),
+    [
+        (200, 200, 200, 200),  # density matches the target
+        (200, 0, 200, 400),  # empty window grows
+        (200, 20, 200, 400),  # sparse window grows at most 2x
+        (200, 4000, 200, 100),  # dense window shrinks at most 2x
+        (BACKFILL_MAX_WINDOW_LEDGERS, 0, 100, BACKFILL_MAX_WINDOW_LEDGERS),
+        (BACKFILL_MIN_WINDOW_LEDGERS, 10_000, 10, BACKFILL_MIN_WINDOW_LEDGERS),
+    ],
+)
+def test_next_backfill_window_adapts_to_density(window, event_count, ledger_span, expected):
+    assert _next_backfill_window(window, event_count, ledger_span) == expected
+
+
+@pytest.mark.django_db
+def test_backfill_windows_grow_over_sparse_ranges(mocker):
+    user = User.objects.create_user(username="sparse-user", password="secret")
+    contract = TrackedContract.objects.create(
+        contract_id="C" + ("b" * 55),
+        name="Sparse Contract",
+        owner=user,
+        is_active=True,
+    )
+    client_mock = mocker.Mock()
+    client_mock.get_events_range.return_value = []
+    mocker.patch("soroscan.ingest.tasks.SorobanClient", return_value=client_mock)
+
+    result = backfill_contract_events(contract.contract_id, 1, 3000)
+
+    windows = [
+        (call.args[1], call.args[2]) for call in client_mock.get_events_range.call_args_list
+    ]
+    assert windows == [(1, 200), (201, 600), (601, 1400), (1401, 3000)]
+    assert result["last_indexed_ledger"] == 3000
+
+
+@pytest.mark.django_db
+def test_backfill_records_coverage_and_usage_once_per_window(mocker):
+    user = User.objects.create_user(username="window-user", password="secret")
+    contract = TrackedContract.objects.create(
+        contract_id="C" + ("c" * 55), name="Window Contract", owner=user, is_active=True
+    )
+
+    def window(start_ledger: int, end_ledger: int, day: int) -> list[MockEvent]:
+        return [
+            MockEvent(
+                contract_id=contract.contract_id,
+                ledger=ledger,
+                event_index=0,
+                tx_hash=f"tx-{ledger}",
+                type="transfer",
+                value={"amount": ledger},
+                ledger_close_at=datetime(2026, 1, day, tzinfo=UTC),
+            )
+            for ledger in range(start_ledger, end_ledger + 1)
+        ]
+
+    client_mock = mocker.Mock()
+    client_mock.get_events_range.side_effect = [window(1, 200, 5), window(201, 400, 3)]
+    mocker.patch("soroscan.ingest.tasks.SorobanClient", return_value=client_mock)
+    record = mocker.patch.object(
+        event_bookkeeping, "record_ledgers", wraps=event_bookkeeping.record_ledgers
+    )
+
+    backfill_contract_events(contract.contract_id, 1, 400)
+
+    assert record.call_count == 2
+    assert list(
+        LedgerCoverage.objects.filter(contract=contract).values_list("start_ledger", "end_ledger")
+    ) == [(1, 400)]
+    assert IndexerState.objects.get(key=USAGE_DIRTY_KEY).value == "2026-01-03"
@@ -0,0 +1,170 @@
+"""
+Tests for keyset (cursor) pagination and count modes on the event listings.
+"""
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from soroscan.ingest.models import ContractEvent
+from soroscan.ingest.pagination import decode_cursor, encode_cursor
+
+from .factories import ContractEventFactory
+
+LIST_URL = "/api/ingest/events/"
+SEARCH_URL = "/api/ingest/events/search/"
+START = datetime(2026, 3, 1, tzinfo=UTC)
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def client(user):
+    api_client = APIClient()
+    api_client.force_authenticate(user=user)
+    return api_client
+
+
+@pytest.fixture
+def events(contract):
+    # Pairs share a timestamp so the id tie-break is exercised.
+    return [
+        ContractEventFactory(
+            contract=contract,
+            event_type="swap" if index % 3 else "mint",
+            timestamp=START + timedelta(minutes=index // 2),
+            ledger=5000 + index,
+        )
+        for index in range(11)
+    ]
+
+
+def _newest_first(events):
+    return [event.pk for event in sorted(events, key=lambda e: (e.timestamp, e.pk), reverse=True)]
+
+
+def _walk(client, url, params):
+    ids, pages = [], 0
+    response = client.get(url, params)
+    while True:
+        assert response.status_code == 200, response.data
+        ids.extend(row["id"] for row in response.data["results"])
+        pages += 1
+        cursor = response.data["next_cursor"]
+        if cursor is None:
+            return ids, pages
+        response = client.get(url, {**params, "cursor": cursor})
+
+
+@pytest.mark.django_db
+class TestCursor:
+    def test_round_trip(self):
+        timestamp = datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=UTC)
+
+        assert decode_cursor(encode_cursor(timestamp, 42)) == (timestamp, 42)
+
+    def test_invalid_cursor_is_a_bad_request(self, client, events):
+        for url in (LIST_URL, SEARCH_URL):
+            response = client.get(url, {"cursor": "not-a-cursor"})
+
+            assert response.status_code == 400
+            assert "cursor" in response.data
+
+
+@pytest.mark.django_db
+class TestEventListKeyset:
+    def test_walks_every_event_once_in_order(self, client, events):
+        ids, pages = _walk(client, LIST_URL, {"pagination": "cursor", "page_size": 3})
+
+        assert ids == _newest_first(events)
+        assert pages == 4
+
+    def test_next_link_carries_the_cursor(self, client, events):
+        response = client.get(LIST_URL, {"pagination": "cursor", "page_size": 5})
+
+        assert "cursor=" in response.data["next"]
+        assert response.data["count"] is None
+        follow = client.get(response.data["next"])
+        assert [row["id"] for row in follow.data["results"]] == _newest_first(events)[5:10]
+
+    def test_ascending_order_and_filters(self, client, events):
+        params = {"pagination": "cursor", "page_size": 2, "ordering": "timestamp"}
+        ids, _ = _walk(client, LIST_URL, {**params, "event_type": "swap"})
+
+        swaps = [event for event in events if event.event_type == "swap"]
+        assert ids == list(reversed(_newest_first(swaps)))
+
+    def test_other_orderings_are_rejected(self, client, events):
+        response = client.get(LIST_URL, {"pagination": "cursor", "ordering": "ledger"})
+
+        assert response.status_code == 400
+
+    def test_deep_pages_do_not_count_or_offset(self, client, events):
+        first = client.get(LIST_URL, {"pagination": "cursor", "page_size": 2})
+        with CaptureQueriesContext(connection) as queries:
+            client.get(LIST_URL, {"cursor": first.data["next_cursor"], "page_size": 2})
+
+        sql = " ".join(query["sql"].upper() for query in queries)
+        assert "COUNT(" not in sql
+        assert "OFFSET" not in sql
+
+    def test_page_numbers_still_count_exactly(self, client, events):
+        response = client.get(LIST_URL, {"page_size": 4, "page": 2})
+
+        assert response.data["count"] == len(events)
+        assert response.data["count_mode"] == "exact"
+        assert len(response.data["results"]) == 4
+
+
+@pytest.mark.django_db
+class TestCountModes:
+    def test_estimated_count_is_cached(self, client, contract, events):
+        response = client.get(LIST_URL, {"count": "estimated"})
+        assert response.data["count"] == len(events)
+        assert response.data["count_mode"] == "estimated"
+
+        ContractEventFactory(contract=contract, timestamp=START, ledger=9999)
+
+        response = client.get(LIST_URL, {"count": "estimated", "page_size": 5})
+        assert response.data["count"] == len(events)
+
+    def test_cursor_pages_count_on_request(self, client, events):
+        response = client.get(LIST_URL, {"pagination": "cursor", "count": "exact"})
+
+        assert response.data["count"] == len(events)
+
+    def test_none_requires_cursor_pages(self, client, events):
+        assert client.get(LIST_URL, {"count": "none"}).status_code == 400
+        assert client.get(LIST_URL, {"count": "bogus"}).status_code == 400
+
+
+@pytest.mark.django_db
+class TestSearchKeyset:
+    def test_walks_filtered_results(self, client, events):
+        params = {"pagination": "cursor", "page_size": 2, "event_type": "swap"}
+        ids, _ = _walk(client, SEARCH_URL, params)
+
+        swaps = [event for event in events if event.event_type == "swap"]
+        assert ids == _newest_first(swaps)
+
+    def test_counts_are_optional(self, client, events):
+        response = client.get(SEARCH_URL, {"pagination": "cursor", "count": "estimated"})
+
+        assert response.data["count"] == len(events)
+        assert client.get(SEARCH_URL, {"pagination": "cursor"}).data["count"] is None
+
+    def test_cache_ignores_unrelated_query_params(self, client, events):
+        client.get(SEARCH_URL, {"event_type": "swap"})
+        ContractEvent.objects.filter(event_type="swap").delete()
+
+        response = client.get(SEARCH_URL, {"event_type": "swap", "_": "1697"})
+
+        assert response.data["count"] > 0
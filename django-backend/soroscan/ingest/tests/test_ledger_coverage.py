@@ -0,0 +1,158 @@
+"""
+Tests for the run-length ledger coverage index (``LedgerCoverage``).
+"""
+import importlib
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from django.apps import apps as django_apps
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from soroscan.ingest.models import ContractEvent, LedgerCoverage
+from soroscan.ingest.services.ledger_coverage import (
+    contract_completeness,
+    ledger_runs,
+    merge_runs,
+    record_ledgers,
+    runs_from_events,
+    summarize_runs,
+)
+from soroscan.ingest.tasks import _ingest_events_batch
+
+from .factories import ContractEventFactory, TrackedContractFactory
+
+
+def _runs(contract):
+    return list(
+        LedgerCoverage.objects.filter(contract=contract).values_list("start_ledger", "end_ledger")
+    )
+
+
+class TestRuns:
+    def test_merge_joins_overlapping_and_adjacent_runs(self):
+        assert merge_runs([(10, 12), (1, 3), (4, 5), (11, 20), (30, 30)]) == [(1, 5), (10, 20), (30, 30)]
+
+    def test_ledger_runs(self):
+        assert ledger_runs([7, 3, 4, 4, 9, 8]) == [(3, 4), (7, 9)]
+
+    def test_summary(self):
+        summary = summarize_runs([(100, 101), (105, 106), (110, 110)])
+
+        assert summary["observed_ledgers"] == 5
+        assert summary["expected_ledgers"] == 11
+        assert summary["missing_ledgers"] == 6
+        assert summary["gaps"] == [
+            {"from_ledger": 102, "to_ledger": 104},
+            {"from_ledger": 107, "to_ledger": 109},
+        ]
+
+
+@pytest.mark.django_db
+class TestRecordLedgers:
+    def test_created_events_extend_the_index(self, contract):
+        for ledger in [10, 11, 13, 12, 20]:
+            ContractEventFactory(contract=contract, ledger=ledger)
+
+        assert _runs(contract) == [(10, 13), (20, 20)]
+
+    def test_merges_touching_runs_only(self, contract):
+        record_ledgers([(contract.pk, ledger) for ledger in [1, 2, 5, 9, 10]])
+        untouched = LedgerCoverage.objects.get(contract=contract, start_ledger=9)
+
+        record_ledgers([(contract.pk, 3), (contract.pk, 4)])
+
+        assert _runs(contract) == [(1, 5), (9, 10)]
+        assert LedgerCoverage.objects.filter(pk=untouched.pk).exists()
+
+    def test_batch_ingest_records_coverage(self, contract):
+        events = [
+            SimpleNamespace(
+                contract_id=contract.contract_id,
+                ledger=ledger,
+                id=f"{ledger:019d}-0000000000",
+                tx_hash=f"{ledger:064x}",
+                type="transfer",
+                value={},
+                xdr="",
+            )
+            for ledger in [100, 101, 103]
+        ]
+
+        _ingest_events_batch(events, "testnet", MagicMock())
+
+        assert _runs(contract) == [(100, 101), (103, 103)]
+
+    def test_rebuild_command_recomputes_from_events(self, contract):
+        for ledger in [5, 6, 8]:
+            ContractEventFactory(contract=contract, ledger=ledger)
+        ContractEvent.objects.filter(ledger=8).delete()
+        LedgerCoverage.objects.create(contract=contract, start_ledger=50, end_ledger=60)
+
+        call_command("rebuild_ledger_coverage", f"--contract={contract.pk}", stdout=MagicMock())
+
+        assert _runs(contract) == [(5, 6)]
+
+    def test_runs_from_events(self, contract):
+        for index, ledger in enumerate([3, 3, 4, 7, 9, 10]):
+            ContractEventFactory(contract=contract, ledger=ledger, event_index=index)
+
+        assert runs_from_events(ContractEvent.objects.filter(contract=contract)) == [
+            (3, 4),
+            (7, 7),
+            (9, 10),
+        ]
+
+
+@pytest.mark.django_db
+class TestSeedMigration:
+    def test_seeds_history_and_keeps_runs_recorded_since(self, contract):
+        for ledger in [20, 21, 25]:
+            ContractEventFactory(contract=contract, ledger=ledger)
+        LedgerCoverage.objects.all().delete()
+        record_ledgers([(contract.pk, 40)])
+        seed = importlib.import_module(
+            "soroscan.ingest.migrations.0058_seed_ledgercoverage"
+        ).seed_coverage
+
+        seed(django_apps, SimpleNamespace(connection=connection))
+
+        assert _runs(contract) == [(20, 21), (25, 25), (40, 40)]
+
+
+@pytest.mark.django_db
+class TestCompleteness:
+    def test_matches_the_stored_runs(self, contract):
+        record_ledgers([(contract.pk, ledger) for ledger in [10, 11, 14]])
+
+        summary = contract_completeness(contract)
+
+        assert summary["missing_ledgers"] == 2
+        assert summary["gaps"] == [{"from_ledger": 12, "to_ledger": 13}]
+        assert summary["completeness_percentage"] == 60.0
+
+    def test_query_count_does_not_grow_with_events(self, contract):
+        record_ledgers([(contract.pk, ledger) for ledger in range(1, 5000, 2)])
+
+        with CaptureQueriesContext(connection) as queries:
+            contract_completeness(contract)
+
+        assert len(queries) == 1
+
+    def test_dashboard_reports_every_visible_contract(self, user):
+        for _ in range(3):
+            contract = TrackedContractFactory(owner=user)
+            record_ledgers([(contract.pk, 1), (contract.pk, 3)])
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        response = client.get(reverse("contract-completeness-dashboard"))
+
+        assert response.status_code == 200
+        rows = response.data["contracts"]
+        assert len(rows) == 3
+        assert {row["missing_ledgers"] for row in rows} == {1}
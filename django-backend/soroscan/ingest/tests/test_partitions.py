@@ -0,0 +1,296 @@
+"""
+Tests for monthly ContractEvent partitioning helpers and partition-aware retention.
+"""
+import gzip
+import importlib
+import io
+import json
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from soroscan.ingest.archival import restore_batch
+from soroscan.ingest.models import (
+    AlertExecution,
+    AlertRule,
+    ArchivedEventBatch,
+    ContractEvent,
+    DataRetentionPolicy,
+)
+from soroscan.ingest.partitions import (
+    Partition,
+    _release_dependents,
+    drop_partitions_before,
+    ensure_partitions,
+    is_partitioned,
+    months_between,
+    partition_ddl,
+)
+from soroscan.ingest.services.export_import import ImportResult, import_rows
+from soroscan.ingest.tasks import (
+    _ingest_events_batch,
+    _ingest_events_serial,
+    _upsert_contract_event,
+    enforce_retention_policies,
+)
+
+from .factories import ContractEventFactory, TrackedContractFactory, WebhookDeliveryLogFactory
+
+migration = importlib.import_module("soroscan.ingest.migrations.0056_partition_contractevent")
+
+
+class TestPartition:
+    def test_month_bounds_and_name(self):
+        partition = Partition.for_month(datetime(2025, 12, 17, 9, 30, tzinfo=UTC))
+
+        assert partition.start == datetime(2025, 12, 1, tzinfo=UTC)
+        assert partition.end == datetime(2026, 1, 1, tzinfo=UTC)
+        assert partition.name == "ingest_contractevent_p2025_12"
+        assert Partition.from_name(partition.name) == partition
+
+    def test_other_tables_are_not_partitions(self):
+        assert Partition.from_name("ingest_contractevent_default") is None
+        assert Partition.from_name("ingest_contractevent_p2025_12_h0") is None
+
+    def test_months_between(self):
+        partitions = months_between(
+            datetime(2025, 11, 30, tzinfo=UTC), datetime(2026, 2, 1, tzinfo=UTC)
+        )
+
+        assert [p.name[-7:] for p in partitions] == ["2025_11", "2025_12", "2026_01", "2026_02"]
+
+    def test_hash_buckets(self):
+        ddl = partition_ddl(Partition.for_month(datetime(2026, 3, 5, tzinfo=UTC)), buckets=2)
+
+        assert ddl[0].endswith("PARTITION BY HASH (contract_id)")
+        assert "FROM ('2026-03-01T00:00:00+00:00') TO ('2026-04-01T00:00:00+00:00')" in ddl[0]
+        assert ddl[2] == (
+            'CREATE TABLE "ingest_contractevent_p2026_03_h1" PARTITION OF '
+            '"ingest_contractevent_p2026_03" FOR VALUES WITH (MODULUS 2, REMAINDER 1)'
+        )
+
+    def test_every_month_gets_an_event_key(self):
+        for buckets in (0, 2):
+            ddl = partition_ddl(Partition.for_month(datetime(2026, 3, 5, tzinfo=UTC)), buckets)
+
+            assert ddl[-1] == (
+                'CREATE UNIQUE INDEX IF NOT EXISTS "ingest_contractevent_p2026_03_event_key" '
+                'ON "ingest_contractevent_p2026_03" (contract_id, ledger, event_index)'
+            )
+
+
+class TestMigrationKeys:
+    def test_partition_key_is_added_to_unique_keys(self):
+        assert (
+            migration._with_partition_key("PRIMARY KEY (id)", True)
+            == 'PRIMARY KEY (id, "timestamp", contract_id)'
+        )
+        assert (
+            migration._with_partition_key("UNIQUE (contract_id, ledger, event_index)", True)
+            == 'UNIQUE (contract_id, ledger, event_index, "timestamp")'
+        )
+
+    def test_partition_key_is_removed_when_reverting(self):
+        assert (
+            migration._with_partition_key('PRIMARY KEY (id, "timestamp", contract_id)', False)
+            == "PRIMARY KEY (id)"
+        )
+        assert (
+            migration._with_partition_key('UNIQUE (contract_id, ledger, event_index, "timestamp")', False)
+            == "UNIQUE (contract_id, ledger, event_index)"
+        )
+
+
+@pytest.mark.django_db
+class TestPlainTable:
+    def test_sqlite_table_is_not_partitioned(self):
+        assert not is_partitioned()
+        assert ensure_partitions() == []
+        assert drop_partitions_before(timezone.now()) == []
+
+    def test_dependents_follow_their_on_delete(self, contract):
+        month = Partition.for_month(datetime(2024, 5, 1, tzinfo=UTC))
+        inside = ContractEventFactory(contract=contract, timestamp=month.start + timedelta(days=3))
+        outside = ContractEventFactory(contract=contract, timestamp=month.end)
+        rule = AlertRule.objects.create(
+            contract=contract, name="r", condition={}, action_type="webhook"
+        )
+        AlertExecution.objects.create(rule=rule, event=inside, status="sent")
+        kept = AlertExecution.objects.create(rule=rule, event=outside, status="sent")
+        log = WebhookDeliveryLogFactory(event=inside)
+
+        _release_dependents(month, "default")
+
+        assert list(AlertExecution.objects.values_list("pk", flat=True)) == [kept.pk]
+        log.refresh_from_db()
+        assert log.event_id is None
+
+
+@pytest.mark.django_db
+class TestEnsurePartitions:
+    def test_hash_buckets_are_skipped_when_keys_lack_contract_id(self, settings):
+        settings.EVENT_PARTITION_HASH_BUCKETS = 4
+        settings.EVENT_PARTITIONS_AHEAD = 0
+        with patch("soroscan.ingest.partitions.is_partitioned", return_value=True), patch(
+            "soroscan.ingest.partitions._keys_include_contract", return_value=False
+        ), patch("soroscan.ingest.partitions.existing_partitions", return_value=[]), patch(
+            "soroscan.ingest.partitions._create_partition"
+        ) as create:
+            ensure_partitions(datetime(2030, 1, 15, tzinfo=UTC))
+
+        (_, partition, buckets), _ = create.call_args
+        assert (partition.name, buckets) == ("ingest_contractevent_p2030_01", 0)
+
+    def test_hash_split_month_is_created_on_postgresql(self, settings):
+        if connection.vendor != "postgresql" or not is_partitioned():
+            pytest.skip("needs the partitioned PostgreSQL events table")
+        settings.EVENT_PARTITION_HASH_BUCKETS = 2
+        settings.EVENT_PARTITIONS_AHEAD = 0
+        contract = TrackedContractFactory()
+
+        created = ensure_partitions(datetime(2090, 1, 15, tzinfo=UTC))
+        ContractEventFactory(contract=contract, timestamp=datetime(2090, 1, 20, tzinfo=UTC))
+
+        assert created == ["ingest_contractevent_p2090_01"]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT COUNT(*) FROM "ingest_contractevent_p2090_01_h0"'
+                ' UNION ALL SELECT COUNT(*) FROM "ingest_contractevent_p2090_01_h1"'
+            )
+            assert sum(row[0] for row in cursor.fetchall()) == 1
+
+
+@pytest.mark.django_db
+class TestPartitionRetention:
+    def _drop(self):
+        with patch("soroscan.ingest.partitions.is_partitioned", return_value=True), patch(
+            "soroscan.ingest.partitions.drop_partitions_before", return_value=[]
+        ) as drop:
+            enforce_retention_policies()
+        return drop
+
+    def test_drops_partitions_past_every_contracts_cutoff(self):
+        short = TrackedContractFactory()
+        TrackedContractFactory()
+        DataRetentionPolicy.objects.create(contract=None, retention_days=90)
+        DataRetentionPolicy.objects.create(contract=short, retention_days=30)
+
+        drop = self._drop()
+
+        (cutoff,) = drop.call_args.args
+        assert timedelta(days=90) <= timezone.now() - cutoff < timedelta(days=90, minutes=1)
+
+    def test_keeps_partitions_while_a_contract_has_no_policy(self):
+        covered = TrackedContractFactory()
+        TrackedContractFactory()
+        DataRetentionPolicy.objects.create(contract=covered, retention_days=30)
+
+        self._drop().assert_not_called()
+
+
+STORED_AT = datetime(2026, 1, 15, 12, tzinfo=UTC)
+
+
+def _rpc_event(contract, timestamp):
+    return SimpleNamespace(
+        contract_id=contract.contract_id,
+        ledger=100,
+        id=f"{100:019d}-{0:010d}",
+        tx_hash="ab" * 32,
+        type="transfer",
+        value={"amount": 1},
+        xdr="",
+        ledger_close_at=timestamp,
+    )
+
+
+def _import_row(contract, timestamp):
+    return {
+        "contract_id": contract.contract_id,
+        "event_type": "transfer",
+        "payload": "{}",
+        "ledger": 100,
+        "event_index": 0,
+        "timestamp": timestamp.isoformat(),
+    }
+
+
+def _ingest_batch(contract, timestamp):
+    client = MagicMock()
+    client.get_invocation.side_effect = RuntimeError("offline")
+    _ingest_events_batch([_rpc_event(contract, timestamp)], "testnet", client)
+
+
+def _ingest_serial(contract, timestamp):
+    client = MagicMock()
+    client.get_invocation.side_effect = RuntimeError("offline")
+    _ingest_events_serial([_rpc_event(contract, timestamp)], "testnet", client)
+
+
+def _backfill(contract, timestamp):
+    _upsert_contract_event(
+        contract, {"ledger": 100, "event_index": 0, "type": "transfer", "timestamp": timestamp}
+    )
+
+
+def _import(contract, timestamp):
+    import_rows([_import_row(contract, timestamp)], ImportResult())
+
+
+def _restore(contract, timestamp):
+    row = {**_import_row(contract, timestamp), "contract__contract_id": contract.contract_id}
+    body = gzip.compress(json.dumps(row).encode() + b"\n")
+    s3 = MagicMock()
+    s3.get_object.side_effect = lambda **kwargs: {"Body": io.BytesIO(body)}
+    policy = DataRetentionPolicy.objects.create(contract=contract, retention_days=30, s3_bucket="b")
+    batch = ArchivedEventBatch.objects.create(
+        policy=policy, s3_key="events/batch.ndjson.gz", event_count=1, size_bytes=len(body)
+    )
+    restore_batch(batch, s3=s3)
+
+
+@pytest.mark.django_db
+class TestEventKeyUniqueness:
+    """Every insert path keeps one row per (contract, ledger, event_index)."""
+
+    @pytest.mark.parametrize(
+        "insert", [_ingest_batch, _ingest_serial, _backfill, _import, _restore]
+    )
+    def test_path_writes_a_new_key(self, insert, contract):
+        insert(contract, STORED_AT)
+
+        assert ContractEvent.objects.filter(contract=contract, ledger=100, event_index=0).count() == 1
+
+    @pytest.mark.parametrize(
+        "insert", [_ingest_batch, _ingest_serial, _backfill, _import, _restore]
+    )
+    @pytest.mark.parametrize("offset", [timedelta(hours=-1), timedelta(hours=1)])
+    def test_same_key_with_another_timestamp(self, insert, offset, contract):
+        ContractEventFactory(contract=contract, ledger=100, event_index=0, timestamp=STORED_AT)
+
+        insert(contract, STORED_AT + offset)
+
+        assert ContractEvent.objects.filter(contract=contract, ledger=100, event_index=0).count() == 1
+
+    def test_partition_rejects_a_duplicate_on_postgresql(self, contract):
+        if connection.vendor != "postgresql" or not is_partitioned():
+            pytest.skip("needs the partitioned PostgreSQL events table")
+        ContractEventFactory(contract=contract, ledger=100, event_index=0, timestamp=STORED_AT)
+
+        with pytest.raises(IntegrityError), transaction.atomic():
+            ContractEvent.objects.bulk_create(
+                [
+                    ContractEvent(
+                        contract=contract,
+                        ledger=100,
+                        event_index=0,
+                        event_type="transfer",
+                        payload={},
+                        timestamp=STORED_AT + timedelta(hours=1),
+                    )
+                ]
+            )
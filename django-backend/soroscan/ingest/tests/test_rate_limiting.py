@@ -2,13 +2,22 @@
 Tests for ingest-time rate limiting.
 """
 
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
 import pytest
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
 from rest_framework.exceptions import Throttled
 
-from soroscan.ingest.models import TrackedContract
-from soroscan.ingest.rate_limit import check_ingest_rate
+from soroscan.ingest.models import ContractEvent, TrackedContract
+from soroscan.ingest.rate_limit import (
+    _incr_window,
+    check_ingest_rate,
+    clear_token_leases,
+    reserve_ingest_tokens,
+)
+from soroscan.ingest.tasks import _backfill_ledger_windows, _iter_ingest_records
 
 User = get_user_model()
 
@@ -79,3 +88,144 @@ class TestIngestRateLimiting:
 
         # Should allow events again
         assert check_ingest_rate(contract) is True
+
+
+@pytest.fixture
+def limited_contract(db):
+    cache.clear()
+    clear_token_leases()
+    user = User.objects.create_user(username="limited", password="testpass")
+    yield TrackedContract.objects.create(
+        contract_id="C" + "L" * 55,
+        name="Limited",
+        owner=user,
+        max_events_per_minute=1000,
+    )
+    clear_token_leases()
+
+
+@pytest.mark.django_db
+class TestReserveIngestTokens:
+    def test_batch_reservation_is_capped_at_limit(self, limited_contract):
+        limited_contract.max_events_per_minute = 5
+
+        assert reserve_ingest_tokens(limited_contract, 3) == 3
+        assert reserve_ingest_tokens(limited_contract, 3) == 2
+        assert reserve_ingest_tokens(limited_contract, 3) == 0
+
+    def test_lease_serves_later_requests_without_cache_calls(self, limited_contract, settings):
+        settings.INGEST_RATE_LEASE_WORKERS = 1
+        assert reserve_ingest_tokens(limited_contract, 1) == 1
+
+        with patch("soroscan.ingest.rate_limit._incr_window") as incr:
+            for _ in range(100):
+                assert check_ingest_rate(limited_contract) is True
+
+        incr.assert_not_called()
+
+    def test_leased_tokens_count_against_the_limit(self, limited_contract, settings):
+        settings.INGEST_RATE_LEASE_WORKERS = 1
+        limited_contract.max_events_per_minute = 200
+
+        assert reserve_ingest_tokens(limited_contract, 150) == 150
+        clear_token_leases()  # another worker holds the rest of the lease
+
+        assert reserve_ingest_tokens(limited_contract, 100) == 30
+
+    def test_unused_leases_are_capped_across_workers(self, limited_contract, settings):
+        settings.INGEST_RATE_LEASE_WORKERS = 4
+        limited_contract.max_events_per_minute = 200
+
+        for _ in range(4):  # every worker leases and then goes idle
+            assert reserve_ingest_tokens(limited_contract, 10) == 10
+            clear_token_leases()
+
+        assert reserve_ingest_tokens(limited_contract, 200) == 140
+
+    def test_cache_errors_fail_open(self, limited_contract):
+        with patch(
+            "soroscan.ingest.rate_limit._incr_window", side_effect=ConnectionError("down")
+        ):
+            assert reserve_ingest_tokens(limited_contract, 10) == 10
+
+    def test_unlimited_contract(self, limited_contract):
+        limited_contract.max_events_per_minute = None
+
+        assert reserve_ingest_tokens(limited_contract, 500) == 500
+
+    def test_page_ingest_reserves_once_per_contract(self, limited_contract):
+        limited_contract.max_events_per_minute = 3
+        events = [
+            SimpleNamespace(
+                contract_id=limited_contract.contract_id,
+                ledger=100,
+                id=f"{100:019d}-{i:010d}",
+                tx_hash=f"{i:064x}",
+                type="transfer",
+                value={"amount": i},
+                xdr="",
+            )
+            for i in range(5)
+        ]
+        client = MagicMock()
+        client.get_invocations.return_value = {}
+
+        with patch(
+            "soroscan.ingest.tasks.get_cached_contract", return_value=limited_contract
+        ), patch(
+            "soroscan.ingest.rate_limit._incr_window", wraps=_incr_window
+        ) as incr:
+            records = list(_iter_ingest_records(events, "testnet", client))
+
+        assert len(records) == 3
+        incr.assert_called_once()
+
+    def test_backfill_reserves_once_per_window(self, limited_contract, settings):
+        settings.INGEST_RATE_LEASE_WORKERS = 1
+        limited_contract.max_events_per_minute = 1000
+        limited_contract.save(update_fields=["max_events_per_minute"])
+        client = MagicMock()
+        client.get_events_range.return_value = [
+            SimpleNamespace(
+                contract_id=limited_contract.contract_id,
+                ledger=100 + i,
+                event_index=0,
+                tx_hash=f"{i:064x}",
+                type="transfer",
+                value={"amount": i},
+                xdr="",
+            )
+            for i in range(5)
+        ]
+
+        with patch(
+            "soroscan.ingest.tasks.reserve_ingest_tokens", wraps=reserve_ingest_tokens
+        ) as reserve, patch("soroscan.ingest.tasks.check_ingest_rate") as per_event:
+            _backfill_ledger_windows(limited_contract, client, 100, 104, lambda ledger: None)
+
+        reserve.assert_called_once_with(limited_contract, 5)
+        per_event.assert_not_called()
+
+    def test_backfill_checkpoints_before_the_first_throttled_ledger(self, limited_contract):
+        limited_contract.max_events_per_minute = 3
+        limited_contract.save(update_fields=["max_events_per_minute"])
+        client = MagicMock()
+        client.get_events_range.return_value = [
+            SimpleNamespace(
+                contract_id=limited_contract.contract_id,
+                ledger=100 + i,
+                event_index=0,
+                tx_hash=f"{i:064x}",
+                type="transfer",
+                value={"amount": i},
+                xdr="",
+            )
+            for i in range(5)
+        ]
+        checkpoints = []
+
+        with pytest.raises(Throttled):
+            _backfill_ledger_windows(limited_contract, client, 100, 104, checkpoints.append)
+
+        assert checkpoints == [102]
+        assert ContractEvent.objects.filter(contract=limited_contract).count() == 3
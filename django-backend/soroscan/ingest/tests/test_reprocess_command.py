@@ -34,6 +34,8 @@ class TestReprocessEventsCommand:
             last_checkpoint_id=500,
             dry_run=True,
             rolled_back=True,
+            events_per_second=1234.5,
+            committed_through_id=5,
         )
         reprocess_mock = mocker.patch(
             "soroscan.ingest.management.commands.reprocess_events.reprocess_contract_events",
@@ -47,16 +49,19 @@ class TestReprocessEventsCommand:
             batch_size=250,
             checkpoint_id=5,
             rollback_on_error=True,
+            workers=None,
         )
 
         captured = capsys.readouterr()
         assert "reprocess_events completed" in captured.out
         assert "processed=10/10" in captured.out
         assert "dry_run=True" in captured.out
+        assert "1234.5 events/sec" in captured.out
         reprocess_mock.assert_called_once_with(
             fake_result.contract_id,
             dry_run=True,
             batch_size=250,
             checkpoint_id=5,
             rollback_on_error=True,
+            workers=None,
         )
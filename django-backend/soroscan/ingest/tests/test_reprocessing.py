@@ -1,10 +1,20 @@
+import billiard
 import pytest
 from django.core.exceptions import ObjectDoesNotExist
+from django.utils import timezone
 
-from soroscan.ingest.models import AdminAction
-from soroscan.ingest.reprocessing import _progress, reprocess_contract_events
+from soroscan.ingest.models import AdminAction, ContractEvent, IndexerState
+from soroscan.ingest.reprocessing import (
+    ReprocessContext,
+    _create_pool,
+    _process_in_worker,
+    _progress,
+    process_rows,
+    reprocess_contract_events,
+)
+from soroscan.ingest.schema_registry import compile_validator
 
-from .factories import ContractEventFactory, TrackedContractFactory
+from .factories import ContractEventFactory, EventSchemaFactory, TrackedContractFactory
 
 
 @pytest.mark.django_db
@@ -27,11 +37,11 @@ class TestReprocessContractEvents:
             signature_status="missing",
         )
 
-        mocker.patch("soroscan.ingest.reprocessing.validate_event_payload", return_value=(False, 2))
-        mocker.patch("soroscan.ingest.reprocessing.resolve_signature_status", return_value="valid")
-        decode_mock = mocker.patch("soroscan.ingest.reprocessing._try_decode_event")
+        mocker.patch("soroscan.ingest.reprocessing._validate_payload", return_value=(False, 2))
+        mocker.patch("soroscan.ingest.reprocessing._check_signature", return_value="valid")
+        decode_mock = mocker.patch("soroscan.ingest.reprocessing._decode", return_value={})
 
-        result = reprocess_contract_events(contract.contract_id, batch_size=10)
+        result = reprocess_contract_events(contract.contract_id, batch_size=10, workers=1)
 
         event.refresh_from_db()
         assert event.validation_status == "failed"
@@ -60,11 +70,11 @@ class TestReprocessContractEvents:
             signature_status="missing",
         )
 
-        mocker.patch("soroscan.ingest.reprocessing.validate_event_payload", return_value=(False, 3))
-        mocker.patch("soroscan.ingest.reprocessing.resolve_signature_status", return_value="invalid")
-        mocker.patch("soroscan.ingest.reprocessing._try_decode_event")
+        mocker.patch("soroscan.ingest.reprocessing._validate_payload", return_value=(False, 3))
+        mocker.patch("soroscan.ingest.reprocessing._check_signature", return_value="invalid")
+        mocker.patch("soroscan.ingest.reprocessing._decode", return_value={})
 
-        result = reprocess_contract_events(contract.contract_id, dry_run=True)
+        result = reprocess_contract_events(contract.contract_id, dry_run=True, workers=1)
 
         event.refresh_from_db()
         # Event stays unchanged because dry-run marks transaction rollback.
@@ -81,11 +91,13 @@ class TestReprocessContractEvents:
         older = ContractEventFactory(contract=contract)
         newer = ContractEventFactory(contract=contract)
 
-        mocker.patch("soroscan.ingest.reprocessing.validate_event_payload", return_value=(True, None))
-        mocker.patch("soroscan.ingest.reprocessing.resolve_signature_status", return_value="missing")
-        decode_mock = mocker.patch("soroscan.ingest.reprocessing._try_decode_event")
+        mocker.patch("soroscan.ingest.reprocessing._validate_payload", return_value=(True, None))
+        mocker.patch("soroscan.ingest.reprocessing._check_signature", return_value="missing")
+        decode_mock = mocker.patch("soroscan.ingest.reprocessing._decode", return_value={})
 
-        result = reprocess_contract_events(contract.contract_id, checkpoint_id=older.id)
+        result = reprocess_contract_events(
+            contract.contract_id, checkpoint_id=older.id, workers=1
+        )
 
         assert result.total_events == 1
         assert result.processed_events == 1
@@ -96,12 +108,12 @@ class TestReprocessContractEvents:
         contract = TrackedContractFactory()
         ContractEventFactory(contract=contract)
 
-        mocker.patch("soroscan.ingest.reprocessing.validate_event_payload", return_value=(True, None))
-        mocker.patch("soroscan.ingest.reprocessing.resolve_signature_status", return_value="missing")
-        mocker.patch("soroscan.ingest.reprocessing._try_decode_event", side_effect=RuntimeError("decode failed"))
+        mocker.patch("soroscan.ingest.reprocessing._validate_payload", return_value=(True, None))
+        mocker.patch("soroscan.ingest.reprocessing._check_signature", return_value="missing")
+        mocker.patch("soroscan.ingest.reprocessing._decode", side_effect=RuntimeError("decode failed"))
 
         with pytest.raises(RuntimeError):
-            reprocess_contract_events(contract.contract_id)
+            reprocess_contract_events(contract.contract_id, workers=1)
 
         assert AdminAction.objects.filter(action="reprocess_events_started").exists()
         assert AdminAction.objects.filter(action="reprocess_events_failed").exists()
@@ -109,3 +121,163 @@ class TestReprocessContractEvents:
     def test_reprocess_missing_contract_raises(self):
         with pytest.raises(ObjectDoesNotExist):
             reprocess_contract_events("C" + "A" * 55)
+
+    def test_reprocess_continues_past_failed_batch_without_rollback(self, mocker):
+        contract = TrackedContractFactory()
+        first = ContractEventFactory(contract=contract, signature_status="missing")
+        second = ContractEventFactory(contract=contract, signature_status="missing")
+        mocker.patch(
+            "soroscan.ingest.reprocessing._check_signature",
+            side_effect=[RuntimeError("boom"), "valid"],
+        )
+
+        result = reprocess_contract_events(
+            contract.contract_id, batch_size=1, rollback_on_error=False, workers=1
+        )
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert result.failed_events == 1
+        assert result.processed_events == 1
+        assert result.last_checkpoint_id == second.id
+        assert first.signature_status == "missing"
+        assert second.signature_status == "valid"
+
+    def test_reprocess_clears_checkpoint_after_completing(self, mocker):
+        contract = TrackedContractFactory()
+        ContractEventFactory(contract=contract)
+        last = ContractEventFactory(contract=contract)
+        EventSchemaFactory(
+            contract=contract,
+            event_type=last.event_type,
+            json_schema={"type": "object", "required": ["never_present"]},
+        )
+
+        result = reprocess_contract_events(contract.contract_id, workers=1)
+
+        assert not IndexerState.objects.filter(key=f"reprocess:{contract.pk}").exists()
+        assert result.committed_through_id == last.id
+        assert result.updated_events >= 1
+        assert result.events_per_second >= 0
+
+    def test_failed_run_keeps_committed_chunks_and_next_run_resumes(self, mocker):
+        contract = TrackedContractFactory()
+        first, second, third = ContractEventFactory.create_batch(3, contract=contract)
+        mocker.patch("soroscan.ingest.reprocessing._validate_payload", return_value=(False, 2))
+        mocker.patch("soroscan.ingest.reprocessing._check_signature", return_value="missing")
+        mocker.patch(
+            "soroscan.ingest.reprocessing._decode",
+            side_effect=[{}, RuntimeError("boom"), {}, {}],
+        )
+
+        with pytest.raises(RuntimeError):
+            reprocess_contract_events(contract.contract_id, batch_size=1, workers=1)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert first.validation_status == "failed"
+        assert second.validation_status != "failed"
+        failure = AdminAction.objects.get(action="reprocess_events_failed")
+        assert failure.changes["committed_through_id"] == first.id
+
+        result = reprocess_contract_events(contract.contract_id, batch_size=1, workers=1)
+
+        assert result.processed_events == 2
+        assert result.committed_through_id == third.id
+        assert ContractEvent.objects.filter(validation_status="failed").count() == 3
+
+    def test_process_pool_matches_in_process_results(self):
+        contract = TrackedContractFactory()
+        EventSchemaFactory(
+            contract=contract,
+            event_type="transfer",
+            json_schema={"type": "object", "required": ["amount"]},
+        )
+        ContractEvent.objects.bulk_create(
+            ContractEventFactory.build(
+                contract=contract,
+                event_type="transfer",
+                payload={"amount": i} if i % 3 else {"to": "G"},
+                ledger=1000 + i,
+                event_index=0,
+                timestamp=timezone.now(),
+            )
+            for i in range(120)
+        )
+
+        result = reprocess_contract_events(contract.contract_id, batch_size=200, workers=2)
+
+        assert result.processed_events == 120
+        statuses = dict(
+            ContractEvent.objects.filter(contract=contract).values_list("ledger", "validation_status")
+        )
+        assert statuses[1000] == "failed"
+        assert statuses[1001] == "passed"
+        assert list(statuses.values()).count("failed") == 40
+
+    def test_schemas_are_compiled_once_per_run(self, mocker):
+        contract = TrackedContractFactory()
+        EventSchemaFactory(contract=contract, event_type="transfer", json_schema={"type": "object"})
+        ContractEventFactory.create_batch(3, contract=contract, event_type="transfer")
+        compile_mock = mocker.patch(
+            "soroscan.ingest.reprocessing.compile_validator",
+            wraps=compile_validator,
+        )
+
+        reprocess_contract_events(contract.contract_id, batch_size=1, workers=1)
+
+        assert compile_mock.call_count == 1
+
+
+def _map_in_daemon(queue):
+    context = ReprocessContext(contract_id="C", schemas={}, signing_key=None, abi_json=None)
+    pool = _create_pool(2, context)
+    try:
+        queue.put(pool.map(_process_in_worker, [[(1, "swap", {}, "")], [(2, "swap", {}, "")]]))
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+class TestPool:
+    def test_daemonic_process_gets_a_pool(self):
+        # Celery prefork children are daemonic, as this process is.
+        ctx = billiard.get_context("fork")
+        queue = ctx.Queue()
+        process = ctx.Process(target=_map_in_daemon, args=(queue,), daemon=True)
+        process.start()
+        results = queue.get(timeout=30)
+        process.join(timeout=30)
+
+        assert [rows[0][0] for rows in results] == [1, 2]
+        assert results[0][0][1]["validation_status"] == "passed"
+
+
+@pytest.mark.django_db
+class TestProcessRows:
+    def test_rows_are_validated_against_latest_schema(self):
+        contract = TrackedContractFactory()
+        EventSchemaFactory(contract=contract, event_type="swap", version=1, json_schema={"type": "object"})
+        EventSchemaFactory(
+            contract=contract,
+            event_type="swap",
+            version=2,
+            json_schema={"type": "object", "required": ["pool"]},
+        )
+        context = ReprocessContext.for_contract(contract)
+
+        results = dict(
+            process_rows(
+                context,
+                [(1, "swap", {"pool": "x"}, ""), (2, "swap", {}, ""), (3, "other", "raw", "")],
+            )
+        )
+
+        assert results[1]["validation_status"] == "passed"
+        assert results[1]["schema_version"] == 2
+        assert results[2]["validation_status"] == "failed"
+        assert results[3] == {
+            "validation_status": "passed",
+            "schema_version": None,
+            "signature_status": "missing",
+        }
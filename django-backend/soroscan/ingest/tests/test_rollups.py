@@ -0,0 +1,218 @@
+"""
+Tests for the daily/weekly/monthly EventRollup tiers and tiered analytics queries.
+"""
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from soroscan.ingest.models import EventAggregation, EventRollup, IndexerState
+from soroscan.ingest.rollups import DIRTY_KEY, get_watermarks, mark_dirty, roll_up
+
+from .factories import TrackedContractFactory
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def client(user):
+    api_client = APIClient()
+    api_client.force_authenticate(user=user)
+    return api_client
+
+
+def _top_of_hour():
+    return timezone.now().replace(minute=0, second=0, microsecond=0)
+
+
+def _seed(contracts, days=70, step_hours=7):
+    """Hourly rows every *step_hours* over the last *days* days."""
+    now = _top_of_hour()
+    rows = []
+    for offset, contract in enumerate(contracts):
+        for hours_back in range(1 + offset, days * 24, step_hours):
+            timestamp = now - timedelta(hours=hours_back)
+            count = (hours_back % 13) + 1
+            for event_type in ("", "swap") if hours_back % 2 else ("", "mint"):
+                rows.append(
+                    EventAggregation(
+                        contract=contract,
+                        event_type=event_type,
+                        timestamp=timestamp,
+                        event_count=count,
+                        is_anomaly=event_type == "" and hours_back % 29 == 0,
+                    )
+                )
+    EventAggregation.objects.bulk_create(rows)
+
+
+def _volume(client, granularity, range_, **params):
+    response = client.get(
+        reverse("analytics-event-volume"),
+        {"granularity": granularity, "range": range_, **params},
+    )
+    assert response.status_code == 200
+    return response.data["data"]
+
+
+@pytest.mark.django_db
+class TestRollUp:
+    def test_builds_every_tier_up_to_the_current_period(self, contract):
+        _seed([contract], days=40)
+        now = timezone.now()
+
+        written = roll_up()
+
+        assert set(written) == {"day", "week", "month"}
+        watermarks = get_watermarks()
+        assert watermarks["day"] == now.replace(hour=0, minute=0, second=0, microsecond=0)
+        assert watermarks["month"].day == 1
+        assert watermarks["week"].weekday() == 0
+
+        rolled = sum(
+            EventRollup.objects.filter(resolution="day", event_type="").values_list(
+                "event_count", flat=True
+            )
+        )
+        hourly = sum(
+            EventAggregation.objects.filter(
+                event_type="", timestamp__lt=watermarks["day"]
+            ).values_list("event_count", flat=True)
+        )
+        assert rolled == hourly
+
+    def test_second_run_without_changes_writes_nothing(self, contract):
+        _seed([contract], days=10)
+        roll_up()
+
+        assert roll_up() == {}
+
+    def test_dirty_bucket_rebuilds_its_periods(self, contract):
+        _seed([contract], days=10)
+        roll_up()
+        row = EventAggregation.objects.filter(
+            event_type="", timestamp__lt=timezone.now() - timedelta(days=3)
+        ).first()
+        day = row.timestamp.replace(hour=0)
+        before = EventRollup.objects.get(
+            resolution="day", contract=contract, event_type="", timestamp=day
+        ).event_count
+
+        row.event_count += 100
+        row.save()
+        mark_dirty(row.timestamp)
+        roll_up()
+
+        assert EventRollup.objects.get(
+            resolution="day", contract=contract, event_type="", timestamp=day
+        ).event_count == before + 100
+        assert not IndexerState.objects.filter(key=DIRTY_KEY).exists()
+
+    def test_marks_keep_the_earliest_bucket_and_skip_the_lock_when_later(self):
+        earlier = _top_of_hour() - timedelta(days=5)
+        mark_dirty(earlier + timedelta(days=1))
+        mark_dirty(earlier)
+
+        with CaptureQueriesContext(connection) as queries:
+            mark_dirty(earlier + timedelta(days=2))
+
+        assert len(queries) == 1
+        assert IndexerState.objects.get(key=DIRTY_KEY).value == earlier.isoformat()
+
+    def test_buckets_of_the_current_day_are_not_marked(self):
+        mark_dirty(_top_of_hour())
+
+        assert not IndexerState.objects.filter(key=DIRTY_KEY).exists()
+
+    def test_rebuild_command(self, contract, capsys):
+        _seed([contract], days=5)
+
+        call_command("rebuild_event_rollups")
+
+        assert "Event rollups rebuilt" in capsys.readouterr().out
+        assert EventRollup.objects.filter(resolution="day").exists()
+
+
+@pytest.mark.django_db
+class TestTieredQueries:
+    @pytest.mark.parametrize(
+        ("granularity", "range_"),
+        [("daily", "30d"), ("weekly", "90d"), ("monthly", "1y"), ("hourly", "7d")],
+    )
+    def test_event_volume_matches_hourly_answer(self, client, user, granularity, range_):
+        contracts = [TrackedContractFactory(owner=user) for _ in range(2)]
+        _seed(contracts)
+        expected = _volume(client, granularity, range_)
+
+        roll_up()
+        cache.clear()
+
+        assert _volume(client, granularity, range_) == expected
+        assert _volume(client, granularity, range_, event_type="swap") == _hourly_only(
+            client, granularity, range_, event_type="swap"
+        )
+
+    def test_rolled_up_periods_are_read_from_the_tier(self, client, contract):
+        _seed([contract], days=20)
+        roll_up()
+        expected = _volume(client, "daily", "30d")
+        watermark = get_watermarks()["day"]
+
+        EventAggregation.objects.filter(timestamp__lt=watermark - timedelta(days=1)).delete()
+
+        assert _volume(client, "daily", "30d") == expected
+
+    def test_top_contracts_and_breakdown_match(self, client, user):
+        _seed([TrackedContractFactory(owner=user) for _ in range(3)])
+        top = client.get(reverse("analytics-top-contracts"), {"range": "1y"}).data
+        breakdown = client.get(reverse("analytics-event-type-breakdown"), {"range": "1y"}).data
+
+        roll_up()
+
+        assert client.get(reverse("analytics-top-contracts"), {"range": "1y"}).data == top
+        assert (
+            client.get(reverse("analytics-event-type-breakdown"), {"range": "1y"}).data
+            == breakdown
+        )
+
+    def test_anomalies_by_period(self, client, contract):
+        _seed([contract], days=40)
+        flagged = EventAggregation.objects.filter(event_type="", is_anomaly=True).count()
+        roll_up()
+
+        response = client.get(
+            reverse("analytics-anomalies"), {"range": "1y", "granularity": "monthly"}
+        )
+
+        assert response.status_code == 200
+        rows = response.data["anomalies"]
+        assert sum(row["anomaly_count"] for row in rows) == flagged
+        assert [row["timestamp"] for row in rows] == sorted(
+            (row["timestamp"] for row in rows), reverse=True
+        )
+
+    def test_anomalies_rejects_unknown_granularity(self, client):
+        response = client.get(reverse("analytics-anomalies"), {"granularity": "yearly"})
+
+        assert response.status_code == 400
+
+
+def _hourly_only(client, granularity, range_, **params):
+    watermarks = IndexerState.objects.filter(key__startswith="rollup:")
+    saved = list(watermarks.values_list("key", "value"))
+    watermarks.delete()
+    try:
+        return _volume(client, granularity, range_, **params)
+    finally:
+        IndexerState.objects.bulk_create(IndexerState(key=k, value=v) for k, v in saved)
@@ -0,0 +1,125 @@
+"""
+Tests for the compiled JSON Schema validator registry.
+"""
+from unittest.mock import patch
+
+import jsonschema
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from soroscan.ingest.schema_registry import (
+    clear_validators,
+    compile_validator,
+    get_contract_validator,
+    get_event_validator,
+    validate_payloads,
+)
+from soroscan.ingest.tasks import validate_contract_payload_schema, validate_event_payload
+
+from .factories import EventSchemaFactory, TrackedContractFactory
+
+
+@pytest.fixture(autouse=True)
+def _clear_validators():
+    clear_validators()
+    yield
+    clear_validators()
+
+
+class TestCompileValidator:
+    def test_draft_follows_dollar_schema(self):
+        validator = compile_validator(
+            {"$schema": "http://json-schema.org/draft-07/schema#", "type": "object"}
+        )
+
+        assert isinstance(validator, jsonschema.Draft7Validator)
+
+    def test_invalid_schema_raises(self):
+        with pytest.raises(jsonschema.SchemaError):
+            compile_validator({"type": "not-a-type"})
+
+
+@pytest.mark.django_db
+class TestEventValidators:
+    def test_latest_version_is_compiled_once(self, contract):
+        EventSchemaFactory(contract=contract, event_type="swap", version=1)
+        EventSchemaFactory(contract=contract, event_type="swap", version=2)
+
+        with patch(
+            "soroscan.ingest.schema_registry.compile_validator",
+            side_effect=compile_validator,
+        ) as compile_mock:
+            first = get_event_validator(contract, "swap")
+            second = get_event_validator(contract, "swap")
+
+        assert first[0] == 2
+        assert first[1] is second[1]
+        compile_mock.assert_called_once()
+
+    def test_repeated_validation_does_not_query(self, contract):
+        EventSchemaFactory(contract=contract, event_type="swap")
+        validate_event_payload(contract, "swap", {"amount": 1})
+
+        with CaptureQueriesContext(connection) as queries:
+            for amount in range(20):
+                validate_event_payload(contract, "swap", {"amount": amount})
+
+        assert len(queries) == 0
+
+    def test_schema_save_invalidates_compiled_validator(self, contract):
+        schema = EventSchemaFactory(contract=contract, event_type="swap")
+        assert validate_event_payload(contract, "swap", {"amount": "x"}) == (False, 1)
+
+        schema.json_schema = {"type": "object"}
+        schema.save()
+
+        assert validate_event_payload(contract, "swap", {"amount": "x"}) == (True, 1)
+
+    def test_new_version_is_picked_up(self, contract):
+        EventSchemaFactory(contract=contract, event_type="swap", version=1)
+        assert get_event_validator(contract, "swap")[0] == 1
+
+        EventSchemaFactory(contract=contract, event_type="swap", version=2)
+
+        assert get_event_validator(contract, "swap")[0] == 2
+
+    def test_missing_schema(self, contract):
+        assert get_event_validator(contract, "unknown") is None
+        assert validate_event_payload(contract, "unknown", {"a": 1}) == (True, None)
+
+    def test_validate_payloads_batch(self, contract):
+        EventSchemaFactory(contract=contract, event_type="swap", version=3)
+
+        results = validate_payloads(
+            contract, "swap", [{"amount": 1}, {"amount": "x"}, None, "raw"]
+        )
+
+        assert results == [(True, 3), (False, 3), (True, None), (True, None)]
+
+    def test_validate_payloads_without_schema(self, contract):
+        assert validate_payloads(contract, "swap", [{"amount": "x"}]) == [(True, None)]
+
+
+@pytest.mark.django_db
+class TestContractValidator:
+    def test_unset_schema(self):
+        contract = TrackedContractFactory(json_schema=None)
+
+        assert get_contract_validator(contract) is None
+        assert validate_contract_payload_schema(contract, {"a": 1}, "swap") is True
+
+    def test_validator_shared_for_equal_schemas(self):
+        schema = {"type": "object", "required": ["amount"]}
+        first = TrackedContractFactory(json_schema=schema)
+        second = TrackedContractFactory(json_schema=dict(schema))
+
+        assert get_contract_validator(first) is get_contract_validator(second)
+
+    def test_failure_is_logged_with_message(self, caplog):
+        contract = TrackedContractFactory(
+            json_schema={"type": "object", "required": ["amount"]}
+        )
+
+        assert validate_contract_payload_schema(contract, {}, "swap", ledger=5) is False
+        assert "'amount' is a required property" in caplog.text
@@ -0,0 +1,166 @@
+"""
+Tests for the sharded backfill orchestrator.
+"""
+import json
+from dataclasses import dataclass
+
+import pytest
+
+from soroscan.ingest.models import ContractEvent, IndexerState
+from soroscan.ingest.tasks import (
+    _advance_backfill_low_watermark,
+    _backfill_shard_key,
+    backfill_contract_shard,
+    orchestrate_backfill,
+)
+
+from .factories import TrackedContractFactory
+
+
+@dataclass
+class MockEvent:
+    contract_id: str
+    ledger: int
+    event_index: int
+    tx_hash: str
+    type: str
+    value: dict
+    xdr: str = ""
+
+
+@pytest.fixture
+def rpc(mocker):
+    client = mocker.Mock()
+
+    def events_range(contract_id, start, end):
+        return [
+            MockEvent(contract_id, ledger, 0, f"tx-{ledger}", "transfer", {"n": ledger})
+            for ledger in range(start, end + 1)
+            if ledger % 10 == 0
+        ]
+
+    client.get_events_range.side_effect = events_range
+    mocker.patch("soroscan.ingest.tasks.SorobanClient", return_value=client)
+    return client
+
+
+def _set_state(contract, shard_start, shard_end, checkpoint, from_ledger=None):
+    key = _backfill_shard_key(contract.pk, shard_start, shard_end)
+    IndexerState.objects.update_or_create(
+        key=key,
+        defaults={
+            "value": json.dumps(
+                {
+                    "from_ledger": from_ledger or shard_start,
+                    "to_ledger": shard_end,
+                    "checkpoint": checkpoint,
+                }
+            )
+        },
+    )
+    return key
+
+
+@pytest.mark.django_db
+class TestOrchestrateBackfill:
+    def test_shards_cover_range_and_advance_watermark(self, rpc):
+        contract = TrackedContractFactory(last_indexed_ledger=None)
+
+        summary = orchestrate_backfill(contract.contract_id, 1, 2500, shard_size=1000)
+
+        assert summary["shards_dispatched"] == 3
+        contract.refresh_from_db()
+        assert contract.last_indexed_ledger == 2500
+        assert ContractEvent.objects.filter(contract=contract).count() == 250
+        assert not IndexerState.objects.filter(key__startswith="backfill:").exists()
+
+    def test_resume_skips_finished_shards(self, rpc):
+        contract = TrackedContractFactory(last_indexed_ledger=None)
+        _set_state(contract, 0, 999, 999, from_ledger=1)
+        _set_state(contract, 1000, 1999, 1499)
+
+        orchestrate_backfill(contract.contract_id, 1, 2999, shard_size=1000)
+
+        fetched = [(c.args[1], c.args[2]) for c in rpc.get_events_range.call_args_list]
+        assert min(start for start, _ in fetched) == 1500
+        contract.refresh_from_db()
+        assert contract.last_indexed_ledger == 2999
+
+    def test_nothing_to_do_when_already_indexed(self, rpc):
+        contract = TrackedContractFactory(last_indexed_ledger=5000)
+
+        summary = orchestrate_backfill(contract.contract_id, 1, 4000, shard_size=1000)
+
+        assert summary["shards_dispatched"] == 0
+        rpc.get_events_range.assert_not_called()
+
+    def test_invalid_range_rejected(self):
+        contract = TrackedContractFactory()
+
+        with pytest.raises(ValueError):
+            orchestrate_backfill(contract.contract_id, 10, 5)
+
+
+@pytest.mark.django_db
+class TestLowWatermark:
+    def test_does_not_skip_unfinished_lower_shard(self):
+        contract = TrackedContractFactory(last_indexed_ledger=None)
+        _set_state(contract, 0, 999, 500, from_ledger=1)
+        _set_state(contract, 1000, 1999, 1999)
+
+        assert _advance_backfill_low_watermark(contract.pk) == 500
+
+        _set_state(contract, 0, 999, 999, from_ledger=1)
+
+        assert _advance_backfill_low_watermark(contract.pk) == 1999
+        assert not IndexerState.objects.filter(key__startswith="backfill:").exists()
+
+    def test_keeps_unfinished_shards_below_live_tip(self, rpc):
+        contract = TrackedContractFactory(last_indexed_ledger=None)
+        lower = _set_state(contract, 0, 999, 400, from_ledger=1)
+        upper = _set_state(contract, 1000, 1999, 1999)
+        # Live ingest moved the contract to the chain tip meanwhile.
+        contract.last_indexed_ledger = 5000
+        contract.save(update_fields=["last_indexed_ledger"])
+
+        assert _advance_backfill_low_watermark(contract.pk) == 5000
+        assert IndexerState.objects.filter(key__in=[lower, upper]).count() == 2
+
+        result = backfill_contract_shard(contract.contract_id, lower)
+
+        fetched = [(c.args[1], c.args[2]) for c in rpc.get_events_range.call_args_list]
+        assert min(start for start, _ in fetched) == 401
+        assert result["created_events"] == 59
+        assert not IndexerState.objects.filter(key__startswith="backfill:").exists()
+
+    def test_rerun_resumes_shards_below_live_tip(self, rpc):
+        contract = TrackedContractFactory(last_indexed_ledger=5000)
+        _set_state(contract, 0, 999, 400, from_ledger=1)
+
+        summary = orchestrate_backfill(contract.contract_id, 1, 999, shard_size=1000)
+
+        assert summary["shards_dispatched"] == 1
+        fetched = [(c.args[1], c.args[2]) for c in rpc.get_events_range.call_args_list]
+        assert min(start for start, _ in fetched) == 401
+        assert not IndexerState.objects.filter(key__startswith="backfill:").exists()
+
+    def test_never_moves_backwards(self):
+        contract = TrackedContractFactory(last_indexed_ledger=3000)
+        _set_state(contract, 0, 999, 999, from_ledger=1)
+
+        assert _advance_backfill_low_watermark(contract.pk) == 3000
+
+
+@pytest.mark.django_db
+def test_shard_checkpoints_each_window(rpc):
+    contract = TrackedContractFactory(last_indexed_ledger=None)
+    key = _set_state(contract, 0, 999, None, from_ledger=1)
+    _set_state(contract, 1000, 1999, None)
+
+    result = backfill_contract_shard(contract.contract_id, key)
+
+    assert result["created_events"] == 99
+    state = json.loads(IndexerState.objects.get(key=_backfill_shard_key(contract.pk, 1000, 1999)).value)
+    assert state["checkpoint"] is None
+    contract.refresh_from_db()
+    assert contract.last_indexed_ledger == 999
@@ -38,6 +38,18 @@ def client(valid_keypair, valid_contract_id):
     )
 
 
+@pytest.fixture(autouse=True)
+def clear_invocation_cache():
+    from django.core.cache import cache
+
+    from soroscan.ingest.stellar_client import get_invocation_cache
+
+    get_invocation_cache().clear()
+    cache.clear()
+    yield
+    get_invocation_cache().clear()
+
+
 class TestSorobanClient:
     def test_client_initialization(self, client):
         assert client.rpc_url == "https://soroban-testnet.stellar.org"
@@ -177,3 +189,223 @@ class TestSorobanClient:
         result = client.get_total_events()
 
         assert result is None
+
+
+class TestIterEventsRange:
+    @staticmethod
+    def _page(ledgers, cursor=None):
+        return MagicMock(
+            events=[MagicMock(ledger=ledger) for ledger in ledgers],
+            cursor=cursor,
+        )
+
+    def test_follows_cursor_until_empty_page(self, client, valid_contract_id):
+        client.server = MagicMock()
+        client.server.get_events.side_effect = [
+            self._page([10, 11], cursor="c1"),
+            self._page([12, 13], cursor="c2"),
+            self._page([14], cursor="c3"),
+            self._page([], cursor="c3"),
+        ]
+
+        pages = list(client.iter_events_range(valid_contract_id, 10, 20, page_size=2))
+
+        assert [[e.ledger for e in page] for page in pages] == [[10, 11], [12, 13], [14]]
+        calls = client.server.get_events.call_args_list
+        assert calls[0].kwargs["start_ledger"] == 10
+        assert calls[0].kwargs["end_ledger"] == 21
+        assert calls[1].kwargs["cursor"] == "c1"
+        assert "start_ledger" not in calls[1].kwargs
+        assert calls[2].kwargs["cursor"] == "c2"
+        assert calls[3].kwargs["cursor"] == "c3"
+
+    def test_short_page_with_cursor_continues(self, client, valid_contract_id):
+        client.server = MagicMock()
+        client.server.get_events.side_effect = [
+            self._page([10], cursor="c1"),
+            self._page([15, 16], cursor="c2"),
+            self._page([17], cursor="c3"),
+            self._page([], cursor="c3"),
+        ]
+
+        pages = list(client.iter_events_range(valid_contract_id, 10, 20, page_size=2))
+
+        assert [e.ledger for page in pages for e in page] == [10, 15, 16, 17]
+
+    def test_page_ending_on_end_ledger_continues(self, client, valid_contract_id):
+        client.server = MagicMock()
+        client.server.get_events.side_effect = [
+            self._page([19, 20], cursor="c1"),
+            self._page([20, 21], cursor="c2"),
+        ]
+
+        pages = list(client.iter_events_range(valid_contract_id, 10, 20, page_size=2))
+
+        assert [e.ledger for page in pages for e in page] == [19, 20, 20]
+        assert client.server.get_events.call_count == 2
+
+    def test_stops_at_events_past_end_ledger(self, client, valid_contract_id):
+        client.server = MagicMock()
+        client.server.get_events.side_effect = [
+            self._page([10, 11], cursor="c1"),
+            self._page([12, 25], cursor="c2"),
+        ]
+
+        pages = list(client.iter_events_range(valid_contract_id, 10, 20, page_size=2))
+
+        assert [e.ledger for page in pages for e in page] == [10, 11, 12]
+
+    def test_stops_when_cursor_does_not_advance(self, client, valid_contract_id):
+        client.server = MagicMock()
+        client.server.get_events.side_effect = [
+            self._page([10, 11], cursor="c1"),
+            self._page([12, 13], cursor="c1"),
+        ]
+
+        pages = list(client.iter_events_range(valid_contract_id, 10, 20, page_size=2))
+
+        assert sum(len(page) for page in pages) == 4
+        assert client.server.get_events.call_count == 2
+
+    def test_empty_range_makes_no_request(self, client, valid_contract_id):
+        client.server = MagicMock()
+
+        assert client.get_events_range(valid_contract_id, 20, 10) == []
+        client.server.get_events.assert_not_called()
+
+
+class TestRateLimiterReserve:
+    def test_reservations_queue_without_holding_lock(self):
+        from soroscan.ingest.stellar_client import RateLimiter
+
+        limiter = RateLimiter(rate=2)
+        waits = [limiter.reserve() for _ in range(4)]
+
+        assert waits[0] == 0 and waits[1] == 0
+        assert waits[2] == pytest.approx(0.5, abs=0.05)
+        assert waits[3] == pytest.approx(1.0, abs=0.05)
+        assert not limiter.lock.locked()
+
+
+class TestGetInvocations:
+    def test_dedupes_hashes_and_serves_cache_hits(self, client):
+        from soroscan.ingest.stellar_client import InvocationData
+
+        cached = InvocationData("G", "C", "fn", {}, None, 1, True)
+        client._add_to_cache("cached", cached)
+        fetched = []
+
+        def fake_fetch(tx_hash):
+            fetched.append(tx_hash)
+            return InvocationData("G", "C", tx_hash, {}, None, 1, True)
+
+        with patch.object(client, "_fetch_invocation", side_effect=fake_fetch):
+            results = client.get_invocations(["a", "b", "a", "cached", "", "b"])
+
+        assert sorted(fetched) == ["a", "b"]
+        assert results["cached"] is cached
+        assert results["a"].function_name == "a"
+        assert set(results) == {"a", "b", "cached"}
+
+    def test_fetches_run_concurrently(self, client):
+        import threading
+
+        from soroscan.ingest.stellar_client import InvocationData
+
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fake_fetch(tx_hash):
+            barrier.wait()
+            return InvocationData("G", "C", tx_hash, {}, None, 1, True)
+
+        with patch.object(client, "_fetch_invocation", side_effect=fake_fetch):
+            results = client.get_invocations(["a", "b", "c"])
+
+        assert len(results) == 3
+
+    def test_misses_are_looked_up_once(self, client):
+        from soroscan.ingest.stellar_client import InvocationData
+
+        with patch.object(client, "_get_from_cache", return_value=None) as lookup, patch.object(
+            client, "_rate_limiter"
+        ), patch.object(client.server, "get_transaction", return_value=None):
+            results = client.get_invocations(["a", "b"])
+
+        assert lookup.call_count == 2
+        assert all(isinstance(r, InvocationData) and not r.success for r in results.values())
+
+
+class TestInvocationCache:
+    @staticmethod
+    def _data(name="fn"):
+        from soroscan.ingest.stellar_client import InvocationData
+
+        return InvocationData("G", "C", name, {"a": 1}, None, 7, True)
+
+    def test_evicts_least_recently_used(self):
+        from soroscan.ingest.stellar_client import InvocationCache
+
+        lru = InvocationCache(max_size=2, ttl=60, use_shared_cache=False)
+        lru.set("a", self._data("a"))
+        lru.set("b", self._data("b"))
+        assert lru.get("a").function_name == "a"
+
+        lru.set("c", self._data("c"))
+
+        assert lru.get("b") is None
+        assert lru.get("a") is not None
+        assert lru.get("c") is not None
+        assert len(lru) == 2
+
+    def test_expired_entries_are_dropped(self):
+        from soroscan.ingest.stellar_client import InvocationCache
+
+        lru = InvocationCache(max_size=10, ttl=60, use_shared_cache=False)
+        with patch("soroscan.ingest.stellar_client.time.monotonic", return_value=1000.0):
+            lru.set("a", self._data())
+        with patch("soroscan.ingest.stellar_client.time.monotonic", return_value=1061.0):
+            assert lru.get("a") is None
+        assert len(lru) == 0
+
+    def test_shared_tier_warms_other_processes(self):
+        from django.core.cache import cache
+
+        from soroscan.ingest.stellar_client import InvocationCache
+
+        cache.delete("invocation:shared-tx")
+        writer = InvocationCache(max_size=10, ttl=60)
+        reader = InvocationCache(max_size=10, ttl=60)
+
+        writer.set("shared-tx", self._data("shared"))
+        data = reader.get("shared-tx")
+
+        assert data == self._data("shared")
+        assert len(reader) == 1
+
+    def test_counters_exported(self):
+        from soroscan.ingest import metrics
+        from soroscan.ingest.stellar_client import InvocationCache
+
+        def value(counter):
+            return counter.labels(cache_type="invocation")._value.get()
+
+        hits, misses, evictions = (
+            value(metrics.cache_hits_total),
+            value(metrics.cache_misses_total),
+            value(metrics.cache_evictions_total),
+        )
+        lru = InvocationCache(max_size=1, ttl=60, use_shared_cache=False)
+        lru.set("a", self._data())
+        lru.get("a")
+        lru.get("missing")
+        lru.set("b", self._data())
+
+        assert value(metrics.cache_hits_total) == hits + 1
+        assert value(metrics.cache_misses_total) == misses + 1
+        assert value(metrics.cache_evictions_total) == evictions + 1
+
+    def test_clients_share_one_cache(self, valid_keypair):
+        first = SorobanClient(secret_key=valid_keypair.secret)
+        second = SorobanClient(secret_key=valid_keypair.secret)
+
+        assert first._invocation_cache is second._invocation_cache
@@ -0,0 +1,203 @@
+"""
+Tests for fan-out-once delivery of live ``contractEvents`` subscriptions.
+"""
+import asyncio
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from channels.layers import get_channel_layer
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from soroscan.ingest.event_router import clear_routes, get_routes
+from soroscan.ingest.schema import schema
+from soroscan.ingest.subscriptions import (
+    SubscriberQueue,
+    build_envelope,
+    envelope_to_event,
+    event_type_filter,
+)
+from soroscan.ingest.tasks import process_new_events
+
+from .factories import ContractEventFactory, WebhookSubscriptionFactory
+
+CONTRACT_ID = "C" + "F" * 55
+
+SUBSCRIPTION = """
+    subscription ($types: [String!]) {
+      contractEvents(contractId: "%s", eventTypes: $types) {
+        id eventType ledger payload timestamp contractId contractName transactionId
+      }
+    }
+""" % CONTRACT_ID
+
+
+def _envelope(event_id, event_type="transfer", ledger=100):
+    return build_envelope(
+        {
+            "id": event_id,
+            "contract_id": 7,
+            "contract__contract_id": CONTRACT_ID,
+            "contract__name": "Fan-out",
+            "event_type": event_type,
+            "payload": {"amount": event_id},
+            "payload_hash": "a" * 64,
+            "decoded_payload": None,
+            "decoding_status": "no_abi",
+            "ledger": ledger,
+            "event_index": 0,
+            "timestamp": datetime(2026, 3, 1, tzinfo=UTC),
+            "tx_hash": "b" * 64,
+            "schema_version": None,
+            "validation_status": "passed",
+            "signature_status": "missing",
+        }
+    )
+
+
+def _message(envelope):
+    data = {"contract_id": CONTRACT_ID, "event_type": envelope["event_type"]}
+    return {"type": "contract_event", "data": data, "event": envelope}
+
+
+class TestEnvelope:
+    def test_round_trip_needs_no_database(self):
+        event = envelope_to_event(_envelope(5))
+
+        assert event.id == 5
+        assert event.contract.contract_id == CONTRACT_ID
+        assert event.timestamp == datetime(2026, 3, 1, tzinfo=UTC)
+        assert event.payload == {"amount": 5}
+
+    def test_event_type_filter(self):
+        assert event_type_filter(None) is None
+        assert event_type_filter([]) is None
+        wanted = event_type_filter(["mint", "burn"])
+        assert wanted("mint") and not wanted("transfer")
+
+
+class TestSubscriberQueue:
+    async def test_drop_oldest(self):
+        queue = SubscriberQueue(2, "drop_oldest")
+        for event_id in (1, 2, 3):
+            queue.put(_envelope(event_id))
+
+        assert [(await queue.get())["id"] for _ in range(2)] == [2, 3]
+        assert queue.dropped == 1
+
+    async def test_coalesce_keeps_the_newest_of_each_type(self):
+        queue = SubscriberQueue(2, "coalesce")
+        queue.put(_envelope(1, "price"))
+        queue.put(_envelope(2, "trade"))
+        queue.put(_envelope(3, "price"))
+
+        assert [(await queue.get())["id"] for _ in range(2)] == [2, 3]
+        assert queue.dropped == 1
+
+    async def test_coalesce_falls_back_to_dropping_the_oldest(self):
+        queue = SubscriberQueue(2, "coalesce")
+        for event_id, event_type in ((1, "a"), (2, "b"), (3, "c")):
+            queue.put(_envelope(event_id, event_type))
+
+        assert [(await queue.get())["id"] for _ in range(2)] == [2, 3]
+
+    async def test_failure_is_raised_after_buffered_items(self):
+        queue = SubscriberQueue(2)
+        queue.put(_envelope(1))
+        queue.fail(RuntimeError("channel layer gone"))
+
+        assert (await queue.get())["id"] == 1
+        with pytest.raises(RuntimeError, match="channel layer gone"):
+            await queue.get()
+
+    def test_unknown_policy_is_rejected(self):
+        with pytest.raises(ValueError):
+            SubscriberQueue(1, "block")
+
+
+class TestSubscription:
+    async def _collect(self, messages, count, variables=None):
+        generator = await schema.subscribe(SUBSCRIPTION, variable_values=variables)
+        first = asyncio.ensure_future(generator.__anext__())
+        await asyncio.sleep(0.05)  # let the subscription join the group
+        layer = get_channel_layer()
+        for message in messages:
+            await layer.group_send(f"events_{CONTRACT_ID}", message)
+        results = [await asyncio.wait_for(first, 2)]
+        while len(results) < count:
+            results.append(await asyncio.wait_for(generator.__anext__(), 2))
+        await generator.aclose()
+        return results
+
+    async def test_events_resolve_from_the_envelope(self):
+        # No django_db mark: any query would raise.
+        (result,) = await self._collect([_message(_envelope(11))], 1)
+
+        assert result.errors is None
+        event = result.data["contractEvents"]
+        assert event["id"] == "11"
+        assert event["contractId"] == CONTRACT_ID
+        assert event["contractName"] == "Fan-out"
+        assert event["payload"] == {"amount": 11}
+
+    async def test_server_side_event_type_filter(self):
+        messages = [
+            _message(_envelope(1, "transfer")),
+            _message(_envelope(2, "mint")),
+            _message(_envelope(3, "transfer")),
+        ]
+
+        results = await self._collect(messages, 1, {"types": ["mint"]})
+
+        assert [r.data["contractEvents"]["id"] for r in results] == ["2"]
+
+    async def test_channel_receive_failure_ends_the_subscription(self):
+        layer = get_channel_layer()
+        with patch.object(
+            type(layer), "receive", AsyncMock(side_effect=RuntimeError("layer down"))
+        ):
+            generator = await schema.subscribe(SUBSCRIPTION)
+            result = await asyncio.wait_for(generator.__anext__(), 2)
+
+        assert result.errors and "layer down" in result.errors[0].message
+
+
+@pytest.mark.django_db
+class TestFanOut:
+    @pytest.fixture(autouse=True)
+    def _clear_routes(self):
+        clear_routes()
+        yield
+        clear_routes()
+
+    def test_envelope_is_built_from_the_routing_query(self, contract):
+        WebhookSubscriptionFactory(contract=contract, event_type="")
+        events = ContractEventFactory.create_batch(3, contract=contract)
+        batch = [
+            {
+                "contract_id": contract.contract_id,
+                "event_type": event.event_type,
+                "ledger": event.ledger,
+                "event_index": event.event_index,
+            }
+            for event in events
+        ]
+        layer = MagicMock(group_send=AsyncMock())
+        get_routes([contract.contract_id])  # warm the routing tables
+
+        with (
+            patch("channels.layers.get_channel_layer", return_value=layer),
+            patch("soroscan.ingest.tasks.dispatch_webhook.delay") as delay,
+            CaptureQueriesContext(connection) as queries,
+        ):
+            process_new_events(batch)
+
+        event_queries = [q for q in queries if '"ingest_contractevent"' in q["sql"]]
+        assert len(event_queries) == 1
+        assert delay.call_count == 3
+        envelopes = [call.args[1]["event"] for call in layer.group_send.await_args_list]
+        assert [e["id"] for e in envelopes] == [event.id for event in events]
+        assert envelopes[0]["contract"]["name"] == contract.name
+        events[0].refresh_from_db()
+        assert envelope_to_event(envelopes[0]).timestamp == events[0].timestamp
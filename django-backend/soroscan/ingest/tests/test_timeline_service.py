@@ -1,9 +1,16 @@
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
-from soroscan.ingest.services.timeline import build_timeline, clamp_group_limit
+from soroscan.ingest.services.timeline import (
+    build_timeline,
+    clamp_group_limit,
+    floor_bucket_start,
+    resolve_tz,
+)
 
 from .factories import ContractEventFactory, TrackedContractFactory, UserFactory
 
@@ -130,3 +137,89 @@ class TestTimelineService:
                 timezone_name="UTC",
                 include_events=False,
             )
+
+
+def _python_timeline(events, bucket_seconds, timezone_name):
+    """Reference grouping: floor every event in Python."""
+    groups = {}
+    for event in events:
+        start = floor_bucket_start(
+            timestamp=event.timestamp,
+            bucket_seconds=bucket_seconds,
+            selected_timezone=resolve_tz(timezone_name),
+        )
+        counts = groups.setdefault(start, {})
+        counts[event.event_type] = counts.get(event.event_type, 0) + 1
+    return sorted(groups.items(), key=lambda item: item[0], reverse=True)
+
+
+@pytest.mark.django_db
+class TestTimelineAggregation:
+    @pytest.fixture
+    def events(self, contract):
+        base = timezone.make_aware(datetime(2024, 3, 9, 22, 0, 0), UTC)
+        return [
+            ContractEventFactory(
+                contract=contract,
+                event_type=("swap", "mint", "burn")[i % 3],
+                timestamp=base + timedelta(minutes=37 * i),
+                ledger=5000 + i,
+                event_index=0,
+            )
+            for i in range(120)
+        ]
+
+    @pytest.mark.parametrize("bucket_seconds", [300, 1800, 3600, 7200, 86400])
+    @pytest.mark.parametrize("timezone_name", ["UTC", "America/New_York", "Asia/Kolkata"])
+    def test_matches_python_bucketing(self, contract, events, bucket_seconds, timezone_name):
+        timeline = build_timeline(
+            contract_id=contract.contract_id,
+            bucket_seconds=bucket_seconds,
+            event_types=None,
+            since=events[0].timestamp,
+            until=events[-1].timestamp,
+            timezone_name=timezone_name,
+            limit_groups=1000,
+        )
+
+        expected = _python_timeline(events, bucket_seconds, timezone_name)
+        assert [(g.start, {c.event_type: c.count for c in g.event_type_counts}) for g in timeline.groups] == expected
+        assert all(g.start.tzinfo == resolve_tz(timezone_name) for g in timeline.groups)
+        assert timeline.total_events == len(events)
+
+    def test_counts_use_a_single_query(self, contract, events):
+        with CaptureQueriesContext(connection) as queries:
+            build_timeline(
+                contract_id=contract.contract_id,
+                bucket_seconds=3600,
+                event_types=None,
+                since=events[0].timestamp,
+                until=events[-1].timestamp,
+                timezone_name="UTC",
+            )
+
+        assert len(queries) == 1
+
+    def test_events_are_limited_per_retained_group(self, contract, events):
+        timeline = build_timeline(
+            contract_id=contract.contract_id,
+            bucket_seconds=86400,
+            event_types=None,
+            since=events[0].timestamp,
+            until=events[-1].timestamp,
+            timezone_name="UTC",
+            limit_groups=2,
+            include_events=True,
+            events_per_group=5,
+        )
+
+        assert len(timeline.groups) == 2
+        for group in timeline.groups:
+            assert len(group.events) == 5
+            assert all(group.start <= e.timestamp < group.end for e in group.events)
+            newest = sorted(
+                (e for e in events if group.start <= e.timestamp < group.end),
+                key=lambda e: e.timestamp,
+                reverse=True,
+            )[:5]
+            assert [e.pk for e in group.events] == [e.pk for e in newest]
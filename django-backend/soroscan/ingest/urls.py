@@ -28,6 +28,7 @@ from .views import (
     health_check,
     networks_view,
     record_event_view,
+    restore_archive_status,
     restore_archived_events,
     transaction_events_view,
     vulnerability_impact_view,
@@ -82,11 +83,17 @@ urlpatterns = [
         webhook_signing_public_key_view,
         name="webhook-signing-public-key",
     ),
+    # Before the router, whose events/<pk>/ route would otherwise match these.
+    path("events/restore-archive/", restore_archived_events, name="restore-archive"),
+    path(
+        "events/restore-archive/<str:job_id>/",
+        restore_archive_status,
+        name="restore-archive-status",
+    ),
     path("", include(router.urls)),
     path("record/", record_event_view, name="record-event"),
     path("health/", health_check, name="health-check"),
     path("events/type-statistics/", event_type_statistics_view, name="event-type-statistics"),
-    path("events/restore-archive/", restore_archived_events, name="restore-archive"),
     path("audit-trail/", audit_trail_view, name="audit-trail"),
     path("admin/ingest-errors/", admin_ingest_errors_view, name="admin-ingest-errors"),
     path(
@@ -7,23 +7,24 @@ import json
 import logging
 import re
 import time
+import uuid
 from datetime import timedelta
 
 from django.conf import settings
 from django.db.models import Count, Max, Min, Q, Avg, Sum
-from django.db.models.functions import Cast
 from django.shortcuts import get_object_or_404, redirect
+from django.urls import reverse
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema, inline_serializer, OpenApiParameter
 from rest_framework import renderers, serializers, status, viewsets
 from rest_framework.decorators import action, api_view, permission_classes, throttle_classes
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
-from rest_framework.pagination import PageNumberPagination
 
 import requests as http_requests
 
@@ -41,12 +42,12 @@ from .models import (
     ContractSnapshot,
     ContractSource,
     ContractVerification,
+    DataRetentionPolicy,
     Organization,
     OrganizationCostSnapshot,
     OrganizationBudget,
     OrganizationMembership,
     IngestError,
-    IndexerState,
     Team,
     TeamMembership,
     TrackedContract,
@@ -54,6 +55,15 @@ from .models import (
     WebhookSubscription,
 )
 from .cache_utils import get_cached_contract
+from .pagination import (
+    COUNT_MODES,
+    EventPagination,
+    count_rows,
+    keyset_page,
+    parse_count_mode,
+    wants_cursor,
+)
+from .rollups import CHAINS, TOTALS_CHAIN, query_counts
 from .serializers import (
     APIKeySerializer,
     ContractEventSerializer,
@@ -66,22 +76,24 @@ from .serializers import (
     OrganizationCorsSerializer,
     OrganizationCostSnapshotSerializer,
     RecordEventRequestSerializer,
+    RestoreArchiveRequestSerializer,
     TeamMemberAddSerializer,
     TeamSerializer,
     TrackedContractSerializer,
     WebhookDeliveryLogSerializer,
     WebhookSubscriptionSerializer,
 )
+from .services.event_search import (
+    SEARCH_OPS,
+    filter_payload_contains,
+    filter_payload_field,
+    search_ranked,
+    search_text,
+)
 from .stellar_client import SorobanClient
 
 logger = logging.getLogger(__name__)
 
-class StandardResultsSetPagination(PageNumberPagination):
-    page_size = 50
-    page_size_query_param = "page_size"
-    max_page_size = 1000
-
-
 class AdminActionSerializer(serializers.ModelSerializer):
     username = serializers.CharField(source="user.username", read_only=True)
 
@@ -288,17 +300,9 @@ class TrackedContractViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=["get"])
     def completeness(self, request, pk=None):
-        contract = self.get_object()
-        state = IndexerState.objects.filter(key=f"completeness:{contract.id}").first()
-        if state:
-            try:
-                return Response(json.loads(state.value))
-            except json.JSONDecodeError:
-                pass
+        from .services.ledger_coverage import contract_completeness
 
-        from .tasks import _calculate_completeness
-
-        return Response(_calculate_completeness(contract))
+        return Response(contract_completeness(self.get_object()))
 
     @extend_schema(responses=ContractSnapshotSerializer(many=True))
     @action(detail=True, methods=["get"], url_path="snapshots")
@@ -319,20 +323,10 @@ class TrackedContractViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def completeness_dashboard(self, request):
-        from .tasks import _calculate_completeness
-
-        rows = []
-        for contract in self.get_queryset():
-            state = IndexerState.objects.filter(key=f"completeness:{contract.id}").first()
-            if state:
-                try:
-                    rows.append(json.loads(state.value))
-                    continue
-                except json.JSONDecodeError:
-                    pass
-            rows.append(_calculate_completeness(contract))
-
-        rows.sort(key=lambda item: item.get("completeness_percentage", 100.0))
+        from .services.ledger_coverage import contracts_completeness
+
+        rows = contracts_completeness(self.get_queryset())
+        rows.sort(key=lambda item: item["completeness_percentage"])
         return Response({"contracts": rows})
 
     @action(detail=True, methods=["post"])
@@ -404,11 +398,14 @@ class ContractEventViewSet(viewsets.ReadOnlyModelViewSet):
     - GET /events/ - List all events (paginated)
     - GET /events/{id}/ - Get event details
     - GET /events/search/ - Full-text + field-level search
+
+    Both listings accept ``pagination=cursor`` for keyset pages that stay
+    cheap at any depth, and ``count=exact|estimated|none``.
     """
 
     queryset = ContractEvent.objects.all()
     serializer_class = ContractEventSerializer
-    pagination_class = StandardResultsSetPagination
+    pagination_class = EventPagination
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = [
         "contract__contract_id",
@@ -443,6 +440,7 @@ class ContractEventViewSet(viewsets.ReadOnlyModelViewSet):
                 name="EventSearchParams",
                 fields={
                     "q": serializers.CharField(required=False),
+                    "rank": serializers.BooleanField(required=False),
                     "contract_id": serializers.CharField(required=False),
                     "event_type": serializers.CharField(required=False),
                     "payload_contains": serializers.CharField(required=False),
@@ -454,6 +452,9 @@ class ContractEventViewSet(viewsets.ReadOnlyModelViewSet):
                     "payload_value": serializers.CharField(required=False),
                     "page": serializers.IntegerField(required=False),
                     "page_size": serializers.IntegerField(required=False),
+                    "pagination": serializers.ChoiceField(choices=["cursor"], required=False),
+                    "cursor": serializers.CharField(required=False),
+                    "count": serializers.ChoiceField(choices=list(COUNT_MODES), required=False),
                 },
             )
         ],
@@ -465,14 +466,17 @@ class ContractEventViewSet(viewsets.ReadOnlyModelViewSet):
         Full-text and field-level search on contract event payloads.
 
         Query params:
-        - q                 — free-text substring match against JSON payload text
+        - q                 — case-insensitive substring match on the payload text
+        - rank              — true: full-text match on q, ordered by relevance_score
         - contract_id       — filter by contract
         - event_type        — filter by event type
-        - payload_contains  — JSON containment sub-string (fast with GIN index)
+        - payload_contains  — JSON object (containment) or plain substring
         - payload_field     — dot-notation field path, e.g. decodedPayload.to
         - payload_op        — operator: eq|neq|gte|lte|gt|lt|contains|startswith|in
         - payload_value     — value for field comparison
         - page / page_size  — pagination (max 1000 per page)
+        - pagination=cursor — keyset pages; follow ``next_cursor`` via ``cursor``
+        - count             — exact|estimated|none (none only with cursor pages)
         """
         qs = ContractEvent.objects.select_related("contract").all()
 
@@ -485,59 +489,34 @@ class ContractEventViewSet(viewsets.ReadOnlyModelViewSet):
         if event_type:
             qs = qs.filter(event_type=event_type)
 
-        # --- free-text substring search against JSON cast to text -------------
+        # --- free-text search on the indexed payload_text column --------------
         q = request.GET.get("q", "").strip()
+        ranked = request.GET.get("rank", "").lower() in ("1", "true", "yes")
+        if ranked and not q:
+            raise ValidationError({"rank": "Ranked search requires q."})
         if q:
-            # Cast JSON payload to text and do a case-insensitive contains search.
-            # The GIN index speeds up JSON containment (@>) queries; for plain text
-            # search we rely on PostgreSQL's icontains on the cast.
-            from django.db.models import TextField
-            qs = qs.annotate(
-                _payload_text=Cast("payload", output_field=TextField())
-            ).filter(_payload_text__icontains=q)
-
-        # --- payload_contains: JSON containment using GIN index ---------------
+            qs = search_ranked(qs, q) if ranked else search_text(qs, q)
+
+        # --- payload_contains: JSONB containment, or substring for plain text --
         payload_contains = request.GET.get("payload_contains", "").strip()
         if payload_contains:
-            # Simple text containment inside the JSON; works with GIN index
-            from django.db.models import TextField
-            if not q:  # avoid double annotation
-                qs = qs.annotate(
-                    _payload_text=Cast("payload", output_field=TextField())
-                )
-            qs = qs.filter(_payload_text__icontains=payload_contains)
+            qs = filter_payload_contains(qs, payload_contains)
 
         # --- payload_field / payload_op / payload_value -----------------------
         payload_field = request.GET.get("payload_field", "").strip()
         payload_op = request.GET.get("payload_op", "eq").strip().lower()
         payload_value = request.GET.get("payload_value")
+        if payload_op not in SEARCH_OPS:
+            payload_op = "eq"
 
         if payload_field and payload_value is not None:
-            # Build ORM lookup key from dot-notation → Django JSONField traversal
-            # e.g. "decodedPayload.to" → payload__decodedPayload__to
-            orm_path = "payload__" + payload_field.replace(".", "__")
-
-            op_map = {
-                "eq": "",
-                "neq": None,  # handled below
-                "gte": "__gte",
-                "lte": "__lte",
-                "gt": "__gt",
-                "lt": "__lt",
-                "contains": "__icontains",
-                "startswith": "__istartswith",
-                "in": "__in",
-            }
-            suffix = op_map.get(payload_op, "")
-            if payload_op == "neq":
-                qs = qs.exclude(**{orm_path: payload_value})
-            elif payload_op == "in":
-                values = [v.strip() for v in payload_value.split(",")]
-                qs = qs.filter(**{f"{orm_path}__in": values})
-            else:
-                qs = qs.filter(**{f"{orm_path}{suffix}": payload_value})
+            qs = filter_payload_field(qs, payload_field, payload_op, payload_value)
 
         # --- pagination -------------------------------------------------------
+        use_cursor = wants_cursor(request.GET)
+        if ranked and use_cursor:
+            raise ValidationError({"pagination": "Ranked search uses page numbers."})
+        count_mode = parse_count_mode(request.GET, cursor=use_cursor)
         try:
             page = max(1, int(request.GET.get("page", 1)))
             page_size = min(max(1, int(request.GET.get("page_size", 50))), 1000)
@@ -545,19 +524,44 @@ class ContractEventViewSet(viewsets.ReadOnlyModelViewSet):
             page = 1
             page_size = 50
 
-        qs = qs.order_by("-timestamp")
-        cache_key = stable_cache_key(
-            "rest_event_search",
-            dict(request.GET.items()),
-        )
+        # Key on the parsed parameters so ignored or reordered query-string
+        # noise does not fragment the cache.
+        search_params = {
+            "contract_id": contract_id,
+            "event_type": event_type,
+            "q": q,
+            "rank": ranked,
+            "payload_contains": payload_contains,
+            "payload_field": payload_field,
+            "payload_op": payload_op,
+            "payload_value": payload_value,
+            "count": count_mode,
+            "page_size": page_size,
+        }
+        if use_cursor:
+            search_params["cursor"] = request.GET.get("cursor", "")
+        else:
+            search_params["page"] = page
+        cache_key = stable_cache_key("rest_event_search", search_params)
 
         def _build():
-            total = qs.count()
+            total = count_rows(qs, count_mode)
+            if use_cursor:
+                items, next_cursor = keyset_page(qs, search_params["cursor"], page_size)
+                return {
+                    "count": total,
+                    "count_mode": count_mode,
+                    "page_size": page_size,
+                    "next_cursor": next_cursor,
+                    "results": EventSearchSerializer(items, many=True).data,
+                }
             offset = (page - 1) * page_size
-            items = list(qs[offset : offset + page_size])
+            ordered = qs if ranked else qs.order_by("-timestamp", "-id")
+            items = list(ordered[offset : offset + page_size])
             ser = EventSearchSerializer(items, many=True)
             return {
                 "count": total,
+                "count_mode": count_mode,
                 "page": page,
                 "page_size": page_size,
                 "results": ser.data,
@@ -1435,21 +1439,25 @@ def event_type_statistics_view(request):
 
 
 @extend_schema(
-    parameters=[
-        inline_serializer(
-            name="RestoreArchiveParams",
-            fields={"batch_id": serializers.IntegerField()},
-        )
-    ],
+    request=RestoreArchiveRequestSerializer,
     responses={
         200: inline_serializer(
+            name="RestoreArchiveNoop",
+            fields={"detail": serializers.CharField()},
+        ),
+        202: inline_serializer(
             name="RestoreArchiveResponse",
             fields={
                 "status": serializers.CharField(),
-                "restored_count": serializers.IntegerField(),
-                "batch_id": serializers.IntegerField(),
+                "job_id": serializers.CharField(),
+                "batch_ids": serializers.ListField(child=serializers.IntegerField()),
+                "status_url": serializers.CharField(),
             },
         ),
+        400: inline_serializer(
+            name="RestoreInvalid",
+            fields={"detail": serializers.CharField()},
+        ),
         404: inline_serializer(
             name="RestoreNotFound",
             fields={"detail": serializers.CharField()},
@@ -1465,88 +1473,129 @@ def event_type_statistics_view(request):
 @throttle_classes([UserRateThrottle])
 def restore_archived_events(request):
     """
-    Retrieve an archived event batch from S3 and re-import events into PostgreSQL.
+    Queue a background job re-importing archived event batches from S3.
 
-    Query params:
-    - batch_id: ID of the ArchivedEventBatch to restore
-    """
-    batch_id = request.query_params.get("batch_id") or request.data.get("batch_id")
-    if not batch_id:
-        return Response({"detail": "batch_id is required."}, status=status.HTTP_400_BAD_REQUEST)
+    Parameters (query string or body):
+    - batch_id, batch_ids or policy_id: the batches to restore; policy_id
+      selects every batch of that retention policy
+    - since/until: only restore events in this timestamp range; batches whose
+      min/max timestamps fall outside it are not downloaded at all
+    - start_ledger/end_ledger: only restore events in this ledger range
 
-    batch = get_object_or_404(ArchivedEventBatch, id=batch_id)
+    Returns 202 with a job_id; poll ``status_url`` for progress.
+    """
+    params = {}
+    for source in (request.query_params, request.data):
+        if hasattr(source, "getlist"):
+            # QueryDict.dict() keeps only the last of repeated batch_ids.
+            params.update(source.dict())
+            if "batch_ids" in source:
+                params["batch_ids"] = source.getlist("batch_ids")
+        else:
+            params.update(source)
+    serializer = RestoreArchiveRequestSerializer(data=params)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    data = serializer.validated_data
+    since, until = data.get("since"), data.get("until")
+    partial = any(
+        data.get(name) is not None for name in ("since", "until", "start_ledger", "end_ledger")
+    )
 
-    if batch.status == ArchivedEventBatch.STATUS_RESTORED:
+    if "batch_id" in data:
+        batch = get_object_or_404(ArchivedEventBatch, id=data["batch_id"])
+        if batch.status == ArchivedEventBatch.STATUS_RESTORED and not partial:
+            return Response(
+                {"detail": "Batch already restored.", "batch_id": batch.id},
+                status=status.HTTP_200_OK,
+            )
+        batches = ArchivedEventBatch.objects.filter(id=batch.id)
+    elif "batch_ids" in data:
+        batches = ArchivedEventBatch.objects.filter(id__in=data["batch_ids"])
+        missing = set(data["batch_ids"]) - set(batches.values_list("id", flat=True))
+        if missing:
+            return Response(
+                {"detail": f"Unknown batch ids: {sorted(missing)}"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+    else:
+        policy = get_object_or_404(DataRetentionPolicy, id=data["policy_id"])
+        batches = policy.batches.all()
+        if not partial:
+            batches = batches.exclude(status=ArchivedEventBatch.STATUS_RESTORED)
+
+    from .archival import batches_overlapping, save_restore_job  # noqa: PLC0415
+    from .tasks import restore_archived_batches  # noqa: PLC0415
+
+    batch_ids = list(
+        batches_overlapping(batches, since, until)
+        .order_by("min_timestamp", "id")
+        .values_list("id", flat=True)
+    )
+    if not batch_ids:
         return Response(
-            {"detail": "Batch already restored.", "batch_id": batch.id},
+            {"detail": "No archived batches overlap the requested range."},
             status=status.HTTP_200_OK,
         )
 
-    try:
-        import boto3  # noqa: PLC0415
-        import gzip  # noqa: PLC0415
-
-        s3 = boto3.client(
-            "s3",
-            region_name=getattr(settings, "AWS_S3_REGION_NAME", None),
-            endpoint_url=getattr(settings, "AWS_S3_ENDPOINT_URL", None),
-            aws_access_key_id=getattr(settings, "AWS_ACCESS_KEY_ID", None),
-            aws_secret_access_key=getattr(settings, "AWS_SECRET_ACCESS_KEY", None),
-        )
-        policy = batch.policy
-        obj = s3.get_object(Bucket=policy.s3_bucket, Key=batch.s3_key)
-        compressed = obj["Body"].read()
-        raw_json = gzip.decompress(compressed)
-        rows = json.loads(raw_json)
-
-    except Exception as exc:
-        logger.exception("Failed to download archive batch %s from S3", batch_id)
-        return Response(
-            {"detail": f"S3 retrieval failed: {str(exc)}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
-
-    restored_count = 0
-    for row in rows:
-        try:
-            contract = get_cached_contract(row["contract__contract_id"])
-            if not contract:
-                raise TrackedContract.DoesNotExist(f"Contract {row['contract__contract_id']} not found")
-            ContractEvent.objects.get_or_create(
-                contract=contract,
-                ledger=row["ledger"],
-                event_index=row["event_index"],
-                defaults={
-                    "event_type": row["event_type"],
-                    "payload": row["payload"],
-                    "payload_hash": row.get("payload_hash", ""),
-                    "timestamp": row["timestamp"],
-                    "tx_hash": row.get("tx_hash", ""),
-                },
-            )
-            restored_count += 1
-        except Exception:
-            logger.warning("Skipped row during restore: %s", row.get("id"), exc_info=True)
-
-    batch.status = ArchivedEventBatch.STATUS_RESTORED
-    batch.save(update_fields=["status"])
-
-    from .models import ArchivalAuditLog  # noqa: PLC0415
-    ArchivalAuditLog.objects.create(
-        action=ArchivalAuditLog.ACTION_RESTORE,
-        batch=batch,
-        policy=batch.policy,
-        event_count=restored_count,
-        detail=f"Restored by user {request.user.id}",
-        performed_by=request.user,
+    job_id = str(uuid.uuid4())
+    save_restore_job(job_id, status="queued", batches=len(batch_ids), done=0, progress_percent=0)
+    restore_archived_batches.apply_async(
+        kwargs={
+            "job_id": job_id,
+            "batch_ids": batch_ids,
+            "start": since.isoformat() if since else None,
+            "end": until.isoformat() if until else None,
+            "start_ledger": data.get("start_ledger"),
+            "end_ledger": data.get("end_ledger"),
+            "user_id": request.user.id,
+        },
+        task_id=job_id,
     )
-
     return Response(
-        {"status": "restored", "restored_count": restored_count, "batch_id": batch.id},
-        status=status.HTTP_200_OK,
+        {
+            "status": "queued",
+            "job_id": job_id,
+            "batch_ids": batch_ids,
+            "status_url": reverse("restore-archive-status", args=[job_id]),
+        },
+        status=status.HTTP_202_ACCEPTED,
     )
 
 
+@extend_schema(
+    responses={
+        200: inline_serializer(
+            name="RestoreJobStatus",
+            fields={
+                "status": serializers.CharField(),
+                "batches": serializers.IntegerField(),
+                "done": serializers.IntegerField(),
+                "failed": serializers.IntegerField(required=False),
+                "restored": serializers.IntegerField(required=False),
+                "skipped": serializers.IntegerField(required=False),
+                "rejected": serializers.IntegerField(required=False),
+                "progress_percent": serializers.IntegerField(),
+            },
+        ),
+        404: inline_serializer(
+            name="RestoreJobNotFound",
+            fields={"detail": serializers.CharField()},
+        ),
+    },
+)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def restore_archive_status(request, job_id):
+    """Progress of a restore job queued by ``restore_archived_events``."""
+    from .archival import restore_job_status  # noqa: PLC0415
+
+    state = restore_job_status(job_id)
+    if state is None:
+        return Response({"detail": "Unknown restore job."}, status=status.HTTP_404_NOT_FOUND)
+    return Response({"job_id": job_id, **state})
+
+
 @extend_schema(
     parameters=[
         inline_serializer(
@@ -2514,22 +2563,20 @@ class AnalyticsViewSet(viewsets.ViewSet):
             cutoff_24h = now - timedelta(hours=24)
             cutoff_7d = now - timedelta(days=7)
 
-            base_qs = EventAggregation.objects.filter(event_type="")
-
-            totals = base_qs.aggregate(
-                total=Sum("event_count"),
+            totals = EventAggregation.objects.filter(
+                event_type="", timestamp__gte=cutoff_7d
+            ).aggregate(
                 last_24h=Sum("event_count", filter=Q(timestamp__gte=cutoff_24h)),
-                last_7d=Sum("event_count", filter=Q(timestamp__gte=cutoff_7d)),
-                anomalies_7d=Count("id", filter=Q(is_anomaly=True, timestamp__gte=cutoff_7d)),
+                last_7d=Sum("event_count"),
+                anomalies_7d=Count("id", filter=Q(is_anomaly=True)),
+            )
+            # All-time figures come from the coarsest rollup tiers.
+            total = sum(
+                row["event_count"] for row in query_counts(TOTALS_CHAIN, [], event_type="")
             )
 
             active_contracts = TrackedContract.objects.filter(is_active=True).count()
-            unique_types = (
-                EventAggregation.objects.exclude(event_type="")
-                .values("event_type")
-                .distinct()
-                .count()
-            )
+            unique_types = len(query_counts(TOTALS_CHAIN, ["event_type"], exclude_totals=True))
             top_row = (
                 EventAggregation.objects.exclude(event_type="")
                 .filter(timestamp__gte=cutoff_7d)
@@ -2540,7 +2587,7 @@ class AnalyticsViewSet(viewsets.ViewSet):
             )
 
             return {
-                "total_events": totals["total"] or 0,
+                "total_events": total,
                 "active_contracts": active_contracts,
                 "events_last_24h": totals["last_24h"] or 0,
                 "events_last_7d": totals["last_7d"] or 0,
@@ -2576,11 +2623,9 @@ class AnalyticsViewSet(viewsets.ViewSet):
         GET /api/ingest/analytics/event_volume/
 
         Returns time-series event count data.
-        Queries pre-computed EventAggregation rows; rolls up to requested granularity.
+        Reads the coarsest rollup tier that matches the requested granularity
+        (see ``rollups``); hourly buckets fill in partial periods.
         """
-        from .models import EventAggregation  # noqa: PLC0415
-        from django.db.models.functions import TruncHour, TruncDay, TruncWeek, TruncMonth  # noqa: PLC0415
-
         granularity = request.query_params.get("granularity", "daily")
         if granularity not in _GRANULARITY_TRUNC:
             return Response(
@@ -2591,8 +2636,7 @@ class AnalyticsViewSet(viewsets.ViewSet):
         range_days = _parse_range(request.query_params.get("range", "30d"))
         since = timezone.now() - timedelta(days=range_days)
 
-        qs = EventAggregation.objects.filter(timestamp__gte=since)
-
+        filters = {}
         contract_id = request.query_params.get("contract_id")
         if contract_id:
             contract = get_cached_contract(contract_id)
@@ -2601,31 +2645,16 @@ class AnalyticsViewSet(viewsets.ViewSet):
                     {"detail": f"Contract '{contract_id}' not found."},
                     status=status.HTTP_404_NOT_FOUND,
                 )
-            qs = qs.filter(contract=contract)
+            filters["contract"] = contract
 
-        event_type = request.query_params.get("event_type")
-        if event_type is not None:
-            qs = qs.filter(event_type=event_type)
-        else:
-            # Default: return totals (event_type='')
-            qs = qs.filter(event_type="")
-
-        trunc_fn_map = {
-            "hourly": TruncHour,
-            "daily": TruncDay,
-            "weekly": TruncWeek,
-            "monthly": TruncMonth,
-        }
-        TruncFn = trunc_fn_map[granularity]
+        # Default: return totals (event_type='')
+        filters["event_type"] = request.query_params.get("event_type") or ""
 
-        rows = (
-            qs.annotate(bucket=TruncFn("timestamp"))
-            .values("bucket", "contract_id")
-            .annotate(
-                count=Sum("event_count"),
-                has_anomaly=Count("id", filter=Q(is_anomaly=True)),
-            )
-            .order_by("bucket")
+        rows = sorted(
+            query_counts(
+                CHAINS[granularity], ["contract_id"], since=since, bucket=granularity, **filters
+            ),
+            key=lambda r: (r["bucket"], r["contract_id"]),
         )
 
         # Enrich with contract_id strings (avoid N+1 by pre-fetching id→contract_id map)
@@ -2638,8 +2667,8 @@ class AnalyticsViewSet(viewsets.ViewSet):
             {
                 "timestamp": r["bucket"].isoformat(),
                 "contract_id": pk_to_cid.get(r["contract_id"], ""),
-                "count": r["count"] or 0,
-                "has_anomaly": r["has_anomaly"] > 0,
+                "count": r["event_count"],
+                "has_anomaly": r["anomaly_count"] > 0,
             }
             for r in rows
         ]
@@ -2671,18 +2700,15 @@ class AnalyticsViewSet(viewsets.ViewSet):
     @action(detail=False, methods=["get"], url_path="top_contracts")
     def top_contracts(self, request):
         """Most active contracts by total event count over the requested range."""
-        from .models import EventAggregation  # noqa: PLC0415
-
         range_days = _parse_range(request.query_params.get("range", "7d"))
         limit = min(int(request.query_params.get("limit", 10)), 100)
         since = timezone.now() - timedelta(days=range_days)
 
-        rows = (
-            EventAggregation.objects.filter(timestamp__gte=since, event_type="")
-            .values("contract_id")
-            .annotate(total=Sum("event_count"))
-            .order_by("-total")[:limit]
-        )
+        rows = sorted(
+            query_counts(TOTALS_CHAIN, ["contract_id"], since=since, event_type=""),
+            key=lambda r: r["event_count"],
+            reverse=True,
+        )[:limit]
 
         contract_pks = [r["contract_id"] for r in rows]
         pk_to_info = {
@@ -2693,7 +2719,7 @@ class AnalyticsViewSet(viewsets.ViewSet):
         contracts = [
             {
                 **pk_to_info.get(r["contract_id"], {"contract_id": "", "name": "", "network": ""}),
-                "event_count": r["total"] or 0,
+                "event_count": r["event_count"],
             }
             for r in rows
         ]
@@ -2718,15 +2744,10 @@ class AnalyticsViewSet(viewsets.ViewSet):
     @action(detail=False, methods=["get"], url_path="event_type_breakdown")
     def event_type_breakdown(self, request):
         """Distribution of event types by count over the requested range."""
-        from .models import EventAggregation  # noqa: PLC0415
-
         range_days = _parse_range(request.query_params.get("range", "7d"))
         since = timezone.now() - timedelta(days=range_days)
 
-        qs = EventAggregation.objects.filter(
-            timestamp__gte=since,
-        ).exclude(event_type="")
-
+        filters = {}
         contract_id = request.query_params.get("contract_id")
         if contract_id:
             contract = get_cached_contract(contract_id)
@@ -2735,21 +2756,23 @@ class AnalyticsViewSet(viewsets.ViewSet):
                     {"detail": f"Contract '{contract_id}' not found."},
                     status=status.HTTP_404_NOT_FOUND,
                 )
-            qs = qs.filter(contract=contract)
+            filters["contract"] = contract
 
-        rows = (
-            qs.values("event_type")
-            .annotate(total=Sum("event_count"))
-            .order_by("-total")
+        rows = sorted(
+            query_counts(
+                TOTALS_CHAIN, ["event_type"], since=since, exclude_totals=True, **filters
+            ),
+            key=lambda r: r["event_count"],
+            reverse=True,
         )
 
-        grand_total = sum(r["total"] or 0 for r in rows)
+        grand_total = sum(r["event_count"] for r in rows)
 
         breakdown = [
             {
                 "event_type": r["event_type"],
-                "count": r["total"] or 0,
-                "pct": round((r["total"] or 0) / grand_total * 100, 2) if grand_total else 0.0,
+                "count": r["event_count"],
+                "pct": round(r["event_count"] / grand_total * 100, 2) if grand_total else 0.0,
             }
             for r in rows
         ]
@@ -2759,7 +2782,15 @@ class AnalyticsViewSet(viewsets.ViewSet):
     # ── Anomalies ─────────────────────────────────────────────────────────────
 
     @extend_schema(
-        parameters=[OpenApiParameter("range", str, default="7d")],
+        parameters=[
+            OpenApiParameter("range", str, default="7d"),
+            OpenApiParameter(
+                "granularity",
+                str,
+                description="hourly (flagged buckets) or daily|weekly|monthly (periods with flagged buckets)",
+                default="hourly",
+            ),
+        ],
         responses=inline_serializer(
             name="AnomalyListResponse",
             fields={
@@ -2770,32 +2801,70 @@ class AnalyticsViewSet(viewsets.ViewSet):
     )
     @action(detail=False, methods=["get"], url_path="anomalies")
     def anomalies(self, request):
-        """Return aggregation buckets flagged as anomalies within the range."""
+        """
+        Return aggregation buckets flagged as anomalies within the range.
+
+        With a coarser ``granularity`` each row is a period containing at least
+        one flagged hourly bucket, with the period's total ``event_count`` and
+        its ``anomaly_count``.
+        """
         from .models import EventAggregation  # noqa: PLC0415
 
+        granularity = request.query_params.get("granularity", "hourly")
+        if granularity not in _GRANULARITY_TRUNC:
+            return Response(
+                {"detail": f"granularity must be one of: {', '.join(_GRANULARITY_TRUNC)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
         range_days = _parse_range(request.query_params.get("range", "7d"))
         since = timezone.now() - timedelta(days=range_days)
 
-        rows = (
-            EventAggregation.objects.filter(
-                is_anomaly=True,
-                event_type="",
-                timestamp__gte=since,
+        if granularity == "hourly":
+            rows = (
+                EventAggregation.objects.filter(
+                    is_anomaly=True,
+                    event_type="",
+                    timestamp__gte=since,
+                )
+                .select_related("contract")
+                .order_by("-timestamp")
             )
-            .select_related("contract")
-            .order_by("-timestamp")
-        )
 
+            anomaly_data = [
+                {
+                    "timestamp": r.timestamp.isoformat(),
+                    "contract_id": r.contract.contract_id,
+                    "contract_name": r.contract.name,
+                    "event_count": r.event_count,
+                }
+                for r in rows
+            ]
+            return Response({"range_days": range_days, "anomalies": anomaly_data})
+
+        periods = sorted(
+            (
+                r
+                for r in query_counts(
+                    CHAINS[granularity], ["contract_id"], since=since, bucket=granularity, event_type=""
+                )
+                if r["anomaly_count"]
+            ),
+            key=lambda r: r["bucket"],
+            reverse=True,
+        )
+        contracts = TrackedContract.objects.in_bulk({r["contract_id"] for r in periods})
         anomaly_data = [
             {
-                "timestamp": r.timestamp.isoformat(),
-                "contract_id": r.contract.contract_id,
-                "contract_name": r.contract.name,
-                "event_count": r.event_count,
+                "timestamp": r["bucket"].isoformat(),
+                "contract_id": contracts[r["contract_id"]].contract_id,
+                "contract_name": contracts[r["contract_id"]].name,
+                "event_count": r["event_count"],
+                "anomaly_count": r["anomaly_count"],
             }
-            for r in rows
+            for r in periods
+            if r["contract_id"] in contracts
         ]
-
         return Response({"range_days": range_days, "anomalies": anomaly_data})
 
     # ── CSV / JSON export ─────────────────────────────────────────────────────
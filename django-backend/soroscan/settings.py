@@ -208,6 +208,8 @@ CACHES = {
 }
 # TTL for REST/GraphQL search, stats, and timeline responses (seconds)
 QUERY_CACHE_TTL_SECONDS = env.int("QUERY_CACHE_TTL_SECONDS", default=60)
+# How long count=estimated falls back to a cached exact count (non-PostgreSQL)
+EVENT_COUNT_ESTIMATE_TTL_SECONDS = env.int("EVENT_COUNT_ESTIMATE_TTL_SECONDS", default=300)
 
 # Rate limiting configuration (via environment variables)
 # To add a new endpoint rate limit:
@@ -335,11 +337,20 @@ CELERY_TASK_SOFT_TIME_LIMIT = env.int("CELERY_TASK_SOFT_TIME_LIMIT", default=540
 CELERY_TASK_ROUTES = {
     "ingest.tasks.ingest_latest_events": {"queue": "high_priority"},
     "ingest.tasks.dispatch_webhook": {"queue": "default"},
+    "ingest.tasks.process_new_events": {"queue": "default"},
     "ingest.tasks.aggregate_event_statistics": {"queue": "low_priority"},
+    "ingest.tasks.flush_event_counters": {"queue": "low_priority"},
+    "ingest.tasks.rollup_event_aggregations": {"queue": "low_priority"},
     "soroscan.ingest.tasks.backfill_contract_events": {"queue": "backfill"},
+    "ingest.tasks.orchestrate_backfill": {"queue": "backfill"},
+    "ingest.tasks.backfill_contract_shard": {"queue": "backfill"},
+    "ingest.tasks.finalize_backfill_shards": {"queue": "backfill"},
     "soroscan.ingest.tasks.evaluate_remediation_rules": {"queue": "default"},
 }
 
+# Seconds between flushes of ingest-time event counters into EventAggregation.
+EVENT_COUNTER_FLUSH_SECONDS = env.int("EVENT_COUNTER_FLUSH_SECONDS", default=30)
+
 # Celery Beat periodic task schedule
 CELERY_BEAT_SCHEDULE = {
     "cleanup-webhook-delivery-logs": {
@@ -366,6 +377,18 @@ CELERY_BEAT_SCHEDULE = {
         "task": "ingest.tasks.aggregate_event_statistics",
         "schedule": 3600,  # hourly
     },
+    "rollup-event-aggregations": {
+        "task": "ingest.tasks.rollup_event_aggregations",
+        "schedule": 900,  # every 15 minutes
+    },
+    "flush-event-counters": {
+        "task": "ingest.tasks.flush_event_counters",
+        "schedule": EVENT_COUNTER_FLUSH_SECONDS,
+    },
+    "maintain-event-partitions": {
+        "task": "ingest.tasks.maintain_event_partitions",
+        "schedule": 86400,  # daily
+    },
     "aggregate-organization-costs": {
         "task": "ingest.tasks.aggregate_organization_costs",
         "schedule": 3600,  # hourly
@@ -397,6 +420,34 @@ CELERY_BEAT_SCHEDULE = {
     },
 }
 
+# Ingest pipeline
+# Persist each polled get_events page with bulk writes instead of one
+# get_or_create per event. Disable to fall back to the serial path.
+INGEST_BATCH_MODE = env.bool("INGEST_BATCH_MODE", default=True)
+# Ledgers per shard when orchestrate_backfill splits a historical import.
+BACKFILL_SHARD_LEDGERS = env.int("BACKFILL_SHARD_LEDGERS", default=10_000)
+# Threads shared by all SorobanClients for concurrent get_transaction lookups.
+INVOCATION_FETCH_WORKERS = env.int("INVOCATION_FETCH_WORKERS", default=8)
+# Shared invocation cache: in-process LRU size, TTL (seconds), and whether
+# misses fall through to the Django cache (Redis) shared across workers.
+INVOCATION_CACHE_MAX_SIZE = env.int("INVOCATION_CACHE_MAX_SIZE", default=10_000)
+INVOCATION_CACHE_TTL = env.int("INVOCATION_CACHE_TTL", default=300)
+INVOCATION_CACHE_SHARED = env.bool("INVOCATION_CACHE_SHARED", default=True)
+# Processes that decode/validate events during reprocess_events (0 = one per CPU).
+REPROCESS_WORKERS = env.int("REPROCESS_WORKERS", default=0)
+# Extra rate-limit tokens a worker reserves per Redis call and keeps for the
+# rest of the minute (capped at a tenth of the contract's per-minute limit).
+INGEST_RATE_LEASE_SIZE = env.int("INGEST_RATE_LEASE_SIZE", default=100)
+# Ingest worker processes sharing those leases; each may lease at most
+# limit / (10 * workers), so unused leases never hold more than a tenth.
+INGEST_RATE_LEASE_WORKERS = env.int("INGEST_RATE_LEASE_WORKERS", default=4)
+# Hourly buckets are recounted only this long after they end, and at most
+# EVENT_RECOUNT_MAX_HOURS of them are checked for drift per aggregation run.
+EVENT_RECOUNT_DELAY_SECONDS = env.int(
+    "EVENT_RECOUNT_DELAY_SECONDS", default=EVENT_COUNTER_FLUSH_SECONDS + 300
+)
+EVENT_RECOUNT_MAX_HOURS = env.int("EVENT_RECOUNT_MAX_HOURS", default=168)
+
 # Analytics — anomaly detection threshold
 # Volume drop percentage that triggers an anomaly flag on an aggregation bucket.
 # e.g. 50 means: flag the bucket if current count < 50 % of the 7-day rolling avg.
@@ -503,6 +554,18 @@ GRAPHQL_N1_DETECTION_ENABLED = env.bool(
     default=DEBUG,
 )
 
+# Live contractEvents subscriptions: events buffered per subscriber, and what to
+# do when a slow client fills the buffer ("drop_oldest" or "coalesce" by event type).
+GRAPHQL_SUBSCRIPTION_QUEUE_SIZE = env.int("GRAPHQL_SUBSCRIPTION_QUEUE_SIZE", default=100)
+GRAPHQL_SUBSCRIPTION_OVERFLOW = env("GRAPHQL_SUBSCRIPTION_OVERFLOW", default="drop_oldest")
+
+# /ws/events/<contract_id>/ streaming: per-connection send queue (same overflow
+# policies as above) and the micro-batch window used by ?mode=stream connections.
+WEBSOCKET_SEND_QUEUE_SIZE = env.int("WEBSOCKET_SEND_QUEUE_SIZE", default=1000)
+WEBSOCKET_SEND_QUEUE_OVERFLOW = env("WEBSOCKET_SEND_QUEUE_OVERFLOW", default="drop_oldest")
+WEBSOCKET_BATCH_WINDOW_MS = env.int("WEBSOCKET_BATCH_WINDOW_MS", default=50)
+WEBSOCKET_MAX_BATCH_SIZE = env.int("WEBSOCKET_MAX_BATCH_SIZE", default=100)
+
 # Contract state snapshot capture (issue #798)
 CONTRACT_SNAPSHOT_INTERVAL = env.int("CONTRACT_SNAPSHOT_INTERVAL", default=1000)
 CONTRACT_SNAPSHOT_MAX_BYTES = env.int("CONTRACT_SNAPSHOT_MAX_BYTES", default=1_048_576)
@@ -670,6 +733,31 @@ AWS_S3_REGION_NAME = env("AWS_S3_REGION_NAME", default="us-east-1")
 # Set AWS_S3_ENDPOINT_URL for S3-compatible stores (MinIO, Localstack, etc.)
 AWS_S3_ENDPOINT_URL = env("AWS_S3_ENDPOINT_URL", default="")
 
+# Streaming event archival (soroscan.ingest.archival): object format
+# ("ndjson" or "parquet", which needs pyarrow), rows read per keyset chunk,
+# compressed size at which a new S3 object is started, and multipart part size.
+ARCHIVE_FORMAT = env("ARCHIVE_FORMAT", default="ndjson")
+ARCHIVE_CHUNK_SIZE = env.int("ARCHIVE_CHUNK_SIZE", default=5000)
+ARCHIVE_MAX_OBJECT_BYTES = env.int("ARCHIVE_MAX_OBJECT_BYTES", default=100 * 1024 * 1024)
+ARCHIVE_MULTIPART_PART_BYTES = env.int("ARCHIVE_MULTIPART_PART_BYTES", default=8 * 1024 * 1024)
+# Archived batches restored in parallel by one restore job (POST events/restore-archive/).
+RESTORE_WORKERS = env.int("RESTORE_WORKERS", default=4)
+
+# Rows per batch and transaction when import_events loads files (COPY on PostgreSQL).
+IMPORT_BATCH_SIZE = env.int("IMPORT_BATCH_SIZE", default=5000)
+
+# Parquet output of export_events (overridable with --compression/--row-group-size).
+EXPORT_PARQUET_COMPRESSION = env("EXPORT_PARQUET_COMPRESSION", default="zstd")
+EXPORT_PARQUET_ROW_GROUP_SIZE = env.int("EXPORT_PARQUET_ROW_GROUP_SIZE", default=100000)
+
+# Monthly ContractEvent partitions on PostgreSQL (soroscan.ingest.partitions):
+# months created ahead of time, hash sub-partitions per month by contract
+# (0 = none; applies to months created afterwards), and whether retention
+# drops expired partitions or only detaches them ("detach") for offline archiving.
+EVENT_PARTITIONS_AHEAD = env.int("EVENT_PARTITIONS_AHEAD", default=3)
+EVENT_PARTITION_HASH_BUCKETS = env.int("EVENT_PARTITION_HASH_BUCKETS", default=0)
+EVENT_PARTITION_RETENTION_ACTION = env("EVENT_PARTITION_RETENTION_ACTION", default="drop")
+
 # Sentry (optional): init only when SENTRY_DSN is set. Celery task failures reported via CeleryIntegration.
 SENTRY_DSN = env("SENTRY_DSN", default="")
 if SENTRY_DSN:
@@ -246,6 +246,7 @@ CONTRACT_SNAPSHOT_MAX_BYTES = 1_048_576
 # Misc defaults needed by code under test
 DEDUP_LOG_RETENTION_DAYS = 90
 EVENT_RETENTION_DAYS = 30
+EVENT_RECOUNT_DELAY_SECONDS = 0
 ALERT_DEDUP_WINDOW_SECONDS = 300
 WEBHOOK_MAX_RETRIES = 5
 INDEXER_SECRET_KEY = ""